@@ -71,6 +71,11 @@ from .request_util import (
 )
 
 
+def _copy_resp(resp: KuroApiResp) -> KuroApiResp:
+    """缓存的响应每次返回一份深复制, 调用方修改 data 不会影响缓存"""
+    return resp.model_copy(deep=True)
+
+
 class WavesApi:
     ssl_verify = True
     ann_map = {}
@@ -291,6 +296,13 @@ class WavesApi:
         data = {}
         return await self._waves_request(LOGIN_LOG_URL, "POST", header, data=data)
 
+    # 同一次指令绘制多张卡片时会重复请求, 短时间缓存
+    @timed_async_cache(
+        5,
+        lambda x: x.success and isinstance(x.data, dict),
+        maxsize=512,
+        copy=_copy_resp,
+    )
     async def get_base_info(self, roleId: str, token: str, serverId: str | None = None):
         header = await get_base_header()
         used_headers = await self.get_used_headers(cookie=token, uid=roleId)
@@ -303,6 +315,13 @@ class WavesApi:
         }
         return await self._waves_request(BASE_DATA_URL, "POST", header, data=data)
 
+    # 同一次指令绘制多张卡片时会重复请求, 短时间缓存
+    @timed_async_cache(
+        5,
+        lambda x: x.success and isinstance(x.data, dict),
+        maxsize=512,
+        copy=_copy_resp,
+    )
     async def get_role_info(self, roleId: str, token: str, serverId: str | None = None):
         header = await get_base_header()
         used_headers = await self.get_used_headers(cookie=token, uid=roleId)
@@ -531,6 +550,8 @@ class WavesApi:
     @timed_async_cache(
         86400,
         lambda x: x.success and isinstance(x.data, (dict, list)),
+        exclude=["token"],
+        copy=_copy_resp,
     )
     async def get_online_list_role(self, token: str):
         """所有的角色列表"""
@@ -542,6 +563,8 @@ class WavesApi:
     @timed_async_cache(
         86400,
         lambda x: x.success and isinstance(x.data, (dict, list)),
+        exclude=["token"],
+        copy=_copy_resp,
     )
     async def get_online_list_weapon(self, token: str):
         """所有的武器列表"""
@@ -553,6 +576,8 @@ class WavesApi:
     @timed_async_cache(
         86400,
         lambda x: x.success and isinstance(x.data, (dict, list)),
+        exclude=["token"],
+        copy=_copy_resp,
     )
     async def get_online_list_phantom(self, token: str):
         """所有的声骸列表"""
@@ -0,0 +1,197 @@
+"""
+游戏数据打包
+
+将 utils/map 下的 detail_json(角色/武器/声骸/套装/材料/怪物) 以及 id2name.json、CharId2Data.json、limit.json
+打包为一个 MessagePack 文件, 通过 mmap 读取, 每条记录在使用时才解码。
+
+文件格式: MAGIC | 版本(u32) | 索引长度(u32) | 索引 | 记录...
+    索引: {"fingerprint": 源文件指纹, "sections": {分类: {key: [偏移, 长度]}}}, 偏移从记录区开始计算
+源文件变化(插件更新)后第一次访问时自动重新打包; 打包失败时回退为直接读取 JSON。
+"""
+
+from collections.abc import Callable, Iterator
+import hashlib
+import mmap
+import os
+from pathlib import Path
+import struct
+from typing import Any
+
+from gsuid_core.logger import logger
+import msgspec
+from msgspec import json as msgjson
+
+from ..resource.RESOURCE_PATH import GAME_DATA_BUNDLE_PATH
+
+BUNDLE_MAGIC = b"WWGD"
+# 打包格式变化时修改
+BUNDLE_VERSION = 1
+HEADER = struct.Struct("<4sII")
+
+MAP_PATH = Path(__file__).parent.parent / "map"
+DETAIL_JSON_PATH = MAP_PATH / "detail_json"
+# 分类 -> 目录, 目录下每个文件一条记录, key 为文件名(不含扩展名)
+BUNDLE_DIRS = {
+    "char": DETAIL_JSON_PATH / "char",
+    "weapon": DETAIL_JSON_PATH / "weapon",
+    "echo": DETAIL_JSON_PATH / "echo",
+    "sonata": DETAIL_JSON_PATH / "sonata",
+    "material": DETAIL_JSON_PATH / "material",
+}
+# 单个文件整体作为一条记录, 放在 FILE_SECTION 分类下
+FILE_SECTION = "file"
+BUNDLE_FILES = {
+    "id2name": MAP_PATH / "id2name.json",
+    "CharId2Data": MAP_PATH / "CharId2Data.json",
+    "limit": MAP_PATH / "limit.json",
+    "monster_dict": DETAIL_JSON_PATH / "monster_dict.json",
+}
+
+
+def iter_source_files() -> Iterator[tuple[str, str, Path]]:
+    """(分类, key, 路径), 目录内保持 rglob 的顺序"""
+    for section, directory in BUNDLE_DIRS.items():
+        for file in directory.rglob("*.json"):
+            yield section, file.name.split(".")[0], file
+    for key, path in BUNDLE_FILES.items():
+        if path.exists():
+            yield FILE_SECTION, key, path
+
+
+def get_source_fingerprint() -> str:
+    """只用到文件的大小和修改时间, 不读取内容"""
+    md5 = hashlib.md5(str(BUNDLE_VERSION).encode())
+    for section, key, path in iter_source_files():
+        stat = path.stat()
+        md5.update(f"{section}/{key}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return md5.hexdigest()
+
+
+def build_game_data_bundle(path: Path = GAME_DATA_BUNDLE_PATH, fingerprint: str | None = None) -> Path:
+    fingerprint = fingerprint or get_source_fingerprint()
+    encoder = msgspec.msgpack.Encoder()
+    sections: dict[str, dict[str, list[int]]] = {}
+    records: list[bytes] = []
+    offset = 0
+    for section, key, file in iter_source_files():
+        try:
+            with open(file, "rb") as f:
+                data = msgjson.decode(f.read())
+        except Exception as e:
+            logger.exception(f"build_game_data_bundle load fail decoding {file}", e)
+            continue
+        record = encoder.encode(data)
+        sections.setdefault(section, {})[key] = [offset, len(record)]
+        records.append(record)
+        offset += len(record)
+
+    index = encoder.encode({"fingerprint": fingerprint, "sections": sections})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(index)))
+        f.write(index)
+        for record in records:
+            f.write(record)
+    os.replace(tmp_path, path)
+    return path
+
+
+class GameDataBundle:
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, index_size = HEADER.unpack_from(self._mmap, 0)
+            if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+                raise ValueError(f"unsupported bundle {path}")
+            index = msgspec.msgpack.decode(self._mmap[HEADER.size : HEADER.size + index_size])
+        except Exception:
+            self.close()
+            raise
+        self.fingerprint: str = index["fingerprint"]
+        self.sections: dict[str, dict[str, list[int]]] = index["sections"]
+        self._data_start = HEADER.size + index_size
+
+    def keys(self, section: str) -> list[str]:
+        return list(self.sections.get(section, {}))
+
+    def has(self, section: str, key: str) -> bool:
+        return key in self.sections.get(section, {})
+
+    def get(self, section: str, key: str, type: Any = Any) -> Any:
+        offset, length = self.sections[section][key]
+        start = self._data_start + offset
+        with memoryview(self._mmap) as view, view[start : start + length] as record:
+            return msgspec.msgpack.decode(record, type=type)
+
+    def close(self):
+        if getattr(self, "_mmap", None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+
+_bundle: GameDataBundle | None = None
+_checked = False
+_reload_callbacks: list[Callable[[], None]] = []
+
+
+def on_bundle_reload(callback: Callable[[], None]):
+    """打包文件重新生成后调用, 用于清理基于旧数据的缓存"""
+    _reload_callbacks.append(callback)
+
+
+def _open_bundle(fingerprint: str) -> GameDataBundle | None:
+    if GAME_DATA_BUNDLE_PATH.exists():
+        try:
+            bundle = GameDataBundle(GAME_DATA_BUNDLE_PATH)
+            if bundle.fingerprint == fingerprint:
+                return bundle
+            bundle.close()
+        except Exception as e:
+            logger.warning(f"[鸣潮] 游戏数据打包文件无效, 重新打包: {e}")
+
+    try:
+        build_game_data_bundle(GAME_DATA_BUNDLE_PATH, fingerprint)
+        logger.info(f"[鸣潮] 游戏数据已重新打包: {GAME_DATA_BUNDLE_PATH}")
+        return GameDataBundle(GAME_DATA_BUNDLE_PATH)
+    except Exception as e:
+        logger.exception(f"[鸣潮] 游戏数据打包失败, 直接读取 JSON: {e}")
+        return None
+
+
+def get_game_data_bundle() -> GameDataBundle | None:
+    """第一次调用时检查源文件, 有变化则重新打包"""
+    global _bundle, _checked
+    if not _checked:
+        _checked = True
+        _bundle = _open_bundle(get_source_fingerprint())
+    return _bundle
+
+
+def refresh_game_data_bundle() -> bool:
+    """源文件有变化时重新打包并通知缓存失效, 返回是否重新打包"""
+    global _bundle, _checked
+    fingerprint = get_source_fingerprint()
+    if _checked and _bundle is not None and _bundle.fingerprint == fingerprint:
+        return False
+
+    # Windows 下需要先关闭 mmap 才能替换文件
+    if _bundle is not None:
+        _bundle.close()
+    _bundle = _open_bundle(fingerprint)
+    _checked = True
+    for callback in _reload_callbacks:
+        callback()
+    return True
+
+
+def load_bundled_file(name: str, type: Any = Any) -> Any:
+    """读取 BUNDLE_FILES 中的单个文件"""
+    bundle = get_game_data_bundle()
+    if bundle is not None and bundle.has(FILE_SECTION, name):
+        return bundle.get(FILE_SECTION, name, type=type)
+    with open(BUNDLE_FILES[name], "rb") as f:
+        return msgjson.decode(f.read(), type=type)
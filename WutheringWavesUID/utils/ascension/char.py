@@ -1,40 +1,53 @@
-import copy
-from pathlib import Path
+from types import MappingProxyType
+from typing import Any
 
 from gsuid_core.logger import logger
-from msgspec import json as msgjson
 
 from ..ascension.constant import fixed_name, sum_percentages
 from ..resource.constant import SKILL_TREE_BREACH_MAP
+from .bundle import DETAIL_JSON_PATH, on_bundle_reload
 from .model import CharacterModel
+from .registry import DetailJsonRegistry
 
-MAP_PATH = Path(__file__).parent.parent / "map/detail_json/char"
-char_id_data = {}
+MAP_PATH = DETAIL_JSON_PATH / "char"
+char_id_data = DetailJsonRegistry(
+    MAP_PATH,
+    summarize=lambda data: {key: data[key] for key in ("name", "starLevel") if key in data},
+)
 
 
-def read_char_json_files(directory):
-    files = directory.rglob("*.json")
+class WavesCharResult:
+    """角色在指定等级/突破下的属性, 启动时预先计算, 所有调用方共享同一个对象, 不可修改"""
 
-    for file in files:
-        try:
-            with open(file, encoding="utf-8") as f:
-                data = msgjson.decode(f.read())
-                file_name = file.name.split(".")[0]
-                char_id_data[file_name] = data
-        except Exception as e:
-            logger.exception(f"read_char_json_files load fail decoding {file}", e)
+    __slots__ = ("name", "starLevel", "stats", "skillTrees", "fixed_skill")
 
+    def __init__(
+        self,
+        name: str = "",
+        starLevel: int = 4,
+        stats: MappingProxyType | None = None,
+        skillTrees: dict | None = None,
+        fixed_skill: MappingProxyType | None = None,
+    ):
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "starLevel", starLevel)
+        if stats is None:
+            stats = MappingProxyType({"life": 0.0, "atk": 0.0, "def": 0.0})
+        object.__setattr__(self, "stats", stats)
+        object.__setattr__(self, "skillTrees", skillTrees if skillTrees is not None else {})
+        object.__setattr__(self, "fixed_skill", fixed_skill if fixed_skill is not None else MappingProxyType({}))
 
-read_char_json_files(MAP_PATH)
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is read-only")
 
 
-class WavesCharResult:
-    def __init__(self):
-        self.name = ""
-        self.starLevel = 4
-        self.stats = {"life": 0.0, "atk": 0.0, "def": 0.0}
-        self.skillTrees = {}
-        self.fixed_skill = {}
+EMPTY_CHAR_RESULT = WavesCharResult()
+
+# (char_id, breach, level) -> WavesCharResult, 角色第一次被查询时生成
+char_result_table: dict[tuple[str, int, int], WavesCharResult] = {}
+_char_table_ids: set[str] = set()
+on_bundle_reload(char_result_table.clear)
+on_bundle_reload(_char_table_ids.clear)
 
 
 def get_breach(breach: int | None, level: int):
@@ -73,23 +86,9 @@ def extract_param_index(desc: str, search_text: str) -> int | None:
         return None
 
 
-def get_char_detail(char_id: str | int, level: int, breach: int | None = None) -> WavesCharResult:
-    """
-    breach 突破
-    resonLevel 精炼
-    """
-    result = WavesCharResult()
-    if str(char_id) not in char_id_data:
-        logger.exception(f"get_char_detail char_id: {char_id} not found")
-        return result
-
-    breach = get_breach(breach, level)
-
-    char_data = char_id_data[str(char_id)]
-    result.name = char_data["name"]
-    result.starLevel = char_data["starLevel"]
-    result.stats = copy.deepcopy(char_data["stats"][str(breach)][str(level)])
-    result.skillTrees = char_data["skillTree"]
+def get_fixed_skill(char_data: dict, breach: int) -> dict[str, str]:
+    """突破 breach 时已解锁的固有技能提供的属性"""
+    fixed_skill = {}
 
     # 构建skill_tree列表
     skill_tree = []
@@ -112,15 +111,66 @@ def get_char_detail(char_id: str | int, level: int, breach: int | None = None) -
         if not search_text:
             continue
 
-        logger.debug(f"get_char_detail search_text: {search_text}, name: {name}")
         if (index := extract_param_index(desc, search_text)) is not None and index < len(params):
             clean_name = search_text.replace("提升", "").replace("全", "")
-            if clean_name not in result.fixed_skill:
-                result.fixed_skill[clean_name] = "0%"
-            result.fixed_skill[clean_name] = sum_percentages(params[index], result.fixed_skill[clean_name])
-            logger.debug(f"get_char_detail {search_text}: {params[index]}")
+            if clean_name not in fixed_skill:
+                fixed_skill[clean_name] = "0%"
+            fixed_skill[clean_name] = sum_percentages(params[index], fixed_skill[clean_name])
+
+    return fixed_skill
+
+
+def build_char_result(
+    char_data: dict,
+    breach: int,
+    level: int,
+    fixed_skill: MappingProxyType | None = None,
+) -> WavesCharResult:
+    stats = char_data["stats"][str(breach)][str(level)]
+    if fixed_skill is None:
+        fixed_skill = MappingProxyType(get_fixed_skill(char_data, breach))
+    return WavesCharResult(
+        name=char_data["name"],
+        starLevel=char_data["starLevel"],
+        stats=MappingProxyType(dict(stats)),
+        skillTrees=char_data["skillTree"],
+        fixed_skill=fixed_skill,
+    )
+
+
+def build_char_table(char_id: str, char_data: dict):
+    """计算该角色所有 等级/突破 的结果, 同一突破共享固有技能"""
+    for breach_key, levels in char_data["stats"].items():
+        breach = int(breach_key)
+        fixed_skill = MappingProxyType(get_fixed_skill(char_data, breach))
+        for level_key in levels:
+            level = int(level_key)
+            char_result_table[(char_id, breach, level)] = build_char_result(char_data, breach, level, fixed_skill)
+    _char_table_ids.add(char_id)
+
+
+def get_char_detail(char_id: str | int, level: int, breach: int | None = None) -> WavesCharResult:
+    """
+    breach 突破
+    resonLevel 精炼
+    返回共享的只读结果
+    """
+    char_id = str(char_id)
+    breach = get_breach(breach, level)
+    result = char_result_table.get((char_id, breach, level))
+    if result is not None:
+        return result
+
+    char_data = char_id_data.get(char_id)
+    if char_data is None:
+        logger.exception(f"get_char_detail char_id: {char_id} not found")
+        return EMPTY_CHAR_RESULT
 
-    return result
+    if char_id not in _char_table_ids:
+        build_char_table(char_id, char_data)
+        if (result := char_result_table.get((char_id, breach, level))) is not None:
+            return result
+    return build_char_result(char_data, breach, level)
 
 
 def get_char_detail2(role) -> WavesCharResult:
@@ -131,13 +181,14 @@ def get_char_detail2(role) -> WavesCharResult:
 
 
 def get_char_id(char_name):
-    return next((_id for _id, value in char_id_data.items() if value["name"] == char_name), None)
+    return next((_id for _id, value in char_id_data.summaries().items() if value["name"] == char_name), None)
 
 
 def get_char_model(char_id: str | int) -> CharacterModel | None:
-    if str(char_id) not in char_id_data:
+    data = char_id_data.get(str(char_id))
+    if data is None:
         return None
-    return CharacterModel(**char_id_data[str(char_id)])
+    return CharacterModel(**data)
 
 
 class CharExp:
@@ -1,60 +1,46 @@
-from pathlib import Path
-
-from gsuid_core.logger import logger
-from msgspec import json as msgjson
-
+from .bundle import DETAIL_JSON_PATH, on_bundle_reload
 from .model import EchoModel
+from .registry import DetailJsonRegistry
 
-MAP_PATH = Path(__file__).parent.parent / "map/detail_json/echo"
-echo_id_data = {}
-set_name_to_echo_ids: dict[str, list[int]] = {}  # 新增：套装名到声骸ID列表的映射
-
+MAP_PATH = DETAIL_JSON_PATH / "echo"
 
-def read_echo_json_files(directory):
-    files = directory.rglob("*.json")
 
-    # 清空原有数据
-    echo_id_data.clear()
-    set_name_to_echo_ids.clear()
+def summarize_echo(data: dict) -> tuple[int | None, list[str]]:
+    """声骸ID 与所属套装名"""
+    return data.get("id"), [info["name"] for info in data.get("group", {}).values() if "name" in info]
 
-    for file in files:
-        try:
-            with open(file, encoding="utf-8") as f:
-                data = msgjson.decode(f.read())
-                file_name = file.name.split(".")[0]
-                echo_id_data[file_name] = data
 
-                # 新增：处理套装映射
-                if "group" in data:
-                    echo_id = data.get("id")
-                    if echo_id:
-                        for group_key, group_info in data["group"].items():
-                            if "name" in group_info:
-                                set_name = group_info["name"]
-                                if set_name not in set_name_to_echo_ids:
-                                    set_name_to_echo_ids[set_name] = []
-                                if echo_id not in set_name_to_echo_ids[set_name]:
-                                    set_name_to_echo_ids[set_name].append(echo_id)
-        except Exception as e:
-            logger.exception(f"read_echo_json_files load fail decoding {file}", e)
+echo_id_data = DetailJsonRegistry(MAP_PATH, summarize=summarize_echo)
+set_name_to_echo_ids: dict[str, list[int]] = {}  # 套装名到声骸ID列表的映射, 第一次使用时生成
+on_bundle_reload(set_name_to_echo_ids.clear)
 
 
-read_echo_json_files(MAP_PATH)
+def load_set_mappings() -> dict[str, list[int]]:
+    if not set_name_to_echo_ids:
+        for echo_id, set_names in echo_id_data.summaries().values():
+            if not echo_id:
+                continue
+            for set_name in set_names:
+                echo_ids = set_name_to_echo_ids.setdefault(set_name, [])
+                if echo_id not in echo_ids:
+                    echo_ids.append(echo_id)
+    return set_name_to_echo_ids
 
 
 def get_echo_model(echo_id: int | str) -> EchoModel | None:
-    if str(echo_id) not in echo_id_data:
+    data = echo_id_data.get(str(echo_id))
+    if data is None:
         return None
-    return EchoModel(**echo_id_data[str(echo_id)])
+    return EchoModel(**data)
 
 
 # 获取套装下的所有声骸ID
 def get_echo_ids_by_set_name(set_name: str) -> list[int]:
     """根据套装名获取所有声骸ID"""
-    return set_name_to_echo_ids.get(set_name, [])
+    return load_set_mappings().get(set_name, [])
 
 
 # 获取所有套装映射
 def get_all_set_mappings() -> dict[str, list[int]]:
     """获取所有套装名到声骸ID列表的映射"""
-    return set_name_to_echo_ids.copy()
+    return load_set_mappings().copy()
@@ -1,29 +1,26 @@
-from pathlib import Path
-
 from gsuid_core.logger import logger
-from msgspec import json as msgjson
 
+from .bundle import BUNDLE_FILES, DETAIL_JSON_PATH, load_bundled_file
 from .model import MonsterModel
 
-MAP_PATH = Path(__file__).parent.parent / "map/detail_json/monster"
-DICT_PATH = Path(__file__).parent.parent / "map/detail_json/monster_dict.json"
+MAP_PATH = DETAIL_JSON_PATH / "monster"
+DICT_PATH = BUNDLE_FILES["monster_dict"]
 monster_id_data = {}
 
 
-def read_id_dict(directory):
+def read_id_dict():
     # 清空原有数据
     monster_id_data.clear()
 
     try:
-        with open(directory, encoding="utf-8") as f:
-            data = msgjson.decode(f.read())
-            for key, value in data.items():
-                monster_id_data[key] = value
+        data = load_bundled_file("monster_dict")
+        for key, value in data.items():
+            monster_id_data[key] = value
     except Exception as e:
-        logger.exception(f"read_id_dict load fail decoding {directory}", e)
+        logger.exception(f"read_id_dict load fail decoding {DICT_PATH}", e)
 
 
-read_id_dict(DICT_PATH)
+read_id_dict()
 
 
 def get_all_monster_id_mappings() -> dict[str, list[int]]:
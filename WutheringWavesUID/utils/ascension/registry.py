@@ -0,0 +1,130 @@
+"""
+detail_json 按需加载
+
+启动时只读取打包文件的索引(没有打包文件时扫描文件名), 数据在第一次访问时才解析,
+解析结果放在有上限的 LRU 缓存中。批量任务可以调用 preload_detail_json 一次性全部加载。
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+from gsuid_core.logger import logger
+from msgspec import json as msgjson
+
+from .bundle import get_game_data_bundle, on_bundle_reload
+
+# 每类数据最多缓存的解析结果数
+DETAIL_CACHE_SIZE = 32
+
+detail_registries: list["DetailJsonRegistry"] = []
+
+
+class DetailJsonRegistry(Mapping[str, Any]):
+    """
+    以文件名(不含扩展名)为 key 的只读映射, 用法与原先的 xxx_id_data 字典相同
+    - in / keys / len 只用到索引, 不会解析文件
+    - summaries 对每个文件只保留 summarize 的结果, 用于按名称查找、列表等需要遍历全部数据的场景
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        summarize: Callable[[dict], Any] | None = None,
+        maxsize: int | None = DETAIL_CACHE_SIZE,
+    ):
+        self.directory = directory
+        self.summarize = summarize
+        self.maxsize = maxsize
+        # 打包文件中的分类名与目录名相同
+        self.section = directory.name
+        # key -> 文件路径, 数据在打包文件中时为 None
+        self._index: dict[str, Path | None] | None = None
+        self._cache: OrderedDict[str, Any] = OrderedDict()
+        self._summaries: dict[str, Any] | None = None
+        detail_registries.append(self)
+        on_bundle_reload(self.reset)
+
+    @property
+    def index(self) -> dict[str, Path | None]:
+        if self._index is None:
+            bundle = get_game_data_bundle()
+            if bundle is not None and self.section in bundle.sections:
+                self._index = dict.fromkeys(bundle.keys(self.section))
+            else:
+                self._index = {file.name.split(".")[0]: file for file in self.directory.rglob("*.json")}
+        return self._index
+
+    def reset(self):
+        self._index = None
+        self._cache.clear()
+        self._summaries = None
+
+    def _decode(self, key: str) -> Any:
+        path = self.index[key]
+        try:
+            if path is None:
+                bundle = get_game_data_bundle()
+                if bundle is None:
+                    raise KeyError(key)
+                return bundle.get(self.section, key)
+            with open(path, encoding="utf-8") as f:
+                return msgjson.decode(f.read())
+        except Exception as e:
+            # 与原先一样, 解析失败的文件视为不存在
+            logger.exception(f"DetailJsonRegistry load fail decoding {path}", e)
+            self.index.pop(key, None)
+            raise KeyError(key) from e
+
+    def __getitem__(self, key: str) -> Any:
+        data = self._cache.get(key)
+        if data is not None:
+            self._cache.move_to_end(key)
+            return data
+
+        data = self._decode(key)
+        self._cache[key] = data
+        if self.maxsize is not None and len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return data
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.index))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def summaries(self) -> dict[str, Any]:
+        """每个文件的摘要, 第一次调用时逐个解析, 之后常驻内存"""
+        if self._summaries is None:
+            summarize = self.summarize or (lambda data: data)
+            summaries = {}
+            for key in list(self.index):
+                data = self._cache.get(key)
+                if data is None:
+                    try:
+                        data = self._decode(key)
+                    except KeyError:
+                        continue
+                summaries[key] = summarize(data)
+            self._summaries = summaries
+        return self._summaries
+
+    def preload(self):
+        """解析全部文件并取消缓存上限"""
+        self.maxsize = None
+        for key in list(self.index):
+            try:
+                self[key]
+            except KeyError:
+                continue
+
+
+def preload_detail_json():
+    """批量任务使用, 一次性加载全部 detail_json"""
+    for registry in detail_registries:
+        registry.preload()
@@ -1,27 +1,11 @@
-from pathlib import Path
-
 from gsuid_core.logger import logger
-from msgspec import json as msgjson
 from pydantic import BaseModel, Field
 
-MAP_PATH = Path(__file__).parent.parent / "map/detail_json/sonata"
-sonata_id_data = {}
-
-
-def read_sonata_json_files(directory):
-    files = directory.rglob("*.json")
+from .bundle import DETAIL_JSON_PATH
+from .registry import DetailJsonRegistry
 
-    for file in files:
-        try:
-            with open(file, encoding="utf-8") as f:
-                data = msgjson.decode(f.read())
-                file_name = file.name.split(".")[0]
-                sonata_id_data[file_name] = data
-        except Exception as e:
-            logger.exception(f"read_char_json_files load fail decoding {file}", e)
-
-
-read_sonata_json_files(MAP_PATH)
+MAP_PATH = DETAIL_JSON_PATH / "sonata"
+sonata_id_data = DetailJsonRegistry(MAP_PATH)
 
 
 class SonataSet(BaseModel):
@@ -49,4 +33,7 @@ def get_sonata_detail(sonata_name: str | None) -> WavesSonataResult:
         logger.exception(f"get_sonata_detail sonata_name: {sonata_name} not found")
         return result
 
-    return WavesSonataResult(**sonata_id_data[sonata_name])
+    data = sonata_id_data.get(sonata_name)
+    if data is None:
+        return result
+    return WavesSonataResult(**data)
@@ -1,46 +1,106 @@
-import copy
-from pathlib import Path
-
-from gsuid_core.logger import logger
-from msgspec import json as msgjson
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any
 
 from ..ascension.constant import fixed_name
+from .bundle import DETAIL_JSON_PATH, on_bundle_reload
 from .model import WeaponModel
+from .registry import DetailJsonRegistry
 
-MAP_PATH = Path(__file__).parent.parent / "map/detail_json/weapon"
-weapon_id_data = {}
+MAP_PATH = DETAIL_JSON_PATH / "weapon"
+weapon_id_data = DetailJsonRegistry(
+    MAP_PATH,
+    summarize=lambda data: {key: data[key] for key in ("name", "starLevel", "type", "effectName") if key in data},
+)
 
 
-def read_weapon_json_files(directory):
-    files = directory.rglob("*.json")
+class WavesWeaponResult:
+    """武器在指定等级/突破/谐振下的属性, 所有调用方共享同一个对象, 不可修改"""
+
+    __slots__ = ("name", "starLevel", "type", "stats", "param", "effect", "effectName", "sub_effect", "resonLevel")
+
+    def __init__(
+        self,
+        name: str = "",
+        starLevel: int = 4,
+        type: int = 0,
+        stats: tuple[MappingProxyType, ...] = (),
+        param: list | None = None,
+        effect: str = "",
+        effectName: str = "",
+        sub_effect: MappingProxyType | None = None,
+        resonLevel: int = 1,
+    ):
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "starLevel", starLevel)
+        object.__setattr__(self, "type", type)
+        object.__setattr__(self, "stats", stats)
+        object.__setattr__(self, "param", param if param is not None else [])
+        object.__setattr__(self, "effect", effect)
+        object.__setattr__(self, "effectName", effectName)
+        object.__setattr__(self, "sub_effect", sub_effect if sub_effect is not None else MappingProxyType({}))
+        object.__setattr__(self, "resonLevel", resonLevel)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is read-only")
 
-    for file in files:
-        try:
-            with open(file, encoding="utf-8") as f:
-                data = msgjson.decode(f.read())
-                file_name = file.name.split(".")[0]
-                weapon_id_data[file_name] = data
-        except Exception as e:
-            logger.exception(f"read_weapon_json_files load fail decoding {file}", e)
+    def get_resonLevel_name(self):
+        return f"谐振{['一', '二', '三', '四', '五'][self.resonLevel - 1]}阶"
 
 
-read_weapon_json_files(MAP_PATH)
+EMPTY_WEAPON_RESULT = WavesWeaponResult()
 
+# 以下表格在武器第一次被查询时生成
+_weapon_table_ids: set[str] = set()
+# (weapon_id, breach, level) -> 格式化后的属性
+weapon_stats_table: dict[tuple[str, int, int], tuple[MappingProxyType, ...]] = {}
+# (weapon_id, resonLevel) -> (效果描述, 谐振属性)
+weapon_effect_table: dict[tuple[str, int], tuple[str, MappingProxyType]] = {}
+# (weapon_id, breach, level, resonLevel) -> WavesWeaponResult, 按最近使用保留 _WEAPON_RESULTS_MAXSIZE 个
+_weapon_results: OrderedDict[tuple[str, Any, int, int], WavesWeaponResult] = OrderedDict()
+_WEAPON_RESULTS_MAXSIZE = 1024
+for _table in (_weapon_table_ids, weapon_stats_table, weapon_effect_table, _weapon_results):
+    on_bundle_reload(_table.clear)
 
-class WavesWeaponResult:
-    def __init__(self):
-        self.name: str = ""
-        self.starLevel: int = 4
-        self.type: int = 0
-        self.stats = []
-        self.param = []
-        self.effect: str = ""
-        self.effectName: str = ""
-        self.sub_effect = {}
-        self.resonLevel: int = 1
 
-    def get_resonLevel_name(self):
-        return f"谐振{['一', '二', '三', '四', '五'][self.resonLevel - 1]}阶"
+def format_weapon_stats(stats: list[dict]) -> tuple[MappingProxyType, ...]:
+    result = []
+    for stat in stats:
+        stat = dict(stat)
+        if stat["isPercent"]:
+            stat["value"] = f"{stat['value'] / 100:.1f}%"
+        elif stat["isRatio"]:
+            stat["value"] = f"{stat['value'] * 100:.1f}%"
+        else:
+            stat["value"] = f"{int(stat['value'])}"
+        result.append(MappingProxyType(stat))
+    return tuple(result)
+
+
+def build_weapon_effect(weapon_data: dict, resonLevel: int) -> tuple[str, MappingProxyType]:
+    effect = weapon_data["effect"]
+    for i, p in enumerate(weapon_data["param"]):
+        _temp = "{" + str(i) + "}"
+        effect = effect.replace(f"{_temp}", str(p[resonLevel - 1]))
+
+    sub_effect = {}
+    for v in fixed_name:
+        if effect.startswith(v):
+            value = weapon_data["param"][0][resonLevel - 1]
+            name = v.replace("提升", "").replace("全", "")
+            sub_effect = {"name": name, "value": f"{value}"}
+
+    return effect, MappingProxyType(sub_effect)
+
+
+def build_weapon_table(weapon_id: str, weapon_data: dict):
+    """计算该武器所有 等级/突破 的属性以及各谐振等级的效果"""
+    for breach_key, levels in weapon_data["stats"].items():
+        for level_key, stats in levels.items():
+            weapon_stats_table[(weapon_id, int(breach_key), int(level_key))] = format_weapon_stats(stats)
+    for resonLevel in range(1, 6):
+        weapon_effect_table[(weapon_id, resonLevel)] = build_weapon_effect(weapon_data, resonLevel)
+    _weapon_table_ids.add(weapon_id)
 
 
 def get_breach(breach: int | None, level: int):
@@ -62,6 +122,29 @@ def get_breach(breach: int | None, level: int):
     return breach
 
 
+def build_weapon_result(weapon_id: str, weapon_data: dict, level: int, breach: Any, resonLevel: int) -> WavesWeaponResult:
+    if weapon_id not in _weapon_table_ids:
+        build_weapon_table(weapon_id, weapon_data)
+    stats = weapon_stats_table.get((weapon_id, breach, level))
+    if stats is None:
+        stats = format_weapon_stats(weapon_data["stats"][str(breach)][str(level)])
+    effect = weapon_effect_table.get((weapon_id, resonLevel))
+    if effect is None:
+        effect = build_weapon_effect(weapon_data, resonLevel)
+
+    return WavesWeaponResult(
+        name=weapon_data["name"],
+        starLevel=weapon_data["starLevel"],
+        type=weapon_data["type"],
+        stats=stats,
+        param=weapon_data["param"],
+        effect=effect[0],
+        effectName=weapon_data["effectName"],
+        sub_effect=effect[1],
+        resonLevel=resonLevel,
+    )
+
+
 def get_weapon_detail(
     weapon_id: str | int,
     level: int,
@@ -71,50 +154,31 @@ def get_weapon_detail(
     """
     breach 突破
     resonLevel 精炼
+    返回共享的只读结果
     """
-    result = WavesWeaponResult()
-    if str(weapon_id) not in weapon_id_data:
-        return result
-
+    weapon_id = str(weapon_id)
     breach = get_breach(breach, level)
-
-    weapon_data = weapon_id_data[str(weapon_id)]
-    result.name = weapon_data["name"]
-    result.starLevel = weapon_data["starLevel"]
-    result.type = weapon_data["type"]
-    result.effectName = weapon_data["effectName"]
-    result.stats = copy.deepcopy(weapon_data["stats"][str(breach)][str(level)])
-    result.param = weapon_data["param"]
-    effect = weapon_data["effect"]
     if resonLevel is None:
         resonLevel = 1
-    result.resonLevel = resonLevel
-    for i, p in enumerate(weapon_data["param"]):
-        _temp = "{" + str(i) + "}"
-        effect = effect.replace(f"{_temp}", str(p[resonLevel - 1]))
-    result.effect = effect
 
-    for stat in result.stats:
-        if stat["isPercent"]:
-            stat["value"] = f"{stat['value'] / 100:.1f}%"
-        elif stat["isRatio"]:
-            stat["value"] = f"{stat['value'] * 100:.1f}%"
-        else:
-            stat["value"] = f"{int(stat['value'])}"
-
-    result.sub_effect = {}
-    for i, v in enumerate(fixed_name):
-        if result.effect.startswith(v):
-            value = weapon_data["param"][0][resonLevel - 1]
-            name = v.replace("提升", "").replace("全", "")
-            result.sub_effect = {"name": name, "value": f"{value}"}
+    key = (weapon_id, breach, level, resonLevel)
+    result = _weapon_results.get(key)
+    if result is not None:
+        _weapon_results.move_to_end(key)
+        return result
 
+    weapon_data = weapon_id_data.get(weapon_id)
+    if weapon_data is None:
+        return EMPTY_WEAPON_RESULT
+    result = _weapon_results[key] = build_weapon_result(weapon_id, weapon_data, level, breach, resonLevel)
+    if len(_weapon_results) > _WEAPON_RESULTS_MAXSIZE:
+        _weapon_results.popitem(last=False)
     return result
 
 
 def get_weapon_id(weapon_name):
     return next(
-        (_id for _id, value in weapon_id_data.items() if value["name"] == weapon_name),
+        (_id for _id, value in weapon_id_data.summaries().items() if value["name"] == weapon_name),
         None,
     )
 
@@ -131,9 +195,10 @@ def get_weapon_star(weapon_name) -> int:
 
 
 def get_weapon_model(weapon_id: int | str) -> WeaponModel | None:
-    if str(weapon_id) not in weapon_id_data:
+    data = weapon_id_data.get(str(weapon_id))
+    if data is None:
         return None
-    return WeaponModel(**weapon_id_data[str(weapon_id)])
+    return WeaponModel(**data)
 
 
 class WeaponExp:
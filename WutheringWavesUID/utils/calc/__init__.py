@@ -20,11 +20,41 @@ from ..damage.damage import DamageAttribute
 from ..resource.constant import card_sort_map as card_sort_map_back
 
 
+class CalcLookups:
+    """
+    角色/武器/套装查询结果, 一次计算内以及批量计算的多个角色之间共用
+    返回的结果都是只读使用的, 可以共享
+    """
+
+    def __init__(self):
+        self.chars: dict[tuple, WavesCharResult] = {}
+        self.weapons: dict[tuple, WavesWeaponResult] = {}
+        self.sonatas: dict[str | None, WavesSonataResult] = {}
+
+    def char(self, role_id, level: int, breach: int | None) -> WavesCharResult:
+        key = (role_id, level, breach)
+        if key not in self.chars:
+            self.chars[key] = get_char_detail(role_id, level, breach)
+        return self.chars[key]
+
+    def weapon(self, weapon_id, level: int, breach: int | None, reson_level: int | None) -> WavesWeaponResult:
+        key = (weapon_id, level, breach, reson_level)
+        if key not in self.weapons:
+            self.weapons[key] = get_weapon_detail(weapon_id, level, breach, reson_level)
+        return self.weapons[key]
+
+    def sonata(self, sonata_name: str | None) -> WavesSonataResult:
+        if sonata_name not in self.sonatas:
+            self.sonatas[sonata_name] = get_sonata_detail(sonata_name)
+        return self.sonatas[sonata_name]
+
+
 class WuWaCalc:
     def __init__(
         self,
         role_detail: RoleDetailData,
         enemy_detail: EnemyDetailData | None = None,
+        lookups: CalcLookups | None = None,
     ):
         """
         # 声骸预处理 -> 声骸套装，声骸数量，声骸首位id
@@ -51,6 +81,8 @@ class WuWaCalc:
         calc.damageAttribute = calc.card_sort_map_to_attribute(calc.role_card)
         """
         self.role_detail: RoleDetailData = role_detail
+        # 查询结果, 批量计算时由调用方传入共用
+        self.lookups = lookups if lookups is not None else CalcLookups()
         # 声骸预处理 -> 声骸套装，声骸数量，声骸首位id
         self.phantom_pre = {}
         # 声骸面板数据
@@ -109,7 +141,7 @@ class WuWaCalc:
                     result["echo_id"] = _phantom.phantomProp.phantomId
                 props = _phantom.get_props()
                 result = self.sum_phantom_value(result, props)
-                sonata_result: WavesSonataResult = get_sonata_detail(_phantom.fetterDetail.name)
+                sonata_result: WavesSonataResult = self.lookups.sonata(_phantom.fetterDetail.name)
                 if sonata_result.name not in temp_result:
                     temp_result[sonata_result.name] = {
                         "phantomIds": [_phantom.phantomProp.phantomId],
@@ -157,13 +189,13 @@ class WuWaCalc:
         weapon_breach = weaponData.breach
         weapon_reson_level = weaponData.resonLevel
 
-        char_result: WavesCharResult = get_char_detail(
+        char_result: WavesCharResult = self.lookups.char(
             role_id,
             role_level,
             role_breach,
         )
 
-        weapon_result: WavesWeaponResult = get_weapon_detail(
+        weapon_result: WavesWeaponResult = self.lookups.weapon(
             weapon_id,
             weapon_level,
             weapon_breach,
@@ -236,8 +268,8 @@ class WuWaCalc:
 
         shuxing = f"{role_attr}伤害加成"
         card_sort_map: dict[str, Any] = copy.deepcopy(card_sort_map_back)
-        char_result: WavesCharResult = get_char_detail(role_id, role_level, role_breach)
-        weapon_result: WavesWeaponResult = get_weapon_detail(weapon_id, weapon_level, weapon_breach, weapon_reson_level)
+        char_result: WavesCharResult = self.lookups.char(role_id, role_level, role_breach)
+        weapon_result: WavesWeaponResult = self.lookups.weapon(weapon_id, weapon_level, weapon_breach, weapon_reson_level)
 
         # 基础生命
         _life = int(char_result.stats["life"])
@@ -0,0 +1,210 @@
+"""
+批量计算角色评分与期望伤害
+
+上传面板、排行索引重建、离线脚本都需要对大量角色走一遍 WuWaCalc,
+同一批角色共用角色/武器/套装的查询结果; 角色较多且开启了进程池时分发到子进程计算。
+"""
+
+import asyncio
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import TypeVar
+
+from gsuid_core.logger import logger
+
+from ..api.model import RoleDetailData
+from ..calculate import calc_phantom_scores, get_calc_map, get_total_score_bg
+from ..damage.abstract import DamageRankRegister
+from . import CalcLookups, WuWaCalc
+
+# 角色数少于该值时进程间传输的开销大于收益, 直接在当前进程计算
+PROCESS_POOL_MIN_ROLES = 16
+
+T = TypeVar("T")
+
+
+class RoleCalcError(Exception):
+    """批量计算中某个角色计算失败, 整批不再返回部分结果"""
+
+
+@dataclass
+class RoleCalcResult:
+    """结果不包含角色数据本身, 与传入的角色按位置对应"""
+
+    # 声骸评分, 没有声骸时为 0
+    phantom_score: float = 0
+    score_bg: str = "c"
+    # 5件套或完整套装的名字
+    sonata_name: str = ""
+    # 排行伤害, 未计算或未适配时为 None, 与伤害函数返回值一样是带千分位的字符串
+    crit_damage: str | None = None
+    expected_damage: str | None = None
+    expected_name: str = ""
+
+
+def prepare_calc(
+    role_detail: RoleDetailData,
+    lookups: CalcLookups | None = None,
+    need_attribute: bool = False,
+) -> WuWaCalc:
+    """执行 WuWaCalc 的声骸/评分模板步骤, need_attribute 时继续生成面板和 DamageAttribute"""
+    calc = WuWaCalc(role_detail, lookups=lookups)
+    calc.phantom_pre = calc.prepare_phantom()
+    calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
+    calc.calc_temp = get_calc_map(
+        calc.phantom_card,
+        role_detail.role.roleName,
+        role_detail.role.roleId,
+    )
+    if need_attribute:
+        calc.role_card = calc.enhance_summation_card_value(calc.phantom_card)
+        calc.damageAttribute = calc.card_sort_map_to_attribute(calc.role_card)
+    return calc
+
+
+def calc_role(
+    role_detail: RoleDetailData,
+    need_expected_damage: bool = True,
+    lookups: CalcLookups | None = None,
+) -> RoleCalcResult:
+    result = RoleCalcResult()
+    if not role_detail.phantomData or not role_detail.phantomData.equipPhantomList:
+        return result
+
+    equipPhantomList = role_detail.phantomData.equipPhantomList
+    calc = prepare_calc(role_detail, lookups)
+
+    phantom_score = 0
+    phantoms = [(_phantom.get_props(), _phantom.cost) for _phantom in equipPhantomList if _phantom and _phantom.phantomProp]
+    for _score, _bg in calc_phantom_scores(role_detail.role.roleId, phantoms, calc.calc_temp):
+        phantom_score += _score
+    result.phantom_score = round(phantom_score, 2)
+    result.score_bg = get_total_score_bg(role_detail.role.roleName, result.phantom_score, calc.calc_temp)
+
+    for ph_detail in calc.phantom_pre.get("ph_detail", []):
+        if ph_detail.get("ph_name") and (ph_detail.get("ph_num") == 5 or ph_detail.get("isFull")):
+            result.sonata_name = ph_detail["ph_name"]
+            break
+
+    if need_expected_damage:
+        rankDetail = DamageRankRegister.find_class(str(role_detail.role.roleId))
+        if rankDetail:
+            calc.role_card = calc.enhance_summation_card_value(calc.phantom_card)
+            calc.damageAttribute = calc.card_sort_map_to_attribute(calc.role_card)
+            result.crit_damage, result.expected_damage = rankDetail["func"](calc.damageAttribute, role_detail)
+            result.expected_name = rankDetail["title"]
+
+    return result
+
+
+def calc_roles(
+    role_details: Iterable[RoleDetailData | dict],
+    need_expected_damage: bool = True,
+    convert: Callable[[RoleDetailData, RoleCalcResult], T] | None = None,
+) -> list[T]:
+    """
+    按顺序计算, 结果与传入的角色一一对应; 任一角色计算失败时抛出 RoleCalcError
+    convert 用于把结果转换为调用方需要的数据, 角色逐个解析、计算、转换, 不会同时持有整批 RoleDetailData
+    """
+    lookups = CalcLookups()
+    results: list[T] = []
+    for index, role_detail in enumerate(role_details):
+        try:
+            if not isinstance(role_detail, RoleDetailData):
+                role_detail = RoleDetailData(**role_detail)
+            result = calc_role(role_detail, need_expected_damage, lookups)
+            results.append(convert(role_detail, result) if convert else result)
+        except Exception as e:
+            role_id = role_detail.role.roleId if isinstance(role_detail, RoleDetailData) else index
+            raise RoleCalcError(f"角色 {role_id} 计算失败: {e!r}") from e
+    return results
+
+
+_process_pool: ProcessPoolExecutor | None = None
+_process_pool_workers = 0
+
+
+def _init_worker():
+    # 子进程(spawn)中需要重新注册; fork 时已经注册过, 重复注册不影响结果
+    from ..damage.register_char import register_char
+    from ..damage.register_echo import register_echo
+    from ..damage.register_weapon import register_weapon
+    from ..map.damage.register import register_damage, register_rank
+
+    register_weapon()
+    register_echo()
+    register_damage()
+    register_rank()
+    register_char()
+
+
+def _calc_chunk(role_details: list[dict], need_expected_damage: bool, convert: Callable | None) -> list:
+    return calc_roles(role_details, need_expected_damage, convert)
+
+
+def get_process_pool(workers: int) -> ProcessPoolExecutor:
+    global _process_pool, _process_pool_workers
+    if _process_pool is None or _process_pool_workers != workers:
+        shutdown_process_pool()
+        _process_pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        _process_pool_workers = workers
+    return _process_pool
+
+
+def shutdown_process_pool():
+    """关闭进程池, 下次使用时重新创建"""
+    global _process_pool, _process_pool_workers
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+    _process_pool = None
+    _process_pool_workers = 0
+
+
+def get_process_workers() -> int:
+    from ...wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config("CalcProcessWorkers").data
+
+
+async def calc_roles_async(
+    role_details: Iterable[RoleDetailData | dict],
+    need_expected_damage: bool = True,
+    convert: Callable[[RoleDetailData, RoleCalcResult], T] | None = None,
+    workers: int | None = None,
+) -> list[T]:
+    """
+    与 calc_roles 相同, 角色较多且进程数大于 0 时分块交给进程池
+    使用进程池时 convert 需要是模块级函数, 返回值需要可以 pickle
+    workers 为 None 时使用配置 CalcProcessWorkers
+    """
+    role_details = list(role_details)
+    if workers is None:
+        workers = get_process_workers()
+    if workers <= 0 or len(role_details) < PROCESS_POOL_MIN_ROLES:
+        return calc_roles(role_details, need_expected_damage, convert)
+
+    # 子进程之间传递 dict, 避免 pydantic 模型的序列化开销
+    payload = [rd.model_dump() if isinstance(rd, RoleDetailData) else rd for rd in role_details]
+    chunk_size = -(-len(payload) // workers)
+    try:
+        pool = get_process_pool(workers)
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(
+            *[
+                loop.run_in_executor(pool, _calc_chunk, payload[i : i + chunk_size], need_expected_damage, convert)
+                for i in range(0, len(payload), chunk_size)
+            ]
+        )
+    except RoleCalcError:
+        raise
+    except BrokenProcessPool as e:
+        # 子进程异常退出后进程池不能再使用, 丢弃后下次重新创建
+        logger.warning(f"[鸣潮][批量计算] 进程池已损坏, 重新创建并改为直接计算: {e}")
+        shutdown_process_pool()
+        return calc_roles(role_details, need_expected_damage, convert)
+    except Exception as e:
+        logger.exception(f"[鸣潮][批量计算] 进程池计算失败, 改为直接计算: {e}")
+        return calc_roles(role_details, need_expected_damage, convert)
+    return [result for chunk in chunks for result in chunk]
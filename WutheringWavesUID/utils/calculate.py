@@ -1,12 +1,18 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
+import hashlib
 import math
 from pathlib import Path
+import time
+from typing import Any
 
 from gsuid_core.logger import logger
 from msgspec import json as msgjson
 
 from ..utils.api.model import Props
 from ..utils.ascension.char import get_char_model
-from .expression_evaluator import find_first_matching_expression
+from .expression_evaluator import compile_expressions
 from .image import SPECIAL_GOLD, WAVES_MOLTEN, WAVES_SIERRA, WAVES_VOID
 from .map.calc_score_script import phantom_sub_value_map as ph_sub_map
 from .resource.constant import ATTRIBUTE_NAME_SET, ID_FULL_CHAR_NAME
@@ -15,77 +21,223 @@ MAP_PATH = Path(__file__).parent / "map/character"
 
 score_interval = ["c", "b", "a", "s", "ss", "sss"]
 fix_max_score = 50
+# 模板文件修改检查间隔(秒)
+TEMPLATE_CHECK_INTERVAL = 10
+
+
+class _TemplateFile:
+    __slots__ = ("mtime", "checked", "data")
+
+    def __init__(self, mtime: int | None, checked: float, data: Any):
+        self.mtime = mtime
+        self.checked = checked
+        self.data = data
+
+
+class CalcTemplateRegistry:
+    """
+    评分模板注册表
+    - 角色目录下的 condition*.json / calc*.json 只解析一次, 条件文件编译为可直接调用的匹配函数
+    - 文件按 mtime 失效, 每个文件最多每 check_interval 秒检查一次
+    - 返回的模板为共享对象, 调用方不应修改
+    """
+
+    def __init__(self, root: Path, check_interval: float = TEMPLATE_CHECK_INTERVAL):
+        self.root = root
+        self.check_interval = check_interval
+        self._files: dict[Path, _TemplateFile] = {}
+        self._dirs: set[str] = set()
+        self._dirs_checked = -math.inf
+        self._fingerprint = ""
+        self._fingerprint_checked = -math.inf
+
+    def char_dir(self, char_name: str) -> Path:
+        now = time.monotonic()
+        if now - self._dirs_checked >= self.check_interval:
+            self._dirs = {p.name for p in self.root.iterdir() if p.is_dir()}
+            self._dirs_checked = now
+        return self.root / (char_name if char_name in self._dirs else "default")
+
+    def read(self, path: Path, compile: Callable[[Any], Any] | None = None) -> Any | None:
+        """读取(并编译)模板文件, 文件不存在时返回 None"""
+        now = time.monotonic()
+        cached = self._files.get(path)
+        if cached is not None and now - cached.checked < self.check_interval:
+            return cached.data
+
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if cached is not None and cached.mtime == mtime:
+            cached.checked = now
+            return cached.data
+
+        data = None
+        if mtime is not None:
+            with open(path, "rb") as f:
+                data = msgjson.decode(f.read())
+            if compile is not None:
+                data = compile(data)
+        self._files[path] = _TemplateFile(mtime, now, data)
+        return data
+
+    def match(self, char_path: Path, file_name: str, ctx: dict) -> str | None:
+        matcher = self.read(char_path / file_name, compile_expressions)
+        return matcher(ctx) if matcher else None
+
+    def fingerprint(self) -> str:
+        """所有模板文件的路径与 mtime 摘要, 模板增删或修改后变化; 最多每 check_interval 秒重新计算"""
+        now = time.monotonic()
+        if now - self._fingerprint_checked >= self.check_interval:
+            md5 = hashlib.md5()
+            for path in sorted(self.root.glob("*/*.json")):
+                try:
+                    mtime = path.stat().st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                md5.update(f"{path.relative_to(self.root)}:{mtime};".encode())
+            self._fingerprint = md5.hexdigest()[:12]
+            self._fingerprint_checked = now
+        return self._fingerprint
+
+    def preload(self):
+        for char_path in self.root.iterdir():
+            if not char_path.is_dir():
+                continue
+            for path in char_path.glob("*.json"):
+                self.read(path, compile_expressions if path.name.startswith("condition") else None)
+
+
+calc_template_registry = CalcTemplateRegistry(MAP_PATH)
 
 
 def get_calc_map(ctx: dict, char_name: str, char_id: int | str):
     if str(char_id) in ID_FULL_CHAR_NAME:
         char_name = ID_FULL_CHAR_NAME[str(char_id)]
-    char_path = MAP_PATH / char_name
-    if not char_path.is_dir():
-        char_path = MAP_PATH / "default"
-
-    def check_conditions(file_name):
-        condition_path = char_path / file_name
-        if condition_path.exists():
-            with open(condition_path, encoding="utf-8") as f:
-                expressions = msgjson.decode(f.read())
-            return find_first_matching_expression(ctx, expressions)
-        return None
+    char_path = calc_template_registry.char_dir(char_name)
 
     # 先检查用户条件，然后是默认条件
-    calc_json_path = check_conditions("condition-user.json") or check_conditions("condition.json") or "calc.json"
+    calc_json_path = (
+        calc_template_registry.match(char_path, "condition-user.json", ctx)
+        or calc_template_registry.match(char_path, "condition.json", ctx)
+        or "calc.json"
+    )
     logger.debug(f"{char_name} [匹配文件]: {char_path.name}/{calc_json_path}")
-    with open(char_path / calc_json_path, encoding="utf-8") as f:
-        return msgjson.decode(f.read())
+    calc_map = calc_template_registry.read(char_path / calc_json_path)
+    if calc_map is None:
+        raise FileNotFoundError(char_path / calc_json_path)
+    return calc_map
 
 
-def calc_phantom_entry(index, prop, cost: int, calc_map, char_attr: str):
-    skill_weight = calc_map.get("skill_weight", [])
-    if not skill_weight:
-        skill_weight = [0, 0, 0, 0]
-    score = 0
-    main_props = calc_map["main_props"]
-    sub_pros = calc_map["sub_props"]
-    if index < 2:
-        # 主属性
-        pros_temp = main_props.get(str(cost))
-    else:
-        pros_temp = sub_pros
+# ---------- 声骸评分 ----------
+# 词条先解析为 (属性列, 数值), 评分模板按属性列编译为权重向量, 评分时做向量乘加
+# 计算顺序与逐条累加完全一致, 结果不变
 
-    value = prop.attributeValue
-    if "%" in prop.attributeValue:
-        value = float(value.replace("%", ""))
-    else:
-        value = float(value)
-    if prop.attributeName == "攻击":
-        if "%" in prop.attributeValue:
-            score += pros_temp.get("攻击%", 0) * value
-        else:
-            score += pros_temp.get("攻击", 0) * value
-    elif prop.attributeName == "生命":
-        if "%" in prop.attributeValue:
-            score += pros_temp.get("生命%", 0) * value
-        else:
-            score += pros_temp.get("生命", 0) * value
-    elif prop.attributeName == "防御":
-        if "%" in prop.attributeValue:
-            score += pros_temp.get("防御%", 0) * value
+# (属性名, 是否百分比) -> 属性列, 第0列用于补齐, 权重恒为0
+_attr_index: dict[tuple[str, bool], int] = {("", False): 0}
+_attr_keys: list[tuple[str, bool]] = [("", False)]
+
+_SKILL_BONUS_INDEX = {
+    "普攻伤害加成": 0,
+    "重击伤害加成": 1,
+    "共鸣技能伤害加成": 2,
+    "共鸣解放伤害加成": 3,
+}
+
+
+@lru_cache(maxsize=4096)
+def parse_prop(attribute_name: str, attribute_value: str) -> tuple[int, float]:
+    """解析词条, 返回 (属性列, 数值)"""
+    percent = "%" in attribute_value
+    key = (attribute_name, percent)
+    if key not in _attr_index:
+        _attr_index[key] = len(_attr_keys)
+        _attr_keys.append(key)
+    value = float(attribute_value.replace("%", "")) if percent else float(attribute_value)
+    return _attr_index[key], value
+
+
+@lru_cache(maxsize=512)
+def get_char_attribute_name(char_id: str) -> str:
+    char_model = get_char_model(char_id)
+    return char_model.get_attribute_name() if char_model else ""
+
+
+def _prop_weight(key: tuple[str, bool], pros_temp: dict, skill_weight: list, char_attr: str):
+    name, percent = key
+    if name in ("攻击", "生命", "防御"):
+        return pros_temp.get(f"{name}%" if percent else name, 0)
+    if name in _SKILL_BONUS_INDEX:
+        return pros_temp.get("技能伤害加成", 0) * skill_weight[_SKILL_BONUS_INDEX[name]]
+    if name[0:2] in ATTRIBUTE_NAME_SET and (char_attr == name[0:2] or char_attr == ""):
+        return pros_temp.get("属性伤害加成", 0)
+    return pros_temp.get(name, 0)
+
+
+class CompiledCalcMap:
+    """评分模板编译结果: 副词条与各 cost 主词条的权重向量"""
+
+    __slots__ = ("calc_map", "char_attr", "skill_weight", "vectors")
+
+    def __init__(self, calc_map: dict, char_attr: str):
+        self.calc_map = calc_map
+        self.char_attr = char_attr
+        self.skill_weight = calc_map.get("skill_weight", []) or [0, 0, 0, 0]
+        # None: 副词条, int: 对应 cost 的主词条
+        self.vectors: dict[int | None, list[float]] = {}
+
+    def vector(self, cost: int | None) -> list[float]:
+        vec = self.vectors.get(cost)
+        if vec is not None and len(vec) == len(_attr_keys):
+            return vec
+
+        if cost is None:
+            pros_temp = self.calc_map["sub_props"]
         else:
-            score += pros_temp.get("防御", 0) * value
-    elif prop.attributeName == "普攻伤害加成":
-        score += pros_temp.get("技能伤害加成", 0) * skill_weight[0] * value
-    elif prop.attributeName == "重击伤害加成":
-        score += pros_temp.get("技能伤害加成", 0) * skill_weight[1] * value
-    elif prop.attributeName == "共鸣技能伤害加成":
-        score += pros_temp.get("技能伤害加成", 0) * skill_weight[2] * value
-    elif prop.attributeName == "共鸣解放伤害加成":
-        score += pros_temp.get("技能伤害加成", 0) * skill_weight[3] * value
-    elif prop.attributeName[0:2] in ATTRIBUTE_NAME_SET and (char_attr == prop.attributeName[0:2] or char_attr == ""):
-        score += pros_temp.get("属性伤害加成", 0) * value
-    else:
-        score += pros_temp.get(prop.attributeName, 0) * value
+            pros_temp = self.calc_map["main_props"].get(str(cost)) or {}
+        if vec is None:
+            vec = self.vectors[cost] = []
+        # 出现新的属性时补齐
+        vec.extend(_prop_weight(key, pros_temp, self.skill_weight, self.char_attr) for key in _attr_keys[len(vec) :])
+        return vec
+
+    def weight(self, index: int, attr: int, cost: int) -> float:
+        return self.vector(cost if index < 2 else None)[attr]
+
+    def score(self, parsed: list[tuple[int, float]], cost: int) -> float:
+        main = self.vector(cost)
+        sub = self.vector(None)
+        score = 0
+        for index, (attr, value) in enumerate(parsed):
+            score += (main if index < 2 else sub)[attr] * value
+        return score
+
+
+_compiled: OrderedDict[tuple[int, str], CompiledCalcMap] = OrderedDict()
+_COMPILED_MAXSIZE = 256
+
+
+def compile_calc_map(calc_map: dict, char_attr: str) -> CompiledCalcMap:
+    key = (id(calc_map), char_attr)
+    compiled = _compiled.get(key)
+    # 同时持有 calc_map 的引用, id 不会被复用
+    if compiled is not None and compiled.calc_map is calc_map:
+        _compiled.move_to_end(key)
+        return compiled
+    compiled = CompiledCalcMap(calc_map, char_attr)
+    _compiled[key] = compiled
+    if len(_compiled) > _COMPILED_MAXSIZE:
+        _compiled.popitem(last=False)
+    return compiled
+
+
+def calc_phantom_entry(index, prop, cost: int, calc_map, char_attr: str, max_score: float):
+    """单个词条的评分, max_score 为 get_max_score(cost, calc_map) 的结果, 由调用方在循环外取一次"""
+    attr, value = parse_prop(prop.attributeName, prop.attributeValue)
+    score = 0
+    score += compile_calc_map(calc_map, char_attr).weight(index, attr, cost) * value
 
-    max_score, props_grade = get_max_score(cost, calc_map)
     percent_score = score / max_score
     final_score = math.floor(percent_score * fix_max_score * 100) / 100
     return score, final_score
@@ -105,25 +257,7 @@ def get_max_score(cost, calc_map):
     return max_score, props_grade
 
 
-def calc_phantom_score(
-    char_id: str | int,
-    prop_list: list[Props],
-    cost: int,
-    calc_map: dict | None,
-) -> tuple[float, str]:
-    if not calc_map:
-        return 0, "c"
-
-    char_model = get_char_model(char_id)
-    char_attr = ""
-    if char_model:
-        char_attr = char_model.get_attribute_name()
-
-    score = 0
-    for index, prop in enumerate(prop_list):
-        _score, _ = calc_phantom_entry(index, prop, cost, calc_map, char_attr)
-        score += _score
-
+def _score_level(score: float, cost: int, calc_map: dict) -> tuple[float, str]:
     max_score, props_grade = get_max_score(cost, calc_map)
     percent_score = score / max_score
 
@@ -134,10 +268,44 @@ def calc_phantom_score(
 
     final_score = math.floor(percent_score * fix_max_score * 100) / 100
     score_level = score_interval[_temp]
-    # logger.debug(f"{char_name} [声骸评分]: {final_score} [声骸评分等级]: {score_level}")
     return final_score, score_level
 
 
+def calc_phantom_scores(
+    char_id: str | int,
+    phantoms: list[tuple[list[Props], int]],
+    calc_map: dict | None,
+) -> list[tuple[float, str]]:
+    """
+    一次计算多个声骸的评分
+    phantoms: [(词条列表, cost)], 返回 [(评分, 评分等级)]
+    """
+    if not calc_map:
+        return [(0, "c")] * len(phantoms)
+    if not phantoms:
+        return []
+
+    compiled = compile_calc_map(calc_map, get_char_attribute_name(str(char_id)))
+    parsed_list = [[parse_prop(prop.attributeName, prop.attributeValue) for prop in props] for props, _ in phantoms]
+    costs = [cost for _, cost in phantoms]
+    scores = [compiled.score(parsed, cost) for parsed, cost in zip(parsed_list, costs)]
+    return [_score_level(score, cost, calc_map) for score, cost in zip(scores, costs)]
+
+
+def calc_phantom_score(
+    char_id: str | int,
+    prop_list: list[Props],
+    cost: int,
+    calc_map: dict | None,
+) -> tuple[float, str]:
+    if not calc_map:
+        return 0, "c"
+
+    compiled = compile_calc_map(calc_map, get_char_attribute_name(str(char_id)))
+    parsed = [parse_prop(prop.attributeName, prop.attributeValue) for prop in prop_list]
+    return _score_level(compiled.score(parsed, cost), cost, calc_map)
+
+
 def get_total_score_bg(char_name: str, score: float, calc_map: dict | None):
     if not calc_map:
         return "c"
@@ -1,32 +1,108 @@
-from collections.abc import Generator
-import json
+import asyncio
+from collections import OrderedDict
+from collections.abc import Generator, Iterable
 from typing import Any
 
-import aiofiles
 from gsuid_core.logger import logger
 import httpx
 
 from ..utils.api.model import RoleDetailData
 from ..utils.api.wwapi import GET_ROLE_DETAIL_URL, RoleDetailResponse
 from ..wutheringwaves_config.wutheringwaves_config import WutheringWavesConfig
-from .resource.RESOURCE_PATH import PLAYER_PATH
+from .role_store import get_role_ids, get_role_mtime, load_role
+
+
+class RoleDetailCache:
+    """
+    已解析的角色面板缓存
+    以角色文件的修改时间判断是否失效, 保存面板时也会主动清除
+    缓存的对象是共享的, 需要修改时请先复制
+    """
+
+    def __init__(self, maxsize: int = 2048):
+        self.cache: OrderedDict[tuple[str, int], tuple[int, RoleDetailData]] = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, uid: str, role_id: int, mtime: int) -> RoleDetailData | None:
+        key = (uid, role_id)
+        item = self.cache.get(key)
+        if item and item[0] == mtime:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return item[1]
+        self.misses += 1
+        return None
+
+    def set(self, uid: str, role_id: int, mtime: int, data: RoleDetailData):
+        key = (uid, role_id)
+        self.cache[key] = (mtime, data)
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+
+    def invalidate(self, uid: str, role_ids: Iterable[int] | None = None):
+        if role_ids is None:
+            keys = [key for key in self.cache if key[0] == uid]
+        else:
+            keys = [(uid, int(role_id)) for role_id in role_ids]
+        for key in keys:
+            self.cache.pop(key, None)
+
+    def info(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self.cache),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0,
+        }
+
+
+role_detail_cache = RoleDetailCache()
+
+
+async def _get_role_detail(uid: str, role_id: int) -> RoleDetailData | None:
+    mtime = await get_role_mtime(uid, role_id)
+    if mtime is None:
+        return None
+
+    role_detail = role_detail_cache.get(uid, role_id, mtime)
+    if role_detail:
+        return role_detail
+
+    data = await load_role(uid, role_id)
+    if not data:
+        return None
+    role_detail = RoleDetailData(**data)
+    role_detail_cache.set(uid, role_id, mtime, role_detail)
+    return role_detail
 
 
 async def get_all_role_detail_info_list(
     uid: str,
 ) -> Generator[RoleDetailData, Any, None] | None:
-    path = PLAYER_PATH / uid / "rawData.json"
-    if not path.exists():
-        return None
-    try:
-        async with aiofiles.open(path, encoding="utf-8") as f:
-            player_data = json.loads(await f.read())
-    except Exception as e:
-        logger.exception(f"get role detail info failed {path}:", e)
-        path.unlink(missing_ok=True)
+    role_ids = await get_role_ids(uid)
+    if role_ids is None:
         return None
 
-    return iter(RoleDetailData(**r) for r in player_data)
+    role_details = await asyncio.gather(*[_get_role_detail(uid, role_id) for role_id in role_ids])
+    return (r for r in role_details if r is not None)
+
+
+async def get_role_detail_info(
+    uid: str,
+    char_id: int | str | list[int] | list[str],
+) -> RoleDetailData | None:
+    """只读取单个角色, char_id 为列表时返回第一个存在的角色"""
+    char_ids = char_id if isinstance(char_id, list) else [char_id]
+    for _char_id in char_ids:
+        role_detail = await _get_role_detail(uid, int(_char_id))
+        if role_detail:
+            return role_detail
+    return None
 
 
 async def get_all_role_detail_info(uid: str) -> dict[str, RoleDetailData] | None:
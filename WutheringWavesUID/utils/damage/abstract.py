@@ -1,12 +1,49 @@
+from collections.abc import Callable
+from typing import Any
+
+from gsuid_core.logger import logger
+
 from ...utils.damage.damage import DamageAttribute
 
 
 class WavesRegister:
     _id_cls_map = {}
+    # id -> 加载函数, 第一次查询该 id 时调用并注册返回值
+    _id_loader_map: dict[Any, Callable[[], Any]] = {}
 
     @classmethod
     def find_class(cls, _id):
-        return cls._id_cls_map.get(_id)
+        clz = cls._id_cls_map.get(_id)
+        if clz is None and _id in cls._id_loader_map:
+            clz = cls._load(_id)
+        return clz
+
+    @classmethod
+    def _load(cls, _id):
+        loader = cls._id_loader_map.get(_id)
+        if loader is None:
+            return cls._id_cls_map.get(_id)
+        try:
+            clz = loader()
+        except Exception as e:
+            logger.exception(f"{cls.__name__} 加载 {_id} 失败: {e}")
+            clz = None
+        # 先注册再移除加载函数, 并发查询时不会拿到 None
+        if clz is not None:
+            cls._id_cls_map[_id] = clz
+        cls._id_loader_map.pop(_id, None)
+        return clz
+
+    @classmethod
+    def register_lazy(cls, _id, loader: Callable[[], Any]):
+        """注册加载函数, 第一次 find_class 时才调用"""
+        cls._id_loader_map[_id] = loader
+
+    @classmethod
+    def warmup(cls):
+        """立即调用所有尚未执行的加载函数"""
+        for _id in list(cls._id_loader_map):
+            cls._load(_id)
 
     @classmethod
     def register_class(cls, _id, _clz):
@@ -18,22 +55,27 @@ class WavesRegister:
 
 class WavesWeaponRegister(WavesRegister):
     _id_cls_map = {}
+    _id_loader_map = {}
 
 
 class WavesEchoRegister(WavesRegister):
     _id_cls_map = {}
+    _id_loader_map = {}
 
 
 class WavesCharRegister(WavesRegister):
     _id_cls_map = {}
+    _id_loader_map = {}
 
 
 class DamageDetailRegister(WavesRegister):
     _id_cls_map = {}
+    _id_loader_map = {}
 
 
 class DamageRankRegister(WavesRegister):
     _id_cls_map = {}
+    _id_loader_map = {}
 
 
 class WeaponAbstract:
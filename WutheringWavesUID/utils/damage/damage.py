@@ -93,6 +93,72 @@ class DamageBonusPhantom:
 
 
 class DamageAttribute:
+    __slots__ = (
+        "role",
+        "char_template",
+        "char_atk",
+        "char_life",
+        "char_def",
+        "weapon_atk",
+        "atk_percent",
+        "life_percent",
+        "def_percent",
+        "atk_phantom_percent",
+        "life_phantom_percent",
+        "def_phantom_percent",
+        "atk_flat",
+        "life_flat",
+        "def_flat",
+        "skill_multi",
+        "healing_skill_multi",
+        "shield_skill_multi",
+        "skill_ratio",
+        "skill_ratio_in_skill_description",
+        "dmg_bonus",
+        "dmg_deepen",
+        "easy_damage",
+        "final_damage",
+        "crit_rate",
+        "crit_dmg",
+        "character_level",
+        "defense_reduction",
+        "defense_ignore",
+        "enemy_resistance",
+        "dmg_bonus_phantom",
+        "ph_detail",
+        "echo_id",
+        "char_attr",
+        "char_damage",
+        "sync_strike",
+        "energy_regen",
+        "effect",
+        "enemy_level",
+        "teammate_char_ids",
+        "env_spectro",
+        "env_spectro_deepen",
+        "env_aero_erosion",
+        "env_aero_erosion_deepen",
+        "env_havoc_bane",
+        "env_havoc_bane_deepen",
+        "env_fusion_burst",
+        "env_fusion_burst_deepen",
+        "env_glacio_chafe",
+        "env_glacio_chafe_deepen",
+        "env_electro_flare",
+        "env_electro_flare_deepen",
+        "abnormalType",
+        "env_shifting",
+        "env_tune_rupture",
+        "env_tune_strain",
+        "env_hack",
+        "off_tune_buildup_rate",
+        "tune_break_boost",
+        "tune_strain_stack",
+        "trigger_shield",
+        "ph_result",
+        "online_level",
+    )
+
     def __init__(
         self,
         role=None,
@@ -350,6 +416,21 @@ class DamageAttribute:
             f")"
         )
 
+    def fork(self) -> "DamageAttribute":
+        """
+        浅复制一份用于单条伤害计算, 代替 copy.deepcopy
+        逐个复制 __slots__ 字段; role/dmg_bonus_phantom 计算中不会修改, 共用同一个对象;
+        effect/ph_detail/teammate_char_ids 复制列表本身, 列表中的元素共用, 修改元素时需要替换(见 set_enemy_level)
+        基础属性的 effect 只有两三条, 复制列表的耗时不到整体的 5%, 不做共享尾部之类的结构
+        """
+        clone = object.__new__(DamageAttribute)
+        for name in DamageAttribute.__slots__:
+            setattr(clone, name, getattr(self, name))
+        clone.effect = self.effect.copy()
+        clone.ph_detail = self.ph_detail.copy()
+        clone.teammate_char_ids = self.teammate_char_ids.copy()
+        return clone
+
     def set_role(self, role: RoleDetailData):
         self.role = role
         return self
@@ -371,9 +452,10 @@ class DamageAttribute:
 
         title = "敌人等级"
         msg = f"{enemy_level}级"
-        for effect in self.effect:
+        for index, effect in enumerate(self.effect):
             if effect.element_msg == title:
-                effect.element_value = msg
+                # effect 可能与 fork 出的对象共用, 替换而不是修改
+                self.effect[index] = WavesEffect(title, msg)
                 break
         else:
             self.add_effect(title, msg)
@@ -1,6 +1,7 @@
 from typing import Any, TypeVar
 
 from gsuid_core.utils.database.base_models import (
+    BaseIDModel,
     BaseModel,
     Bind,
     Push,
@@ -26,10 +27,14 @@ exec_list.extend(
     ]
 )
 
+# 排行索引中表示 "该uid已建立索引" 的特殊角色id
+RANK_INDEX_MARK = 0
+
 T_WavesBind = TypeVar("T_WavesBind", bound="WavesBind")
 T_WavesUser = TypeVar("T_WavesUser", bound="WavesUser")
 T_WavesPush = TypeVar("T_WavesPush", bound="WavesPush")
 T_WavesUserAvatar = TypeVar("T_WavesUserAvatar", bound="WavesUserAvatar")
+T_WavesRoleRank = TypeVar("T_WavesRoleRank", bound="WavesRoleRank")
 
 
 class WavesUserAvatar(BaseModel, table=True):
@@ -350,6 +355,124 @@ class WavesPush(Push, table=True):
         return True
 
 
+class WavesRoleRank(BaseIDModel, table=True):
+    """角色排行索引, 每个 (uid, char_id) 一行"""
+
+    __table_args__: dict[str, Any] = {"extend_existing": True}
+    uid: str = Field(default="", title="鸣潮UID", index=True)
+    char_id: int = Field(default=0, title="角色ID", index=True)
+    version: str = Field(default="", title="索引版本")
+    score: float = Field(default=0, title="声骸分数")
+    score_bg: str = Field(default="", title="评分背景")
+    expected_damage: str = Field(default="0", title="期望伤害")
+    expected_damage_int: int = Field(default=0, title="期望伤害")
+    level: int = Field(default=0, title="角色等级")
+    chain: int = Field(default=0, title="命座")
+    weapon_id: int = Field(default=0, title="武器ID")
+    weapon_level: int = Field(default=0, title="武器等级")
+    weapon_reson_level: int = Field(default=0, title="武器精炼")
+    sonata_name: str = Field(default="", title="合鸣效果")
+
+    @classmethod
+    @with_session
+    async def get_rank_by_char(
+        cls: type[T_WavesRoleRank],
+        session: AsyncSession,
+        char_ids: list[int],
+        uids: list[str],
+        version: str,
+        limit: int | None = None,
+    ) -> list[T_WavesRoleRank]:
+        """获取uid列表中指定角色、指定版本且有评分的排行索引, 按声骸分数从高到低"""
+        sql = (
+            select(cls)
+            .where(
+                and_(
+                    col(cls.char_id).in_(char_ids),
+                    col(cls.uid).in_(uids),
+                    col(cls.version) == version,
+                    col(cls.score) > 0,
+                )
+            )
+            .order_by(col(cls.score).desc())
+        )
+        if limit is not None:
+            sql = sql.limit(limit)
+        result = await session.execute(sql)
+        return list(result.scalars().all())
+
+    @classmethod
+    @with_session
+    async def get_indexed_uids(
+        cls: type[T_WavesRoleRank],
+        session: AsyncSession,
+        version: str,
+        uids: list[str] | None = None,
+    ) -> set[str]:
+        """获取已按当前版本建立索引的uid"""
+        sql = select(cls.uid).where(
+            and_(
+                col(cls.char_id) == RANK_INDEX_MARK,
+                col(cls.version) == version,
+            )
+        )
+        if uids is not None:
+            sql = sql.where(col(cls.uid).in_(uids))
+        result = await session.execute(sql)
+        return set(result.scalars().all())
+
+    @classmethod
+    @with_session
+    async def replace_rank(
+        cls: type[T_WavesRoleRank],
+        session: AsyncSession,
+        uid: str,
+        rows: list[dict[str, Any]],
+        delete_char_ids: list[int] | None = None,
+        full: bool = False,
+    ):
+        """
+        更新uid的排行索引
+        - full: 清空该uid的所有索引后重建, 并写入索引标记
+        - delete_char_ids: 额外需要删除的角色
+        """
+        if full:
+            await session.execute(delete(cls).where(col(cls.uid) == uid))
+        else:
+            char_ids = [row["char_id"] for row in rows] + (delete_char_ids or [])
+            if char_ids:
+                await session.execute(
+                    delete(cls).where(
+                        and_(
+                            col(cls.uid) == uid,
+                            col(cls.char_id).in_(char_ids),
+                        )
+                    )
+                )
+
+        session.add_all([cls(uid=uid, **row) for row in rows])
+
+    @classmethod
+    @with_session
+    async def delete_rank(
+        cls: type[T_WavesRoleRank],
+        session: AsyncSession,
+        uid: str,
+        char_ids: list[int] | None = None,
+    ):
+        """删除uid的角色索引, 不指定角色时删除全部角色 (保留索引标记)"""
+        sql = delete(cls).where(
+            and_(
+                col(cls.uid) == uid,
+                col(cls.char_id) != RANK_INDEX_MARK,
+            )
+        )
+        if char_ids is not None:
+            sql = sql.where(col(cls.char_id).in_(char_ids))
+        result = await session.execute(sql)
+        return result.rowcount
+
+
 @site.register_admin
 class WavesBindAdmin(GsAdminModel):
     pk_name = "id"
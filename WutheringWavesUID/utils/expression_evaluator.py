@@ -1,115 +1,161 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
 from gsuid_core.logger import logger
+from msgspec import json as msgjson
+
+
+def convert_value(value):
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError as _:
+            pass
+    elif isinstance(value, list):
+        return [convert_value(item) for item in value]
+    return value
+
+
+def _in(a, b):
+    if isinstance(a, list):
+        return any(i in b for i in a)
+    return a in b
+
+
+def _not_in(a, b):
+    if isinstance(a, list):
+        return all(i not in b for i in a)
+    return a not in b
+
+
+# 操作符 -> (比较函数, 是否需要转换数值)
+COMPARISONS: dict[str, tuple[Callable[[Any, Any], bool], bool]] = {
+    "=": (lambda a, b: a == b, False),
+    "!=": (lambda a, b: a != b, False),
+    "<": (lambda a, b: a < b, True),
+    ">": (lambda a, b: a > b, True),
+    "<=": (lambda a, b: a <= b, True),
+    ">=": (lambda a, b: a >= b, True),
+    "in": (_in, True),
+    "!in": (_not_in, True),
+}
+
+Predicate = Callable[[dict], bool]
+
+# 比较次数少于该值时直接求值比查缓存更快
+CACHE_MIN_COMPARISONS = 4
+
 
+def _raise(error: Exception) -> Predicate:
+    # 格式错误在求值时才抛出, 与逐条解释执行时的表现一致
+    def predicate(ctx: dict) -> bool:
+        raise error
 
-def convert_wrapper(func):
-    def wrapper(a, b):
-        def convert(value):
-            if isinstance(value, str):
-                if "%" in value:
-                    value.replace("%", "")
-                try:
-                    value = float(value)
-                except ValueError as _:
-                    pass
-            elif isinstance(value, list):
-                return [convert(item) for item in value]
-            return value
-
-        a = convert(a)
-        b = convert(b)
-        return func(a, b)
-
-    return wrapper
-
-
-class ExpressionFunc:
-    @staticmethod
-    def func_equal(a, b):
-        return a == b
-
-    @staticmethod
-    def func_not_equal(a, b):
-        return a != b
-
-    @staticmethod
-    @convert_wrapper
-    def func_less_than(a, b):
-        return a < b
-
-    @staticmethod
-    @convert_wrapper
-    def func_greater_than(a, b):
-        return a > b
-
-    @staticmethod
-    @convert_wrapper
-    def func_less_than_or_equal(a, b):
-        return a <= b
-
-    @staticmethod
-    @convert_wrapper
-    def func_greater_than_or_equal(a, b):
-        return a >= b
-
-    @staticmethod
-    @convert_wrapper
-    def func_in(a, b):
-        if isinstance(a, list):
-            return any(i in b for i in a)
-
-        return a in b
-
-    @staticmethod
-    @convert_wrapper
-    def func_not_in(a, b):
-        if isinstance(a, list):
-            return all(i not in b for i in a)
-        return a not in b
-
-
-class ExpressionEvaluator:
-    def __init__(self, ctx):
-        self.ctx = ctx
-
-    def evaluate(self, expression):
-        return self._evaluate_expression(expression["op"], expression)
-
-    def _evaluate_expression(self, op, expression):
+    return predicate
+
+
+def compile_expression(expression: dict, keys: list[str] | None = None) -> Predicate:
+    """将条件树编译为闭包, 常量在编译时完成转换; keys 用于收集条件引用的 ctx 键(每次比较一个)"""
+    try:
+        op = expression["op"]
         if op in {"&&", "||", "!"}:
-            return self._evaluate_logical(op, expression["sub"])
-        else:
-            return self._evaluate_comparison(expression)
-
-    def _evaluate_logical(self, op, childs):
-        operations = {
-            "&&": all,
-            "||": any,
-            "!": lambda v: not list(v)[0],
-        }
-        operation = operations[op]
-        return operation(self.evaluate(child) for child in childs)
-
-    def _evaluate_comparison(self, expression):
-        operations = {
-            "=": ExpressionFunc.func_equal,
-            "!=": ExpressionFunc.func_not_equal,
-            "<": ExpressionFunc.func_less_than,
-            ">": ExpressionFunc.func_greater_than,
-            "<=": ExpressionFunc.func_less_than_or_equal,
-            ">=": ExpressionFunc.func_greater_than_or_equal,
-            "in": ExpressionFunc.func_in,
-            "!in": ExpressionFunc.func_not_in,
-        }
-        key, op, value = expression["key"], expression["op"], expression["value"]
-        return operations[op](self.ctx.get(key), value)
-
-
-def find_first_matching_expression(ctx, expressions, default="calc.json"):
-    evaluator = ExpressionEvaluator(ctx)
-    for expr in expressions:
+            children = [compile_expression(child, keys) for child in expression["sub"]]
+            if op == "&&":
+                return lambda ctx: all(child(ctx) for child in children)
+            if op == "||":
+                return lambda ctx: any(child(ctx) for child in children)
+            # "!" 会对所有子条件求值, 取第一个的结果
+            return lambda ctx: not [child(ctx) for child in children][0]
+
+        func, need_convert = COMPARISONS[op]
+        key, value = expression["key"], expression["value"]
+    except Exception as e:
+        return _raise(e)
+
+    if keys is not None:
+        keys.append(key)
+    if not need_convert:
+        return lambda ctx: func(ctx.get(key), value)
+
+    value = convert_value(value)
+    return lambda ctx: func(convert_value(ctx.get(key)), value)
+
+
+class CompiledExpressions:
+    """
+    编译后的条件列表, 按顺序返回第一个满足条件的 choose
+    条件较多时, 结果按条件引用到的 ctx 值缓存
+    """
+
+    def __init__(self, expressions: list[dict], default: str = "calc.json", maxsize: int = 256):
+        self.default = default
+        self.maxsize = maxsize
+        keys: list[str] = []
+        self.rules = [(compile_expression(expr, keys), expr) for expr in expressions]
+        self.keys = tuple(dict.fromkeys(keys))
+        self.cached = len(keys) >= CACHE_MIN_COMPARISONS
+        self._cache: OrderedDict[tuple, str] = OrderedDict()
+
+    def _match(self, ctx: dict) -> str:
+        for predicate, expr in self.rules:
+            try:
+                if predicate(ctx):
+                    return expr["choose"]
+            except Exception as e:
+                logger.exception(e)
+        return self.default
+
+    def __call__(self, ctx: dict) -> str:
+        if not self.cached:
+            return self._match(ctx)
+        # int/float/bool 数值相等时比较结果相同, 可以共用缓存; 列表等不可哈希的值不缓存
+        cache_key = tuple(map(ctx.get, self.keys))
         try:
-            if evaluator.evaluate(expr):
-                return expr["choose"]
-        except Exception as e:
-            logger.exception(e)
-    return default
+            result = self._cache.get(cache_key)
+        except TypeError:
+            return self._match(ctx)
+        if result is not None:
+            self._cache.move_to_end(cache_key)
+            return result
+
+        result = self._match(ctx)
+        self._cache[cache_key] = result
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return result
+
+
+def compile_expressions(expressions: list[dict], default: str = "calc.json") -> CompiledExpressions:
+    return CompiledExpressions(expressions, default)
+
+
+# 条件文件路径 -> (mtime, 编译结果)
+_file_cache: dict[Path, tuple[int, CompiledExpressions]] = {}
+
+
+def compile_expressions_file(path: Path, default: str = "calc.json") -> CompiledExpressions | None:
+    """读取并编译条件文件, 按 (路径, mtime) 缓存, 文件修改后重新编译; 文件不存在时返回 None"""
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        _file_cache.pop(path, None)
+        return None
+
+    cached = _file_cache.get(path)
+    if cached is not None and cached[0] == mtime and cached[1].default == default:
+        return cached[1]
+
+    with open(path, "rb") as f:
+        compiled = CompiledExpressions(msgjson.decode(f.read()), default)
+    _file_cache[path] = (mtime, compiled)
+    return compiled
+
+
+def find_first_matching_expression(ctx, expressions: list[dict] | Path, default="calc.json"):
+    """expressions 为条件文件路径时使用缓存的编译结果, 文件不存在时返回 None"""
+    if isinstance(expressions, Path):
+        compiled = compile_expressions_file(expressions, default)
+        return compiled(ctx) if compiled is not None else None
+    return CompiledExpressions(expressions, default)._match(ctx)
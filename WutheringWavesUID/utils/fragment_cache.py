@@ -0,0 +1,171 @@
+"""
+渲染片段缓存
+
+角色面板中的武器、共鸣链、技能、声骸等区块只依赖少量输入, 以绘制输入的哈希为 key 缓存绘制结果,
+面板数据没有变化时再次请求只需要拼接。
+绘制输入包括用到的下载资源(图标等)的修改时间(utils/image.resource_mtime), 资源缺失时使用的占位图不会在资源下载后继续命中。
+- 内存: 按图片大小计算容量的 LRU, 容量为 0 时关闭
+- 磁盘(可选): 以 PNG 保存在 RENDER_FRAGMENT_PATH, 重启后仍可命中, 长时间未使用的文件自动清理
+
+icon_cache 使用相同的结构缓存缩放/遮罩后的头像和武器图标(RENDER_ICON_PATH), 见 utils/image.py。
+
+缓存的图片为共享对象, 调用方只能作为贴图来源使用, 不能修改。
+"""
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+import hashlib
+import os
+from pathlib import Path
+import threading
+import time
+
+from gsuid_core.logger import logger
+from PIL import Image
+
+from ..wutheringwaves_config import WutheringWavesConfig
+from .resource.RESOURCE_PATH import RENDER_FRAGMENT_PATH, RENDER_ICON_PATH
+
+# 绘制逻辑或素材变化时修改, 旧的缓存(包括磁盘缓存)自动失效
+FRAGMENT_VERSION = 1
+ICON_VERSION = 1
+# 磁盘缓存文件超过该时间未使用则删除
+DISK_EXPIRE_SECONDS = 7 * 24 * 3600
+DISK_PRUNE_INTERVAL = 3600
+
+
+def _image_bytes(img: Image.Image) -> int:
+    return img.width * img.height * len(img.getbands())
+
+
+class FragmentCache:
+    def __init__(
+        self,
+        path: Path = RENDER_FRAGMENT_PATH,
+        size_config: str = "RenderFragmentCacheSize",
+        disk_config: str = "RenderFragmentDiskCache",
+        version: int = FRAGMENT_VERSION,
+    ):
+        self.path = path
+        self.size_config = size_config
+        self.disk_config = disk_config
+        self.version = version
+        self._memory: OrderedDict[str, Image.Image] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+
+    def make_key(self, parts: tuple[Hashable, ...]) -> str:
+        """parts 只能包含 str/int/float/tuple 等 repr 稳定的值"""
+        return hashlib.blake2b(repr((self.version, parts)).encode(), digest_size=16).hexdigest()
+
+    @property
+    def max_bytes(self) -> int:
+        return WutheringWavesConfig.get_config(self.size_config).data * 1024 * 1024
+
+    @property
+    def use_disk(self) -> bool:
+        return WutheringWavesConfig.get_config(self.disk_config).data
+
+    def get(self, key: str) -> Image.Image | None:
+        with self._lock:
+            img = self._memory.get(key)
+            if img is not None:
+                self._memory.move_to_end(key)
+                return img
+
+        if not self.use_disk:
+            return None
+        path = self.path / f"{key}.png"
+        try:
+            with Image.open(path) as f:
+                img = f.convert("RGBA")
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"[鸣潮] 渲染片段缓存读取失败 {path}: {e}")
+            return None
+        self._put_memory(key, img)
+        return img
+
+    def put(self, key: str, img: Image.Image):
+        self._put_memory(key, img)
+        if not self.use_disk:
+            return
+        path = self.path / f"{key}.png"
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        try:
+            img.save(tmp_path, "PNG", compress_level=1)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"[鸣潮] 渲染片段缓存写入失败 {path}: {e}")
+        self._prune_disk()
+
+    def _put_memory(self, key: str, img: Image.Image):
+        max_bytes = self.max_bytes
+        size = _image_bytes(img)
+        if size > max_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= _image_bytes(old)
+            self._memory[key] = img
+            self._memory_bytes += size
+            while self._memory_bytes > max_bytes:
+                _, old = self._memory.popitem(last=False)
+                self._memory_bytes -= _image_bytes(old)
+
+    def _prune_disk(self):
+        now = time.time()
+        if now - self._last_prune < DISK_PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        for path in self.path.glob("*.png"):
+            try:
+                if now - path.stat().st_mtime > DISK_EXPIRE_SECONDS:
+                    path.unlink()
+            except OSError:
+                continue
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    async def get_or_render(
+        self,
+        parts: tuple[Hashable, ...],
+        render: Callable[[], Awaitable[Image.Image]],
+    ) -> Image.Image:
+        """parts 为绘制该片段用到的全部输入, 命中时直接返回缓存的图片"""
+        if self.max_bytes <= 0:
+            return await render()
+
+        key = self.make_key(parts)
+        img = self.get(key)
+        if img is None:
+            img = await render()
+            self.put(key, img)
+        return img
+
+    def get_or_render_sync(
+        self,
+        parts: tuple[Hashable, ...],
+        render: Callable[[], Image.Image],
+    ) -> Image.Image:
+        """get_or_render 的同步版本, 用于绘图线程中"""
+        if self.max_bytes <= 0:
+            return render()
+
+        key = self.make_key(parts)
+        img = self.get(key)
+        if img is None:
+            img = render()
+            self.put(key, img)
+        return img
+
+
+fragment_cache = FragmentCache()
+icon_cache = FragmentCache(RENDER_ICON_PATH, "IconCacheSize", "IconDiskCache", ICON_VERSION)
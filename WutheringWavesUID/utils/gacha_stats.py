@@ -0,0 +1,119 @@
+"""
+抽卡统计
+
+每个卡池的统计(保底计数、五星列表、连UP/连歪等)保存为可以继续累加的状态,
+新增记录时只需要把新记录按时间顺序累加进去, 不必重新遍历全部历史。
+"""
+
+import hashlib
+from typing import Any
+
+from .resource.constant import NORMAL_LIST
+
+# 统计格式变化时修改, 旧的统计会被重新计算
+GACHA_STATS_VERSION = 1
+
+# 会歪的卡池
+UP_POOL_NAMES = ["角色精准调谐", "角色联动唤取", "角色忆旅唤取", "角色新旅唤取"]
+
+
+def get_stats_fingerprint() -> str:
+    """常驻列表变化时 is_up 会变, 统计需要重算"""
+    raw = f"{GACHA_STATS_VERSION}:{','.join(NORMAL_LIST)}"
+    return hashlib.md5(raw.encode()).hexdigest()[:16]
+
+
+def new_pool_stats() -> dict[str, Any]:
+    return {
+        "count": 0,  # 已统计的记录数
+        "num": 1,  # 当前保底计数 + 1
+        "first_time": "",
+        "last_time": "",
+        "r_num": [],  # 每个五星的抽数
+        "rank_s_list": [],  # 五星记录
+        "up_count": 0,
+        # 连UP / 连歪 / 小保底不歪, 只统计五星角色
+        "cur_up": 0,
+        "max_up": 0,
+        "cur_non_up": 0,
+        "max_non_up": 0,
+        "prev_is_up": False,
+        "small_guarantee": 0,
+        "up_after_up": 0,
+    }
+
+
+def _is_role(item: dict) -> bool:
+    return item.get("resourceType") == "角色" and item.get("qualityLevel") == 5
+
+
+def accumulate_pool_stats(stats: dict[str, Any], records: list[dict]) -> dict[str, Any]:
+    """按 旧->新 的顺序把 records 累加到 stats 中"""
+    for data in records:
+        if stats["count"] == 0:
+            stats["first_time"] = data["time"]
+        stats["last_time"] = data["time"]
+        stats["count"] += 1
+
+        if data["qualityLevel"] != 5:
+            stats["num"] += 1
+            continue
+
+        item = dict(data)
+        item["gacha_num"] = stats["num"]
+        item["is_up"] = item["name"] not in NORMAL_LIST
+        stats["num"] = 1
+
+        rank_s_list = stats["rank_s_list"]
+        prev = rank_s_list[-1] if rank_s_list else None
+        stats["r_num"].append(item["gacha_num"])
+        rank_s_list.append(item)
+        if item["is_up"]:
+            stats["up_count"] += 1
+
+        # 小保底不歪率: 第一个五星, 以及UP五星角色之后的五星角色
+        if _is_role(item) and (prev is None or (_is_role(prev) and prev["is_up"])):
+            stats["small_guarantee"] += 1
+            if item["is_up"]:
+                stats["up_after_up"] += 1
+
+        if not _is_role(item):
+            continue
+
+        # 最多连续UP
+        if item["is_up"]:
+            stats["cur_up"] += 1
+            stats["max_up"] = max(stats["max_up"], stats["cur_up"])
+        else:
+            stats["cur_up"] = 0
+
+        # 最多连歪, 连续两个UP才中断
+        if item["is_up"]:
+            if stats["prev_is_up"]:
+                stats["max_non_up"] = max(stats["max_non_up"], stats["cur_non_up"])
+                stats["cur_non_up"] = 0
+            stats["prev_is_up"] = True
+        else:
+            stats["cur_non_up"] += 1
+            stats["prev_is_up"] = False
+
+    return stats
+
+
+def build_pool_stats(records: list[dict]) -> dict[str, Any]:
+    """从完整记录(新->旧)计算统计"""
+    return accumulate_pool_stats(new_pool_stats(), records[::-1])
+
+
+def get_max_consecutive_up(stats: dict[str, Any]) -> int:
+    return stats["max_up"]
+
+
+def get_max_consecutive_non_up(stats: dict[str, Any]) -> int:
+    return max(stats["max_non_up"], stats["cur_non_up"])
+
+
+def get_non_deviation_rate(stats: dict[str, Any]) -> float | str:
+    if not stats["small_guarantee"]:
+        return "-"
+    return float(f"{stats['up_after_up'] / stats['small_guarantee'] * 100:.1f}")
@@ -0,0 +1,285 @@
+"""
+抽卡记录存储
+
+每个卡池的记录由若干个只追加、不修改的分段组成:
+    PLAYER_PATH/<uid>/gacha/manifest.json        当前使用的分段
+    PLAYER_PATH/<uid>/gacha/segments/*.json      分段文件, 按时间从旧到新保存
+    PLAYER_PATH/<uid>/gacha/stats.json           每个卡池的统计, 随新增记录累加
+    PLAYER_PATH/<uid>/<type>_gacha_logs_*.json   备份, 与旧版 gacha_logs.json 格式相同, 不依赖分段
+更新记录时只写入新增的记录; 需要改动旧记录时(导入合并、清理错误数据)该卡池整体重写,
+不再被 manifest 引用的分段随即删除。
+旧版的 gacha_logs.json 会在第一次访问时自动迁移, 迁移完成后重命名为 gacha_logs.json.bak 保留。
+"""
+
+import asyncio
+from datetime import datetime
+import os
+from pathlib import Path
+import time
+from typing import Any
+import uuid
+
+import aiofiles
+from gsuid_core.logger import logger
+import msgspec
+
+from .gacha_stats import accumulate_pool_stats, build_pool_stats, get_stats_fingerprint
+from .resource.RESOURCE_PATH import PLAYER_PATH
+from .response_cache import response_cache
+
+GACHA_DIR_NAME = "gacha"
+SEGMENT_DIR_NAME = "segments"
+MANIFEST_NAME = "manifest.json"
+STATS_NAME = "stats.json"
+LEGACY_FILE_NAME = "gacha_logs.json"
+LEGACY_BACKUP_SUFFIX = ".bak"
+# 单个卡池的分段数超过该值时合并为一个
+MAX_SEGMENTS = 16
+
+_locks: dict[str, asyncio.Lock] = {}
+
+
+def get_gacha_dir(uid: str) -> Path:
+    return PLAYER_PATH / str(uid) / GACHA_DIR_NAME
+
+
+def _get_lock(uid: str) -> asyncio.Lock:
+    return _locks.setdefault(str(uid), asyncio.Lock())
+
+
+async def _read_json(path: Path) -> Any:
+    async with aiofiles.open(path, "rb") as f:
+        return msgspec.json.decode(await f.read())
+
+
+async def _write_json(path: Path, data: Any):
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    async with aiofiles.open(tmp_path, "wb") as f:
+        await f.write(msgspec.json.encode(data))
+    os.replace(tmp_path, path)
+
+
+async def _write_segment(uid: str, records: list[dict]) -> str:
+    """写入一个分段, records 为 新->旧, 文件中按 旧->新 保存"""
+    segment_dir = get_gacha_dir(uid) / SEGMENT_DIR_NAME
+    segment_dir.mkdir(parents=True, exist_ok=True)
+    name = f"{time.time_ns()}_{uuid.uuid4().hex[:8]}.json"
+    await _write_json(segment_dir / name, records[::-1])
+    return name
+
+
+async def _read_manifest(uid: str) -> dict | None:
+    path = get_gacha_dir(uid) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    return await _read_json(path)
+
+
+async def _migrate_legacy(uid: str) -> bool:
+    """将旧的 gacha_logs.json 转换为分段存储, 返回是否存在数据"""
+    if (get_gacha_dir(uid) / MANIFEST_NAME).exists():
+        return True
+
+    legacy_path = PLAYER_PATH / str(uid) / LEGACY_FILE_NAME
+    if not legacy_path.exists():
+        return False
+
+    async with _get_lock(uid):
+        if (get_gacha_dir(uid) / MANIFEST_NAME).exists():
+            return True
+        try:
+            legacy = await _read_json(legacy_path)
+        except Exception as e:
+            logger.exception(f"[鸣潮] 迁移抽卡记录失败 {legacy_path}:", e)
+            return False
+
+        await _write_manifest(uid, legacy.get("data_time"), {}, legacy.get("data", {}))
+        os.replace(legacy_path, legacy_path.with_name(f"{LEGACY_FILE_NAME}{LEGACY_BACKUP_SUFFIX}"))
+        logger.debug(f"[鸣潮] 抽卡记录迁移完成 uid:{uid}")
+    return True
+
+
+async def _write_manifest(
+    uid: str,
+    data_time: str | None,
+    pools: dict[str, dict],
+    replace: dict[str, list[dict]] | None = None,
+    append: dict[str, list[dict]] | None = None,
+) -> dict:
+    pools = {name: dict(pool) for name, pool in pools.items()}
+    for name, records in (replace or {}).items():
+        pools[name] = {
+            "segments": [await _write_segment(uid, records)] if records else [],
+            "count": len(records),
+        }
+    for name, records in (append or {}).items():
+        if not records:
+            continue
+        pool = pools.setdefault(name, {"segments": [], "count": 0})
+        pool["segments"] = [*pool["segments"], await _write_segment(uid, records)]
+        pool["count"] += len(records)
+
+    manifest = {
+        "data_time": data_time or datetime.now().strftime("%Y-%m-%d %H-%M-%S"),
+        "pools": pools,
+    }
+    gacha_dir = get_gacha_dir(uid)
+    gacha_dir.mkdir(parents=True, exist_ok=True)
+    await _write_json(gacha_dir / MANIFEST_NAME, manifest)
+    return manifest
+
+
+async def _read_pool(uid: str, pool: dict) -> list[dict]:
+    """读取卡池全部记录, 返回 新->旧"""
+    segment_dir = get_gacha_dir(uid) / SEGMENT_DIR_NAME
+    records = []
+    for name in pool.get("segments", []):
+        records.extend(await _read_json(segment_dir / name))
+    return records[::-1]
+
+
+async def _read_stats(uid: str) -> dict[str, dict]:
+    path = get_gacha_dir(uid) / STATS_NAME
+    if not path.exists():
+        return {}
+    try:
+        stats = await _read_json(path)
+    except Exception:
+        return {}
+    if stats.get("fingerprint") != get_stats_fingerprint():
+        return {}
+    return stats.get("pools", {})
+
+
+async def _write_stats(uid: str, manifest: dict, stats: dict[str, dict]):
+    # 与 manifest 的卡池顺序保持一致, 并记录统计对应的分段
+    pools = {}
+    for name, pool in manifest["pools"].items():
+        if name in stats:
+            pools[name] = {**stats[name], "segments": pool["segments"]}
+    await _write_json(
+        get_gacha_dir(uid) / STATS_NAME,
+        {"fingerprint": get_stats_fingerprint(), "pools": pools},
+    )
+
+
+async def _collect_garbage(uid: str, manifest: dict):
+    """删除 manifest 不再引用的分段, 备份不依赖分段"""
+    used = {name for pool in manifest["pools"].values() for name in pool["segments"]}
+    for path in (get_gacha_dir(uid) / SEGMENT_DIR_NAME).glob("*.json"):
+        if path.name not in used:
+            path.unlink(missing_ok=True)
+
+
+async def has_gachalogs(uid: str) -> bool:
+    return await _migrate_legacy(uid)
+
+
+async def _load_gachalogs(uid: str, manifest: dict) -> dict[str, Any]:
+    names = list(manifest["pools"].keys())
+    records = await asyncio.gather(*[_read_pool(uid, manifest["pools"][name]) for name in names])
+    return {
+        "uid": str(uid),
+        "data_time": manifest.get("data_time", ""),
+        "data": dict(zip(names, records)),
+    }
+
+
+async def load_gachalogs(uid: str) -> dict[str, Any] | None:
+    """
+    读取抽卡记录, 没有数据时返回 None
+    返回格式与旧版 gacha_logs.json 相同: {"uid", "data_time", "data": {卡池名: [记录(新->旧)]}}
+    """
+    if not await _migrate_legacy(uid):
+        return None
+    manifest = await _read_manifest(uid)
+    if manifest is None:
+        return None
+    return await _load_gachalogs(uid, manifest)
+
+
+async def load_gacha_stats(uid: str) -> dict[str, dict] | None:
+    """
+    读取每个卡池的统计, 没有数据时返回 None
+    统计与当前分段不一致(或统计规则变化)的卡池会重新计算
+    """
+    if not await _migrate_legacy(uid):
+        return None
+    async with _get_lock(uid):
+        manifest = await _read_manifest(uid)
+        if manifest is None:
+            return None
+
+        stats = await _read_stats(uid)
+        changed = stats.keys() != manifest["pools"].keys()
+        for name, pool in manifest["pools"].items():
+            if name not in stats or stats[name].get("segments") != pool["segments"]:
+                stats[name] = {**build_pool_stats(await _read_pool(uid, pool)), "segments": pool["segments"]}
+                changed = True
+        if changed:
+            await _write_stats(uid, manifest, stats)
+
+    return {name: stats[name] for name in manifest["pools"]}
+
+
+async def save_gachalogs_data(
+    uid: str,
+    data: dict[str, list[dict]],
+    old_data: dict[str, list[dict]] | None = None,
+    data_time: str | None = None,
+) -> None:
+    """
+    保存抽卡记录(新->旧)
+    传入 old_data(即磁盘上的现有记录) 时, 新记录以 old_data 结尾的卡池只追加多出来的部分,
+    其余卡池整体重写。
+    """
+    await _migrate_legacy(uid)
+    async with _get_lock(uid):
+        manifest = await _read_manifest(uid)
+        pools: dict[str, dict] = manifest["pools"] if manifest else {}
+
+        append: dict[str, list[dict]] = {}
+        replace: dict[str, list[dict]] = {}
+        for name, records in data.items():
+            old = old_data.get(name, []) if old_data is not None else None
+            pool = pools.get(name)
+            if old is not None and pool and pool["count"] == len(old) and len(pool["segments"]) < MAX_SEGMENTS:
+                added = len(records) - len(old)
+                if added >= 0 and records[added:] == old:
+                    append[name] = records[:added]
+                    continue
+            replace[name] = records
+
+        stats = await _read_stats(uid)
+        for name, records in data.items():
+            pool_stats = stats.get(name)
+            if name in append and pool_stats and pool_stats.get("segments") == pools[name]["segments"]:
+                accumulate_pool_stats(pool_stats, append[name][::-1])
+            else:
+                stats[name] = build_pool_stats(records)
+
+        manifest = await _write_manifest(uid, data_time, pools, replace, append)
+        await _write_stats(uid, manifest, stats)
+        if replace:
+            await _collect_garbage(uid, manifest)
+    response_cache.invalidate(uid)
+
+
+async def snapshot_gachalogs(uid: str, type: str) -> Path | None:
+    """
+    备份当前抽卡记录
+    备份为完整的旧版 gacha_logs.json 格式(包括每个卡池的数量), 不依赖分段,
+    改名为 gacha_logs.json 并删除 gacha 目录即可恢复
+    """
+    if not await _migrate_legacy(uid):
+        return None
+    async with _get_lock(uid):
+        manifest = await _read_manifest(uid)
+        if manifest is None:
+            return None
+        gachalogs = await _load_gachalogs(uid, manifest)
+        for name, records in gachalogs["data"].items():
+            gachalogs[name] = len(records)
+        path = PLAYER_PATH / str(uid) / f"{type}_gacha_logs_{datetime.now().strftime('%Y-%m-%d.%H%M%S')}.json"
+        await _write_json(path, gachalogs)
+    return path
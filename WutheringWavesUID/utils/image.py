@@ -20,6 +20,7 @@ from PIL import (
 )
 
 from ..utils.database.models import WavesUserAvatar
+from ..utils.fragment_cache import icon_cache
 from ..utils.resource.RESOURCE_PATH import (
     AVATAR_PATH,
     CUSTOM_CARD_PATH,
@@ -28,6 +29,7 @@ from ..utils.resource.RESOURCE_PATH import (
     SHARE_BG_PATH,
     WEAPON_PATH,
 )
+from ..utils.texture import get_texture, load_texture, texture_manager
 from ..wutheringwaves_config import WutheringWavesConfig
 
 ICON = Path(__file__).parent.parent.parent / "ICON.png"
@@ -117,8 +119,11 @@ def load_asset(path, mode: str = "RGBA") -> Image.Image:
     """读取素材并缓存解码结果, 返回副本(可安全修改)。文件变更(mtime)时自动失效。
 
     仅用于小尺寸素材(图标/背景条/模板); 大图(角色立绘/分享背景)请勿使用, 避免内存膨胀。
+    texture2d 目录中的素材由 texture_manager 缓存。
     """
     path_str = str(path)
+    if mode == "RGBA" and path_str in texture_manager.index:
+        return load_texture(path_str)
     try:
         mtime_ns = os.stat(path_str).st_mtime_ns
     except OSError:
@@ -136,11 +141,15 @@ def get_ICON():
     return Image.open(ICON)
 
 
-async def get_random_share_bg():
+def get_random_share_bg_sync():
     path = random.choice(os.listdir(f"{SHARE_BG_PATH}"))
     return Image.open(f"{SHARE_BG_PATH}/{path}").convert("RGBA").resize((2560, 1440))
 
 
+async def get_random_share_bg():
+    return get_random_share_bg_sync()
+
+
 async def get_random_share_bg_path():
     path = random.choice(os.listdir(f"{SHARE_BG_PATH}"))
     return SHARE_BG_PATH / path
@@ -177,7 +186,7 @@ async def get_role_pile(resource_id: int | str, custom: bool = False) -> tuple[b
     return get_role_pile_sync(resource_id, custom)
 
 
-async def get_role_pile_old(resource_id: int | str, custom: bool = False) -> Image.Image:
+def get_role_pile_old_sync(resource_id: int | str, custom: bool = False) -> Image.Image:
     if custom:
         custom_dir = f"{CUSTOM_MR_CARD_PATH}/{resource_id}"
         if os.path.isdir(custom_dir) and len(os.listdir(custom_dir)) > 0:
@@ -194,8 +203,16 @@ async def get_role_pile_old(resource_id: int | str, custom: bool = False) -> Ima
         return load_asset(TEXT_PATH / "缺失.png")
 
 
+async def get_role_pile_old(resource_id: int | str, custom: bool = False) -> Image.Image:
+    return get_role_pile_old_sync(resource_id, custom)
+
+
+def get_square_avatar_path(resource_id: int | str) -> Path:
+    return AVATAR_PATH / f"role_head_{resource_id}.png"
+
+
 def get_square_avatar_sync(resource_id: int | str) -> Image.Image:
-    path = AVATAR_PATH / f"role_head_{resource_id}.png"
+    path = get_square_avatar_path(resource_id)
     return load_asset(path if path.exists() else TEXT_PATH / "缺失.png")
 
 
@@ -203,7 +220,7 @@ async def get_square_avatar(resource_id: int | str) -> Image.Image:
     return get_square_avatar_sync(resource_id)
 
 
-async def cropped_square_avatar(item_icon: Image.Image, size: int) -> Image.Image:
+def cropped_square_avatar_sync(item_icon: Image.Image, size: int) -> Image.Image:
     # 目标尺寸
     target_width, target_height = size, size
     # 原始尺寸
@@ -227,8 +244,16 @@ async def cropped_square_avatar(item_icon: Image.Image, size: int) -> Image.Imag
     return resized_image
 
 
+async def cropped_square_avatar(item_icon: Image.Image, size: int) -> Image.Image:
+    return cropped_square_avatar_sync(item_icon, size)
+
+
+def get_square_weapon_path(resource_id: int | str) -> Path:
+    return WEAPON_PATH / f"weapon_{resource_id}.png"
+
+
 def get_square_weapon_sync(resource_id: int | str) -> Image.Image:
-    path = WEAPON_PATH / f"weapon_{resource_id}.png"
+    path = get_square_weapon_path(resource_id)
     return load_asset(path if path.exists() else TEXT_PATH / "缺失.png")
 
 
@@ -236,6 +261,108 @@ async def get_square_weapon(resource_id: int | str) -> Image.Image:
     return get_square_weapon_sync(resource_id)
 
 
+def resource_mtime(path: Path) -> int:
+    """资源文件的修改时间, 不存在时为 0; 放入缓存 key 中, 资源下载/更新后缓存随之失效"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def get_square_avatar_resized_sync(resource_id: int | str, size: tuple[int, int]) -> Image.Image:
+    """缩放后的角色头像, 按 (角色id, 尺寸) 缓存, 返回的图片不能修改"""
+    mtime = resource_mtime(get_square_avatar_path(resource_id))
+
+    def render() -> Image.Image:
+        return get_square_avatar_sync(resource_id).resize(size)
+
+    return icon_cache.get_or_render_sync(("avatar_resize", str(resource_id), mtime, size), render)
+
+
+async def get_square_avatar_resized(resource_id: int | str, size: tuple[int, int]) -> Image.Image:
+    return get_square_avatar_resized_sync(resource_id, size)
+
+
+def get_square_avatar_cropped_sync(resource_id: int | str, size: int) -> Image.Image:
+    """cropped_square_avatar 处理后的角色头像, 按 (角色id, 尺寸) 缓存, 返回的图片不能修改"""
+    mtime = resource_mtime(get_square_avatar_path(resource_id))
+
+    def render() -> Image.Image:
+        return cropped_square_avatar_sync(get_square_avatar_sync(resource_id), size)
+
+    return icon_cache.get_or_render_sync(("avatar_crop", str(resource_id), mtime, size), render)
+
+
+async def get_square_avatar_cropped(resource_id: int | str, size: int) -> Image.Image:
+    return get_square_avatar_cropped_sync(resource_id, size)
+
+
+def get_square_weapon_resized_sync(resource_id: int | str, size: tuple[int, int]) -> Image.Image:
+    """缩放后的武器图标, 按 (武器id, 尺寸) 缓存, 返回的图片不能修改"""
+    mtime = resource_mtime(get_square_weapon_path(resource_id))
+
+    def render() -> Image.Image:
+        return get_square_weapon_sync(resource_id).resize(size)
+
+    return icon_cache.get_or_render_sync(("weapon_resize", str(resource_id), mtime, size), render)
+
+
+async def get_square_weapon_resized(resource_id: int | str, size: tuple[int, int]) -> Image.Image:
+    return get_square_weapon_resized_sync(resource_id, size)
+
+
+def get_square_weapon_cropped_sync(resource_id: int | str, size: int) -> Image.Image:
+    """crop_center_img 裁剪后的武器图标, 按 (武器id, 尺寸) 缓存, 返回的图片不能修改"""
+    mtime = resource_mtime(get_square_weapon_path(resource_id))
+
+    def render() -> Image.Image:
+        return crop_center_img(get_square_weapon_sync(resource_id), size, size)
+
+    return icon_cache.get_or_render_sync(("weapon_crop", str(resource_id), mtime, size), render)
+
+
+async def get_square_weapon_cropped(resource_id: int | str, size: int) -> Image.Image:
+    return get_square_weapon_cropped_sync(resource_id, size)
+
+
+def draw_rank_user_avatar(pic: Image.Image, mask_path: Path) -> Image.Image:
+    """排行榜的用户头像: 裁剪为 120x120 并套用遮罩, 放在 180x180 的画布上"""
+    pic_temp = crop_center_img(pic, 120, 120)
+    img = Image.new("RGBA", (180, 180))
+    img.paste(pic_temp, (0, -5), get_texture(mask_path, (120, 120)))
+    return img
+
+
+def get_rank_role_avatar_sync(resource_id: int | str, mask_path: Path) -> Image.Image:
+    """
+    排行榜的角色头像(获取用户头像失败时使用): 缩放为 160x160 并套用遮罩, 放在 180x180 的画布上
+    按 (角色id, 遮罩) 缓存, 返回的图片不能修改
+    """
+    mtime = resource_mtime(get_square_avatar_path(resource_id))
+
+    def render() -> Image.Image:
+        pic = get_square_avatar_sync(resource_id)
+        pic_temp = Image.new("RGBA", pic.size)
+        pic_temp.paste(pic.resize((160, 160)), (10, 10))
+        pic_temp = pic_temp.resize((160, 160))
+
+        avatar_mask = get_texture(mask_path)
+        mask_pic_temp = Image.new("RGBA", avatar_mask.size)
+        mask_pic_temp.paste(avatar_mask, (-20, -45), avatar_mask)
+        mask_pic_temp = mask_pic_temp.resize((160, 160))
+
+        img = Image.new("RGBA", (180, 180))
+        img.paste(pic_temp, (0, 0), mask_pic_temp)
+        return img
+
+    parts = ("rank_avatar", str(resource_id), mtime, str(mask_path), resource_mtime(mask_path))
+    return icon_cache.get_or_render_sync(parts, render)
+
+
+async def get_rank_role_avatar(resource_id: int | str, mask_path: Path) -> Image.Image:
+    return get_rank_role_avatar_sync(resource_id, mask_path)
+
+
 def get_attribute_sync(name: str = "", is_simple: bool = False) -> Image.Image:
     if is_simple:
         name = f"attribute/attr_simple_{name}.png"
@@ -570,7 +697,7 @@ async def pic_download_from_url(
         return Image.open(TEXT_PATH / "缺失.png").convert("RGBA")
 
 
-async def get_custom_gaussian_blur(img: Image.Image) -> Image.Image:
+def get_custom_gaussian_blur_sync(img: Image.Image) -> Image.Image:
     from ..wutheringwaves_config.wutheringwaves_config import ShowConfig
 
     radius = ShowConfig.get_config("BlurRadius").data
@@ -593,3 +720,7 @@ async def get_custom_gaussian_blur(img: Image.Image) -> Image.Image:
         # 调整对比度
         img = ImageEnhance.Contrast(img).enhance(contrast)
     return img
+
+
+async def get_custom_gaussian_blur(img: Image.Image) -> Image.Image:
+    return get_custom_gaussian_blur_sync(img)
@@ -4,7 +4,7 @@ from gsuid_core.models import Event
 from gsuid_core.utils.image.image_tools import crop_center_img
 from PIL import Image
 
-from ..utils.image import get_event_avatar, get_square_avatar
+from ..utils.image import get_event_avatar, get_square_avatar_sync
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
 
@@ -23,8 +23,8 @@ async def draw_pic_with_ring(ev: Event):
     return avatar, avatar_ring
 
 
-async def draw_pic(roleId):
-    pic = await get_square_avatar(roleId)
+def draw_pic_sync(roleId):
+    pic = get_square_avatar_sync(roleId)
     mask_pic = Image.open(TEXT_PATH / "avatar_mask.png")
     img = Image.new("RGBA", (180, 180))
     mask = mask_pic.resize((140, 140))
@@ -32,3 +32,7 @@ async def draw_pic(roleId):
     img.paste(resize_pic, (22, 18), mask)
 
     return img
+
+
+async def draw_pic(roleId):
+    return draw_pic_sync(roleId)
@@ -0,0 +1,151 @@
+"""
+评分模板条件文件(condition*.json)的匹配耗时
+
+对 character 目录下的每个条件文件, 用极限面板(1.json)的声骸汇总作为 ctx,
+并把条件中出现的每个常量依次代入对应的键, 保证每条规则都能命中;
+分别用原来的逐条解释执行、现在的 find_first_matching_expression 和编译后的匹配函数求值,
+检查结果一致并输出单次匹配的平均耗时。
+
+    python WutheringWavesUID/utils/map/condition_benchmark_script.py [重复次数]
+"""
+
+import logging
+from pathlib import Path
+import sys
+import time
+
+from msgspec import json as msgjson
+
+logging.disable(logging.CRITICAL + 1)  # 禁用所有级别（包括 CRITICAL）
+# 将项目根目录加入 sys.path
+root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(root))
+
+from WutheringWavesUID.utils.api.model import RoleDetailData
+from WutheringWavesUID.utils.calc import CalcLookups, WuWaCalc
+from WutheringWavesUID.utils.expression_evaluator import compile_expressions, find_first_matching_expression
+
+SCRIPT_PATH = Path(__file__).parents[0]
+MAP_PATH = SCRIPT_PATH / "character"
+LIMIT_ROLE = SCRIPT_PATH / "1.json"
+
+REPEAT = 2000
+
+
+# ----- 原实现(逐条解释执行), 作为对照 -----
+def _convert(value):
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError as _:
+            pass
+    elif isinstance(value, list):
+        return [_convert(item) for item in value]
+    return value
+
+
+def _converted(func):
+    return lambda a, b: func(_convert(a), _convert(b))
+
+
+OLD_OPERATIONS = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": _converted(lambda a, b: a < b),
+    ">": _converted(lambda a, b: a > b),
+    "<=": _converted(lambda a, b: a <= b),
+    ">=": _converted(lambda a, b: a >= b),
+    "in": _converted(lambda a, b: any(i in b for i in a) if isinstance(a, list) else a in b),
+    "!in": _converted(lambda a, b: all(i not in b for i in a) if isinstance(a, list) else a not in b),
+}
+
+
+def old_evaluate(ctx: dict, expression: dict) -> bool:
+    op = expression["op"]
+    if op == "&&":
+        return all(old_evaluate(ctx, child) for child in expression["sub"])
+    if op == "||":
+        return any(old_evaluate(ctx, child) for child in expression["sub"])
+    if op == "!":
+        return not [old_evaluate(ctx, child) for child in expression["sub"]][0]
+    return OLD_OPERATIONS[op](ctx.get(expression["key"]), expression["value"])
+
+
+def old_find_first_matching_expression(ctx, expressions, default="calc.json"):
+    for expr in expressions:
+        try:
+            if old_evaluate(ctx, expr):
+                return expr["choose"]
+        except Exception as _:
+            pass
+    return default
+
+
+# ----- ctx -----
+def load_panel_ctx() -> list[dict]:
+    lookups = CalcLookups()
+    result = []
+    for raw in msgjson.decode(LIMIT_ROLE.read_bytes()):
+        role_detail = RoleDetailData(**raw)
+        calc = WuWaCalc(role_detail, lookups=lookups)
+        calc.phantom_pre = calc.prepare_phantom()
+        result.append(calc.enhance_summation_phantom_value(calc.phantom_pre))
+    return result
+
+
+def collect_constants(expression: dict, constants: dict[str, list]):
+    if "sub" in expression:
+        for child in expression["sub"]:
+            collect_constants(child, constants)
+    elif "key" in expression:
+        values = expression["value"] if isinstance(expression["value"], list) else [expression["value"]]
+        constants.setdefault(expression["key"], []).extend(values)
+
+
+def build_ctx_list(expressions: list[dict], panels: list[dict]) -> list[dict]:
+    constants: dict[str, list] = {}
+    for expr in expressions:
+        collect_constants(expr, constants)
+    ctx_list = list(panels)
+    for panel in panels:
+        for key, values in constants.items():
+            for value in values:
+                ctx_list.append({**panel, key: value})
+    return ctx_list
+
+
+def bench(func, ctx_list: list[dict], repeat: int) -> float:
+    """单次匹配的平均耗时(us)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for ctx in ctx_list:
+            func(ctx)
+    return (time.perf_counter() - start) / (repeat * len(ctx_list)) * 1e6
+
+
+def main(repeat: int):
+    panels = load_panel_ctx()
+    files = sorted(MAP_PATH.glob("*/condition*.json"))
+    print(f"条件文件 {len(files)} 个, 极限面板 {len(panels)} 个, 重复 {repeat} 次")
+    for path in files:
+        expressions = msgjson.decode(path.read_bytes())
+        ctx_list = build_ctx_list(expressions, panels)
+        matcher = compile_expressions(expressions)
+
+        for ctx in ctx_list:
+            expected = old_find_first_matching_expression(ctx, expressions)
+            actual = (find_first_matching_expression(ctx, expressions), matcher(ctx))
+            assert actual == (expected, expected), (path, ctx, expected, actual)
+
+        old_us = bench(lambda ctx: old_find_first_matching_expression(ctx, expressions), ctx_list, repeat)
+        uncompiled_us = bench(lambda ctx: find_first_matching_expression(ctx, expressions), ctx_list, repeat)
+        compiled_us = bench(matcher, ctx_list, repeat)
+        name = f"{path.parent.name}/{path.name}"
+        print(
+            f"{name}: 规则 {len(expressions)} 条, ctx {len(ctx_list)} 个, 缓存 {'开' if matcher.cached else '关'} | "
+            f"原实现 {old_us:.2f}us, 每次编译 {uncompiled_us:.2f}us, 编译后 {compiled_us:.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else REPEAT)
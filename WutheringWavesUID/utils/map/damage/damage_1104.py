@@ -1,5 +1,4 @@
 # 凌阳
-import copy
 
 from gsuid_core.logger import logger
 
@@ -21,16 +20,16 @@ from .damage import echo_damage, phase_damage, weapon_damage
 
 
 def calc_damage(attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False) -> tuple[str, str]:
-    attr1 = copy.deepcopy(attr)
+    attr1 = attr.fork()
     crit_damage1, expected_damage1 = calc_damage_1(attr1, role, isGroup)
 
-    attr2 = copy.deepcopy(attr)
+    attr2 = attr.fork()
     crit_damage2, expected_damage2 = calc_damage_a(attr2, role, isGroup)
 
-    attr3 = copy.deepcopy(attr)
+    attr3 = attr.fork()
     crit_damage3, expected_damage3 = calc_damage_e(attr3, role, isGroup)
 
-    attr4 = copy.deepcopy(attr)
+    attr4 = attr.fork()
     crit_damage4, expected_damage4 = calc_damage_ea(attr4, role, isGroup)
 
     crit_damage = crit_damage1 + crit_damage2 + crit_damage3 + crit_damage4
@@ -1,5 +1,4 @@
 # 珂莱塔
-import copy
 
 from ...api.model import RoleDetailData
 from ...ascension.char import WavesCharResult, get_char_detail2
@@ -28,15 +27,15 @@ def calc_damage(attr: DamageAttribute, role: RoleDetailData, isGroup: bool = Fal
 
     attr.add_effect(title, msg)
     init_len = len(attr.effect)
-    attr1 = copy.deepcopy(attr)
+    attr1 = attr.fork()
     crit_damage1, expected_damage1 = calc_damage_r(attr1, role, isGroup)
     attr1.add_effect("r伤害", f"期望伤害:{crit_damage1}; 暴击伤害:{expected_damage1}")
 
-    attr2 = copy.deepcopy(attr)
+    attr2 = attr.fork()
     crit_damage2, expected_damage2 = calc_damage_3(attr2, role, isGroup, trigger_times=4)
     attr2.add_effect("死兆*4伤害", f"期望伤害:{crit_damage2}; 暴击伤害:{expected_damage2}")
 
-    attr3 = copy.deepcopy(attr)
+    attr3 = attr.fork()
     crit_damage3, expected_damage3 = calc_damage_2(attr3, role, isGroup)
     attr3.add_effect("r尾刀伤害", f"期望伤害:{crit_damage3}; 暴击伤害:{expected_damage3}")
 
@@ -383,8 +382,8 @@ def calc_damage_33(attr: DamageAttribute, role: RoleDetailData, isGroup: bool =
         s1_ratio = 0
         s2_ratio = 0
 
-    attr1 = copy.deepcopy(attr)
-    attr2 = copy.deepcopy(attr)
+    attr1 = attr.fork()
+    attr2 = attr.fork()
 
     attr1.add_skill_multi(s1)
     attr1.add_skill_ratio(s1_ratio)
@@ -1,5 +1,4 @@
 # 长离
-import copy
 
 from ...api.model import RoleDetailData
 from ...ascension.char import WavesCharResult, get_char_detail2
@@ -182,17 +181,17 @@ def calc_damage_1(attr: DamageAttribute, role: RoleDetailData, isGroup: bool = F
 
 
 def calc_damage_2(attr: DamageAttribute, role: RoleDetailData, isGroup: bool = False) -> tuple[str, str]:
-    attr1 = copy.deepcopy(attr)
+    attr1 = attr.fork()
     crit_damage1, expected_damage1 = calc_damage_0(attr1, role, isGroup)
     attr1.add_effect("焚身以火暴击伤害", f"{crit_damage1}")
     attr1.add_effect("焚身以火期望伤害", f"{expected_damage1}")
 
-    attr2 = copy.deepcopy(attr)
+    attr2 = attr.fork()
     crit_damage2, expected_damage2 = calc_damage_1(attr2, role, isGroup)
     attr2.add_effect("离火照丹心暴击伤害", f"{crit_damage2}")
     attr2.add_effect("离火照丹心期望伤害", f"{expected_damage2}")
 
-    attr3 = copy.deepcopy(attr)
+    attr3 = attr.fork()
     crit_damage3, expected_damage3 = calc_damage_0(attr3, role, isGroup, True)
     attr3.add_effect("焚身以火暴击伤害", f"{crit_damage3}")
     attr3.add_effect("焚身以火期望伤害", f"{expected_damage3}")
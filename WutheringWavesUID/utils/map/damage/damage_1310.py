@@ -1,6 +1,5 @@
 # 漂泊者·导电
 
-import copy
 from typing import Literal
 
 from ...api.model import RoleDetailData
@@ -256,19 +255,19 @@ def calc_damage_3(
 
     crit_damage_total, expected_damage_total = 0, 0
 
-    attr_copy = copy.deepcopy(attr)
+    attr_copy = attr.fork()
     crit_damage, expected_damage = calc_damage_1(attr_copy, role, isGroup, FC="ThrumSpectro")
     attr.add_effect("千声翻涌·衍射3段", f"期望伤害:{crit_damage}; 暴击伤害:{expected_damage}")
     crit_damage_total += float(crit_damage.replace(",", ""))
     expected_damage_total += float(expected_damage.replace(",", ""))
 
-    attr_copy = copy.deepcopy(attr)
+    attr_copy = attr.fork()
     crit_damage, expected_damage = calc_damage_1(attr_copy, role, isGroup, FC="ThrumHavoc")
     attr.add_effect("千声翻涌·湮灭3段", f"期望伤害:{crit_damage}; 暴击伤害:{expected_damage}")
     crit_damage_total += float(crit_damage.replace(",", ""))
     expected_damage_total += float(expected_damage.replace(",", ""))
 
-    attr_copy = copy.deepcopy(attr)
+    attr_copy = attr.fork()
     crit_damage, expected_damage = calc_damage_1(attr_copy, role, isGroup, FC="ThrumAeroSword")
     attr.add_effect("千声翻涌·剑止万律", f"期望伤害:{crit_damage}; 暴击伤害:{expected_damage}")
     crit_damage_total += float(crit_damage.replace(",", ""))
@@ -288,19 +287,19 @@ def calc_damage_4(
 
     crit_damage_total, expected_damage_total = 0.0, 0.0
 
-    attr_copy = copy.deepcopy(attr)
+    attr_copy = attr.fork()
     crit_damage, expected_damage = calc_damage_1(attr_copy, role, isGroup, FC="ThrumHavocMid-air")
     attr.add_effect("千声翻涌·湮灭空中3段", f"期望伤害:{crit_damage}; 暴击伤害:{expected_damage}")
     crit_damage_total += float(crit_damage.replace(",", ""))
     expected_damage_total += float(expected_damage.replace(",", ""))
 
-    attr_copy = copy.deepcopy(attr)
+    attr_copy = attr.fork()
     crit_damage, expected_damage = calc_damage_1(attr_copy, role, isGroup, FC="ThrumAeroMid-air")
     attr.add_effect("·气动空中3段+·气动下落", f"期望伤害:{crit_damage}; 暴击伤害:{expected_damage}")
     crit_damage_total += float(crit_damage.replace(",", ""))
     expected_damage_total += float(expected_damage.replace(",", ""))
 
-    attr_copy = copy.deepcopy(attr)
+    attr_copy = attr.fork()
     crit_damage, expected_damage = calc_damage_1(attr_copy, role, isGroup, FC="ThrumAeroSword")
     attr.add_effect("千声翻涌·剑止万律", f"期望伤害:{crit_damage}; 暴击伤害:{expected_damage}")
     crit_damage_total += float(crit_damage.replace(",", ""))
@@ -1,3 +1,4 @@
+from functools import partial
 import importlib
 import os
 
@@ -16,50 +17,53 @@ SPECIAL_ID_TO_MODULE = {
 }
 
 
-def _register_attr(attr_name, register_method):
+def get_damage_manifest() -> dict[str, str]:
     """
-    自动扫描当前目录下所有 damage_*.py 模块，
-    通过 importlib.import_module 导入（保持包上下文），
-    提取指定属性（如 damage_detail 或 rank），
-    并根据特例映射注册到对应的角色ID上。
+    角色ID -> 模块相对路径(如 ".damage_1102"), 只扫描文件名, 不导入模块
+    指向同一模块的特例ID(SPECIAL_ID_TO_MODULE)也在其中
     """
-    for filename in os.listdir(CURRENT_DIR):
+    manifest = {}
+    for filename in sorted(os.listdir(CURRENT_DIR)):
         if not filename.startswith("damage_") or not filename.endswith(".py"):
             continue
-
         # 模块名（不带 .py 后缀），例如 "damage_1102"
         module_name = filename[:-3]
-        # 相对于当前包的导入路径，例如 ".damage_1102"
-        relative_name = f".{module_name}"
-        try:
-            # 使用相对导入，保持包上下文，这样模块内部的相对导入（如 from ...api）就能正常工作
-            module = importlib.import_module(relative_name, package=CUR_PACKAGE)
-        except ImportError as e:
-            raise ImportError(f"导入模块 {module_name} 失败: {e}") from e
-
-        attr_value = getattr(module, attr_name, None)
-        if attr_value is None:
-            continue
+        # 模块后缀（角色ID），如 "1102"
+        manifest[module_name[7:]] = f".{module_name}"
+
+    for reg_id, mod_suffix in SPECIAL_ID_TO_MODULE.items():
+        if mod_suffix in manifest:
+            manifest[reg_id] = manifest[mod_suffix]
+    return manifest
+
 
-        # 提取模块后缀（角色ID），如 "1102"
-        module_suffix = module_name[7:]  # 去掉 "damage_"
-        default_id = module_suffix
+def _load_attr(relative_name: str, attr_name: str):
+    # 使用相对导入，保持包上下文，这样模块内部的相对导入（如 from ...api）就能正常工作
+    try:
+        module = importlib.import_module(relative_name, package=CUR_PACKAGE)
+    except ImportError as e:
+        raise ImportError(f"导入模块 {relative_name[1:]} 失败: {e}") from e
+    return getattr(module, attr_name, None)
 
-        # 收集所有需要注册到此模块数据的ID（默认ID + 指向该模块的特例ID）
-        ids_to_register = {default_id}
-        for reg_id, mod_suffix in SPECIAL_ID_TO_MODULE.items():
-            if mod_suffix == default_id:
-                ids_to_register.add(reg_id)
 
-        for rid in ids_to_register:
-            register_method(rid, attr_value)
+def _register_attr(attr_name, register_cls, eager: bool = False):
+    """
+    按清单登记所有角色的 damage_*.py 模块，
+    模块在第一次 find_class 该角色时才导入并提取指定属性（如 damage_detail 或 rank）。
+    eager 为 True 时立即导入全部模块（离线脚本/预热使用）。
+    """
+    for rid, relative_name in get_damage_manifest().items():
+        register_cls.register_lazy(rid, partial(_load_attr, relative_name, attr_name))
+
+    if eager:
+        register_cls.warmup()
 
 
-def register_damage():
+def register_damage(eager: bool = False):
     """注册所有角色的伤害详情数据（damage_detail）"""
-    _register_attr("damage_detail", DamageDetailRegister.register_class)
+    _register_attr("damage_detail", DamageDetailRegister, eager)
 
 
-def register_rank():
+def register_rank(eager: bool = False):
     """注册所有角色的命座/排行数据（rank）"""
-    _register_attr("rank", DamageRankRegister.register_class)
+    _register_attr("rank", DamageRankRegister, eager)
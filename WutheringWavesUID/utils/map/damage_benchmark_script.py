@@ -0,0 +1,126 @@
+"""
+伤害计算的耗时
+
+对所有注册了伤害详情(damage_detail)的角色, 用极限面板(1.json)逐条计算每一行伤害,
+分别用 copy.deepcopy 与 DamageAttribute.fork() 复制基础属性:
+先检查两种方式的暴击/期望伤害、效果记录和属性输出完全一致且基础属性未被修改, 再输出复制与整体的耗时,
+以及 fork() 中复制 effect/ph_detail/teammate_char_ids 列表所占的耗时。
+
+    python WutheringWavesUID/utils/map/damage_benchmark_script.py [重复次数]
+"""
+
+import copy
+import logging
+from pathlib import Path
+import sys
+import time
+import timeit
+
+from msgspec import json as msgjson
+
+logging.disable(logging.CRITICAL + 1)  # 禁用所有级别（包括 CRITICAL）
+# 将项目根目录加入 sys.path
+root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(root))
+
+from WutheringWavesUID.utils.api.model import RoleDetailData
+from WutheringWavesUID.utils.calc import CalcLookups
+from WutheringWavesUID.utils.calc.batch import prepare_calc
+from WutheringWavesUID.utils.damage.abstract import DamageDetailRegister
+from WutheringWavesUID.utils.damage.register_char import register_char
+from WutheringWavesUID.utils.damage.register_echo import register_echo
+from WutheringWavesUID.utils.damage.register_weapon import register_weapon
+from WutheringWavesUID.utils.map.damage.register import register_damage, register_rank
+
+SCRIPT_PATH = Path(__file__).parents[0]
+LIMIT_ROLE = SCRIPT_PATH / "1.json"
+
+REPEAT = 3
+
+
+def load_cases():
+    """[(角色id, 角色面板, 基础 DamageAttribute, 伤害详情)], 以及没有极限面板的角色id"""
+    lookups = CalcLookups()
+    panels = {}
+    for raw in msgjson.decode(LIMIT_ROLE.read_bytes()):
+        role_detail = RoleDetailData(**raw)
+        panels[str(role_detail.role.roleId)] = role_detail
+
+    cases = []
+    missing = []
+    for char_id in sorted(DamageDetailRegister._id_cls_map, key=str):
+        damage_detail = DamageDetailRegister.find_class(char_id)
+        role_detail = panels.get(str(char_id))
+        if not damage_detail:
+            continue
+        if not role_detail:
+            missing.append(str(char_id))
+            continue
+        calc = prepare_calc(role_detail, lookups, need_attribute=True)
+        cases.append((str(char_id), role_detail, calc.damageAttribute, damage_detail))
+    return cases, missing
+
+
+def run_pass(cases, clone) -> tuple[dict, float, float]:
+    """计算一遍所有伤害行, 返回 (结果, 复制耗时, 总耗时)"""
+    result = {}
+    copy_time = total_time = 0.0
+    for char_id, role_detail, base, damage_detail in cases:
+        for index, detail in enumerate(damage_detail):
+            t0 = time.perf_counter()
+            attr = clone(base)
+            t1 = time.perf_counter()
+            damage = detail["func"](attr, role_detail)
+            t2 = time.perf_counter()
+            copy_time += t1 - t0
+            total_time += t2 - t0
+            result[(char_id, index)] = (damage, [str(effect) for effect in attr.effect], str(attr))
+        # 基础属性不能被单条伤害计算修改
+        result[(char_id, "base")] = str(base)
+    return result, copy_time, total_time
+
+
+def main(repeat: int):
+    register_weapon()
+    register_echo()
+    register_damage(eager=True)
+    register_rank(eager=True)
+    register_char()
+
+    cases, missing = load_cases()
+    lines = sum(len(damage_detail) for *_, damage_detail in cases)
+    print(f"角色 {len(cases)} 个, 伤害 {lines} 行, 重复 {repeat} 次")
+    if missing:
+        print(f"没有极限面板, 未计算: {', '.join(missing)}")
+
+    clones = {"deepcopy": copy.deepcopy, "fork": lambda attr: attr.fork()}
+    results = {}
+    for name, clone in clones.items():
+        copy_time = total_time = 0.0
+        for _ in range(repeat):
+            results[name], _copy, _total = run_pass(cases, clone)
+            copy_time += _copy
+            total_time += _total
+        print(f"{name}: 复制 {copy_time / repeat * 1000:.1f}ms, 总计 {total_time / repeat * 1000:.1f}ms (每遍)")
+
+    mismatch = [key for key in results["deepcopy"] if results["deepcopy"][key] != results["fork"].get(key)]
+    if mismatch:
+        print(f"结果不一致 {len(mismatch)} 项: {mismatch[:10]}")
+        sys.exit(1)
+    print("结果一致")
+
+    # fork() 中复制列表的耗时
+    number = 1000
+    fork_time = list_time = 0.0
+    for *_, base, _ in cases:
+        fork_time += timeit.timeit(base.fork, number=number)
+        list_time += timeit.timeit(
+            lambda base=base: (base.effect.copy(), base.ph_detail.copy(), base.teammate_char_ids.copy()),
+            number=number,
+        )
+    count = len(cases) * number
+    print(f"fork: 每次 {fork_time / count * 1e6:.2f}us, 其中复制列表 {list_time / count * 1e6:.2f}us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else REPEAT)
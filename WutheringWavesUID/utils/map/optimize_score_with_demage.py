@@ -14,7 +14,8 @@ sys.path.insert(0, str(root))
 
 from WutheringWavesUID.utils.api.model import RoleDetailData
 from WutheringWavesUID.utils.ascension.weapon import get_weapon_model
-from WutheringWavesUID.utils.calc import WuWaCalc
+from WutheringWavesUID.utils.calc import CalcLookups
+from WutheringWavesUID.utils.calc.batch import prepare_calc
 from WutheringWavesUID.utils.damage.abstract import DamageRankRegister
 from WutheringWavesUID.utils.damage.register_char import register_char
 from WutheringWavesUID.utils.damage.register_echo import register_echo
@@ -40,6 +41,8 @@ template_data = json.loads(TEMPLATE_DATA_PATH.read_text(encoding="utf-8"))
 id2Name = json.loads(ID_NAME_PATH.read_text(encoding="utf-8"))
 limit_role = json.loads(LIMIT_ROLE.read_text(encoding="utf-8"))
 limit_role_id_list = {i["role"]["roleId"]: i for i in limit_role}
+# 所有测试面板共用角色/武器/套装的查询结果
+calc_lookups = CalcLookups()
 
 # ----- 声骸副词条离散值（仅用于取值） -----
 phantom_sub_value = [
@@ -116,12 +119,7 @@ def get_calc_map(ctx: dict, char_name: str, char_id: int | str):
         char_path = MAP_PATH / "default"
 
     def check_conditions(file_name):
-        condition_path = char_path / file_name
-        if condition_path.exists():
-            with open(condition_path, encoding="utf-8") as f:
-                expressions = msgjson.decode(f.read())
-            return find_first_matching_expression(ctx, expressions)
-        return None
+        return find_first_matching_expression(ctx, char_path / file_name)
 
     calc_json_path = check_conditions("condition-user.json") or check_conditions("condition.json") or "calc.json"
     with open(char_path / calc_json_path, encoding="utf-8") as f:
@@ -244,16 +242,7 @@ def update_calc_json_weights(char_name, char_id, calc_file, weapon_id):
     # 辅助函数：计算伤害
     def calc_damage(role_dict, need_crit=False):
         role_obj = RoleDetailData(**role_dict)
-        calc = WuWaCalc(role_obj)
-        calc.phantom_pre = calc.prepare_phantom()
-        calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
-        calc.calc_temp = get_calc_map(
-            calc.phantom_card,
-            role_obj.role.roleName,
-            role_obj.role.roleId,
-        )
-        calc.role_card = calc.enhance_summation_card_value(calc.phantom_card)
-        attr = calc.card_sort_map_to_attribute(calc.role_card)
+        attr = prepare_calc(role_obj, calc_lookups, need_attribute=True).damageAttribute
         crit_damage, expected_damage = rankDetail["func"](attr, role_obj)
         print(
             f"  角色面板 暴击：{attr.crit_rate} 爆伤：{attr.crit_dmg} 攻击：{attr.effect_attack} 防御：{attr.effect_def} 生命：{attr.effect_life} 加成：{attr.dmg_bonus} 共效：{attr.energy_regen}"
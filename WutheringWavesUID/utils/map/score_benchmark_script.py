@@ -0,0 +1,210 @@
+"""
+声骸评分的耗时
+
+对 character 目录下的每个评分模板(calc*.json), 用极限面板(1.json)的声骸和随机生成的声骸,
+对比原来的逐条 if/elif 累加与现在编译为权重向量的 calc_phantom_scores:
+先检查两者的评分和等级完全一致, 再分别计时 单个角色(5个声骸) 与 大批量(200个声骸) 两种场景。
+
+原实现每次调用都会重新构建 CharacterModel, 这里两边都使用缓存的角色属性, 只比较评分本身的耗时。
+
+    python WutheringWavesUID/utils/map/score_benchmark_script.py [重复次数] [随机种子]
+"""
+
+import logging
+import math
+from pathlib import Path
+import random
+import sys
+import time
+
+from msgspec import json as msgjson
+
+logging.disable(logging.CRITICAL + 1)  # 禁用所有级别（包括 CRITICAL）
+# 将项目根目录加入 sys.path
+root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(root))
+
+from WutheringWavesUID.utils.api.model import Props, RoleDetailData
+from WutheringWavesUID.utils.calculate import (
+    calc_phantom_scores,
+    fix_max_score,
+    get_char_attribute_name,
+    get_max_score,
+    score_interval,
+)
+from WutheringWavesUID.utils.map.calc_score_script import phantom_sub_value_map
+from WutheringWavesUID.utils.resource.constant import ATTRIBUTE_NAME_SET, ID_FULL_CHAR_NAME
+
+SCRIPT_PATH = Path(__file__).parents[0]
+MAP_PATH = SCRIPT_PATH / "character"
+LIMIT_ROLE = SCRIPT_PATH / "1.json"
+
+REPEAT = 200
+SEED = 20240523
+BATCH_SIZE = 200
+
+
+# ----- 原实现, 作为对照 -----
+def old_calc_phantom_entry(index, prop, cost: int, calc_map, char_attr: str):
+    skill_weight = calc_map.get("skill_weight", [])
+    if not skill_weight:
+        skill_weight = [0, 0, 0, 0]
+    score = 0
+    main_props = calc_map["main_props"]
+    sub_pros = calc_map["sub_props"]
+    if index < 2:
+        # 主属性
+        pros_temp = main_props.get(str(cost))
+    else:
+        pros_temp = sub_pros
+
+    value = prop.attributeValue
+    if "%" in prop.attributeValue:
+        value = float(value.replace("%", ""))
+    else:
+        value = float(value)
+    if prop.attributeName == "攻击":
+        if "%" in prop.attributeValue:
+            score += pros_temp.get("攻击%", 0) * value
+        else:
+            score += pros_temp.get("攻击", 0) * value
+    elif prop.attributeName == "生命":
+        if "%" in prop.attributeValue:
+            score += pros_temp.get("生命%", 0) * value
+        else:
+            score += pros_temp.get("生命", 0) * value
+    elif prop.attributeName == "防御":
+        if "%" in prop.attributeValue:
+            score += pros_temp.get("防御%", 0) * value
+        else:
+            score += pros_temp.get("防御", 0) * value
+    elif prop.attributeName == "普攻伤害加成":
+        score += pros_temp.get("技能伤害加成", 0) * skill_weight[0] * value
+    elif prop.attributeName == "重击伤害加成":
+        score += pros_temp.get("技能伤害加成", 0) * skill_weight[1] * value
+    elif prop.attributeName == "共鸣技能伤害加成":
+        score += pros_temp.get("技能伤害加成", 0) * skill_weight[2] * value
+    elif prop.attributeName == "共鸣解放伤害加成":
+        score += pros_temp.get("技能伤害加成", 0) * skill_weight[3] * value
+    elif prop.attributeName[0:2] in ATTRIBUTE_NAME_SET and (char_attr == prop.attributeName[0:2] or char_attr == ""):
+        score += pros_temp.get("属性伤害加成", 0) * value
+    else:
+        score += pros_temp.get(prop.attributeName, 0) * value
+
+    max_score, props_grade = get_max_score(cost, calc_map)
+    percent_score = score / max_score
+    final_score = math.floor(percent_score * fix_max_score * 100) / 100
+    return score, final_score
+
+
+def old_calc_phantom_score(char_attr: str, prop_list: list[Props], cost: int, calc_map: dict) -> tuple[float, str]:
+    score = 0
+    for index, prop in enumerate(prop_list):
+        _score, _ = old_calc_phantom_entry(index, prop, cost, calc_map, char_attr)
+        score += _score
+
+    max_score, props_grade = get_max_score(cost, calc_map)
+    percent_score = score / max_score
+
+    _temp = 0
+    for index, _temp_per in enumerate(props_grade):
+        if percent_score >= _temp_per:
+            _temp = index
+
+    final_score = math.floor(percent_score * fix_max_score * 100) / 100
+    return final_score, score_interval[_temp]
+
+
+def old_calc_phantom_scores(char_attr: str, phantoms: list[tuple[list[Props], int]], calc_map: dict):
+    return [old_calc_phantom_score(char_attr, props, cost, calc_map) for props, cost in phantoms]
+
+
+# ----- 声骸 -----
+def load_panel_phantoms() -> list[tuple[str, list[tuple[list[Props], int]]]]:
+    """每个极限面板的 (角色id, 声骸 [(词条列表, cost)])"""
+    result = []
+    for raw in msgjson.decode(LIMIT_ROLE.read_bytes()):
+        role_detail = RoleDetailData(**raw)
+        if not role_detail.phantomData or not role_detail.phantomData.equipPhantomList:
+            continue
+        phantoms = [
+            (_phantom.get_props(), _phantom.cost)
+            for _phantom in role_detail.phantomData.equipPhantomList
+            if _phantom and _phantom.phantomProp
+        ]
+        result.append((str(role_detail.role.roleId), phantoms))
+    return result
+
+
+def random_phantoms(rng: random.Random, panels: list[tuple[str, list[tuple[list[Props], int]]]], size: int):
+    """主词条取自极限面板, 副词条随机"""
+    mains = [(props[:2], cost) for _, phantoms in panels for props, cost in phantoms]
+    result = []
+    for _ in range(size):
+        main_props, cost = rng.choice(mains)
+        sub_props = [
+            Props(attributeName=name.replace("%", ""), attributeValue=rng.choice(phantom_sub_value_map[name]))
+            for name in rng.sample(sorted(phantom_sub_value_map), 5)
+        ]
+        result.append((main_props + sub_props, cost))
+    return result
+
+
+def load_templates() -> list[tuple[str, str, dict]]:
+    """(模板名, 角色id, 模板), 没有对应角色的目录(default 等)角色id为空"""
+    name_to_id = {name: char_id for char_id, name in ID_FULL_CHAR_NAME.items()}
+    result = []
+    for path in sorted(MAP_PATH.glob("*/calc*.json")):
+        char_id = name_to_id.get(path.parent.name, "")
+        result.append((f"{path.parent.name}/{path.name}", char_id, msgjson.decode(path.read_bytes())))
+    return result
+
+
+def bench(func, repeat: int) -> float:
+    """单次调用的平均耗时(us)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(repeat: int, seed: int):
+    rng = random.Random(seed)
+    panels = load_panel_phantoms()
+    templates = load_templates()
+    batch = random_phantoms(rng, panels, BATCH_SIZE)
+    checks = [phantoms for _, phantoms in panels] + [batch]
+
+    # 结果一致
+    for name, char_id, calc_map in templates:
+        char_attr = get_char_attribute_name(char_id)
+        for phantoms in checks:
+            expected = old_calc_phantom_scores(char_attr, phantoms, calc_map)
+            actual = calc_phantom_scores(char_id, phantoms, calc_map)
+            assert expected == actual, (name, expected, actual)
+    print(f"评分模板 {len(templates)} 个, 极限面板 {len(panels)} 个, 随机声骸 {BATCH_SIZE} 个, 结果一致")
+
+    # 单个角色: 每个极限面板用自己的模板, 模板与极限面板按角色对应
+    templates_by_id = {char_id: calc_map for _, char_id, calc_map in templates if char_id}
+    roles = []
+    for char_id, phantoms in panels:
+        calc_map = templates_by_id.get(char_id) or templates[0][2]
+        roles.append((char_id, get_char_attribute_name(char_id), phantoms, calc_map))
+
+    old_us = bench(lambda: [old_calc_phantom_scores(attr, ph, cm) for _, attr, ph, cm in roles], repeat) / len(roles)
+    new_us = bench(lambda: [calc_phantom_scores(cid, ph, cm) for cid, _, ph, cm in roles], repeat) / len(roles)
+    print(f"单个角色(5个声骸): 原实现 {old_us:.1f}us, 现实现 {new_us:.1f}us")
+
+    # 大批量: 同一个模板
+    _, char_id, calc_map = templates[0]
+    char_attr = get_char_attribute_name(char_id)
+    old_us = bench(lambda: old_calc_phantom_scores(char_attr, batch, calc_map), repeat)
+    new_us = bench(lambda: calc_phantom_scores(char_id, batch, calc_map), repeat)
+    print(f"大批量({BATCH_SIZE}个声骸, 单个模板): 原实现 {old_us:.1f}us, 现实现 {new_us:.1f}us")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else REPEAT,
+        int(sys.argv[2]) if len(sys.argv) > 2 else SEED,
+    )
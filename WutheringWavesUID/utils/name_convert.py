@@ -1,10 +1,12 @@
 import json
 from pathlib import Path
+import time
 
 from gsuid_core.logger import logger
 from gsuid_core.sv import get_plugin_force_prefixs, get_plugin_prefixs
 from msgspec import json as msgjson
 
+from ..utils.ascension.bundle import load_bundled_file
 from ..utils.resource.RESOURCE_PATH import (
     CUSTOM_CHAR_ALIAS_PATH,
     CUSTOM_ECHO_ALIAS_PATH,
@@ -26,6 +28,47 @@ echo_alias_data: dict[str, list[str]] = {}
 
 CHAR_NAME_PATTERN = r"[\w\u4e00-\u9fa5·]+"
 
+# 自定义别名文件的检查间隔(秒), 文件变化时重新加载
+ALIAS_CHECK_INTERVAL = 10
+
+
+class AliasIndex:
+    """
+    别名索引, 结果与按 alias_data 顺序逐个匹配完全一致
+    - exact: 别名 -> 第一个包含该别名的名称序号
+    - substring: 名称(以及 with_alias 时的别名)的所有子串 -> 第一个包含该子串的名称序号
+    """
+
+    def __init__(self, alias_data: dict[str, list[str]], with_alias: bool = False):
+        self.names = list(alias_data.keys())
+        self.exact: dict[str, int] = {}
+        self.substring: dict[str, int] = {}
+        for order, (name, aliases) in enumerate(alias_data.items()):
+            for alias in aliases:
+                self.exact.setdefault(alias, order)
+            texts = [name, *(alias for alias in aliases if alias)] if with_alias else [name]
+            for text in texts:
+                for start in range(len(text) + 1):
+                    for end in range(start, len(text) + 1):
+                        self.substring.setdefault(text[start:end], order)
+
+    def find(self, text: str, exact: bool = True, substring: bool = True) -> str | None:
+        """返回第一个 text 为其子串或别名的名称"""
+        orders = []
+        if exact and (order := self.exact.get(text)) is not None:
+            orders.append(order)
+        if substring and (order := self.substring.get(text)) is not None:
+            orders.append(order)
+        return self.names[min(orders)] if orders else None
+
+
+char_alias_index = AliasIndex({})
+weapon_alias_index = AliasIndex({})
+sonata_alias_index = AliasIndex({})
+echo_alias_index = AliasIndex({}, with_alias=True)
+_custom_alias_mtime: dict[Path, float | None] = {}
+_custom_alias_checked = 0.0
+
 
 def get_event_command_text(ev) -> str:
     PREFIX_LIST = get_plugin_prefixs("WutheringWavesUID") + get_plugin_force_prefixs("WutheringWavesUID")
@@ -110,37 +153,73 @@ def load_alias_data():
     with open(CUSTOM_ECHO_ALIAS_PATH, "w", encoding="UTF-8") as f:
         f.write(json.dumps(echo_alias_data, indent=2, ensure_ascii=False))
 
+    build_alias_index()
+
+
+def _get_mtime(path: Path) -> float | None:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def build_alias_index():
+    global char_alias_index, weapon_alias_index, sonata_alias_index, echo_alias_index, _custom_alias_checked
+    char_alias_index = AliasIndex(char_alias_data)
+    weapon_alias_index = AliasIndex(weapon_alias_data)
+    sonata_alias_index = AliasIndex(sonata_alias_data)
+    echo_alias_index = AliasIndex(echo_alias_data, with_alias=True)
+
+    for path in (CUSTOM_CHAR_ALIAS_PATH, CUSTOM_SONATA_ALIAS_PATH, CUSTOM_WEAPON_ALIAS_PATH, CUSTOM_ECHO_ALIAS_PATH):
+        _custom_alias_mtime[path] = _get_mtime(path)
+    _custom_alias_checked = time.monotonic()
+
+
+def check_alias_update():
+    """自定义别名文件被修改后重新加载"""
+    global _custom_alias_checked
+    now = time.monotonic()
+    if now - _custom_alias_checked < ALIAS_CHECK_INTERVAL:
+        return
+    _custom_alias_checked = now
+    if any(_get_mtime(path) != mtime for path, mtime in _custom_alias_mtime.items()):
+        logger.info("[鸣潮] 自定义别名文件已修改, 重新加载别名")
+        load_alias_data()
+
 
 load_alias_data()
 
-with open(MAP_PATH / "CharId2Data.json", encoding="UTF-8") as f:
-    char_id_data = msgjson.decode(f.read(), type=dict[str, dict[str, str]])
+char_id_data = load_bundled_file("CharId2Data", type=dict[str, dict[str, str]])
 
-with open(MAP_PATH / "id2name.json", encoding="UTF-8") as f:
-    id2name = msgjson.decode(f.read(), type=dict[str, str])
+id2name = load_bundled_file("id2name", type=dict[str, str])
+
+# 名称 -> 第一个对应的 id
+name2id: dict[str, str] = {}
+for _id, _name in id2name.items():
+    name2id.setdefault(_name, _id)
+# int(id) -> 名称
+int_id2name: dict[int, str] = {}
+for _id, _name in id2name.items():
+    int_id2name.setdefault(int(_id), _name)
 
 
 def alias_to_char_name(char_name: str) -> str:
-    for i in char_alias_data:
-        if (char_name in i) or (char_name in char_alias_data[i]):
-            return i
-    return char_name
+    check_alias_update()
+    name = char_alias_index.find(char_name)
+    return char_name if name is None else name
 
 
 def alias_to_char_name_optional(char_name: str | None) -> str | None:
     if not char_name:
         return None
-    for i in char_alias_data:
-        if (char_name in i) or (char_name in char_alias_data[i]):
-            return i
-    return None
+    check_alias_update()
+    return char_alias_index.find(char_name)
 
 
 def alias_to_char_name_list(char_name: str) -> list[str]:
-    for i in char_alias_data:
-        if (char_name in i) or (char_name in char_alias_data[i]):
-            return char_alias_data[i]
-    return []
+    check_alias_update()
+    name = char_alias_index.find(char_name)
+    return char_alias_data[name] if name is not None else []
 
 
 def char_id_to_char_name(char_id: str) -> str | None:
@@ -152,80 +231,52 @@ def char_id_to_char_name(char_id: str) -> str | None:
 
 
 def char_name_to_char_id(char_name: str) -> str | None:
-    char_name = alias_to_char_name(char_name)
-    for id, name in id2name.items():
-        if char_name == name:
-            return id
-    else:
-        return None
+    return name2id.get(alias_to_char_name(char_name))
 
 
 def alias_to_weapon_name(weapon_name: str) -> str:
-    for i in weapon_alias_data:
-        if (weapon_name in i) or (weapon_name in weapon_alias_data[i]):
-            return i
+    check_alias_update()
+    if (name := weapon_alias_index.find(weapon_name)) is not None:
+        return name
 
     if "专武" in weapon_name:
         char_name = weapon_name.replace("专武", "")
         name = alias_to_char_name(char_name)
         weapon_name = f"{name}专武"
 
-    for i in weapon_alias_data:
-        if (weapon_name in i) or (weapon_name in weapon_alias_data[i]):
-            return i
-
-    return weapon_name
+    name = weapon_alias_index.find(weapon_name)
+    return weapon_name if name is None else name
 
 
 def weapon_name_to_weapon_id(weapon_name: str) -> str | None:
-    weapon_name = alias_to_weapon_name(weapon_name)
-    for id, name in id2name.items():
-        if weapon_name == name:
-            return id
-    else:
-        return None
+    return name2id.get(alias_to_weapon_name(weapon_name))
 
 
 def alias_to_sonata_name(sonata_name: str | None) -> str | None:
     if sonata_name is None:
         return None
-    for i in sonata_alias_data:
-        if (sonata_name in i) or (sonata_name in sonata_alias_data[i]):
-            return i
-    return None
+    check_alias_update()
+    return sonata_alias_index.find(sonata_name)
 
 
 def phantom_id_to_phantom_name(phantom_id: str) -> str | None:
-    for id, name in id2name.items():
-        if int(phantom_id) == int(id):
-            return name
-    else:
+    if not int_id2name:
         return None
+    return int_id2name.get(int(phantom_id))
 
 
 def alias_to_echo_name(echo_name: str) -> str:
+    check_alias_update()
     if echo_name in echo_alias_data:
         return echo_name
-    for i, j in echo_alias_data.items():
-        if echo_name in j:
-            return i
-
-    for i, j in echo_alias_data.items():
-        if echo_name in i:
-            return i
-        for k in j:
-            if k and echo_name in k:
-                return i
-    return echo_name
+    if (name := echo_alias_index.find(echo_name, substring=False)) is not None:
+        return name
+    name = echo_alias_index.find(echo_name, exact=False)
+    return echo_name if name is None else name
 
 
 def echo_name_to_echo_id(echo_name: str) -> str | None:
-    echo_name = alias_to_echo_name(echo_name)
-    for id, name in id2name.items():
-        if echo_name == name:
-            return id
-    else:
-        return None
+    return name2id.get(alias_to_echo_name(echo_name))
 
 
 def easy_id_to_name(id: str, default: str = "") -> str:
@@ -1,7 +1,6 @@
 from typing import Any
 
 from gsuid_core.logger import logger
-import httpx
 
 from ..api.wwapi import (
     UPLOAD_ABYSS_RECORD_URL,
@@ -11,6 +10,7 @@ from ..api.wwapi import (
     UPLOAD_SLASH_RECORD_URL,
     UPLOAD_URL,
 )
+from ..cache import TimedCache
 from ..database.models import WavesUserAvatar
 from .const import (
     QUEUE_ABYSS_RECORD,
@@ -20,7 +20,10 @@ from .const import (
     QUEUE_SCORE_RANK,
     QUEUE_SLASH_RECORD,
 )
-from .queues import event_handler, start_dispatcher
+from .queues import call_in_dispatcher, event_handler, start_dispatcher
+from .upload import UploadPipeline, get_waves_token
+
+avatar_cache = TimedCache(timeout=600, maxsize=1000)
 
 
 async def concatenate_user_id_for_avatar(item: dict) -> dict:
@@ -28,7 +31,10 @@ async def concatenate_user_id_for_avatar(item: dict) -> dict:
     if "user_id" in item:
         qid = item["user_id"]
         logger.debug(f"[鸣潮][总排行上传] 用户id: {qid}")
-        data = await WavesUserAvatar.select_data(qid)
+        data = avatar_cache.get(qid)
+        if data is None:
+            data = await WavesUserAvatar.select_data(qid)
+            avatar_cache.set(qid, data or False)
         if data:
             logger.debug(f"[鸣潮][总排行上传] 用户别名hash: {data}")
             if data.bot_id in ["qqgroup", "qq_official"]:
@@ -43,197 +49,121 @@ async def concatenate_user_id_for_avatar(item: dict) -> dict:
     return item
 
 
-@event_handler(QUEUE_SCORE_RANK)
-async def send_score_rank(item: Any):
-    if not item:
-        return
-    if not isinstance(item, dict):
-        return
-    from ...wutheringwaves_config import WutheringWavesConfig
+def score_rank_key(item: dict) -> Any:
+    # 单角色刷新与全量刷新互不覆盖
+    char_ids = tuple(c.get("char_id") for c in item.get("char_info", [])) if item.get("single_refresh") else ()
+    return item.get("waves_id"), item.get("single_refresh"), char_ids
 
-    WavesToken = WutheringWavesConfig.get_config("WavesToken").data
 
-    if not WavesToken:
-        return
+def abyss_record_key(item: dict) -> Any:
+    # AbyssItem
+    return item.get("waves_id"), item.get("version")
 
-    item = await concatenate_user_id_for_avatar(item)
-    logger.debug(f"[鸣潮][总排行上传] item: {item}")
 
-    async with httpx.AsyncClient() as client:
-        res = None
-        try:
-            res = await client.post(
-                UPLOAD_URL,
-                json=item,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            logger.info(f"上传面板结果: {res.status_code} - {res.text}")
-        except Exception as e:
-            logger.exception(f"上传面板失败: {res.text if res else ''} {e}")
+def slash_record_key(item: dict) -> Any:
+    # SlashDetailRequest 使用驼峰字段
+    return item.get("wavesId"), item.get("challengeId")
 
 
-@event_handler(QUEUE_ABYSS_RECORD)
-async def send_abyss_record(item: Any):
-    if not item:
-        return
-    if not isinstance(item, dict):
-        return
-    from ...wutheringwaves_config import WutheringWavesConfig
+def gacha_record_key(item: dict) -> Any:
+    return item.get("waves_id")
 
-    WavesToken = WutheringWavesConfig.get_config("WavesToken").data
 
-    if not WavesToken:
-        return
+def role_detail_key(item: dict) -> Any:
+    return item.get("waves_id")
 
-    item = await concatenate_user_id_for_avatar(item)
-
-    async with httpx.AsyncClient() as client:
-        res = None
-        try:
-            res = await client.post(
-                UPLOAD_ABYSS_RECORD_URL,
-                json=item,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            logger.info(f"上传深渊结果: {res.status_code} - {res.text}")
-        except Exception as e:
-            logger.exception(f"上传深渊失败: {res.text if res else ''} {e}")
 
+def matrix_record_key(item: dict) -> Any:
+    return item.get("wavesId")
 
-@event_handler(QUEUE_SLASH_RECORD)
-async def send_slash_record(item: Any):
-    if not item:
-        return
-    if not isinstance(item, dict):
-        return
-    from ...wutheringwaves_config import WutheringWavesConfig
-
-    WavesToken = WutheringWavesConfig.get_config("WavesToken").data
 
-    if not WavesToken:
-        return
+score_rank_uploader = UploadPipeline(
+    QUEUE_SCORE_RANK, UPLOAD_URL, "面板", key_func=score_rank_key, prepare=concatenate_user_id_for_avatar
+)
+abyss_record_uploader = UploadPipeline(
+    QUEUE_ABYSS_RECORD,
+    UPLOAD_ABYSS_RECORD_URL,
+    "深渊",
+    key_func=abyss_record_key,
+    prepare=concatenate_user_id_for_avatar,
+)
+slash_record_uploader = UploadPipeline(
+    QUEUE_SLASH_RECORD,
+    UPLOAD_SLASH_RECORD_URL,
+    "冥海",
+    key_func=slash_record_key,
+    prepare=concatenate_user_id_for_avatar,
+)
+gacha_record_uploader = UploadPipeline(
+    QUEUE_GACHA_RECORD,
+    UPLOAD_GACHA_RECORD_URL,
+    "抽卡记录",
+    key_func=gacha_record_key,
+    prepare=concatenate_user_id_for_avatar,
+)
+role_detail_uploader = UploadPipeline(
+    QUEUE_ROLE_DETAIL,
+    UPLOAD_ROLE_DETAIL_URL,
+    "角色细节",
+    key_func=role_detail_key,
+    prepare=concatenate_user_id_for_avatar,
+)
+matrix_record_uploader = UploadPipeline(QUEUE_MATRIX_RECORD, UPLOAD_MATRIX_RECORD_URL, "矩阵记录", key_func=matrix_record_key)
 
-    item = await concatenate_user_id_for_avatar(item)
-
-    async with httpx.AsyncClient() as client:
-        res = None
-        try:
-            res = await client.post(
-                UPLOAD_SLASH_RECORD_URL,
-                json=item,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            logger.info(f"上传冥海结果: {res.status_code} - {res.text}")
-        except Exception as e:
-            logger.exception(f"上传冥海失败: {res.text if res else ''} {e}")
+UPLOADERS = [
+    score_rank_uploader,
+    abyss_record_uploader,
+    slash_record_uploader,
+    gacha_record_uploader,
+    role_detail_uploader,
+    matrix_record_uploader,
+]
 
 
-@event_handler(QUEUE_GACHA_RECORD)
-async def send_gacha_record(item: Any):
+async def submit_upload(uploader: UploadPipeline, item: Any):
     if not item:
         return
     if not isinstance(item, dict):
         return
-    from ...wutheringwaves_config import WutheringWavesConfig
-
-    WavesToken = WutheringWavesConfig.get_config("WavesToken").data
-
-    if not WavesToken:
+    if not get_waves_token():
         return
+    await uploader.submit(item)
 
-    item = await concatenate_user_id_for_avatar(item)
-
-    async with httpx.AsyncClient() as client:
-        res = None
-        try:
-            res = await client.post(
-                UPLOAD_GACHA_RECORD_URL,
-                json=item,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            logger.info(f"上传抽卡记录结果: {res.status_code} - {res.text}")
-        except Exception as e:
-            logger.exception(f"上传抽卡记录失败: {res.text if res else ''} {e}")
 
+@event_handler(QUEUE_SCORE_RANK)
+async def send_score_rank(item: Any):
+    logger.debug(f"[鸣潮][总排行上传] item: {item}")
+    await submit_upload(score_rank_uploader, item)
 
-@event_handler(QUEUE_ROLE_DETAIL)
-async def send_role_detail(item: Any):
-    if not item:
-        return
-    if not isinstance(item, dict):
-        return
-    from ...wutheringwaves_config import WutheringWavesConfig
 
-    WavesToken = WutheringWavesConfig.get_config("WavesToken").data
+@event_handler(QUEUE_ABYSS_RECORD)
+async def send_abyss_record(item: Any):
+    await submit_upload(abyss_record_uploader, item)
+
 
-    if not WavesToken:
-        return
+@event_handler(QUEUE_SLASH_RECORD)
+async def send_slash_record(item: Any):
+    await submit_upload(slash_record_uploader, item)
 
-    item = await concatenate_user_id_for_avatar(item)
-
-    async with httpx.AsyncClient() as client:
-        res = None
-        try:
-            res = await client.post(
-                UPLOAD_ROLE_DETAIL_URL,
-                json=item,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            logger.info(f"上传角色细节结果: {res.status_code} - {res.text}")
-        except Exception as e:
-            logger.exception(f"上传角色细节失败: {res.text if res else ''} {e}")
 
+@event_handler(QUEUE_GACHA_RECORD)
+async def send_gacha_record(item: Any):
+    await submit_upload(gacha_record_uploader, item)
 
-@event_handler(QUEUE_MATRIX_RECORD)
-async def send_matrix_record(item: Any):
-    if not item:
-        return
-    if not isinstance(item, dict):
-        return
-    from ...wutheringwaves_config import WutheringWavesConfig
 
-    WavesToken = WutheringWavesConfig.get_config("WavesToken").data
+@event_handler(QUEUE_ROLE_DETAIL)
+async def send_role_detail(item: Any):
+    await submit_upload(role_detail_uploader, item)
 
-    if not WavesToken:
-        return
 
-    async with httpx.AsyncClient() as client:
-        res = None
-        try:
-            res = await client.post(
-                UPLOAD_MATRIX_RECORD_URL,
-                json=item,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            logger.info(f"上传矩阵记录结果: {res.status_code} - {res.text}")
-        except Exception as e:
-            logger.exception(f"上传矩阵记录失败: {res.text if res else ''} {e}")
+@event_handler(QUEUE_MATRIX_RECORD)
+async def send_matrix_record(item: Any):
+    await submit_upload(matrix_record_uploader, item)
 
 
 def init_queues():
     # 启动任务分发器
     start_dispatcher(daemon=True)
+    # 启动上传管道, 恢复上次未完成的上传
+    for uploader in UPLOADERS:
+        call_in_dispatcher(uploader.start)
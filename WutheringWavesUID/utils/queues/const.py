@@ -4,3 +4,17 @@ QUEUE_SLASH_RECORD = "waves_slash_record"
 QUEUE_GACHA_RECORD = "waves_gacha_record"
 QUEUE_ROLE_DETAIL = "waves_role_detail"
 QUEUE_MATRIX_RECORD = "waves_matrix_record"
+
+# 任务分发器
+DISPATCHER_QUEUE_MAXSIZE = 1000  # 每种任务的队列上限
+DISPATCHER_WORKERS = 2  # 每种任务的 worker 数量
+DISPATCHER_OVERFLOW = "drop_oldest"  # 队列满时: drop_new 丢弃新任务 / drop_oldest 丢弃最早的任务
+
+# 上传管道
+UPLOAD_BATCH_SIZE = 20  # 单批最多处理数量
+UPLOAD_LINGER = 1.0  # 凑批等待时间(秒)
+UPLOAD_CONCURRENCY = 4  # 单个队列同时上传数量
+UPLOAD_QUEUE_MAXSIZE = 1000  # 队列上限, 满时提交方等待
+UPLOAD_MAX_RETRIES = 3  # 失败重试次数
+UPLOAD_RETRY_BASE = 2.0  # 重试间隔基数(秒), 指数退避
+UPLOAD_RETRY_INTERVAL = 600  # 重新上传重试耗尽的暂存数据的间隔(秒)
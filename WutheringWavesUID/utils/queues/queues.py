@@ -1,16 +1,61 @@
 import asyncio
 from collections.abc import Callable, Coroutine
 import threading
-from typing import Any
+import time
+from typing import Any, Literal
 
 from gsuid_core.logger import logger
 
+from .const import DISPATCHER_OVERFLOW, DISPATCHER_QUEUE_MAXSIZE, DISPATCHER_WORKERS
 
-class TaskDispatcher:
+OverflowPolicy = Literal["drop_new", "drop_oldest"]
+
+
+class QueueStats:
     def __init__(self):
-        self.queue = asyncio.Queue()
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, latency: float, success: bool):
+        self.processed += 1
+        if not success:
+            self.failed += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    @property
+    def avg_latency(self) -> float:
+        return self.total_latency / self.processed if self.processed else 0.0
+
+
+class TaskDispatcher:
+    """
+    任务分发器
+    - 每种任务一个有界队列, 由固定数量的 worker 处理
+    - 在宿主事件循环中启动时直接使用该循环, 否则自己创建并持有一个事件循环线程
+    - 队列满时按 overflow 策略丢弃最新或最旧的任务
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DISPATCHER_QUEUE_MAXSIZE,
+        workers: int = DISPATCHER_WORKERS,
+        overflow: OverflowPolicy = DISPATCHER_OVERFLOW,
+    ):
+        self.maxsize = maxsize
+        self.workers = workers
+        self.overflow: OverflowPolicy = overflow
         self.running = False
         self.handlers: dict[str, list[Callable]] = {}
+        self.queues: dict[str, asyncio.Queue] = {}
+        self.stats: dict[str, QueueStats] = {}
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._own_loop = False
+        self._thread: threading.Thread | None = None
+        self._tasks: list[asyncio.Task] = []
 
     def register_handler(
         self,
@@ -20,61 +65,158 @@ class TaskDispatcher:
         # 初始化处理器列表
         if task_type not in self.handlers:
             self.handlers[task_type] = []
+            self.stats[task_type] = QueueStats()
 
         # 添加处理器到列表
         self.handlers[task_type].append(handler)
         logger.info(f"注册任务处理器: {task_type} -> {handler.__name__}")
 
+        # 启动后注册的任务类型也需要 worker
+        if self.running and self.loop:
+            self.loop.call_soon_threadsafe(self._start_workers, task_type)
+
     def emit(self, task_type: str, data: Any) -> None:
-        if not self.running:
+        if not self.running or not self.loop:
             logger.warning("任务分发器未启动或已关闭")
             return
         if task_type not in self.handlers:
             return
 
         try:
-            loop = asyncio.get_event_loop()
-            asyncio.run_coroutine_threadsafe(self.queue.put((task_type, data)), loop)
+            in_loop = asyncio.get_running_loop() is self.loop
         except RuntimeError:
-            # 如果没有事件循环，创建一个新的
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.queue.put((task_type, data)))
+            in_loop = False
 
-    async def _process(self) -> None:
-        while True:
-            try:
-                if not self.running:
-                    break
+        if in_loop:
+            self._put(task_type, data)
+        else:
+            self.loop.call_soon_threadsafe(self._put, task_type, data)
 
-                task_type, data = await asyncio.wait_for(self.queue.get(), timeout=3.0)
+    def _put(self, task_type: str, data: Any) -> None:
+        if not self.running:
+            return
+        queue = self.queues.get(task_type)
+        if queue is None:
+            self._start_workers(task_type)
+            queue = self.queues[task_type]
 
-                # 获取所有处理器并依次执行
-                handlers = self.handlers.get(task_type, [])
-                for handler in handlers:
-                    asyncio.create_task(self._run_task(handler, data, task_type))
+        if queue.full():
+            self.stats[task_type].dropped += 1
+            if self.overflow == "drop_new":
+                logger.warning(f"任务队列已满, 丢弃新任务: {task_type}")
+                return
+            queue.get_nowait()
+            queue.task_done()
+            logger.warning(f"任务队列已满, 丢弃最早的任务: {task_type}")
+        queue.put_nowait((time.perf_counter(), data))
 
-                self.queue.task_done()
+    def _start_workers(self, task_type: str) -> None:
+        if task_type in self.queues or not self.loop:
+            return
+        queue = asyncio.Queue(maxsize=self.maxsize)
+        self.queues[task_type] = queue
+        for _ in range(self.workers):
+            self._tasks.append(self.loop.create_task(self._worker(task_type, queue)))
 
-            except asyncio.TimeoutError:
-                continue
-            except Exception as e:
-                logger.exception(f"任务处理异常: {e}")
+    async def _worker(self, task_type: str, queue: asyncio.Queue) -> None:
+        stats = self.stats[task_type]
+        while self.running:
+            enqueue_time, data = await queue.get()
+            try:
+                success = True
+                for handler in self.handlers.get(task_type, []):
+                    success = await self._run_task(handler, data, task_type) and success
+                stats.record(time.perf_counter() - enqueue_time, success)
+            finally:
+                queue.task_done()
 
-    async def _run_task(self, handler: Callable, data: Any, task_type: str) -> None:
+    async def _run_task(self, handler: Callable, data: Any, task_type: str) -> bool:
         try:
             result = handler(data)
             if asyncio.iscoroutine(result):
                 await result
+            return True
         except Exception as e:
             logger.exception(f"任务执行错误 ({task_type}): {e}")
+            return False
+
+    def _start_all(self) -> None:
+        for task_type in list(self.handlers):
+            self._start_workers(task_type)
 
     def start(self, daemon: bool = True) -> None:
         if self.running:
             return
 
         self.running = True
-        threading.Thread(target=lambda: asyncio.run(self._process()), daemon=daemon).start()
+        try:
+            # 优先使用宿主事件循环
+            self.loop = asyncio.get_running_loop()
+            self._own_loop = False
+            self._start_all()
+        except RuntimeError:
+            # 没有运行中的事件循环时, 自己持有一个
+            self.loop = asyncio.new_event_loop()
+            self._own_loop = True
+            self._thread = threading.Thread(target=self.loop.run_forever, daemon=daemon, name="waves-dispatcher")
+            self._thread.start()
+            self.loop.call_soon_threadsafe(self._start_all)
+
+    def call_soon(self, func: Callable[[], Any]) -> None:
+        """在分发器的事件循环中执行 func"""
+        if not self.running or not self.loop:
+            logger.warning("任务分发器未启动或已关闭")
+            return
+        self.loop.call_soon_threadsafe(func)
+
+    async def _shutdown(self, loop: asyncio.AbstractEventLoop) -> None:
+        """取消所有 worker 并等待其结束; 自己持有的事件循环随后停止"""
+        tasks = self._tasks
+        self._tasks = []
+        self.queues.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._own_loop:
+            loop.stop()
+
+    def stop(self, timeout: float = 5) -> None:
+        """
+        停止分发器
+        使用宿主事件循环时只取消 worker;
+        自己持有事件循环时等待线程结束后关闭该循环, 在分发器线程内调用时无法等待, 只停止循环
+        """
+        if not self.running or not self.loop:
+            return
+        self.running = False
+        loop, thread = self.loop, self._thread
+        self.loop = None
+        self._thread = None
+
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(loop), loop)
+        if not self._own_loop or thread is None or thread is threading.current_thread():
+            return
+
+        thread.join(timeout)
+        if thread.is_alive():
+            future.cancel()
+            logger.warning("任务分发器线程未能按时结束, 事件循环未关闭")
+            return
+        loop.close()
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        result = {}
+        for task_type, stats in self.stats.items():
+            queue = self.queues.get(task_type)
+            result[task_type] = {
+                "depth": queue.qsize() if queue else 0,
+                "processed": stats.processed,
+                "failed": stats.failed,
+                "dropped": stats.dropped,
+                "avg_latency": stats.avg_latency,
+                "max_latency": stats.max_latency,
+            }
+        return result
 
 
 # 创建全局任务分发器实例
@@ -92,10 +234,18 @@ def start_dispatcher(daemon: bool = True) -> None:
     dispatcher.start(daemon=daemon)
 
 
+def call_in_dispatcher(func: Callable[[], Any]) -> None:
+    dispatcher.call_soon(func)
+
+
 def push_item(queue_name: str, item: Any) -> None:
     dispatcher.emit(queue_name, item)
 
 
+def get_dispatcher_stats() -> dict[str, dict[str, Any]]:
+    return dispatcher.get_stats()
+
+
 def event_handler(task_type: str) -> Callable:
     """
     事件处理器装饰器, 用于本地撰写排行等逻辑，不干扰主库代码；
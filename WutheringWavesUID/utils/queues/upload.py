@@ -0,0 +1,254 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+from pathlib import Path
+import time
+from typing import Any
+import uuid
+
+import aiofiles
+from gsuid_core.logger import logger
+import httpx
+
+from ..resource.RESOURCE_PATH import UPLOAD_SPOOL_PATH
+from .const import (
+    UPLOAD_BATCH_SIZE,
+    UPLOAD_CONCURRENCY,
+    UPLOAD_LINGER,
+    UPLOAD_MAX_RETRIES,
+    UPLOAD_QUEUE_MAXSIZE,
+    UPLOAD_RETRY_BASE,
+    UPLOAD_RETRY_INTERVAL,
+)
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_upload_client() -> httpx.AsyncClient:
+    """所有上传共用一个连接池"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10),
+            limits=httpx.Limits(max_connections=UPLOAD_CONCURRENCY * 4, max_keepalive_connections=UPLOAD_CONCURRENCY * 2),
+        )
+    return _client
+
+
+def get_waves_token() -> str:
+    from ...wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config("WavesToken").data
+
+
+class UploadPipeline:
+    """
+    上传管道
+    - 提交的数据先写入暂存目录, 上传成功后删除
+    - start() 时恢复暂存目录中遗留的数据, 之后每隔 retry_interval 重新上传重试耗尽的暂存数据
+    - 按 batch_size / linger 凑批, 同一批内 key_func 相同的数据只上传最新的一条
+    - 单个队列最多 concurrency 个请求同时进行, 队列满时提交方等待
+    - 网络错误/5xx/429 按指数退避重试
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        label: str,
+        key_func: Callable[[dict], Any],
+        prepare: Callable[[dict], Awaitable[dict]] | None = None,
+        batch_size: int = UPLOAD_BATCH_SIZE,
+        linger: float = UPLOAD_LINGER,
+        concurrency: int = UPLOAD_CONCURRENCY,
+        max_retries: int = UPLOAD_MAX_RETRIES,
+        retry_base: float = UPLOAD_RETRY_BASE,
+        retry_interval: float = UPLOAD_RETRY_INTERVAL,
+        maxsize: int = UPLOAD_QUEUE_MAXSIZE,
+    ):
+        self.name = name
+        self.url = url
+        self.label = label
+        self.key_func = key_func
+        self.prepare = prepare
+        self.batch_size = batch_size
+        self.linger = linger
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_interval = retry_interval
+        self.maxsize = maxsize
+        self.spool_dir = UPLOAD_SPOOL_PATH / name
+
+        self.queue: asyncio.Queue[tuple[Path | None, dict]] | None = None
+        self.worker: asyncio.Task | None = None
+        # 已经在队列中或正在上传的暂存文件, 重新上传时跳过
+        self._pending: set[Path] = set()
+        self.stats = {"uploaded": 0, "failed": 0, "deduped": 0, "retried": 0, "restored": 0}
+
+    def start(self):
+        """启动上传 worker 并恢复暂存数据, 需要在事件循环中调用"""
+        loop = asyncio.get_running_loop()
+        if self.worker and not self.worker.done() and self.worker.get_loop() is loop:
+            return
+        self.queue = asyncio.Queue(maxsize=self.maxsize)
+        self._pending.clear()
+        self.worker = loop.create_task(self._run())
+
+    def stop(self):
+        if self.worker:
+            self.worker.cancel()
+            self.worker = None
+
+    async def submit(self, item: dict):
+        self.start()
+        path = await self._spool(item)
+        await self.queue.put((path, item))  # type: ignore
+
+    async def _spool(self, item: dict) -> Path | None:
+        path = self.spool_dir / f"{time.time_ns()}_{uuid.uuid4().hex[:8]}.json"
+        # 写入前登记, 避免写到一半时被当作遗留数据重新上传
+        self._pending.add(path)
+        try:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(path, "w", encoding="utf-8") as f:
+                await f.write(json.dumps(item, ensure_ascii=False))
+            return path
+        except Exception as e:
+            logger.warning(f"[鸣潮][{self.label}上传] 暂存失败: {e}")
+            self._pending.discard(path)
+            path.unlink(missing_ok=True)
+            return None
+
+    def _unspool(self, path: Path | None):
+        if path:
+            self._pending.discard(path)
+            path.unlink(missing_ok=True)
+
+    async def _restore(self):
+        """重新上传暂存目录中不在队列里的数据(启动前遗留的、重试耗尽的)"""
+        if not self.spool_dir.exists():
+            return
+        batch = []
+        for path in sorted(self.spool_dir.glob("*.json")):
+            if path in self._pending:
+                continue
+            try:
+                async with aiofiles.open(path, encoding="utf-8") as f:
+                    batch.append((path, json.loads(await f.read())))
+                self._pending.add(path)
+            except Exception as e:
+                logger.warning(f"[鸣潮][{self.label}上传] 暂存数据损坏 {path}: {e}")
+                path.unlink(missing_ok=True)
+        if not batch:
+            return
+        logger.info(f"[鸣潮][{self.label}上传] 恢复 {len(batch)} 条未完成的上传")
+        self.stats["restored"] += len(batch)
+        for i in range(0, len(batch), self.batch_size):
+            await self._process_batch(batch[i : i + self.batch_size])
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        queue = self.queue
+        assert queue is not None
+        next_restore = loop.time()
+        while True:
+            if loop.time() >= next_restore:
+                try:
+                    await self._restore()
+                except Exception as e:
+                    logger.exception(f"[鸣潮][{self.label}上传] 恢复暂存数据异常: {e}")
+                next_restore = loop.time() + self.retry_interval
+            try:
+                batch = [await asyncio.wait_for(queue.get(), next_restore - loop.time())]
+            except asyncio.TimeoutError:
+                continue
+            deadline = loop.time() + self.linger
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._process_batch(batch)
+            except Exception as e:
+                logger.exception(f"[鸣潮][{self.label}上传] 批处理异常: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _process_batch(self, batch: list[tuple[Path | None, dict]]):
+        # 同一批内相同 key 只保留最新的一条
+        latest: dict[Any, tuple[Path | None, dict]] = {}
+        for path, item in batch:
+            key = self.key_func(item)
+            if key is None:
+                key = id(item)
+            if key in latest:
+                self._unspool(latest.pop(key)[0])
+                self.stats["deduped"] += 1
+            latest[key] = (path, item)
+
+        token = get_waves_token()
+        if not token:
+            for path, _ in latest.values():
+                self._unspool(path)
+            return
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _limited(path: Path | None, item: dict):
+            async with semaphore:
+                await self._upload(path, item, token)
+
+        await asyncio.gather(*[_limited(path, item) for path, item in latest.values()])
+
+    async def _upload(self, path: Path | None, item: dict, token: str):
+        if self.prepare:
+            item = await self.prepare(dict(item))
+
+        client = get_upload_client()
+        for attempt in range(self.max_retries + 1):
+            res = None
+            try:
+                res = await client.post(
+                    self.url,
+                    json=item,
+                    headers={
+                        "Content-Type": "application/json",
+                        "Authorization": f"Bearer {token}",
+                    },
+                )
+                if res.status_code < 400:
+                    logger.info(f"上传{self.label}结果: {res.status_code} - {res.text}")
+                    self.stats["uploaded"] += 1
+                    self._unspool(path)
+                    return
+                if res.status_code != 429 and res.status_code < 500:
+                    # 数据本身有问题, 重试也没用
+                    logger.warning(f"上传{self.label}失败: {res.status_code} - {res.text}")
+                    self.stats["failed"] += 1
+                    self._unspool(path)
+                    return
+                logger.warning(f"上传{self.label}失败: {res.status_code} - {res.text}")
+            except Exception as e:
+                logger.warning(f"上传{self.label}失败: {res.text if res else ''} {e}")
+
+            if attempt < self.max_retries:
+                self.stats["retried"] += 1
+                await asyncio.sleep(self.retry_base * (2**attempt))
+
+        # 重试耗尽, 保留暂存文件, 等下一次 _restore 重新上传
+        self.stats["failed"] += 1
+        if path:
+            self._pending.discard(path)
+        logger.warning(f"[鸣潮][{self.label}上传] 重试{self.max_retries}次后仍失败, 已暂存")
+
+    def info(self) -> dict[str, int]:
+        return {
+            **self.stats,
+            "pending": self.queue.qsize() if self.queue else 0,
+        }
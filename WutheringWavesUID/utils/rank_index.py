@@ -0,0 +1,134 @@
+"""
+角色排行索引
+
+每个 (uid, char_id) 预先计算好声骸分数与期望伤害, 保存在数据库中。
+角色数据写入/删除时 (role_store) 只更新变化的角色, 排行时直接读取索引排序,
+不再逐个读取所有用户的 rawData.json 并重新计算。
+"""
+
+import asyncio
+from collections.abc import Iterable
+from typing import Any
+
+from gsuid_core.logger import logger
+
+from .api.model import RoleDetailData
+from .calc.batch import RoleCalcResult, calc_roles_async
+from .calculate import calc_template_registry
+from .char_info_utils import get_all_role_detail_info_list
+from .database.models import RANK_INDEX_MARK, WavesRoleRank
+from .util import get_version
+
+# 每次查询的uid数量, 避免超过 SQLite 的参数个数限制
+UID_CHUNK_SIZE = 500
+
+
+def get_rank_index_version() -> str:
+    # 评分模板与伤害公式随版本变化; 评分模板与条件文件可以不重启修改, 也计入版本
+    # 版本不同时索引需要重建
+    return f"{get_version()}-{calc_template_registry.fingerprint()}"
+
+
+def rank_row(role_detail: RoleDetailData, result: RoleCalcResult) -> dict[str, Any] | None:
+    """排行数据, 与排行卡片的计算保持一致; 没有声骸评分时返回 None"""
+    if result.phantom_score == 0:
+        return None
+
+    expected_damage = result.expected_damage or "0"
+    return {
+        "char_id": role_detail.role.roleId,
+        "score": result.phantom_score,
+        "score_bg": result.score_bg,
+        "expected_damage": expected_damage,
+        "expected_damage_int": int(expected_damage.replace(",", "")),
+        "level": role_detail.role.level,
+        "chain": role_detail.get_chain_num(),
+        "weapon_id": role_detail.weaponData.weapon.weaponId,
+        "weapon_level": role_detail.weaponData.level,
+        "weapon_reson_level": role_detail.weaponData.resonLevel or 0,
+        "sonata_name": result.sonata_name,
+    }
+
+
+async def build_rank_rows(uid: str, role_details: Iterable[RoleDetailData | dict], version: str) -> list[dict[str, Any]]:
+    rows = []
+    for row in await calc_roles_async(role_details, convert=rank_row):
+        if row:
+            row["version"] = version
+            rows.append(row)
+    return rows
+
+
+async def rebuild_rank_index(uid: str, role_details: Iterable[RoleDetailData | dict] | None = None):
+    """重建uid的全部排行索引"""
+    version = get_rank_index_version()
+    if role_details is None:
+        role_details = await get_all_role_detail_info_list(uid) or []
+
+    rows = await build_rank_rows(uid, role_details, version)
+    rows.append({"char_id": RANK_INDEX_MARK, "version": version})
+    await WavesRoleRank.replace_rank(uid, rows, full=True)
+
+
+async def update_rank_index(uid: str, roles: Iterable[dict], deleted_ids: Iterable[int] = ()):
+    """
+    角色数据写入后更新排行索引 (由 role_store 在写入/删除角色后调用)
+    已建立索引时只重算写入的角色并删除被删除的角色, 未建立时从已保存的数据重建
+    """
+    roles = list(roles)
+    deleted_ids = [int(i) for i in deleted_ids]
+    if not roles and not deleted_ids:
+        return
+
+    version = get_rank_index_version()
+    try:
+        if uid not in await WavesRoleRank.get_indexed_uids(version, [uid]):
+            await rebuild_rank_index(uid)
+            return
+
+        rows = await build_rank_rows(uid, roles, version)
+        # 没有评分的角色也要删掉旧索引
+        delete_char_ids = [role["role"]["roleId"] for role in roles] + deleted_ids
+        await WavesRoleRank.replace_rank(uid, rows, delete_char_ids=delete_char_ids)
+    except Exception as e:
+        logger.exception(f"[鸣潮][排行索引] uid:{uid} 更新失败", e)
+
+
+async def get_rank_index(
+    uids: Iterable[str],
+    char_ids: int | str | list[int] | list[str],
+) -> dict[str, WavesRoleRank]:
+    """
+    获取uid列表中指定角色的排行索引
+    未建立索引(或版本过旧)的uid会先从本地面板数据重建
+    """
+    if isinstance(char_ids, (int, str)):
+        char_ids = [char_ids]
+    char_id_list = [int(i) for i in char_ids]
+    uid_list = list(set(uids))
+
+    version = get_rank_index_version()
+    uid_chunks = [uid_list[i : i + UID_CHUNK_SIZE] for i in range(0, len(uid_list), UID_CHUNK_SIZE)]
+    indexed: set[str] = set()
+    for chunk in uid_chunks:
+        indexed |= await WavesRoleRank.get_indexed_uids(version, chunk)
+    missing = set(uid_list) - indexed
+    if missing:
+        logger.info(f"[鸣潮][排行索引] 重建 {len(missing)} 个uid的索引")
+        semaphore = asyncio.Semaphore(50)
+
+        async def _rebuild(uid: str):
+            async with semaphore:
+                try:
+                    await rebuild_rank_index(uid)
+                except Exception as e:
+                    logger.warning(f"[鸣潮][排行索引] uid:{uid} 重建失败: {e}")
+
+        await asyncio.gather(*[_rebuild(uid) for uid in missing])
+
+    result: dict[str, WavesRoleRank] = {}
+    for chunk in uid_chunks:
+        # 按分数从高到低, 同一uid有多个角色(漂泊者)时保留分数最高的, 读取面板时使用该行的 char_id
+        for row in await WavesRoleRank.get_rank_by_char(char_id_list, chunk, version):
+            result.setdefault(row.uid, row)
+    return result
@@ -1,17 +1,16 @@
 import asyncio
-import json
 
-import aiofiles
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
 
 from ..utils.api.model import AccountBaseInfo, RoleList
+from ..utils.char_info_utils import role_detail_cache
 from ..utils.error_reply import WAVES_CODE_098, WAVES_CODE_101, WAVES_CODE_102
 from ..utils.expression_ctx import WavesCharRank, get_waves_char_rank
 from ..utils.hint import error_reply
 from ..utils.queues.const import QUEUE_ROLE_DETAIL, QUEUE_SCORE_RANK
 from ..utils.queues.queues import push_item
-from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
+from ..utils.role_store import delete_roles, load_all_roles, save_roles
 from ..utils.util import get_version, send_master_info
 from ..utils.waves_api import waves_api
 from ..wutheringwaves_config import WutheringWavesConfig
@@ -131,23 +130,13 @@ async def save_card_info(
 ):
     if len(waves_data) == 0:
         return
-    _dir = PLAYER_PATH / uid
-    _dir.mkdir(parents=True, exist_ok=True)
-    path = _dir / "rawData.json"
 
-    old_data = {}
-    if path.exists():
-        try:
-            async with aiofiles.open(path, encoding="utf-8") as f:
-                old = json.loads(await f.read())
-                old_data = {d["role"]["roleId"]: d for d in old}
-        except Exception as e:
-            logger.exception(f"save_card_info get failed {path}:", e)
-            path.unlink(missing_ok=True)
+    old_data = {d["role"]["roleId"]: d for d in await load_all_roles(uid) or []}
 
     #
     refresh_update = {}
     refresh_unchanged = {}
+    removed_ids = []
     for item in waves_data:
         role_id = item["role"]["roleId"]
 
@@ -159,6 +148,7 @@ async def save_card_info(
                     continue
                 if piaobo_id != role_id:
                     del old_data[piaobo_id]
+                    removed_ids.append(piaobo_id)
 
         old = old_data.get(role_id)
         if old != item:
@@ -168,16 +158,16 @@ async def save_card_info(
 
         old_data[role_id] = item
 
-    save_data = list(old_data.values())
-
     # 上传总排行，国际服支持需pcap&登录
     await send_card(uid, waves_data, bot_id, user_id, is_self_ck, token)
 
+    # 只写入有变化的角色, 排行索引在写入时同步更新
     try:
-        async with aiofiles.open(path, "w", encoding="utf-8") as file:
-            await file.write(json.dumps(save_data, ensure_ascii=False))
+        await delete_roles(uid, removed_ids)
+        await save_roles(uid, refresh_update.values())
     except Exception as e:
-        logger.exception(f"save_card_info save failed {path}:", e)
+        logger.exception(f"save_card_info save failed {uid}:", e)
+    role_detail_cache.invalidate(uid, [*removed_ids, *refresh_update.keys()])
 
     if waves_map:
         waves_map["refresh_update"] = refresh_update
@@ -0,0 +1,274 @@
+"""
+绘图任务执行器
+
+- render_sync: 同步绘图函数的装饰器, 调用时占用绘图名额, 在绘图线程池中执行 PIL 绘制, 不阻塞事件循环;
+  被装饰的函数只做绘制, 接口请求/数据库查询/资源下载在调用前完成, 避免上游变慢时占满名额而 CPU 空闲
+- render_slot: 绘图名额, 同时绘制的任务数有上限, 并记录每种绘图的耗时
+- render_task: 绘图入口装饰器, 排队过多或等待超时(RenderBusyError)时返回繁忙提示
+- convert_img: 与 gsuid_core 的 convert_img 相同, 图片编码放到线程池执行, 不阻塞事件循环
+- run / run_job: 同步的 PIL 操作放到线程池; RenderJob 可以 pickle, 配置了进程数时交给进程池
+
+PIL 的解码/缩放/编码会释放 GIL, 默认使用线程池; 绘图过程中的字体、素材缓存和异步资源下载不能跨进程,
+只有完全由参数决定结果的任务才适合写成 RenderJob。
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import partial, wraps
+import threading
+import time
+from typing import Any, ParamSpec, TypeVar
+
+from gsuid_core.logger import logger
+from gsuid_core.utils.image.convert import convert_img as _convert_img
+from PIL import Image
+
+from ..wutheringwaves_config.wutheringwaves_config import WutheringWavesConfig
+
+T = TypeVar("T")
+P = ParamSpec("P")
+
+# 排队等待的任务数上限, 超过时直接拒绝
+RENDER_QUEUE_MAXSIZE = 32
+# 单次绘图超过该时间时记录警告(秒)
+RENDER_SLOW_THRESHOLD = 5
+RENDER_BUSY_MSG = "[鸣潮] 当前绘图任务较多, 请稍后再试！"
+
+
+class RenderBusyError(Exception):
+    pass
+
+
+@dataclass
+class RenderJob:
+    """可以 pickle 的绘图任务, func 需要是模块级函数, 参数和返回值需要可以 pickle"""
+
+    func: Callable[..., Any]
+    args: tuple = ()
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+    def __call__(self) -> Any:
+        return self.func(*self.args, **self.kwargs)
+
+
+class RenderStats:
+    def __init__(self):
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.total_wait = 0.0
+
+    def record(self, latency: float, wait: float, success: bool):
+        self.processed += 1
+        if not success:
+            self.failed += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.total_wait += wait
+
+    @property
+    def avg_latency(self) -> float:
+        return self.total_latency / self.processed if self.processed else 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.processed if self.processed else 0.0
+
+
+_local = threading.local()
+
+
+def encode_image(img: Image.Image, is_base64: bool = False) -> bytes | str:
+    """
+    在线程/子进程中调用 gsuid_core 的 convert_img, 编码参数与宿主保持一致
+    每个线程复用一个事件循环, 不会每张图片新建
+    """
+    loop = getattr(_local, "loop", None)
+    if loop is None:
+        loop = _local.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(_convert_img(img, is_base64=is_base64))
+
+
+class RenderExecutor:
+    def __init__(self):
+        self.stats: dict[str, RenderStats] = {}
+        self.waiting = 0
+        self.running = 0
+        self._semaphore: asyncio.Semaphore | None = None
+        self._concurrency = 0
+        self._thread_pool: ThreadPoolExecutor | None = None
+        self._thread_workers = 0
+        self._process_pool: ProcessPoolExecutor | None = None
+        self._process_workers = 0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        concurrency = max(WutheringWavesConfig.get_config("RenderConcurrency").data, 1)
+        if self._semaphore is None or self._concurrency != concurrency:
+            self._semaphore = asyncio.Semaphore(concurrency)
+            self._concurrency = concurrency
+        return self._semaphore
+
+    def get_thread_pool(self) -> ThreadPoolExecutor | None:
+        """RenderWorkers 为 0 时返回 None, 在事件循环中直接执行"""
+        workers = WutheringWavesConfig.get_config("RenderWorkers").data
+        if workers <= 0:
+            return None
+        if self._thread_pool is None or self._thread_workers != workers:
+            if self._thread_pool is not None:
+                self._thread_pool.shutdown(wait=False)
+            self._thread_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="waves_render")
+            self._thread_workers = workers
+        return self._thread_pool
+
+    def get_process_pool(self) -> ProcessPoolExecutor | None:
+        workers = WutheringWavesConfig.get_config("RenderProcessWorkers").data
+        if workers <= 0:
+            return None
+        if self._process_pool is None or self._process_workers != workers:
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False)
+            self._process_pool = ProcessPoolExecutor(max_workers=workers)
+            self._process_workers = workers
+        return self._process_pool
+
+    async def _run_in(self, executor: Executor | None, func: Callable[[], T]) -> T:
+        if executor is None:
+            return func()
+        return await asyncio.get_running_loop().run_in_executor(executor, func)
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """在线程池中执行同步函数"""
+        return await self._run_in(self.get_thread_pool(), partial(func, *args, **kwargs))
+
+    async def run_job(self, job: RenderJob) -> Any:
+        """
+        配置了 RenderProcessWorkers 时在进程池中执行, 否则在线程池中执行
+        与 run 不同, RenderWorkers 为 0 时也不会在事件循环中执行, 而是使用默认线程池
+        """
+        loop = asyncio.get_running_loop()
+        process_pool = self.get_process_pool()
+        if process_pool is not None:
+            try:
+                return await loop.run_in_executor(process_pool, job)
+            except Exception as e:
+                logger.warning(f"[鸣潮] 绘图进程池执行失败, 改为在线程池执行: {e}")
+        return await loop.run_in_executor(self.get_thread_pool(), job)
+
+    async def acquire(self, name: str) -> tuple[asyncio.Semaphore, float]:
+        """等待绘图名额, 返回占用的名额和等待时间; 排队过多或超时时抛出 RenderBusyError"""
+        semaphore = self._get_semaphore()
+        stats = self.stats.setdefault(name, RenderStats())
+        if semaphore.locked() and self.waiting >= RENDER_QUEUE_MAXSIZE:
+            stats.rejected += 1
+            raise RenderBusyError(name)
+
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            timeout = WutheringWavesConfig.get_config("RenderQueueTimeout").data
+            await asyncio.wait_for(semaphore.acquire(), timeout=timeout if timeout > 0 else None)
+        except asyncio.TimeoutError:
+            stats.rejected += 1
+            raise RenderBusyError(name)
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        return semaphore, time.perf_counter() - start
+
+    def release(self, name: str, semaphore: asyncio.Semaphore, wait: float, latency: float, success: bool):
+        # 配置修改后 _semaphore 会被替换, 需要释放获取时的那一个
+        self.running -= 1
+        semaphore.release()
+        self.stats.setdefault(name, RenderStats()).record(latency, wait, success)
+        if latency > RENDER_SLOW_THRESHOLD:
+            logger.warning(f"[鸣潮] 绘图 {name} 耗时 {latency:.2f}s, 等待 {wait:.2f}s")
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            name: {
+                "processed": stats.processed,
+                "failed": stats.failed,
+                "rejected": stats.rejected,
+                "avg_latency": stats.avg_latency,
+                "max_latency": stats.max_latency,
+                "avg_wait": stats.avg_wait,
+            }
+            for name, stats in self.stats.items()
+        }
+
+
+render_executor = RenderExecutor()
+
+
+@asynccontextmanager
+async def render_slot(name: str) -> AsyncIterator[None]:
+    """占用一个绘图名额, 排队过多或超时时抛出 RenderBusyError"""
+    semaphore, wait = await render_executor.acquire(name)
+    start = time.perf_counter()
+    success = False
+    try:
+        yield
+        success = True
+    finally:
+        render_executor.release(name, semaphore, wait, time.perf_counter() - start, success)
+
+
+def render_sync(name: str) -> Callable[[Callable[P, T]], Callable[P, Awaitable[T]]]:
+    """
+    同步绘图函数装饰器, 被装饰的函数变为协程: 占用绘图名额后在绘图线程池中执行
+    函数内只能做 PIL 绘制和读取本地素材, 需要下载的图片和接口数据作为参数传入
+
+        @render_sync("abyss")
+        def draw_abyss_card(...) -> Image.Image:
+            ...
+
+        card_img = await draw_abyss_card(...)
+        return await convert_img(card_img)
+    """
+
+    def decorator(func: Callable[P, T]) -> Callable[P, Awaitable[T]]:
+        @wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            async with render_slot(name):
+                return await render_executor.run(func, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def render_task(name: str) -> Callable:
+    """
+    绘图入口装饰器, 用于直接响应命令的 draw_* 协程, 函数内部调用 render_sync 绘图
+    名额不足(RenderBusyError)时返回繁忙提示
+
+        @render_task("abyss")
+        async def draw_abyss_img(ev: Event, uid: str, user_id: str) -> bytes | str:
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except RenderBusyError:
+                logger.warning(f"[鸣潮] 绘图 {name} 排队过多, 已拒绝")
+                return RENDER_BUSY_MSG
+
+        return wrapper
+
+    return decorator
+
+
+async def convert_img(img: Image.Image | str | bytes, is_base64: bool = False) -> bytes | str:
+    """与 gsuid_core 的 convert_img 相同, PIL 图片的编码在线程池(或进程池)中执行"""
+    if not isinstance(img, Image.Image):
+        return await _convert_img(img, is_base64=is_base64)
+    if render_executor.get_thread_pool() is None and render_executor.get_process_pool() is None:
+        return await _convert_img(img, is_base64=is_base64)
+    return await render_executor.run_job(RenderJob(encode_image, (img, is_base64)))
@@ -65,6 +65,17 @@ POKER_PATH = OTHER_PATH / "poker"
 SKIN_PATH = OTHER_PATH / "skin"
 
 
+# 上传队列暂存
+UPLOAD_SPOOL_PATH = MAIN_PATH / "upload_spool"
+
+# 打包后的游戏数据
+GAME_DATA_BUNDLE_PATH = MAIN_PATH / "game_data.bundle"
+
+# 渲染缓存
+RENDER_CACHE_PATH = MAIN_PATH / "render_cache"
+RENDER_FRAGMENT_PATH = RENDER_CACHE_PATH / "fragment"
+RENDER_ICON_PATH = RENDER_CACHE_PATH / "icon"
+
 # 别名
 ALIAS_PATH = MAIN_PATH / "alias"
 CUSTOM_CHAR_ALIAS_PATH = ALIAS_PATH / "char_alias.json"
@@ -105,6 +116,10 @@ def init_dir():
         ALIAS_PATH,
         CUSTOM_MR_CARD_PATH,
         SKIN_PATH,
+        UPLOAD_SPOOL_PATH,
+        RENDER_CACHE_PATH,
+        RENDER_FRAGMENT_PATH,
+        RENDER_ICON_PATH,
         ALL_SKIN_PATH,
         ROLE_SKIN_PATH,
         WEAPON_SKIN_PATH,
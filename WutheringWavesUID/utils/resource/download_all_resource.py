@@ -1,6 +1,7 @@
 # from .download_core import download_all_file
 from gsuid_core.logger import logger
 
+from ..ascension.bundle import refresh_game_data_bundle
 from .download_github import download_all_file
 from .RESOURCE_PATH import (
     ALL_SKIN_PATH,
@@ -40,4 +41,7 @@ async def download_all_resource():
     # 记录完整日志
     logger.info(f"📦 [资源下载完成] {result}")
 
+    # 游戏数据有变化时重新打包
+    refresh_game_data_bundle()
+
     return result
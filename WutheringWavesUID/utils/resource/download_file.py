@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from gsuid_core.utils.download_resource.download_file import download
 from PIL import Image
 
@@ -14,51 +16,84 @@ from .RESOURCE_PATH import (
 )
 
 
-async def get_skill_img(char_id: str | int, skill_name: str, pic_url: str) -> Image.Image:
-    _dir = ROLE_DETAIL_SKILL_PATH / str(char_id)
+def get_skill_img_path(char_id: str | int, skill_name: str) -> Path:
+    return ROLE_DETAIL_SKILL_PATH / str(char_id) / f"skill_{skill_name.strip()}.png"
+
+
+def get_chain_img_path(char_id: str | int, order_id: int) -> Path:
+    return ROLE_DETAIL_CHAINS_PATH / str(char_id) / f"chain_{order_id}.png"
+
+
+def get_phantom_img_path(phantom_id: int) -> Path:
+    return PHANTOM_PATH / f"phantom_{phantom_id}.png"
+
+
+async def download_skill_img(char_id: str | int, skill_name: str, pic_url: str):
+    _path = get_skill_img_path(char_id, skill_name)
+    _dir, name = _path.parent, _path.name
     _dir.mkdir(parents=True, exist_ok=True)
+    if not _path.exists() and pic_url:
+        await download(pic_url, _dir, name, tag="[鸣潮]")
 
-    skill_name = skill_name.strip()
-    name = f"skill_{skill_name}.png"
-    _path = _dir / name
-    if not _path.exists():
-        if pic_url:
-            await download(pic_url, _dir, name, tag="[鸣潮]")
-        else:
-            # logger.warning(f"[鸣潮] 角色 {char_id} 的 {skill_name} 技能图片不存在，使用默认图片")
-            _path = MISSING_IMG
+
+def get_skill_img_sync(char_id: str | int, skill_name: str, pic_url: str) -> Image.Image:
+    """只读取本地图片, 需要先 download_skill_img"""
+    _path = get_skill_img_path(char_id, skill_name)
+    if not _path.exists() and not pic_url:
+        # logger.warning(f"[鸣潮] 角色 {char_id} 的 {skill_name} 技能图片不存在，使用默认图片")
+        _path = MISSING_IMG
 
     return load_asset(_path)
 
 
-async def get_chain_img(char_id: str | int, order_id: int, pic_url: str) -> Image.Image:
-    _dir = ROLE_DETAIL_CHAINS_PATH / str(char_id)
+async def get_skill_img(char_id: str | int, skill_name: str, pic_url: str) -> Image.Image:
+    await download_skill_img(char_id, skill_name, pic_url)
+    return get_skill_img_sync(char_id, skill_name, pic_url)
+
+
+async def download_chain_img(char_id: str | int, order_id: int, pic_url: str):
+    _path = get_chain_img_path(char_id, order_id)
+    _dir, name = _path.parent, _path.name
     _dir.mkdir(parents=True, exist_ok=True)
+    if not _path.exists() and pic_url:
+        await download(pic_url, _dir, name, tag="[鸣潮]")
 
-    name = f"chain_{order_id}.png"
-    _path = _dir / name
-    if not _path.exists():
-        if pic_url:
-            await download(pic_url, _dir, name, tag="[鸣潮]")
-        else:
-            # logger.warning(f"[鸣潮] 角色 {char_id} 的共鸣链图片不存在，使用默认图片")
-            _path = MISSING_IMG
+
+def get_chain_img_sync(char_id: str | int, order_id: int, pic_url: str) -> Image.Image:
+    """只读取本地图片, 需要先 download_chain_img"""
+    _path = get_chain_img_path(char_id, order_id)
+    if not _path.exists() and not pic_url:
+        # logger.warning(f"[鸣潮] 角色 {char_id} 的共鸣链图片不存在，使用默认图片")
+        _path = MISSING_IMG
 
     return load_asset(_path)
 
 
-async def get_phantom_img(phantom_id: int, pic_url: str) -> Image.Image:
-    name = f"phantom_{phantom_id}.png"
-    _path = PHANTOM_PATH / name
-    if not _path.exists():
-        if pic_url:
-            await download(pic_url, PHANTOM_PATH, name, tag="[鸣潮]")
-        else:
-            _path = MISSING_IMG
+async def get_chain_img(char_id: str | int, order_id: int, pic_url: str) -> Image.Image:
+    await download_chain_img(char_id, order_id, pic_url)
+    return get_chain_img_sync(char_id, order_id, pic_url)
+
+
+async def download_phantom_img(phantom_id: int, pic_url: str):
+    _path = get_phantom_img_path(phantom_id)
+    if not _path.exists() and pic_url:
+        await download(pic_url, PHANTOM_PATH, _path.name, tag="[鸣潮]")
+
+
+def get_phantom_img_sync(phantom_id: int, pic_url: str) -> Image.Image:
+    """只读取本地图片, 需要先 download_phantom_img"""
+    _path = get_phantom_img_path(phantom_id)
+    if not _path.exists() and not pic_url:
+        _path = MISSING_IMG
 
     return load_asset(_path)
 
 
+async def get_phantom_img(phantom_id: int, pic_url: str) -> Image.Image:
+    await download_phantom_img(phantom_id, pic_url)
+    return get_phantom_img_sync(phantom_id, pic_url)
+
+
 async def get_monster_img(monster_id: int, need_echo_id: int = 0, pic_url: str = "") -> Image.Image:
     _path = MONSTER_PATH / f"monster_{monster_id}.png"
     if need_echo_id != 0 and not _path.exists():
@@ -0,0 +1,135 @@
+"""
+图片响应缓存
+
+同一个查询在数据没有变化时结果相同, 缓存 convert_img 编码后的结果, 命中时跳过绘制和编码。
+- key: (命令, 特征码, 查询参数, 配置哈希), 配置变化后旧缓存不再命中;
+  配置哈希只在配置写入(StringConfig.write_config, 包括命令与控制台修改)后重新计算
+- 特征码的角色/抽卡数据写入时(role_store / gacha_store)清除该特征码的缓存
+- 在线状态、排名等来自网络的数据不在 key 中, 由过期时间(ResponseCacheTTL)限制
+
+只缓存 bytes 结果, 错误提示等字符串结果不缓存。
+"""
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+import hashlib
+import time
+from typing import Any
+
+from ..wutheringwaves_config.wutheringwaves_config import ShowConfig, WutheringWavesConfig
+
+# 缓存结果总大小上限
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+_config_hash: str | None = None
+
+
+def get_config_hash() -> str:
+    global _config_hash
+    if _config_hash is None:
+        md5 = hashlib.md5()
+        for config in (WutheringWavesConfig, ShowConfig):
+            md5.update(repr([(key, value.data) for key, value in config.config.items()]).encode())
+        _config_hash = md5.hexdigest()
+    return _config_hash
+
+
+def invalidate_config_hash():
+    global _config_hash
+    _config_hash = None
+
+
+def _watch_config_write(config):
+    """配置的所有修改最终都会调用 write_config 保存, 在写入后清除配置哈希"""
+    write_config = config.write_config
+
+    def _write_config(*args, **kwargs):
+        try:
+            return write_config(*args, **kwargs)
+        finally:
+            invalidate_config_hash()
+
+    config.write_config = _write_config
+
+
+for _config in (WutheringWavesConfig, ShowConfig):
+    _watch_config_write(_config)
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        # key -> (结果, 过期时间)
+        self._entries: OrderedDict[tuple, tuple[bytes, float]] = OrderedDict()
+        self._bytes = 0
+        self._uid_keys: dict[str, set[tuple]] = {}
+
+    @property
+    def ttl(self) -> int:
+        return WutheringWavesConfig.get_config("ResponseCacheTTL").data
+
+    def _pop(self, key: tuple):
+        data, _ = self._entries.pop(key)
+        self._bytes -= len(data)
+        uid_keys = self._uid_keys.get(key[1])
+        if uid_keys is not None:
+            uid_keys.discard(key)
+            if not uid_keys:
+                del self._uid_keys[key[1]]
+
+    def get(self, key: tuple) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] < time.time():
+            self._pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: tuple, data: bytes, ttl: int):
+        if len(data) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._pop(key)
+        self._entries[key] = (data, time.time() + ttl)
+        self._bytes += len(data)
+        self._uid_keys.setdefault(key[1], set()).add(key)
+        while self._bytes > self.max_bytes:
+            self._pop(next(iter(self._entries)))
+
+    def invalidate(self, uid: str):
+        """特征码的数据有变化时调用"""
+        for key in list(self._uid_keys.get(str(uid), ())):
+            self._pop(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._uid_keys.clear()
+        self._bytes = 0
+
+    async def get_or_render(
+        self,
+        command: str,
+        uid: str,
+        parts: tuple[Hashable, ...],
+        render: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """parts 为除特征码外影响结果的全部参数"""
+        ttl = self.ttl
+        if ttl <= 0:
+            return await render()
+
+        key = (command, str(uid), parts, get_config_hash())
+        data = self.get(key)
+        if data is not None:
+            return data
+
+        result = await render()
+        if isinstance(result, bytes):
+            self.set(key, result, ttl)
+        return result
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,202 @@
+"""
+角色面板存储
+
+每个角色单独保存为一个 MessagePack 文件:
+    PLAYER_PATH/<uid>/roles/<roleId>.msgpack
+读写单个角色只需要处理一个文件, 刷新面板时只重写有变化的角色。
+写入或删除角色后清除该特征码的响应缓存, 并更新排行索引(rank_index)。
+旧版的 rawData.json 会在第一次访问时自动迁移, 迁移完成后重命名为 rawData.json.bak 保留;
+读取失败时保持原文件不变, 不进行迁移。
+"""
+
+import asyncio
+from collections.abc import Iterable
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import aiofiles
+from gsuid_core.logger import logger
+from msgspec import msgpack
+
+from .resource.RESOURCE_PATH import PLAYER_PATH
+from .response_cache import response_cache
+
+ROLE_DIR_NAME = "roles"
+ROLE_SUFFIX = ".msgpack"
+LEGACY_FILE_NAME = "rawData.json"
+LEGACY_BACKUP_SUFFIX = ".bak"
+
+_encoder = msgpack.Encoder()
+_decoder = msgpack.Decoder()
+_migrate_locks: dict[str, asyncio.Lock] = {}
+
+
+def get_role_dir(uid: str) -> Path:
+    return PLAYER_PATH / str(uid) / ROLE_DIR_NAME
+
+
+def get_role_path(uid: str, role_id: int | str) -> Path:
+    return get_role_dir(uid) / f"{role_id}{ROLE_SUFFIX}"
+
+
+async def _migrate_legacy(uid: str) -> bool:
+    """将旧的 rawData.json 拆分为单角色文件, 返回是否存在数据"""
+    role_dir = get_role_dir(uid)
+    if role_dir.exists():
+        return True
+
+    legacy_path = PLAYER_PATH / str(uid) / LEGACY_FILE_NAME
+    if not legacy_path.exists():
+        return False
+
+    lock = _migrate_locks.setdefault(str(uid), asyncio.Lock())
+    async with lock:
+        if role_dir.exists():
+            return True
+        try:
+            async with aiofiles.open(legacy_path, encoding="utf-8") as f:
+                player_data = json.loads(await f.read())
+        except Exception as e:
+            # 保留原文件, 以便手动修复后重新迁移
+            logger.exception(f"[鸣潮] 迁移角色数据失败 {legacy_path}:", e)
+            return False
+
+        tmp_dir = role_dir.with_name(f"{ROLE_DIR_NAME}.tmp")
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        for role in player_data:
+            async with aiofiles.open(tmp_dir / f"{role['role']['roleId']}{ROLE_SUFFIX}", "wb") as f:
+                await f.write(_encoder.encode(role))
+        os.replace(tmp_dir, role_dir)
+        os.replace(legacy_path, legacy_path.with_name(f"{LEGACY_FILE_NAME}{LEGACY_BACKUP_SUFFIX}"))
+        logger.debug(f"[鸣潮] 角色数据迁移完成 uid:{uid} 共{len(player_data)}个角色")
+    return True
+
+
+async def has_role_data(uid: str) -> bool:
+    return await _migrate_legacy(uid)
+
+
+async def get_role_ids(uid: str) -> list[int] | None:
+    """获取已保存的角色id, 没有数据时返回 None"""
+    if not await _migrate_legacy(uid):
+        return None
+    return sorted(int(p.stem) for p in get_role_dir(uid).glob(f"*{ROLE_SUFFIX}") if p.stem.isdigit())
+
+
+async def get_role_mtime(uid: str, role_id: int | str) -> int | None:
+    """角色文件的修改时间(ns), 文件不存在时返回 None"""
+    if not await _migrate_legacy(uid):
+        return None
+    try:
+        return get_role_path(uid, role_id).stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+async def load_role(uid: str, role_id: int | str) -> dict[str, Any] | None:
+    """读取单个角色"""
+    if not await _migrate_legacy(uid):
+        return None
+    path = get_role_path(uid, role_id)
+    if not path.exists():
+        return None
+    try:
+        async with aiofiles.open(path, "rb") as f:
+            return _decoder.decode(await f.read())
+    except Exception as e:
+        logger.exception(f"[鸣潮] 读取角色数据失败 {path}:", e)
+        path.unlink(missing_ok=True)
+        return None
+
+
+async def load_all_roles(uid: str) -> list[dict[str, Any]] | None:
+    """读取所有角色, 没有数据时返回 None"""
+    role_ids = await get_role_ids(uid)
+    if role_ids is None:
+        return None
+    roles = await asyncio.gather(*[load_role(uid, role_id) for role_id in role_ids])
+    return [role for role in roles if role is not None]
+
+
+async def save_roles(uid: str, roles: Iterable[dict[str, Any]]):
+    """保存(覆盖)指定的角色, 未传入的角色保持不变"""
+    await _migrate_legacy(uid)
+    role_dir = get_role_dir(uid)
+    role_dir.mkdir(parents=True, exist_ok=True)
+    roles = list(roles)
+    for role in roles:
+        await _write_role(get_role_path(uid, role["role"]["roleId"]), _encoder.encode(role))
+    if roles:
+        await _roles_changed(uid, roles)
+
+
+async def _roles_changed(uid: str, roles: Iterable[dict[str, Any]] = (), deleted_ids: Iterable[int | str] = ()):
+    """角色写入/删除后调用"""
+    response_cache.invalidate(uid)
+    # rank_index 依赖 char_info_utils -> role_store, 在这里导入避免循环引用
+    from .rank_index import update_rank_index
+
+    await update_rank_index(str(uid), roles, deleted_ids)
+
+
+async def _write_role(path: Path, data: bytes):
+    """先写临时文件再替换, 读取方不会看到写了一半的文件"""
+    tmp_path = path.with_suffix(".tmp")
+    async with aiofiles.open(tmp_path, "wb") as f:
+        await f.write(data)
+    os.replace(tmp_path, path)
+
+
+async def _read_bytes(path: Path) -> bytes | None:
+    try:
+        async with aiofiles.open(path, "rb") as f:
+            return await f.read()
+    except FileNotFoundError:
+        return None
+
+
+async def delete_roles(uid: str, role_ids: Iterable[int | str] | None = None) -> int:
+    """删除指定角色, 不指定时删除全部, 返回删除的数量"""
+    if not await _migrate_legacy(uid):
+        return 0
+    if role_ids is None:
+        paths = list(get_role_dir(uid).glob(f"*{ROLE_SUFFIX}"))
+    else:
+        paths = [get_role_path(uid, role_id) for role_id in role_ids]
+
+    deleted_ids = []
+    for path in paths:
+        if path.exists():
+            path.unlink(missing_ok=True)
+            deleted_ids.append(path.stem)
+    if deleted_ids:
+        await _roles_changed(uid, deleted_ids=deleted_ids)
+    return len(deleted_ids)
+
+
+async def replace_all_roles(uid: str, roles: list[dict[str, Any]]):
+    """
+    用传入的角色替换全部数据
+    内容未变化的角色文件不会重写, 先写入新角色再删除多余的角色, 替换过程中不会出现空数据
+    """
+    await _migrate_legacy(uid)
+    role_dir = get_role_dir(uid)
+    role_dir.mkdir(parents=True, exist_ok=True)
+
+    changed = []
+    keep = set()
+    for role in roles:
+        path = get_role_path(uid, role["role"]["roleId"])
+        keep.add(path.name)
+        data = _encoder.encode(role)
+        if await _read_bytes(path) != data:
+            await _write_role(path, data)
+            changed.append(role)
+    if changed:
+        await _roles_changed(uid, changed)
+
+    stale = [p.stem for p in role_dir.glob(f"*{ROLE_SUFFIX}") if p.name not in keep]
+    if stale:
+        await delete_roles(uid, stale)
@@ -0,0 +1,132 @@
+"""
+静态素材(texture2d)管理
+
+第一次使用时扫描插件内所有 texture2d 目录建立索引, 之后读取索引中的素材不再访问磁盘:
+- get_texture: 返回解码后的 RGBA 共享图片, 只能作为贴图来源使用(paste/alpha_composite 的源、copy、resize 等)
+- load_texture: 返回可以修改的副本, 用于需要在素材上绘制文字或贴图的场景
+- size: 缓存常用的缩放结果, 缩放方式与 Image.resize 的默认参数相同
+
+缓存按解码后的大小限制总量(TextureCacheSize), 超出时淘汰最久未使用的素材。
+不在 texture2d 目录中的文件(下载的资源、自定义图片等)每次直接读取, 不缓存。
+素材文件在运行中被替换时需要调用 texture_manager.reload()。
+"""
+
+from collections import OrderedDict
+import os
+from pathlib import Path
+import threading
+
+from PIL import Image
+
+from ..wutheringwaves_config import WutheringWavesConfig
+
+PLUGIN_PATH = Path(__file__).parent.parent
+TEXTURE_DIR_NAME = "texture2d"
+
+_Key = tuple[str, tuple[int, int] | None]
+
+
+def _image_bytes(img: Image.Image) -> int:
+    return img.width * img.height * len(img.getbands())
+
+
+def _open_texture(path: str, size: tuple[int, int] | None = None) -> Image.Image:
+    img = Image.open(path).convert("RGBA")
+    if size is not None:
+        img = img.resize(size)
+    return img
+
+
+class TextureManager:
+    def __init__(self, root: Path = PLUGIN_PATH):
+        self.root = root
+        self._index: set[str] | None = None
+        self._cache: OrderedDict[_Key, Image.Image] = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return WutheringWavesConfig.get_config("TextureCacheSize").data * 1024 * 1024
+
+    @property
+    def index(self) -> set[str]:
+        if self._index is None:
+            self._index = self._scan()
+        return self._index
+
+    def _scan(self) -> set[str]:
+        index = set()
+        for texture_dir in self.root.rglob(TEXTURE_DIR_NAME):
+            if not texture_dir.is_dir():
+                continue
+            for dirpath, _, filenames in os.walk(texture_dir):
+                for filename in filenames:
+                    index.add(os.path.join(dirpath, filename))
+        return index
+
+    def get(self, path: str | Path, size: tuple[int, int] | None = None) -> Image.Image:
+        path_str = str(path)
+        max_bytes = self.max_bytes
+        if max_bytes <= 0 or path_str not in self.index:
+            return _open_texture(path_str, size)
+
+        key = (path_str, size)
+        with self._lock:
+            img = self._cache.get(key)
+            if img is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return img
+            self.misses += 1
+
+        if size is None:
+            img = _open_texture(path_str)
+        else:
+            img = self.get(path_str).resize(size)
+        self._put(key, img, max_bytes)
+        return img
+
+    def _put(self, key: _Key, img: Image.Image, max_bytes: int):
+        size = _image_bytes(img)
+        if size > max_bytes:
+            return
+        with self._lock:
+            old = self._cache.pop(key, None)
+            if old is not None:
+                self._cache_bytes -= _image_bytes(old)
+            self._cache[key] = img
+            self._cache_bytes += size
+            while self._cache_bytes > max_bytes:
+                _, old = self._cache.popitem(last=False)
+                self._cache_bytes -= _image_bytes(old)
+
+    def reload(self):
+        """重新扫描素材目录并清空缓存"""
+        with self._lock:
+            self._index = None
+            self._cache.clear()
+            self._cache_bytes = 0
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "count": len(self._cache),
+            "bytes": self._cache_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+texture_manager = TextureManager()
+
+
+def get_texture(path: str | Path, size: tuple[int, int] | None = None) -> Image.Image:
+    """读取素材(RGBA), 返回共享的图片, 不能修改"""
+    return texture_manager.get(path, size)
+
+
+def load_texture(path: str | Path, size: tuple[int, int] | None = None) -> Image.Image:
+    """读取素材(RGBA), 返回可以修改的副本"""
+    return texture_manager.get(path, size).copy()
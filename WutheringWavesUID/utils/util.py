@@ -1,9 +1,11 @@
 import asyncio
+from collections import OrderedDict
 from collections.abc import Callable, Coroutine
 from functools import wraps
 import inspect
 import random
 import string
+import sys
 import time
 from typing import Any, TypeVar, overload
 
@@ -11,52 +13,176 @@ from gsuid_core.subscribe import gs_subscribe
 import httpx
 
 
-def timed_async_cache(expiration, condition=lambda x: True):
+def _estimate_size(value: Any, _depth: int = 0) -> int:
+    """粗略估算对象占用的字节数, 用于缓存容量控制"""
+    size = sys.getsizeof(value)
+    if _depth > 4:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += _estimate_size(k, _depth + 1) + _estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for v in value:
+            size += _estimate_size(v, _depth + 1)
+    elif hasattr(value, "__dict__"):
+        size += _estimate_size(vars(value), _depth + 1)
+    return size
+
+
+def _freeze_key_value(value: Any) -> Any:
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def timed_async_cache(
+    expiration: float,
+    condition: Callable[[Any], Any] = lambda x: True,
+    *,
+    exclude: list[str] | None = None,
+    maxsize: int = 256,
+    max_bytes: int | None = None,
+    stale: float = 0,
+    copy: Callable[[Any], Any] | None = None,
+):
+    """
+    异步函数缓存
+    - 缓存键由函数参数组成(包括默认值), exclude 中的参数不参与; 类方法只按类区分, 不按实例区分
+    - expiration: 缓存有效期(秒)
+    - condition: 返回值满足条件才缓存
+    - maxsize / max_bytes: 最大缓存条数 / 最大缓存字节数, 超出按LRU淘汰
+    - stale: 过期后仍可返回旧值的时间(秒), 同时在后台刷新
+    - 相同参数的并发调用只会执行一次
+    - copy: 每次返回前复制结果; 不传时所有调用方共用缓存中的对象, 调用方不能修改返回值
+    使用示例:
+    # 不同 token 能看到的数据不同, token 保留在缓存键中
+    @timed_async_cache(5, lambda x: x.success, copy=lambda x: x.model_copy(deep=True))
+    async def get_base_info(self, roleId: str, token: str): ...
+
+    # 返回的数据与 token 无关, 不参与缓存键
+    @timed_async_cache(86400, lambda x: x.success, exclude=["token"])
+    async def get_online_list_role(self, token: str): ...
+    """
+    excluded = set(exclude or [])
+
     def decorator(func):
-        cache = {}
-        locks = {}
+        # key -> (value, timestamp, size)
+        cache: OrderedDict[tuple, tuple[Any, float, int]] = OrderedDict()
+        inflight: dict[tuple, asyncio.Future] = {}
+        stats = {"hits": 0, "misses": 0, "stale_hits": 0, "evictions": 0}
+        total_bytes = 0
 
         sig = inspect.signature(func)
         params = list(sig.parameters.keys())
-        is_cls_method = params and params[0] in ["self", "cls"]
+        is_cls_method = bool(params) and params[0] in ["self", "cls"]
 
-        @wraps(func)
-        async def wrapper(*args):
-            current_time = time.time()
+        def make_key(args, kwargs) -> tuple:
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
             if is_cls_method and args and hasattr(args[0], "__class__"):
-                cache_key = f"{args[0].__class__.__name__}.{func.__name__}"
+                # 类方法只按类区分, 不按实例区分
+                prefix = f"{args[0].__class__.__name__}.{func.__name__}"
             else:
-                cache_key = func.__name__
-
-            # 为每个缓存键创建一个锁
-            if cache_key not in locks:
-                locks[cache_key] = asyncio.Lock()
-
-            # 检查缓存，如果有效则直接返回
-            if cache_key in cache:
-                value, timestamp = cache[cache_key]
-                if current_time - timestamp < expiration:
-                    return value
-
-            # 获取锁以确保并发安全
-            async with locks[cache_key]:
-                # 双重检查，避免等待锁期间其他协程已经更新了缓存
-                if cache_key in cache:
-                    value, timestamp = cache[cache_key]
-                    if current_time - timestamp < expiration:
-                        return value
-
-                # 执行原始函数
-                value = await func(*args)
+                prefix = func.__name__
+
+            parts = [prefix]
+            for index, (name, value) in enumerate(bound.arguments.items()):
+                if index == 0 and is_cls_method:
+                    continue
+                if name in excluded:
+                    continue
+                parts.append((name, _freeze_key_value(value)))
+            return tuple(parts)
+
+        def pop_entry(key):
+            nonlocal total_bytes
+            _, _, size = cache.pop(key)
+            total_bytes -= size
+
+        def store(key, value):
+            nonlocal total_bytes
+            size = _estimate_size(value) if max_bytes else 0
+            if max_bytes and size > max_bytes:
+                return
+            if key in cache:
+                pop_entry(key)
+            cache[key] = (value, time.time(), size)
+            total_bytes += size
+            while cache and (len(cache) > maxsize or (max_bytes and total_bytes > max_bytes)):
+                pop_entry(next(iter(cache)))
+                stats["evictions"] += 1
+
+        async def load(key, args, kwargs):
+            try:
+                value = await func(*args, **kwargs)
                 if condition(value):
-                    cache[cache_key] = (value, current_time)
+                    store(key, value)
                 return value
+            finally:
+                inflight.pop(key, None)
+
+        def start_load(key, args, kwargs) -> asyncio.Future:
+            # 同一个键同时只会有一个请求在执行
+            task = inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(load(key, args, kwargs))
+                inflight[key] = task
+            return task
 
+        def output(value):
+            return copy(value) if copy is not None else value
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            entry = cache.get(key)
+            if entry is not None:
+                value, timestamp, _ = entry
+                age = time.time() - timestamp
+                if age < expiration:
+                    cache.move_to_end(key)
+                    stats["hits"] += 1
+                    return output(value)
+                if age < expiration + stale:
+                    # 返回旧值, 后台刷新
+                    cache.move_to_end(key)
+                    stats["stale_hits"] += 1
+                    task = start_load(key, args, kwargs)
+                    task.add_done_callback(_consume_exception)
+                    return output(value)
+                pop_entry(key)
+
+            stats["misses"] += 1
+            return output(await asyncio.shield(start_load(key, args, kwargs)))
+
+        def cache_info() -> dict[str, int]:
+            return {
+                **stats,
+                "size": len(cache),
+                "bytes": total_bytes,
+                "inflight": len(inflight),
+            }
+
+        def cache_clear():
+            nonlocal total_bytes
+            cache.clear()
+            total_bytes = 0
+
+        wrapper.cache_info = cache_info  # type: ignore[attr-defined]
+        wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
         return wrapper
 
     return decorator
 
 
+def _consume_exception(task: asyncio.Future):
+    # 后台刷新失败时不抛出未获取的异常
+    if not task.cancelled():
+        task.exception()
+
+
 F = TypeVar("F", bound=Callable[..., Coroutine[Any, Any, Any]])
 
 
@@ -211,7 +337,7 @@ filter_msg = [
 
 
 # 发送主人信息
-@timed_async_cache(300, lambda x: x)
+@timed_async_cache(300, lambda x: x, exclude=["msg"])
 async def send_master_info(msg: str):
     # 过滤
     for i in filter_msg:
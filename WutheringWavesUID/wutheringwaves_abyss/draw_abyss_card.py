@@ -1,11 +1,11 @@
 from pathlib import Path
 
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from PIL import Image, ImageDraw
 
 from ..utils.api.model import (
     AbyssChallenge,
+    AbyssDifficulty,
     AbyssFloor,
     AccountBaseInfo,
     RoleDetailData,
@@ -26,9 +26,10 @@ from ..utils.fonts.waves_fonts import (
 )
 from ..utils.hint import error_reply
 from ..utils.image import GOLD, GREY, add_footer, get_waves_bg
-from ..utils.imagetool import draw_pic, draw_pic_with_ring
+from ..utils.imagetool import draw_pic_sync, draw_pic_with_ring
 from ..utils.queues.const import QUEUE_ABYSS_RECORD
 from ..utils.queues.queues import push_item
+from ..utils.render_executor import convert_img, render_sync, render_task
 from ..utils.util import get_version
 from ..utils.waves_api import waves_api
 from ..wutheringwaves_config import PREFIX
@@ -65,6 +66,7 @@ async def get_abyss_data(uid: str, ck: str, is_self_ck: bool):
         return AbyssChallenge.model_validate(abyss_data)
 
 
+@render_task("abyss")
 async def draw_abyss_img(ev: Event, uid: str, user_id: str) -> bytes | str:
     is_self_ck, ck = await waves_api.get_ck_result(uid, user_id, ev.bot_id)
     if not ck:
@@ -124,6 +126,43 @@ async def draw_abyss_img(ev: Event, uid: str, user_id: str) -> bytes | str:
     if not needAbyss:
         return ABYSS_ERROR_MESSAGE_NO_DEEP
 
+    # 根据面板数据获取详细信息
+    role_detail_info_map = await get_all_roleid_detail_info(uid)
+
+    # 头像 头像环
+    avatar, avatar_ring = await draw_pic_with_ring(ev)
+    card_img = await draw_abyss_card(
+        account_info,
+        role_info,
+        abyss_data,
+        needAbyss,
+        difficultyName,
+        is_self_ck,
+        role_detail_info_map,
+        avatar,
+        avatar_ring,
+    )
+    if isinstance(card_img, str):
+        return card_img
+    card_img = await convert_img(card_img)
+    # 上传深渊记录
+    await upload_abyss_record(is_self_ck, uid, difficultyName, abyss_data)
+
+    return card_img
+
+
+@render_sync("abyss")
+def draw_abyss_card(
+    account_info: AccountBaseInfo,
+    role_info: RoleList,
+    abyss_data: AbyssChallenge,
+    needAbyss: AbyssDifficulty,
+    difficultyName: str,
+    is_self_ck: bool,
+    role_detail_info_map: dict[str, RoleDetailData] | None,
+    avatar: Image.Image,
+    avatar_ring: Image.Image,
+) -> Image.Image | str:
     frameHigh = sum([len(i.floorList) * 141 + 90 + 50 for i in needAbyss.towerAreaList if i.floorList]) + 100 + 50
 
     h = frameHigh + 220
@@ -136,8 +175,6 @@ async def draw_abyss_img(ev: Event, uid: str, user_id: str) -> bytes | str:
     base_info_draw.text((226, 173), f"特征码:  {account_info.id}", GOLD, waves_font_25, "lm")
     card_img.paste(base_info_bg, (15, 20), base_info_bg)
 
-    # 头像 头像环
-    avatar, avatar_ring = await draw_pic_with_ring(ev)
     card_img.paste(avatar, (25, 70), avatar)
     card_img.paste(avatar_ring, (35, 80), avatar_ring)
 
@@ -152,9 +189,6 @@ async def draw_abyss_img(ev: Event, uid: str, user_id: str) -> bytes | str:
         title_bar_draw.text((810, 78), f"Lv.{account_info.worldLevel}", "white", waves_font_42, "mm")
         card_img.paste(title_bar, (-20, 70), title_bar)
 
-    # 根据面板数据获取详细信息
-    role_detail_info_map = await get_all_roleid_detail_info(uid)
-
     # frame
     frame = Image.open(TEXT_PATH / "frame.png")
     frame = frame.resize((frame.size[0], frameHigh))
@@ -220,7 +254,7 @@ async def draw_abyss_img(ev: Event, uid: str, user_id: str) -> bytes | str:
                         if not role:
                             continue
 
-                        avatar = await draw_pic(role.roleId)
+                        avatar = draw_pic_sync(role.roleId)
                         char_bg = Image.open(TEXT_PATH / f"char_bg{role.starLevel}.png")
                         char_bg_draw = ImageDraw.Draw(char_bg)
                         char_bg_draw.text((90, 150), f"{role.roleName}", "white", waves_font_18, "mm")
@@ -251,13 +285,9 @@ async def draw_abyss_img(ev: Event, uid: str, user_id: str) -> bytes | str:
             return ABYSS_ERROR_MESSAGE_LOGIN
         return ABYSS_ERROR_MESSAGE_NO_DATA
 
-    # 上传深渊记录
-    await upload_abyss_record(is_self_ck, uid, difficultyName, abyss_data)
-
     card_img.paste(frame, (0, 210), frame)
 
     card_img = add_footer(card_img, 600, 20)
-    card_img = await convert_img(card_img)
     return card_img
 
 
@@ -2,7 +2,6 @@ from datetime import timedelta
 from pathlib import Path
 
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from PIL import Image, ImageDraw
 
 from ..utils.api.model import AccountBaseInfo, ChallengeArea, RoleList
@@ -25,8 +24,9 @@ from ..utils.image import (
     get_waves_bg,
     pic_download_from_url,
 )
-from ..utils.imagetool import draw_pic, draw_pic_with_ring
+from ..utils.imagetool import draw_pic_sync, draw_pic_with_ring
 from ..utils.name_convert import char_name_to_char_id
+from ..utils.render_executor import convert_img, render_sync, render_task
 from ..utils.resource.RESOURCE_PATH import CHALLENGE_PATH
 from ..utils.waves_api import waves_api
 
@@ -38,6 +38,7 @@ ERROR_OPEN = "您未打开库街区[全息挑战]的对外展示"
 ERROR_NO_CHALLENGE = "您未通关任何全息战略"
 
 
+@render_task("challenge")
 async def draw_challenge_img(ev: Event, uid: str, user_id: str) -> bytes | str:
     is_self_ck, ck = await waves_api.get_ck_result(uid, user_id, ev.bot_id)
     if not ck:
@@ -68,6 +69,28 @@ async def draw_challenge_img(ev: Event, uid: str, user_id: str) -> bytes | str:
 
     role_info = RoleList.model_validate(role_info.data)
 
+    # 头像 头像环
+    avatar, avatar_ring = await draw_pic_with_ring(ev)
+    # 全息boss图标
+    boss_icons = {}
+    for _challenge in challenge_data.challengeInfo.values():
+        boss_icon_url = _challenge[0].bossIconUrl
+        boss_icons[boss_icon_url] = await pic_download_from_url(CHALLENGE_PATH, boss_icon_url)
+
+    card_img = await draw_challenge_card(challenge_data, account_info, role_info, avatar, avatar_ring, boss_icons)
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+@render_sync("challenge")
+def draw_challenge_card(
+    challenge_data: ChallengeArea,
+    account_info: AccountBaseInfo,
+    role_info: RoleList,
+    avatar: Image.Image,
+    avatar_ring: Image.Image,
+    boss_icons: dict[str, Image.Image],
+) -> Image.Image:
     num = len(challenge_data.challengeInfo)
     a = num // 2 + (0 if num % 2 == 0 else 1)
     h = 300 + a * 260 + 50
@@ -80,8 +103,6 @@ async def draw_challenge_img(ev: Event, uid: str, user_id: str) -> bytes | str:
     base_info_draw.text((226, 173), f"特征码:  {account_info.id}", GOLD, waves_font_25, "lm")
     card_img.paste(base_info_bg, (15, 20), base_info_bg)
 
-    # 头像 头像环
-    avatar, avatar_ring = await draw_pic_with_ring(ev)
     card_img.paste(avatar, (25, 70), avatar)
     card_img.paste(avatar_ring, (35, 80), avatar_ring)
 
@@ -122,7 +143,7 @@ async def draw_challenge_img(ev: Event, uid: str, user_id: str) -> bytes | str:
 
         boss_difficulty = 1
         boss_level = 1
-        boss_icon = await pic_download_from_url(CHALLENGE_PATH, _challenge[0].bossIconUrl)
+        boss_icon = boss_icons[_challenge[0].bossIconUrl]
         boss_icon = boss_icon.resize((242, 156))
         img_temp.alpha_composite(boss_icon, (20, 20))
         for _temp in reversed(_challenge):
@@ -145,10 +166,10 @@ async def draw_challenge_img(ev: Event, uid: str, user_id: str) -> bytes | str:
                 )
                 if not role:
                     roleId = char_name_to_char_id(_role.roleName)
-                    avatar = await draw_pic(roleId)
+                    avatar = draw_pic_sync(roleId)
                     char_bg = Image.open(TEXT_PATH / f"char_bg{5}.png")
                 else:
-                    avatar = await draw_pic(role.roleId)
+                    avatar = draw_pic_sync(role.roleId)
                     char_bg = Image.open(TEXT_PATH / f"char_bg{role.starLevel}.png")
 
                 char_bg_draw = ImageDraw.Draw(char_bg)
@@ -191,5 +212,4 @@ async def draw_challenge_img(ev: Event, uid: str, user_id: str) -> bytes | str:
         challenge_index += 1
 
     card_img = add_footer(card_img, 600, 20)
-    card_img = await convert_img(card_img)
     return card_img
@@ -2,7 +2,6 @@ from pathlib import Path
 
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from PIL import Image, ImageDraw
 
 from ..utils.api.model import (
@@ -22,10 +21,19 @@ from ..utils.fonts.waves_fonts import (
     waves_font_58,
 )
 from ..utils.hint import error_reply
-from ..utils.image import GOLD, GREY, add_footer, draw_text_with_shadow, get_random_share_bg, pic_download_from_url
-from ..utils.imagetool import draw_pic_with_ring, get_square_avatar
+from ..utils.image import (
+    GOLD,
+    GREY,
+    add_footer,
+    draw_text_with_shadow,
+    get_random_share_bg_sync,
+    get_square_avatar_sync,
+    pic_download_from_url,
+)
+from ..utils.imagetool import draw_pic_with_ring
 from ..utils.queues.const import QUEUE_MATRIX_RECORD
 from ..utils.queues.queues import push_item
+from ..utils.render_executor import convert_img, render_sync, render_task
 from ..utils.resource.RESOURCE_PATH import MATRIX_PATH
 from ..utils.util import get_version
 from ..utils.waves_api import waves_api
@@ -68,6 +76,7 @@ async def get_matrix_data(uid: str, ck: str, is_self_ck: bool):
     return matrix_data
 
 
+@render_task("matrix")
 async def draw_matrix_img(ev: Event, uid: str, user_id: str) -> bytes | str:
     is_self_ck, ck = await waves_api.get_ck_result(uid, user_id, ev.bot_id)
     if not ck:
@@ -100,8 +109,51 @@ async def draw_matrix_img(ev: Event, uid: str, user_id: str) -> bytes | str:
         modeIds = [int(text)]
     logger.debug(f"[鸣潮][终焉矩阵] modeIds: {modeIds}")
 
+    # 获取角色详情
+    role_detail_info_map = await get_all_roleid_detail_info(uid)
+
+    # 头像、头像环
+    avatar, avatar_ring = await draw_pic_with_ring(ev)
+    # 增益图标, 下载失败的不绘制
+    buff_icons = {}
+    for mode in matrix_data.modeDetails:
+        if not mode.hasRecord or mode.modeId not in modeIds:
+            continue
+        for team in mode.teams or []:
+            if not team.buffs or not team.buffs[0].buffIcon:
+                continue
+            buff_icon_url = team.buffs[0].buffIcon
+            try:
+                buff_icons[buff_icon_url] = await pic_download_from_url(MATRIX_PATH, buff_icon_url)
+            except Exception:
+                pass
+
+    card_img = await draw_matrix_card(
+        account_info, role_info, matrix_data, modeIds, role_detail_info_map, avatar, avatar_ring, buff_icons
+    )
+    card_img = await convert_img(card_img)
+    # 上传矩阵数据到排行榜
+    await upload_matrix_record(uid, matrix_data, role_info, role_detail_info_map)
+
+    # 保存矩阵数据到本地群排行
+    await save_matrix_to_group_rank(user_id, uid, account_info.name, matrix_data, role_info, role_detail_info_map)
+
+    return card_img
+
+
+@render_sync("matrix")
+def draw_matrix_card(
+    account_info: AccountBaseInfo,
+    role_info: RoleList,
+    matrix_data: MatrixData,
+    modeIds: list[int],
+    role_detail_info_map: dict,
+    avatar: Image.Image,
+    avatar_ring: Image.Image,
+    buff_icons: dict[str, Image.Image],
+) -> Image.Image:
     # 画布 2560 * 1440
-    card_img = await get_random_share_bg()  # 已返回 2560 x 1440 图像
+    card_img = get_random_share_bg_sync()  # 已返回 2560 x 1440 图像
     img = Image.new("RGBA", (2560, 1440), (30, 45, 65, 70))  # 遮罩
     card_img = Image.alpha_composite(card_img, img)
     card_img_draw = ImageDraw.Draw(card_img)
@@ -114,8 +166,6 @@ async def draw_matrix_img(ev: Event, uid: str, user_id: str) -> bytes | str:
     base_info_draw.text((226, 173), f"特征码:  {account_info.id}", GOLD, waves_font_25, "lm")
     base_info_bg.paste(base_info, (-30, -70), base_info)
 
-    # 头像、头像环
-    avatar, avatar_ring = await draw_pic_with_ring(ev)
     base_info_bg.paste(avatar, (-20, -20), avatar)
     base_info_bg.paste(avatar_ring, (-10, -10), avatar_ring)
 
@@ -132,9 +182,6 @@ async def draw_matrix_img(ev: Event, uid: str, user_id: str) -> bytes | str:
     base_info_bg = base_info_bg.resize((int(2560 * 0.8), int(1440 * 0.8)))
     card_img.paste(base_info_bg, (30, 10), base_info_bg)
 
-    # 获取角色详情
-    role_detail_info_map = await get_all_roleid_detail_info(uid)
-
     # 绘制模式数据（改用内容宽度 1220，左右边距 30）
     y_offset = 200
     content_width = 1500 - 60  # 左右边距各30
@@ -308,12 +355,10 @@ async def draw_matrix_img(ev: Event, uid: str, user_id: str) -> bytes | str:
                     buff = team.buffs[0]
                     buff_text = buff.buffName[:4]
                     if buff.buffIcon:
-                        try:
-                            buff_pic = await pic_download_from_url(MATRIX_PATH, buff.buffIcon)
+                        buff_pic = buff_icons.get(buff.buffIcon)
+                        if buff_pic is not None:
                             buff_pic = buff_pic.resize((30, 30), Image.Resampling.LANCZOS)
                             team_bg.paste(buff_pic, ((base_width - 30) // 2, 0), buff_pic)
-                        except Exception:
-                            pass
                     else:
                         team_draw.text((35, 0), f"{buff_text}", "white", waves_font_16, "lm")
 
@@ -326,7 +371,7 @@ async def draw_matrix_img(ev: Event, uid: str, user_id: str) -> bytes | str:
                         role = next((r for r in role_info.roleList if r.roleIconUrl == icon_url), None)
                         if not role:
                             continue
-                        avatar = await get_square_avatar(role.roleId)
+                        avatar = get_square_avatar_sync(role.roleId)
                         avatar = avatar.resize((128, 124), Image.Resampling.LANCZOS)
                         role_bg = role_card_bg.copy()
                         role_bg.paste(avatar, (0, 10), avatar)  # 原始偏移 10px
@@ -366,17 +411,10 @@ async def draw_matrix_img(ev: Event, uid: str, user_id: str) -> bytes | str:
             # 更新 y_offset（所有队伍卡片之后）
             y_offset += total_teams_height
 
-    # 上传矩阵数据到排行榜
-    await upload_matrix_record(uid, matrix_data, role_info, role_detail_info_map)
-
-    # 保存矩阵数据到本地群排行
-    await save_matrix_to_group_rank(user_id, uid, account_info.name, matrix_data, role_info, role_detail_info_map)
-
     # 裁剪画布到实际使用的高度，并添加页脚
     final_height = max(y_offset, 1440)
     card_img = card_img.crop((0, 0, 2560, final_height))
     card_img = add_footer(card_img, 600, 20, color="black")
-    card_img = await convert_img(card_img)
     return card_img
 
 
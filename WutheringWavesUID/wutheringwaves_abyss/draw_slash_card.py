@@ -1,7 +1,6 @@
 from pathlib import Path
 
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from PIL import Image, ImageDraw
 
 from ..utils.api.model import (
@@ -32,9 +31,10 @@ from ..utils.image import (
     get_waves_bg,
     pic_download_from_url,
 )
-from ..utils.imagetool import draw_pic, draw_pic_with_ring
+from ..utils.imagetool import draw_pic_sync, draw_pic_with_ring
 from ..utils.queues.const import QUEUE_SLASH_RECORD
 from ..utils.queues.queues import push_item
+from ..utils.render_executor import convert_img, render_sync, render_task
 from ..utils.resource.RESOURCE_PATH import SLASH_PATH
 from ..utils.waves_api import waves_api
 from ..wutheringwaves_grouprank.models import GroupRankRecord
@@ -95,6 +95,7 @@ async def get_slash_data(uid: str, ck: str, is_self_ck: bool) -> SlashDetail | s
         return SlashDetail.model_validate(slash_data)
 
 
+@render_task("slash")
 async def draw_slash_img(ev: Event, uid: str, user_id: str) -> bytes | str:
     is_self_ck, ck = await waves_api.get_ck_result(uid, user_id, ev.bot_id)
     if not ck:
@@ -161,6 +162,47 @@ async def draw_slash_img(ev: Event, uid: str, user_id: str) -> bytes | str:
 
     role_info = RoleList.model_validate(role_info.data)
 
+    # 根据面板数据获取详细信息
+    role_detail_info_map = await get_all_roleid_detail_info(uid)
+    role_detail_info_map = role_detail_info_map if role_detail_info_map else {}
+
+    # 头像 头像环
+    avatar, avatar_ring = await draw_pic_with_ring(ev)
+    # 队伍、增益图标
+    slash_icons = {}
+    for difficulty in slash_detail.difficultyList:
+        for challenge in difficulty.challengeList:
+            if challenge.challengeId not in query_challenge_ids:
+                continue
+            for slash_half in challenge.halfList:
+                if slash_half is None:
+                    continue
+                for icon_url in (difficulty.teamIcon, slash_half.buffIcon):
+                    if icon_url not in slash_icons:
+                        slash_icons[icon_url] = await pic_download_from_url(SLASH_PATH, icon_url)
+
+    card_img = await draw_slash_card(
+        account_info, slash_detail, query_challenge_ids, role_detail_info_map, avatar, avatar_ring, slash_icons
+    )
+    card_img = await convert_img(card_img)
+    await upload_slash_record(is_self_ck, uid, slash_detail)
+
+    # 保存到群排行数据库
+    await save_to_group_rank(user_id, uid, slash_detail, account_info.name, role_info)
+
+    return card_img
+
+
+@render_sync("slash")
+def draw_slash_card(
+    account_info: AccountBaseInfo,
+    slash_detail: SlashDetail,
+    query_challenge_ids: list[int],
+    role_detail_info_map: dict,
+    avatar: Image.Image,
+    avatar_ring: Image.Image,
+    slash_icons: dict[str, Image.Image],
+) -> Image.Image:
     # 绘制图片
     footer_h = 50
     card_h = 300
@@ -178,8 +220,6 @@ async def draw_slash_img(ev: Event, uid: str, user_id: str) -> bytes | str:
     base_info_draw.text((226, 173), f"特征码:  {account_info.id}", GOLD, waves_font_25, "lm")
     card_img.paste(base_info_bg, (15, 20), base_info_bg)
 
-    # 头像 头像环
-    avatar, avatar_ring = await draw_pic_with_ring(ev)
     card_img.paste(avatar, (25, 70), avatar)
     card_img.paste(avatar_ring, (35, 80), avatar_ring)
 
@@ -202,10 +242,6 @@ async def draw_slash_img(ev: Event, uid: str, user_id: str) -> bytes | str:
     card_draw = ImageDraw.Draw(card_img)
     card_draw.text((620, 280), end_time_str, "white", waves_font_25, "lm")
 
-    # 根据面板数据获取详细信息
-    role_detail_info_map = await get_all_roleid_detail_info(uid)
-    role_detail_info_map = role_detail_info_map if role_detail_info_map else {}
-
     # 绘制挑战信息
     # 倒序
     index = 0
@@ -270,7 +306,7 @@ async def draw_slash_img(ev: Event, uid: str, user_id: str) -> bytes | str:
                     GOLD,
                     waves_font_25,
                 )
-                team_pic = await pic_download_from_url(SLASH_PATH, difficulty.teamIcon)
+                team_pic = slash_icons[difficulty.teamIcon]
                 role_hang_bg.alpha_composite(team_pic, (30, 35))
 
                 # buff
@@ -286,7 +322,7 @@ async def draw_slash_img(ev: Event, uid: str, user_id: str) -> bytes | str:
                     [0, 95, 100, 100],
                     fill=buff_color,
                 )
-                buff_pic = await pic_download_from_url(SLASH_PATH, slash_half.buffIcon)
+                buff_pic = slash_icons[slash_half.buffIcon]
                 buff_pic = buff_pic.resize((100, 100))
                 buff_bg.paste(buff_pic, (0, 0), buff_pic)
 
@@ -296,7 +332,7 @@ async def draw_slash_img(ev: Event, uid: str, user_id: str) -> bytes | str:
                     char_model = get_char_model(slash_role.roleId)
                     if char_model is None:
                         continue
-                    avatar = await draw_pic(slash_role.roleId)
+                    avatar = draw_pic_sync(slash_role.roleId)
                     char_bg = Image.open(TEXT_PATH / f"char_bg{char_model.starLevel}.png")
                     char_bg_draw = ImageDraw.Draw(char_bg)
                     char_bg_draw.text(
@@ -335,14 +371,7 @@ async def draw_slash_img(ev: Event, uid: str, user_id: str) -> bytes | str:
             )
             index += 1
 
-    await upload_slash_record(is_self_ck, uid, slash_detail)
-
     card_img = add_footer(card_img, 600, 20)
-    card_img = await convert_img(card_img)
-
-    # 保存到群排行数据库
-    await save_to_group_rank(user_id, uid, slash_detail, account_info.name, role_info)
-
     return card_img
 
 
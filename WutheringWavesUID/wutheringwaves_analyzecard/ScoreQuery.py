@@ -15,12 +15,13 @@ from opencc import OpenCC
 from PIL import Image, ImageDraw
 
 from ..utils.api.model import Props
-from ..utils.ascension.char import get_char_model
 from ..utils.cache import TimedCache
 from ..utils.calculate import (
     calc_phantom_entry,
     calc_phantom_score,
     get_calc_map,
+    get_char_attribute_name,
+    get_max_score,
     get_valid_color,
 )
 from ..utils.fonts.waves_fonts import (
@@ -251,13 +252,10 @@ async def draw_score(char_name: str, char_id: str, props: list[Props], cost: int
     sh_calc_map_draw.text((40, 165), f"[评分模版]：{calc_map['name']}", "white", waves_font_24, "lm")
 
     sh_temp = Image.new("RGBA", (404, 402), (25, 35, 55, 0))
+    char_attr = get_char_attribute_name(str(char_id))
+    max_score, _ = get_max_score(cost, calc_map)
     for index, _prop in enumerate(props):
-        char_model = get_char_model(char_id)
-        char_attr = ""
-        if char_model:
-            char_attr = char_model.get_attribute_name()
-
-        _, score = calc_phantom_entry(index, _prop, cost, calc_map, char_attr)
+        _, score = calc_phantom_entry(index, _prop, cost, calc_map, char_attr, max_score)
         logger.debug(f"{char_name} [属性]: {_prop.attributeName} {_prop.attributeValue} [评分]: {score}")
 
         font = waves_font_20 if index == 1 else waves_font_24
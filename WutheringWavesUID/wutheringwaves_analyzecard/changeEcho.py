@@ -1,8 +1,6 @@
 import copy
-import json
 import re
 
-import aiofiles
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
@@ -12,7 +10,7 @@ from ..utils.error_reply import WAVES_CODE_103
 from ..utils.hint import error_reply
 from ..utils.name_convert import alias_to_char_name, alias_to_sonata_name, phantom_id_to_phantom_name
 from ..utils.refresh_char_detail import save_card_info
-from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
+from ..utils.role_store import load_all_roles
 from ..utils.waves_api import waves_api
 from ..wutheringwaves_config import PREFIX
 from .char_fetterDetail import get_fetterDetail_from_sonata, get_first_echo_id_list
@@ -67,22 +65,11 @@ async def change_echo(bot: Bot, ev: Event):
 
 
 async def get_local_all_role_detail(uid: str) -> tuple[bool, dict]:
-    _dir = PLAYER_PATH / uid
-    _dir.mkdir(parents=True, exist_ok=True)
-    path = _dir / "rawData.json"
-
-    role_data = {}
-    if path.exists():
-        try:
-            async with aiofiles.open(path, encoding="utf-8") as f:
-                data = json.loads(await f.read())
-                role_data = {d["role"]["roleId"]: d for d in data}
-        except Exception as e:
-            logger.error(f"[鸣潮] 基础数据get failed {path}:", e)
-            path.unlink(missing_ok=True)
-    else:
-        return False, role_data
+    data = await load_all_roles(uid)
+    if data is None:
+        return False, {}
 
+    role_data = {d["role"]["roleId"]: d for d in data}
     return True, role_data
 
 
@@ -274,31 +261,19 @@ async def change_sonata_and_first_echo(bot: Bot, char_id: int, sonata_a: str | N
 
 
 async def get_local_all_role_info(uid: str) -> tuple[bool, dict]:
-    _dir = PLAYER_PATH / uid
-    _dir.mkdir(parents=True, exist_ok=True)
-    path = _dir / "rawData.json"
-
     # 初始化标准数据结构
     role_data = {"roleList": [], "showRoleIdList": [], "showToGuest": False}
 
-    if not path.exists():
+    raw_data = await load_all_roles(uid)
+    if raw_data is None:
         return False, role_data
 
-    try:
-        async with aiofiles.open(path, encoding="utf-8") as f:
-            raw_data = json.loads(await f.read())
+    # 正确解析角色列表
+    for item in raw_data:
+        if "role" in item:
+            role_data["roleList"].append(item["role"])
 
-            # 正确解析角色列表
-            if isinstance(raw_data, list):
-                for item in raw_data:
-                    if "role" in item:
-                        role_data["roleList"].append(item["role"])
-
-        return True, role_data
-    except Exception as e:
-        logger.error(f"[鸣潮] 数据解析失败 {path}:", e)
-        path.unlink(missing_ok=True)
-        return False, role_data
+    return True, role_data
 
 
 async def change_weapon_resonLevel(waves_id: str, char: str, reson_level: int):
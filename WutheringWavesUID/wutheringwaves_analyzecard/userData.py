@@ -10,8 +10,8 @@ from ..utils.ascension.echo import get_echo_model
 from ..utils.ascension.weapon import get_weapon_detail
 from ..utils.name_convert import alias_to_weapon_name, char_id_to_char_name, phantom_id_to_phantom_name, weapon_name_to_weapon_id
 from ..utils.refresh_char_detail import save_card_info
+from ..utils.role_store import load_role
 from ..wutheringwaves_config import PREFIX, WutheringWavesConfig
-from .changeEcho import get_local_all_role_detail
 from .char_fetterDetail import echo_data_to_cost, get_fetterDetail_from_char, get_fetterDetail_from_sonata
 from .Phantom_check import PhantomValidator
 from .user_info_utils import get_region_by_uid, save_user_info
@@ -251,8 +251,7 @@ async def check_phantom_data(data) -> tuple[bool, dict | str]:
 
 async def compare_update_card_info(uid, waves_data):
     """避免覆盖更新角色数据(角色等级、武器等级、武器谐振*、技能等级*)到本地"""
-    _, all_data = await get_local_all_role_detail(uid)
-    existing_data = all_data.get(waves_data["role"]["roleId"], {})
+    existing_data = await load_role(uid, waves_data["role"]["roleId"]) or {}
     if not existing_data:
         return waves_data
 
@@ -1,10 +1,10 @@
 import copy
+from functools import partial
 from pathlib import Path
 import re
 
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 import httpx
 from PIL import Image, ImageDraw, ImageEnhance
@@ -12,7 +12,9 @@ from PIL import Image, ImageDraw, ImageEnhance
 from ..utils import hint
 from ..utils.api.model import (
     AccountBaseInfo,
+    EquipPhantom,
     OnlineRoleList,
+    Props,
     RoleDetailData,
     WeaponData,
 )
@@ -35,7 +37,7 @@ from ..utils.calculate import (
     get_total_score_bg,
     get_valid_color,
 )
-from ..utils.char_info_utils import get_all_roleid_detail_info, get_role_detail_online
+from ..utils.char_info_utils import get_role_detail_info, get_role_detail_online
 from ..utils.damage.abstract import DamageDetailRegister
 from ..utils.error_reply import WAVES_CODE_102
 from ..utils.fonts.waves_fonts import (
@@ -52,6 +54,7 @@ from ..utils.fonts.waves_fonts import (
     waves_font_42,
     waves_font_50,
 )
+from ..utils.fragment_cache import fragment_cache
 from ..utils.image import (
     GOLD,
     GREY,
@@ -61,22 +64,25 @@ from ..utils.image import (
     WAVES_SHUXING_MAP,
     WEAPON_RESONLEVEL_COLOR,
     add_footer,
-    change_color,
+    change_color_sync,
     draw_text_with_shadow,
-    get_attribute,
-    get_attribute_effect,
-    get_attribute_prop,
-    get_custom_gaussian_blur,
+    get_attribute_effect_sync,
+    get_attribute_prop_sync,
+    get_attribute_sync,
+    get_custom_gaussian_blur_sync,
     get_event_avatar,
-    get_role_pile,
+    get_role_pile_sync,
     get_small_logo,
     get_square_avatar,
-    get_square_weapon,
+    get_square_weapon_path,
+    get_square_weapon_sync,
     get_user_avatar,
     get_waves_bg,
-    get_weapon_type,
+    get_weapon_type_sync,
+    resource_mtime,
 )
 from ..utils.name_convert import alias_to_char_name, char_name_to_char_id
+from ..utils.render_executor import convert_img, render_sync, render_task
 from ..utils.resource.constant import (
     ATTRIBUTE_ID_MAP,
     DEAFAULT_WEAPON_ID,
@@ -86,10 +92,18 @@ from ..utils.resource.constant import (
     get_short_name,
 )
 from ..utils.resource.download_file import (
-    get_chain_img,
-    get_phantom_img,
-    get_skill_img,
+    download_chain_img,
+    download_phantom_img,
+    download_skill_img,
+    get_chain_img_path,
+    get_chain_img_sync,
+    get_phantom_img_path,
+    get_phantom_img_sync,
+    get_skill_img_path,
+    get_skill_img_sync,
 )
+from ..utils.response_cache import response_cache
+from ..utils.texture import get_texture, load_texture
 from ..utils.waves_api import waves_api
 from ..wutheringwaves_analyzecard.user_info_utils import get_user_detail_info
 from ..wutheringwaves_config import PREFIX
@@ -163,8 +177,8 @@ weight_list = [
     "共鸣解放伤害加成",
 ]
 
-damage_bar1 = Image.open(TEXT_PATH / "damage_bar1.png")
-damage_bar2 = Image.open(TEXT_PATH / "damage_bar2.png")
+damage_bar1 = get_texture(TEXT_PATH / "damage_bar1.png")
+damage_bar2 = get_texture(TEXT_PATH / "damage_bar2.png")
 
 
 async def get_one_rank(item: OneRankRequest) -> OneRankResponse | None:
@@ -235,7 +249,123 @@ def parse_text_and_number(text):
         return text, None
 
 
-async def ph_card_draw(
+def draw_phantom_tile(
+    _phantom: EquipPhantom | None,
+    props: list[Props] | None,
+    _score: float,
+    _bg: str,
+    calc_temp: dict | None,
+) -> Image.Image:
+    """单个声骸卡片, 按绘制内容缓存, 返回的图片不能修改"""
+    if not (_phantom and _phantom.phantomProp and props is not None):
+
+        def render_empty() -> Image.Image:
+            sh_temp = Image.new("RGBA", (350, 550))
+            sh_temp.alpha_composite(get_texture(TEXT_PATH / "sh_bg.png"), dest=(0, 0))
+            return sh_temp
+
+        return fragment_cache.get_or_render_sync(("phantom_tile",), render_empty)
+
+    phantom_prop = _phantom.phantomProp
+    prop_colors = [
+        ("white", "white") if index <= 1 else get_valid_color(_prop.attributeName, _prop.attributeValue, calc_temp)
+        for index, _prop in enumerate(props)
+    ]
+
+    def render() -> Image.Image:
+        sh_temp = Image.new("RGBA", (350, 550))
+        sh_temp_draw = ImageDraw.Draw(sh_temp)
+        sh_bg = get_texture(TEXT_PATH / "sh_bg.png")
+        sh_temp.alpha_composite(sh_bg, dest=(0, 0))
+        sh_title = get_texture(TEXT_PATH / f"sh_title_{_bg}.png")
+
+        sh_temp.alpha_composite(sh_title, dest=(0, 0))
+
+        phantom_icon = get_phantom_img_sync(phantom_prop.phantomId, phantom_prop.iconUrl)
+        fetter_icon = get_attribute_effect_sync(_phantom.fetterDetail.name)
+        fetter_icon = fetter_icon.resize((50, 50))
+        phantom_icon.alpha_composite(fetter_icon, dest=(205, 0))
+        phantom_icon = phantom_icon.resize((100, 100))
+        sh_temp.alpha_composite(phantom_icon, dest=(20, 20))
+        phantomName = phantom_prop.name.replace("·", " ").replace("（", " ").replace("）", "")
+        short_name = get_short_name(phantom_prop.phantomId, phantomName)
+        sh_temp_draw.text((130, 40), f"{short_name}", SPECIAL_GOLD, waves_font_28, "lm")
+
+        # 声骸等级背景
+        ph_level_img = Image.new("RGBA", (84, 30), (255, 255, 255, 0))
+        ph_level_img_draw = ImageDraw.Draw(ph_level_img)
+        ph_level_img_draw.rounded_rectangle([0, 0, 84, 30], radius=8, fill=(0, 0, 0, int(0.8 * 255)))
+        ph_level_img_draw.text((8, 13), f"Lv.{_phantom.level}", "white", waves_font_24, "lm")
+        sh_temp.alpha_composite(ph_level_img, (128, 58))
+
+        # 声骸分数背景
+        ph_score_img = Image.new("RGBA", (100, 30), (255, 255, 255, 0))
+        ph_score_img_draw = ImageDraw.Draw(ph_score_img)
+        ph_score_img_draw.rounded_rectangle([0, 0, 100, 30], radius=8, fill=(186, 55, 42, int(0.8 * 255)))
+        ph_score_img_draw.text((50, 13), f"{_score}分", "white", waves_font_24, "mm")
+        sh_temp.alpha_composite(ph_score_img, (223, 58))
+
+        for index in range(0, _phantom.cost):
+            promote_icon = get_texture(TEXT_PATH / "promote_icon.png", (30, 30))
+            sh_temp.alpha_composite(promote_icon, dest=(128 + 30 * index, 90))
+
+        for index, _prop in enumerate(props):
+            oset = 55
+            prop_img = get_attribute_prop_sync(_prop.attributeName)
+            prop_img = prop_img.resize((40, 40))
+            sh_temp.alpha_composite(prop_img, (15, 167 + index * oset))
+            sh_temp_draw = ImageDraw.Draw(sh_temp)
+            name_color, num_color = prop_colors[index]
+            sh_temp_draw.text(
+                (60, 187 + index * oset),
+                f"{_prop.attributeName[:6]}",
+                name_color,
+                waves_font_24,
+                "lm",
+            )
+            sh_temp_draw.text(
+                (343, 187 + index * oset),
+                f"{_prop.attributeValue}",
+                num_color,
+                waves_font_24,
+                "rm",
+            )
+        return sh_temp
+
+    parts = (
+        "phantom_tile",
+        phantom_prop.phantomId,
+        phantom_prop.iconUrl,
+        resource_mtime(get_phantom_img_path(phantom_prop.phantomId)),
+        phantom_prop.name,
+        _phantom.fetterDetail.name,
+        _phantom.level,
+        _phantom.cost,
+        _score,
+        _bg,
+        tuple((_prop.attributeName, _prop.attributeValue, colors) for _prop, colors in zip(props, prop_colors)),
+    )
+    return fragment_cache.get_or_render_sync(parts, render)
+
+
+async def download_role_detail_img(role_detail: RoleDetailData, need_chain_skill: bool = True):
+    """绘图线程中只读取本地图片, 绘制前先下载面板用到的声骸、共鸣链和技能图标"""
+    if role_detail.phantomData and role_detail.phantomData.equipPhantomList:
+        for _phantom in role_detail.phantomData.equipPhantomList:
+            if _phantom and _phantom.phantomProp:
+                await download_phantom_img(_phantom.phantomProp.phantomId, _phantom.phantomProp.iconUrl)
+    if not need_chain_skill:
+        return
+
+    role_id = role_detail.role.roleId
+    for _mz in role_detail.chainList:
+        await download_chain_img(role_id, _mz.order, _mz.iconUrl)  # type: ignore
+    for _skill in role_detail.get_skill_list():
+        if _skill.skill.type != "延奏技能" and _skill.skill.type != "谐度破坏":
+            await download_skill_img(role_id, _skill.skill.name, _skill.skill.iconUrl)
+
+
+def ph_card_draw(
     ph_sum_value,
     role_detail: RoleDetailData,
     is_draw=True,
@@ -245,11 +375,11 @@ async def ph_card_draw(
     char_name = role_detail.role.roleName
 
     phantom_temp = Image.new("RGBA", (1200, 1280 + ph_sum_value))
-    banner3 = Image.open(TEXT_PATH / "banner3.png")
+    banner3 = get_texture(TEXT_PATH / "banner3.png")
     phantom_temp.alpha_composite(banner3, dest=(0, 0))
 
-    ph_0 = Image.open(TEXT_PATH / "ph_0.png")
-    ph_1 = Image.open(TEXT_PATH / "ph_1.png")
+    ph_0 = get_texture(TEXT_PATH / "ph_0.png")
+    ph_1 = get_texture(TEXT_PATH / "ph_1.png")
     #  phantom_sum_value = {}
     calc = WuWaCalc(role_detail, enemy_detail)
     if role_detail.phantomData and role_detail.phantomData.equipPhantomList:
@@ -265,73 +395,13 @@ async def ph_card_draw(
         )
 
         for i, _phantom in enumerate(equipPhantomList):
-            sh_temp = Image.new("RGBA", (350, 550))
-            sh_temp_draw = ImageDraw.Draw(sh_temp)
-            sh_bg = Image.open(TEXT_PATH / "sh_bg.png")
-            sh_temp.alpha_composite(sh_bg, dest=(0, 0))
+            props, _score, _bg = None, 0, ""
             if _phantom and _phantom.phantomProp:
                 props = _phantom.get_props()
                 _score, _bg = calc_phantom_score(role_detail.role.roleId, props, _phantom.cost, calc.calc_temp)
-
                 phantom_score += _score
-                sh_title = Image.open(TEXT_PATH / f"sh_title_{_bg}.png")
-
-                sh_temp.alpha_composite(sh_title, dest=(0, 0))
-
-                phantom_icon = await get_phantom_img(_phantom.phantomProp.phantomId, _phantom.phantomProp.iconUrl)
-                fetter_icon = await get_attribute_effect(_phantom.fetterDetail.name)
-                fetter_icon = fetter_icon.resize((50, 50))
-                phantom_icon.alpha_composite(fetter_icon, dest=(205, 0))
-                phantom_icon = phantom_icon.resize((100, 100))
-                sh_temp.alpha_composite(phantom_icon, dest=(20, 20))
-                phantomName = _phantom.phantomProp.name.replace("·", " ").replace("（", " ").replace("）", "")
-                short_name = get_short_name(_phantom.phantomProp.phantomId, phantomName)
-                sh_temp_draw.text((130, 40), f"{short_name}", SPECIAL_GOLD, waves_font_28, "lm")
-
-                # 声骸等级背景
-                ph_level_img = Image.new("RGBA", (84, 30), (255, 255, 255, 0))
-                ph_level_img_draw = ImageDraw.Draw(ph_level_img)
-                ph_level_img_draw.rounded_rectangle([0, 0, 84, 30], radius=8, fill=(0, 0, 0, int(0.8 * 255)))
-                ph_level_img_draw.text((8, 13), f"Lv.{_phantom.level}", "white", waves_font_24, "lm")
-                sh_temp.alpha_composite(ph_level_img, (128, 58))
-
-                # 声骸分数背景
-                ph_score_img = Image.new("RGBA", (100, 30), (255, 255, 255, 0))
-                ph_score_img_draw = ImageDraw.Draw(ph_score_img)
-                ph_score_img_draw.rounded_rectangle([0, 0, 100, 30], radius=8, fill=(186, 55, 42, int(0.8 * 255)))
-                ph_score_img_draw.text((50, 13), f"{_score}分", "white", waves_font_24, "mm")
-                sh_temp.alpha_composite(ph_score_img, (223, 58))
-
-                for index in range(0, _phantom.cost):
-                    promote_icon = Image.open(TEXT_PATH / "promote_icon.png")
-                    promote_icon = promote_icon.resize((30, 30))
-                    sh_temp.alpha_composite(promote_icon, dest=(128 + 30 * index, 90))
-
-                for index, _prop in enumerate(props):
-                    oset = 55
-                    prop_img = await get_attribute_prop(_prop.attributeName)
-                    prop_img = prop_img.resize((40, 40))
-                    sh_temp.alpha_composite(prop_img, (15, 167 + index * oset))
-                    sh_temp_draw = ImageDraw.Draw(sh_temp)
-                    name_color = "white"
-                    num_color = "white"
-                    if index > 1:
-                        name_color, num_color = get_valid_color(_prop.attributeName, _prop.attributeValue, calc.calc_temp)
-                    sh_temp_draw.text(
-                        (60, 187 + index * oset),
-                        f"{_prop.attributeName[:6]}",
-                        name_color,
-                        waves_font_24,
-                        "lm",
-                    )
-                    sh_temp_draw.text(
-                        (343, 187 + index * oset),
-                        f"{_prop.attributeValue}",
-                        num_color,
-                        waves_font_24,
-                        "rm",
-                    )
             if is_draw:
+                sh_temp = draw_phantom_tile(_phantom, props, _score, _bg, calc.calc_temp)
                 phantom_temp.alpha_composite(
                     sh_temp,
                     dest=(
@@ -343,10 +413,10 @@ async def ph_card_draw(
         if phantom_score > 0:
             phantom_score = round(phantom_score, 2)
             _bg = get_total_score_bg(char_name, phantom_score, calc.calc_temp)
-            sh_score_bg_c = Image.open(TEXT_PATH / f"sh_score_bg_{_bg}.png")
+            sh_score_bg_c = get_texture(TEXT_PATH / f"sh_score_bg_{_bg}.png")
             score_temp = Image.new("RGBA", sh_score_bg_c.size)
             score_temp.alpha_composite(sh_score_bg_c)
-            sh_score_c = Image.open(TEXT_PATH / f"sh_score_{_bg}.png")
+            sh_score_c = get_texture(TEXT_PATH / f"sh_score_{_bg}.png")
             score_temp.alpha_composite(sh_score_c)
             score_temp_draw = ImageDraw.Draw(score_temp)
 
@@ -354,7 +424,7 @@ async def ph_card_draw(
             score_temp_draw.text((180, 380), f"{phantom_score:.2f}分", "white", waves_font_40, "mm")
             score_temp_draw.text((180, 440), "声骸评分", GREY, waves_font_40, "mm")
         else:
-            abs_bg = Image.open(TEXT_PATH / "abs.png")
+            abs_bg = get_texture(TEXT_PATH / "abs.png")
             score_temp = Image.new("RGBA", abs_bg.size)
             score_temp.alpha_composite(abs_bg)
             score_temp_draw = ImageDraw.Draw(score_temp)
@@ -370,12 +440,12 @@ async def ph_card_draw(
                 name, default_value = name_default
                 if name == "属性伤害加成":
                     value = calc.phantom_card.get(shuxing, default_value)
-                    prop_img = await get_attribute_prop(shuxing)
+                    prop_img = get_attribute_prop_sync(shuxing)
                     name_color, _ = get_valid_color(shuxing, value, calc.calc_temp)
                     name = shuxing
                 else:
                     value = calc.phantom_card.get(name, default_value)
-                    prop_img = await get_attribute_prop(name)
+                    prop_img = get_attribute_prop_sync(name)
                     name_color, _ = get_valid_color(name, value, calc.calc_temp)
                 prop_img = prop_img.resize((40, 40))
                 ph_bg = ph_0.copy() if ni % 2 == 0 else ph_1.copy()
@@ -452,18 +522,14 @@ async def get_role_need(
             if not waves_id
             else await draw_char_with_ring(char_id)
         )
-        all_role_detail: dict[str, RoleDetailData] | None = await get_all_roleid_detail_info(uid)
-
         if char_id in SPECIAL_CHAR:
             query_list = SPECIAL_CHAR.copy()[char_id]
         else:
             query_list = [char_id]
 
-        for temp_char_id in query_list:
-            if all_role_detail and temp_char_id in all_role_detail:
-                role_detail: RoleDetailData = all_role_detail[temp_char_id]
-                break
-        else:
+        # 只读取需要的角色
+        role_detail: RoleDetailData | None = await get_role_detail_info(uid, query_list)
+        if not role_detail:
             if is_limit_query:
                 return (
                     None,
@@ -487,22 +553,21 @@ async def get_role_need(
     return avatar, role_detail
 
 
-async def draw_fixed_img(img, avatar, account_info, role_detail):
+def draw_fixed_img(img, avatar, account_info, role_detail):
     # 头像部分
-    avatar_ring = Image.open(TEXT_PATH / "avatar_ring.png")
+    avatar_ring = get_texture(TEXT_PATH / "avatar_ring.png", (180, 180))
 
     img.paste(avatar, (45, 20), avatar)
-    avatar_ring = avatar_ring.resize((180, 180))
     img.paste(avatar_ring, (55, 30), avatar_ring)
 
-    base_info_bg = Image.open(TEXT_PATH / "base_info_bg.png")
+    base_info_bg = load_texture(TEXT_PATH / "base_info_bg.png")
     base_info_draw = ImageDraw.Draw(base_info_bg)
     base_info_draw.text((275, 120), f"{account_info.name[:7]}", "white", waves_font_30, "lm")
     base_info_draw.text((226, 173), f"特征码:  {account_info.id}", GOLD, waves_font_25, "lm")
     img.paste(base_info_bg, (35, -30), base_info_bg)
 
     if account_info.is_full:
-        title_bar = Image.open(TEXT_PATH / "title_bar.png")
+        title_bar = load_texture(TEXT_PATH / "title_bar.png")
         title_bar_draw = ImageDraw.Draw(title_bar)
         title_bar_draw.text((510, 125), "账号等级", GREY, waves_font_26, "mm")
         title_bar_draw.text((510, 78), f"Lv.{account_info.level}", "white", waves_font_42, "mm")
@@ -515,14 +580,14 @@ async def draw_fixed_img(img, avatar, account_info, role_detail):
         img.paste(title_bar, (200, 15), title_bar)
 
     # 左侧pile部分
-    is_custom, role_pile = await get_role_pile(role_detail.role.roleId, True)
-    char_mask = Image.open(TEXT_PATH / "char_mask.png")
-    char_fg = Image.open(TEXT_PATH / "char_fg.png")
+    is_custom, role_pile = get_role_pile_sync(role_detail.role.roleId, True)
+    char_mask = get_texture(TEXT_PATH / "char_mask.png")
+    char_fg = load_texture(TEXT_PATH / "char_fg.png")
 
-    role_attribute = await get_attribute(role_detail.role.attributeName)
+    role_attribute = get_attribute_sync(role_detail.role.attributeName)
     role_attribute = role_attribute.resize((50, 50)).convert("RGBA")
     char_fg.paste(role_attribute, (434, 112), role_attribute)
-    weapon_type = await get_weapon_type(role_detail.role.weaponTypeName)
+    weapon_type = get_weapon_type_sync(role_detail.role.weaponTypeName)
     weapon_type = weapon_type.resize((40, 40)).convert("RGBA")
     char_fg.paste(weapon_type, (439, 182), weapon_type)
 
@@ -596,6 +661,142 @@ def resize_and_center_image(image, output_size=(560, 1000), background_color=(25
     return result_image
 
 
+def draw_weapon_block(weaponData: WeaponData) -> Image.Image:
+    """右侧武器区块, 按绘制内容缓存, 返回的图片不能修改"""
+    weapon_breach = get_breach(weaponData.breach, weaponData.level)
+    weapon_detail: WavesWeaponResult = get_weapon_detail(
+        weaponData.weapon.weaponId,
+        weaponData.level,
+        weaponData.breach,
+        weaponData.resonLevel,
+    )
+    weapon_stats = tuple((stat["name"], stat["value"]) for stat in weapon_detail.stats[:2])
+
+    def render() -> Image.Image:
+        weapon_bg = get_texture(TEXT_PATH / "weapon_bg.png")
+        weapon_bg_temp = Image.new("RGBA", weapon_bg.size)
+        weapon_bg_temp.alpha_composite(weapon_bg, dest=(0, 0))
+
+        weapon_icon = get_square_weapon_sync(weaponData.weapon.weaponId)
+        weapon_icon = crop_center_img(weapon_icon, 110, 110)
+        weapon_icon_bg = get_weapon_icon_bg(weaponData.weapon.weaponStarLevel)
+        weapon_icon_bg.paste(weapon_icon, (10, 20), weapon_icon)
+
+        weapon_bg_temp_draw = ImageDraw.Draw(weapon_bg_temp)
+        weapon_bg_temp_draw.text((200, 70), f"{weaponData.weapon.weaponName}", SPECIAL_GOLD, waves_font_40, "lm")
+        weapon_bg_temp_draw.text((203, 115), f"Lv.{weaponData.level}/90", "white", waves_font_30, "lm")
+
+        _x = 220 + 43 * len(weaponData.weapon.weaponName)
+        _y = 77
+        wrc_fill = WEAPON_RESONLEVEL_COLOR[weaponData.resonLevel] + (int(0.8 * 255),)  # type: ignore
+        weapon_bg_temp_draw.rounded_rectangle([_x - 15, _y - 15, _x + 50, _y + 15], radius=7, fill=wrc_fill)
+
+        weapon_bg_temp_draw.text((_x, _y), f"精{weaponData.resonLevel}", "white", waves_font_24, "lm")
+
+        for i in range(0, weapon_breach):  # type: ignore
+            promote_icon = get_texture(TEXT_PATH / "promote_icon.png")
+            weapon_bg_temp.alpha_composite(promote_icon, dest=(200 + 40 * i, 140))
+
+        weapon_bg_temp.alpha_composite(weapon_icon_bg, dest=(45, 40))
+
+        for index, (stat_name, stat_value) in enumerate(weapon_stats):
+            stats_img = get_attribute_prop_sync(stat_name)
+            stats_img = stats_img.resize((40, 40))
+            weapon_bg_temp.alpha_composite(stats_img, (65, 187 + index * 50))
+            weapon_bg_temp_draw.text((130, 207 + index * 50), f"{stat_name}", "white", waves_font_30, "lm")
+            weapon_bg_temp_draw.text((500, 207 + index * 50), f"{stat_value}", "white", waves_font_30, "rm")
+        return weapon_bg_temp
+
+    parts = (
+        "weapon",
+        weaponData.weapon.weaponId,
+        resource_mtime(get_square_weapon_path(weaponData.weapon.weaponId)),
+        weaponData.weapon.weaponName,
+        weaponData.weapon.weaponStarLevel,
+        weaponData.level,
+        weapon_breach,
+        weaponData.resonLevel,
+        weapon_stats,
+    )
+    return fragment_cache.get_or_render_sync(parts, render)
+
+
+def draw_chain_strip(role_detail: RoleDetailData) -> Image.Image:
+    """共鸣链区块, 按绘制内容缓存, 返回的图片不能修改"""
+    role_id = role_detail.role.roleId
+    shuxing_color = WAVES_SHUXING_MAP[role_detail.role.attributeName]  # type: ignore
+    chains = tuple(
+        (_mz.order, _mz.iconUrl, _mz.name, _mz.unlocked, resource_mtime(get_chain_img_path(role_id, _mz.order)))
+        for _mz in role_detail.chainList
+    )
+
+    def render() -> Image.Image:
+        mz_temp = Image.new("RGBA", (1200, 300))
+        for i, (order, icon_url, chain_name, unlocked, _) in enumerate(chains):
+            mz_bg = load_texture(TEXT_PATH / "mz_bg.png")
+            mz_bg_temp = Image.new("RGBA", mz_bg.size)
+            mz_bg_temp_draw = ImageDraw.Draw(mz_bg_temp)
+            chain = get_chain_img_sync(role_id, order, icon_url)  # type: ignore
+            chain = chain.resize((100, 100))
+            mz_bg.paste(chain, (95, 75), chain)
+            mz_bg_temp.alpha_composite(mz_bg, dest=(0, 0))
+            if unlocked:
+                mz_bg_temp = change_color_sync(mz_bg_temp, shuxing_color)
+
+            name = re.sub(r'[",，]+', "", chain_name) if chain_name else ""
+            if len(name) >= 8:
+                mz_bg_temp_draw.text((147, 230), f"{name}", "white", waves_font_16, "mm")
+            else:
+                mz_bg_temp_draw.text((147, 230), f"{name}", "white", waves_font_20, "mm")
+
+            if not unlocked:
+                mz_bg_temp = ImageEnhance.Brightness(mz_bg_temp).enhance(0.3)
+            mz_temp.alpha_composite(mz_bg_temp, dest=(i * 190, 0))
+        return mz_temp
+
+    return fragment_cache.get_or_render_sync(("chain", role_id, shuxing_color, chains), render)
+
+
+def draw_skill_bar(role_detail: RoleDetailData) -> Image.Image:
+    """技能区块, 按绘制内容缓存, 返回的图片不能修改"""
+    role_id = role_detail.role.roleId
+    skills = tuple(
+        (
+            _skill.skill.type,
+            _skill.skill.name,
+            _skill.skill.iconUrl,
+            _skill.level,
+            resource_mtime(get_skill_img_path(role_id, _skill.skill.name)),
+        )
+        for _skill in role_detail.get_skill_list()
+        if _skill.skill.type != "延奏技能" and _skill.skill.type != "谐度破坏"
+    )
+
+    def render() -> Image.Image:
+        skill_bar = load_texture(TEXT_PATH / "skill_bar.png")
+        skill_bg_1 = get_texture(TEXT_PATH / "skill_bg.png")
+
+        for temp_i, (skill_type, skill_name, icon_url, skill_level, _) in enumerate(skills):
+            skill_bg = skill_bg_1.copy()
+            skill_img = get_skill_img_sync(role_id, skill_name, icon_url)
+            skill_img = skill_img.resize((70, 70))
+            skill_bg.paste(skill_img, (57, 65), skill_img)
+
+            skill_bg_draw = ImageDraw.Draw(skill_bg)
+            skill_bg_draw.text((150, 83), f"{skill_type}", "white", waves_font_25, "lm")
+            skill_bg_draw.text((150, 113), f"Lv.{skill_level}", "white", waves_font_25, "lm")
+
+            skill_bg_temp = Image.new("RGBA", skill_bg.size)
+            skill_bg_temp = Image.alpha_composite(skill_bg_temp, skill_bg)
+
+            _x = 20 + temp_i * 215
+            _y = -20
+            skill_bar.alpha_composite(skill_bg_temp, dest=(_x, _y))
+        return skill_bar
+
+    return fragment_cache.get_or_render_sync(("skill", role_id, skills), render)
+
+
 async def draw_char_detail_img(
     ev: Event,
     uid: str,
@@ -607,6 +808,43 @@ async def draw_char_detail_img(
     change_list_regex=None,
     is_limit_query=False,
     is_refresh: int = 0,
+):
+    render = partial(
+        _draw_char_detail_img,
+        ev,
+        uid,
+        char,
+        user_id,
+        waves_id,
+        need_convert_img,
+        is_force_avatar,
+        change_list_regex,
+        is_limit_query,
+        is_refresh,
+    )
+    # 换装/强制头像/刷新标识的结果不缓存
+    if not need_convert_img or is_force_avatar or change_list_regex or is_refresh != 0:
+        return await render()
+    return await response_cache.get_or_render(
+        "char_detail",
+        waves_id or uid,
+        (char, user_id, ev.bot_id, is_limit_query),
+        render,
+    )
+
+
+@render_task("char_detail")
+async def _draw_char_detail_img(
+    ev: Event,
+    uid: str,
+    char: str,
+    user_id,
+    waves_id: str | None = None,
+    need_convert_img=True,
+    is_force_avatar=False,
+    change_list_regex=None,
+    is_limit_query=False,
+    is_refresh: int = 0,
 ):
     char, damageId = parse_text_and_number(char)
 
@@ -695,12 +933,12 @@ async def draw_char_detail_img(
     oneRank: OneRankResponse | None = None
     enemy_detail: EnemyDetailData | None = EnemyDetailData()
     if change_list_regex:
+        # 面板数据来自缓存, 修改前先复制
         temp = copy.deepcopy(role_detail)
         try:
-            role_detail, change_command = await change_role_detail(uid, ck, role_detail, enemy_detail, change_list_regex)
+            role_detail, change_command = await change_role_detail(uid, ck, temp, enemy_detail, change_list_regex)
         except Exception as e:
             logger.exception("角色数据转换错误", e)
-            role_detail = temp
     else:
         if not is_limit_query:
             # 非极限面板查询时，获取评分排名
@@ -708,8 +946,49 @@ async def draw_char_detail_img(
             if oneRank and len(oneRank.data) > 0:
                 dd_len += 60 * 2
 
+    await download_role_detail_img(role_detail)
+    img = await draw_char_detail_card(
+        role_detail,
+        account_info,
+        avatar,
+        enemy_detail,
+        damage_calc,
+        damageDetail,
+        oneRank,
+        char_name,
+        change_command,
+        isDraw,
+        ph_sum_value,
+        jineng_len,
+        echo_list,
+        dd_len,
+        is_refresh,
+    )
+    if need_convert_img:
+        img = await convert_img(img)
+    return img
+
+
+@render_sync("char_detail")
+def draw_char_detail_card(
+    role_detail: RoleDetailData,
+    account_info: AccountBaseInfo,
+    avatar: Image.Image,
+    enemy_detail: EnemyDetailData | None,
+    damage_calc,
+    damageDetail,
+    oneRank: OneRankResponse | None,
+    char_name: str,
+    change_command: str,
+    isDraw: bool,
+    ph_sum_value: int,
+    jineng_len: int,
+    echo_list: int,
+    dd_len: int,
+    is_refresh: int,
+) -> Image.Image:
     # 声骸
-    calc, phantom_temp = await ph_card_draw(ph_sum_value, role_detail, isDraw, change_command, enemy_detail)
+    calc, phantom_temp = ph_card_draw(ph_sum_value, role_detail, isDraw, change_command, enemy_detail)
     calc.role_card = calc.enhance_summation_card_value(calc.phantom_card)
 
     damage_calc_img = None
@@ -717,7 +996,7 @@ async def draw_char_detail_img(
         damage_title = damage_calc["title"]
         # damageAttribute = card_sort_map_to_attribute(card_map)
         calc.damageAttribute = calc.card_sort_map_to_attribute(calc.role_card)
-        damageAttributeTemp = copy.deepcopy(calc.damageAttribute)
+        damageAttributeTemp = calc.damageAttribute.fork()
         crit_damage, expected_damage = damage_calc["func"](damageAttributeTemp, role_detail)
         logger.debug(f"{char_name}-{damage_title} 暴击伤害: {crit_damage}")
         logger.debug(f"{char_name}-{damage_title} 期望伤害: {expected_damage}")
@@ -760,9 +1039,9 @@ async def draw_char_detail_img(
         dd_len += damage_calc_img.size[1]
 
     # 创建背景
-    img = await get_card_bg(1200, 1250 + echo_list + ph_sum_value + jineng_len + dd_len, "bg3")
+    img = get_card_bg(1200, 1250 + echo_list + ph_sum_value + jineng_len + dd_len, "bg3")
     # 固定位置
-    await draw_fixed_img(img, avatar, account_info, role_detail)
+    draw_fixed_img(img, avatar, account_info, role_detail)
 
     # 声骸
     img.paste(phantom_temp, (0, 1320 + jineng_len), phantom_temp)
@@ -772,96 +1051,27 @@ async def draw_char_detail_img(
 
     if is_refresh != 0:  # 数据已更新标识
         if is_refresh == 1:
-            refresh_img = Image.open(TEXT_PATH / "xingxing.png").convert("RGBA")
+            refresh_img = get_texture(TEXT_PATH / "xingxing.png", (110, 110))
             star_x = 290
         if is_refresh == -1:
-            refresh_img = Image.open(TEXT_PATH / "refresh_no.png").convert("RGBA")
+            refresh_img = get_texture(TEXT_PATH / "refresh_no.png", (110, 110))
             star_x = 10
         star_y = 1320 + jineng_len + 120 + ph_sum_value - 20
-        refresh_img = refresh_img.resize((110, 110))
         img.alpha_composite(refresh_img, (star_x, star_y))
 
     # 右侧属性
     right_image_temp = Image.new("RGBA", (600, 1100))
 
     # 武器banner
-    banner2 = Image.open(TEXT_PATH / "banner2.png")
+    banner2 = get_texture(TEXT_PATH / "banner2.png")
     right_image_temp.alpha_composite(banner2, dest=(0, 600))
 
     # 右侧属性-武器
-    weapon_bg = Image.open(TEXT_PATH / "weapon_bg.png")
-    weapon_bg_temp = Image.new("RGBA", weapon_bg.size)
-    weapon_bg_temp.alpha_composite(weapon_bg, dest=(0, 0))
-
-    weaponData: WeaponData = role_detail.weaponData
-
-    weapon_icon = await get_square_weapon(weaponData.weapon.weaponId)
-    weapon_icon = crop_center_img(weapon_icon, 110, 110)
-    weapon_icon_bg = get_weapon_icon_bg(weaponData.weapon.weaponStarLevel)
-    weapon_icon_bg.paste(weapon_icon, (10, 20), weapon_icon)
-
-    weapon_bg_temp_draw = ImageDraw.Draw(weapon_bg_temp)
-    weapon_bg_temp_draw.text((200, 70), f"{weaponData.weapon.weaponName}", SPECIAL_GOLD, waves_font_40, "lm")
-    weapon_bg_temp_draw.text((203, 115), f"Lv.{weaponData.level}/90", "white", waves_font_30, "lm")
-
-    _x = 220 + 43 * len(weaponData.weapon.weaponName)
-    _y = 77
-    wrc_fill = WEAPON_RESONLEVEL_COLOR[weaponData.resonLevel] + (int(0.8 * 255),)  # type: ignore
-    weapon_bg_temp_draw.rounded_rectangle([_x - 15, _y - 15, _x + 50, _y + 15], radius=7, fill=wrc_fill)
-
-    weapon_bg_temp_draw.text((_x, _y), f"精{weaponData.resonLevel}", "white", waves_font_24, "lm")
-
-    weapon_breach = get_breach(weaponData.breach, weaponData.level)
-    for i in range(0, weapon_breach):  # type: ignore
-        promote_icon = Image.open(TEXT_PATH / "promote_icon.png")
-        weapon_bg_temp.alpha_composite(promote_icon, dest=(200 + 40 * i, 140))
-
-    weapon_bg_temp.alpha_composite(weapon_icon_bg, dest=(45, 40))
-
-    weapon_detail: WavesWeaponResult = get_weapon_detail(
-        weaponData.weapon.weaponId,
-        weaponData.level,
-        weaponData.breach,
-        weaponData.resonLevel,
-    )
-    stats_main = await get_attribute_prop(weapon_detail.stats[0]["name"])
-    stats_main = stats_main.resize((40, 40))
-    weapon_bg_temp.alpha_composite(stats_main, (65, 187))
-    weapon_bg_temp_draw.text((130, 207), f"{weapon_detail.stats[0]['name']}", "white", waves_font_30, "lm")
-    weapon_bg_temp_draw.text((500, 207), f"{weapon_detail.stats[0]['value']}", "white", waves_font_30, "rm")
-    stats_sub = await get_attribute_prop(weapon_detail.stats[1]["name"])
-    stats_sub = stats_sub.resize((40, 40))
-    weapon_bg_temp.alpha_composite(stats_sub, (65, 237))
-    weapon_bg_temp_draw.text((130, 257), f"{weapon_detail.stats[1]['name']}", "white", waves_font_30, "lm")
-    weapon_bg_temp_draw.text((500, 257), f"{weapon_detail.stats[1]['value']}", "white", waves_font_30, "rm")
-
+    weapon_bg_temp = draw_weapon_block(role_detail.weaponData)
     right_image_temp.alpha_composite(weapon_bg_temp, dest=(0, 650))
 
     # 命座部分
-    mz_temp = Image.new("RGBA", (1200, 300))
-
-    shuxing_color = WAVES_SHUXING_MAP[role_detail.role.attributeName]  # type: ignore
-    for i, _mz in enumerate(role_detail.chainList):
-        mz_bg = Image.open(TEXT_PATH / "mz_bg.png")
-        mz_bg_temp = Image.new("RGBA", mz_bg.size)
-        mz_bg_temp_draw = ImageDraw.Draw(mz_bg_temp)
-        chain = await get_chain_img(role_detail.role.roleId, _mz.order, _mz.iconUrl)  # type: ignore
-        chain = chain.resize((100, 100))
-        mz_bg.paste(chain, (95, 75), chain)
-        mz_bg_temp.alpha_composite(mz_bg, dest=(0, 0))
-        if _mz.unlocked:
-            mz_bg_temp = await change_color(mz_bg_temp, shuxing_color)
-
-        name = re.sub(r'[",，]+', "", _mz.name) if _mz.name else ""
-        if len(name) >= 8:
-            mz_bg_temp_draw.text((147, 230), f"{name}", "white", waves_font_16, "mm")
-        else:
-            mz_bg_temp_draw.text((147, 230), f"{name}", "white", waves_font_20, "mm")
-
-        if not _mz.unlocked:
-            mz_bg_temp = ImageEnhance.Brightness(mz_bg_temp).enhance(0.3)
-        mz_temp.alpha_composite(mz_bg_temp, dest=(i * 190, 0))
-
+    mz_temp = draw_chain_strip(role_detail)
     img.paste(mz_temp, (0, 1080 + jineng_len), mz_temp)
 
     if isDraw and damageDetail and role_detail.phantomData and role_detail.phantomData.equipPhantomList:
@@ -875,7 +1085,7 @@ async def draw_char_detail_img(
         img.alpha_composite(damage_title_bg, dest=(0, 2600 + ph_sum_value + jineng_len))
         for dindex, damage_temp in enumerate(damageDetail):
             damage_title = damage_temp["title"]
-            damageAttributeTemp = copy.deepcopy(calc.damageAttribute)
+            damageAttributeTemp = calc.damageAttribute.fork()
             crit_damage, expected_damage = damage_temp["func"](damageAttributeTemp, role_detail)
             logger.debug(f"{char_name}-{damage_title} 暴击伤害: {crit_damage}")
             logger.debug(f"{char_name}-{damage_title} 期望伤害: {expected_damage}")
@@ -941,9 +1151,9 @@ async def draw_char_detail_img(
                 dest=(0, 2600 + ph_sum_value + jineng_len + (dindex + 1) * 60),
             )
 
-    banner1 = Image.open(TEXT_PATH / "banner4.png")
+    banner1 = get_texture(TEXT_PATH / "banner4.png")
     right_image_temp.alpha_composite(banner1, dest=(0, 0))
-    sh_bg = Image.open(TEXT_PATH / "prop_bg.png")
+    sh_bg = load_texture(TEXT_PATH / "prop_bg.png")
     sh_bg_draw = ImageDraw.Draw(sh_bg)
 
     shuxing = f"{role_detail.role.attributeName}伤害加成"
@@ -951,12 +1161,12 @@ async def draw_char_detail_img(
         name, default_value = name_default
         if name == "属性伤害加成":
             value = calc.role_card.get(shuxing, default_value)
-            prop_img = await get_attribute_prop(shuxing)
+            prop_img = get_attribute_prop_sync(shuxing)
             name_color, _ = get_valid_color(shuxing, value, calc.calc_temp)
             name = shuxing
         else:
             value = calc.role_card.get(name, default_value)
-            prop_img = await get_attribute_prop(name)
+            prop_img = get_attribute_prop_sync(name)
             name_color, _ = get_valid_color(name, value, calc.calc_temp)
 
         prop_img = prop_img.resize((40, 40))
@@ -968,38 +1178,14 @@ async def draw_char_detail_img(
     img.paste(right_image_temp, (570, 200), right_image_temp)
 
     # 技能
-    skill_bar = Image.open(TEXT_PATH / "skill_bar.png")
-    skill_bg_1 = Image.open(TEXT_PATH / "skill_bg.png")
-
-    temp_i = 0
-    for _, _skill in enumerate(role_detail.get_skill_list()):
-        if _skill.skill.type == "延奏技能" or _skill.skill.type == "谐度破坏":
-            continue
-        skill_bg = skill_bg_1.copy()
-        # logger.debug(f"{char_name}-{_skill.skill.name}")
-        skill_img = await get_skill_img(role_detail.role.roleId, _skill.skill.name, _skill.skill.iconUrl)
-        skill_img = skill_img.resize((70, 70))
-        skill_bg.paste(skill_img, (57, 65), skill_img)
-
-        skill_bg_draw = ImageDraw.Draw(skill_bg)
-        skill_bg_draw.text((150, 83), f"{_skill.skill.type}", "white", waves_font_25, "lm")
-        skill_bg_draw.text((150, 113), f"Lv.{_skill.level}", "white", waves_font_25, "lm")
-
-        skill_bg_temp = Image.new("RGBA", skill_bg.size)
-        skill_bg_temp = Image.alpha_composite(skill_bg_temp, skill_bg)
-
-        _x = 20 + temp_i * 215
-        _y = -20
-        skill_bar.alpha_composite(skill_bg_temp, dest=(_x, _y))
-        temp_i += 1
+    skill_bar = draw_skill_bar(role_detail)
     img.alpha_composite(skill_bar, dest=(0, 1150))
 
     img = add_footer(img)
-    if need_convert_img:
-        img = await convert_img(img)
     return img
 
 
+@render_task("char_score")
 async def draw_char_score_img(ev: Event, uid: str, char: str, user_id: str, waves_id: str | None = None):
     char, damageId = parse_text_and_number(char)
 
@@ -1036,10 +1222,22 @@ async def draw_char_score_img(ev: Event, uid: str, char: str, user_id: str, wave
     if isinstance(role_detail, str):
         return role_detail
 
+    await download_role_detail_img(role_detail, need_chain_skill=False)
+    img = await draw_char_score_card(role_detail, account_info, avatar)
+    img = await convert_img(img)
+    return img
+
+
+@render_sync("char_score")
+def draw_char_score_card(
+    role_detail: RoleDetailData,
+    account_info: AccountBaseInfo,
+    avatar: Image.Image,
+) -> Image.Image:
     # 创建背景
-    img = await get_card_bg(1200, 3380, "bg3")
+    img = get_card_bg(1200, 3380, "bg3")
     # 固定位置
-    await draw_fixed_img(img, avatar, account_info, role_detail)
+    draw_fixed_img(img, avatar, account_info, role_detail)
 
     # 声骸属性
     char_id = role_detail.role.roleId
@@ -1049,8 +1247,8 @@ async def draw_char_score_img(ev: Event, uid: str, char: str, user_id: str, wave
     right_image_temp = Image.new("RGBA", (600, 1100))
     introduce_temp = Image.new("RGBA", (1500, 880), (0, 0, 0, 0))
 
-    ph_0 = Image.open(TEXT_PATH / "ph_0.png")
-    ph_1 = Image.open(TEXT_PATH / "ph_1.png")
+    ph_0 = get_texture(TEXT_PATH / "ph_0.png")
+    ph_1 = get_texture(TEXT_PATH / "ph_1.png")
     # phantom_sum_value = {}
     calc: WuWaCalc = WuWaCalc(role_detail)
     if role_detail.phantomData and role_detail.phantomData.equipPhantomList:
@@ -1068,19 +1266,19 @@ async def draw_char_score_img(ev: Event, uid: str, char: str, user_id: str, wave
         for i, _phantom in enumerate(equipPhantomList):
             sh_temp = Image.new("RGBA", (600, 1100))
             sh_temp_draw = ImageDraw.Draw(sh_temp)
-            sh_bg = Image.open(TEXT_PATH / "sh_bg.png")
+            sh_bg = get_texture(TEXT_PATH / "sh_bg.png")
             sh_temp.alpha_composite(sh_bg, dest=(0, 0))
             if _phantom and _phantom.phantomProp:
                 props = _phantom.get_props()
                 _score, _bg = calc_phantom_score(char_id, props, _phantom.cost, calc.calc_temp)
 
                 phantom_score += _score
-                sh_title = Image.open(TEXT_PATH / f"sh_title_{_bg}.png")
+                sh_title = get_texture(TEXT_PATH / f"sh_title_{_bg}.png")
 
                 sh_temp.alpha_composite(sh_title, dest=(0, 0))
 
-                phantom_icon = await get_phantom_img(_phantom.phantomProp.phantomId, _phantom.phantomProp.iconUrl)
-                fetter_icon = await get_attribute_effect(_phantom.fetterDetail.name)
+                phantom_icon = get_phantom_img_sync(_phantom.phantomProp.phantomId, _phantom.phantomProp.iconUrl)
+                fetter_icon = get_attribute_effect_sync(_phantom.fetterDetail.name)
                 fetter_icon = fetter_icon.resize((50, 50))
                 phantom_icon.alpha_composite(fetter_icon, dest=(205, 0))
                 phantom_icon = phantom_icon.resize((100, 100))
@@ -1104,13 +1302,13 @@ async def draw_char_score_img(ev: Event, uid: str, char: str, user_id: str, wave
                 sh_temp.alpha_composite(ph_score_img, (228, 58))
 
                 for index in range(0, _phantom.cost):
-                    promote_icon = Image.open(TEXT_PATH / "promote_icon.png")
-                    promote_icon = promote_icon.resize((30, 30))
+                    promote_icon = get_texture(TEXT_PATH / "promote_icon.png", (30, 30))
                     sh_temp.alpha_composite(promote_icon, dest=(128 + 30 * index, 90))
 
+                max_score, _ = get_max_score(_phantom.cost, calc.calc_temp)
                 for index, _prop in enumerate(props):
                     oset = 55
-                    prop_img = await get_attribute_prop(_prop.attributeName)
+                    prop_img = get_attribute_prop_sync(_prop.attributeName)
                     prop_img = prop_img.resize((40, 40))
                     # sh_temp.alpha_composite(prop_img, (15, 167 + index * oset))
                     sh_temp_draw = ImageDraw.Draw(sh_temp)
@@ -1139,6 +1337,7 @@ async def draw_char_score_img(ev: Event, uid: str, char: str, user_id: str, wave
                         _phantom.cost,
                         calc.calc_temp,
                         role_detail.role.attributeName or "",
+                        max_score,
                     )
                     score_color = WAVES_MOONLIT
                     if final_score > 0:
@@ -1151,7 +1350,6 @@ async def draw_char_score_img(ev: Event, uid: str, char: str, user_id: str, wave
                         "rm",
                     )
 
-                max_score, _ = get_max_score(_phantom.cost, calc.calc_temp)
                 sh_temp_draw.text(
                     (343, 191 + 7 * 55),
                     f"C{_phantom.cost}最高分(未对齐):{max_score}分",
@@ -1165,10 +1363,10 @@ async def draw_char_score_img(ev: Event, uid: str, char: str, user_id: str, wave
         if phantom_score > 0:
             phantom_score = round(phantom_score, 2)
             _bg = get_total_score_bg(char_name, phantom_score, calc.calc_temp)
-            sh_score_bg_c = Image.open(TEXT_PATH / f"sh_score_bg_{_bg}.png")
+            sh_score_bg_c = get_texture(TEXT_PATH / f"sh_score_bg_{_bg}.png")
             score_temp = Image.new("RGBA", sh_score_bg_c.size)
             score_temp.alpha_composite(sh_score_bg_c)
-            sh_score_c = Image.open(TEXT_PATH / f"sh_score_{_bg}.png")
+            sh_score_c = get_texture(TEXT_PATH / f"sh_score_{_bg}.png")
             score_temp.alpha_composite(sh_score_c)
             score_temp_draw = ImageDraw.Draw(score_temp)
 
@@ -1176,7 +1374,7 @@ async def draw_char_score_img(ev: Event, uid: str, char: str, user_id: str, wave
             score_temp_draw.text((180, 380), f"{phantom_score:.2f}分", "white", waves_font_40, "mm")
             score_temp_draw.text((180, 440), "声骸评分", GREY, waves_font_40, "mm")
         else:
-            abs_bg = Image.open(TEXT_PATH / "abs.png")
+            abs_bg = get_texture(TEXT_PATH / "abs.png")
             score_temp = Image.new("RGBA", abs_bg.size)
             score_temp.alpha_composite(abs_bg)
             score_temp_draw = ImageDraw.Draw(score_temp)
@@ -1191,12 +1389,12 @@ async def draw_char_score_img(ev: Event, uid: str, char: str, user_id: str, wave
                 name, default_value = name_default
                 if name == "属性伤害加成":
                     value = calc.phantom_card.get(shuxing, default_value)
-                    prop_img = await get_attribute_prop(shuxing)
+                    prop_img = get_attribute_prop_sync(shuxing)
                     name_color, _ = get_valid_color(shuxing, value, calc.calc_temp)
                     name = shuxing
                 else:
                     value = calc.phantom_card.get(name, default_value)
-                    prop_img = await get_attribute_prop(name)
+                    prop_img = get_attribute_prop_sync(name)
                     name_color, _ = get_valid_color(name, value, calc.calc_temp)
                 prop_img = prop_img.resize((40, 40))
                 ph_bg = ph_0.copy() if ni % 2 == 0 else ph_1.copy()
@@ -1253,20 +1451,19 @@ async def draw_char_score_img(ev: Event, uid: str, char: str, user_id: str, wave
                 entry_list.append(value)
             weight_list_temp[i] = ",".join(entry_list)
 
-        await draw_weight(introduce_temp, role_detail.role.roleName, weight_list_temp, calc.calc_temp)
+        draw_weight(introduce_temp, role_detail.role.roleName, weight_list_temp, calc.calc_temp)
 
-    char_bg = Image.open(TEXT_PATH / "char.png")
+    char_bg = get_texture(TEXT_PATH / "char.png")
     img.paste(char_bg, (1100, 220), char_bg)
     img.paste(phantom_temp, (0, 1050), phantom_temp)
     img.paste(right_image_temp, (605, 225), right_image_temp)
     img.alpha_composite(introduce_temp, (0, 2400))
 
     img = add_footer(img)
-    img = await convert_img(img)
     return img
 
 
-async def draw_weight(image, role_name, weight_list_temp, calc_temp):
+def draw_weight(image, role_name, weight_list_temp, calc_temp):
     draw = ImageDraw.Draw(image)
     draw.rectangle([10, 10, 1490, 870], fill=(0, 0, 0, int(0.7 * 255)))
 
@@ -1329,9 +1526,8 @@ async def draw_pic_with_ring(ev: Event, is_force_avatar=False, force_resource_id
     else:
         pic = await get_user_avatar(ev.user_id)
 
-    mask_pic = Image.open(TEXT_PATH / "avatar_mask.png")
     img = Image.new("RGBA", (180, 180))
-    mask = mask_pic.resize((160, 160))
+    mask = get_texture(TEXT_PATH / "avatar_mask.png", (160, 160))
     resize_pic = crop_center_img(pic, 160, 160)
     img.paste(resize_pic, (20, 20), mask)
 
@@ -1341,9 +1537,8 @@ async def draw_pic_with_ring(ev: Event, is_force_avatar=False, force_resource_id
 async def draw_char_with_ring(char_id):
     pic = await get_square_avatar(char_id)
 
-    mask_pic = Image.open(TEXT_PATH / "avatar_mask.png")
     img = Image.new("RGBA", (180, 180))
-    mask = mask_pic.resize((160, 160))
+    mask = get_texture(TEXT_PATH / "avatar_mask.png", (160, 160))
     resize_pic = crop_center_img(pic, 160, 160)
     img.paste(resize_pic, (20, 20), mask)
 
@@ -1354,7 +1549,7 @@ def get_weapon_icon_bg(star: int = 3) -> Image.Image:
     if star < 3:
         star = 3
     bg_path = TEXT_PATH / f"weapon_icon_bg_{star}.png"
-    bg_img = Image.open(bg_path)
+    bg_img = load_texture(bg_path)
     return bg_img
 
 
@@ -1417,7 +1612,7 @@ async def generate_online_role_detail(char_id: str):
     return RoleDetailData.model_validate(char_template_data)
 
 
-async def get_card_bg(
+def get_card_bg(
     w: int,
     h: int,
     bg: str = "bg",
@@ -1432,5 +1627,5 @@ async def get_card_bg(
     if not img:
         img = get_waves_bg(w, h, bg)
 
-    img = await get_custom_gaussian_blur(img)
+    img = get_custom_gaussian_blur_sync(img)
     return img
@@ -41,6 +41,9 @@ async def get_remote_role_detail_info(find_char_id: list[str], waves_id, ck) ->
             (role for role in gen_temp if str(role.role.roleId) in find_char_id),
             None,
         )
+        # 缓存中的对象不能被修改
+        if role_detail_info:
+            role_detail_info = role_detail_info.model_copy(deep=True)
 
     if not role_detail_info:
         for char_id in find_char_id:
@@ -1,3 +1,4 @@
+from functools import partial
 from pathlib import Path
 
 from gsuid_core.logger import logger
@@ -42,6 +43,7 @@ from ..utils.image import (
 from ..utils.refresh_char_detail import refresh_char
 from ..utils.resource.constant import NORMAL_LIST
 from ..utils.resource.download_file import get_skill_img
+from ..utils.response_cache import response_cache
 from ..utils.util import send_master_info
 from ..utils.waves_api import waves_api
 from ..wutheringwaves_analyzecard.user_info_utils import get_user_detail_info
@@ -118,6 +120,27 @@ async def draw_char_list_img(
     is_peek: bool = False,
     user_waves_id: str = "",
     page_index: int = 1,
+) -> str | bytes:
+    render = partial(_draw_char_list_img, uid, ev, user_id, is_refresh, is_peek, user_waves_id, page_index)
+    # 刷新时需要重新获取数据
+    if is_refresh:
+        return await render()
+    return await response_cache.get_or_render(
+        "char_list",
+        uid,
+        (user_id, ev.bot_id, is_peek, user_waves_id, page_index),
+        render,
+    )
+
+
+async def _draw_char_list_img(
+    uid: str,
+    ev: Event,
+    user_id: str,
+    is_refresh: bool = False,
+    is_peek: bool = False,
+    user_waves_id: str = "",
+    page_index: int = 1,
 ) -> str | bytes:
     _, ck = await waves_api.get_ck_result(user_waves_id, user_id, ev.bot_id)
     account_info = await get_user_detail_info(uid)
@@ -223,4 +223,73 @@ CONFIG_DEFAULT: dict[str, GSC] = {
         "验证码提供方appkey",
         "",
     ),
+    "DamagePreload": GsBoolConfig(
+        "启动时预加载伤害计算（重启生效）",
+        "关闭时角色伤害计算模块在第一次使用时才加载",
+        False,
+    ),
+    "CalcProcessWorkers": GsIntConfig(
+        "批量计算进程数",
+        "排行索引重建等批量计算评分/伤害时使用的进程数, 0为不使用进程池",
+        0,
+        32,
+    ),
+    "RenderFragmentCacheSize": GsIntConfig(
+        "面板渲染片段缓存大小（MB）",
+        "缓存角色面板中武器/共鸣链/技能/声骸等区块的绘制结果, 0为关闭",
+        64,
+        1024,
+    ),
+    "RenderFragmentDiskCache": GsBoolConfig(
+        "面板渲染片段磁盘缓存",
+        "开启后渲染片段同时保存到磁盘, 重启后仍可使用",
+        False,
+    ),
+    "ResponseCacheTTL": GsIntConfig(
+        "面板图片缓存时间（秒）",
+        "角色面板/练度/声骸列表/抽卡记录图片的缓存时间, 数据更新时自动失效, 0为关闭",
+        120,
+        3600,
+    ),
+    "RenderWorkers": GsIntConfig(
+        "绘图线程数",
+        "图片编码等绘图操作使用的线程数, 0为在事件循环中直接执行",
+        2,
+        16,
+    ),
+    "RenderProcessWorkers": GsIntConfig(
+        "绘图进程数",
+        "图片编码等可以跨进程的绘图任务使用的进程数, 0为不使用进程池",
+        0,
+        16,
+    ),
+    "RenderConcurrency": GsIntConfig(
+        "同时绘图任务数",
+        "同时进行的面板/排行/深塔等绘图任务数, 超出的任务排队等待",
+        4,
+        32,
+    ),
+    "RenderQueueTimeout": GsIntConfig(
+        "绘图排队超时（秒）",
+        "绘图任务排队超过该时间时提示稍后再试, 0为一直等待",
+        30,
+        300,
+    ),
+    "TextureCacheSize": GsIntConfig(
+        "素材缓存大小（MB）",
+        "texture2d 静态素材解码后的缓存大小, 0为关闭",
+        256,
+        2048,
+    ),
+    "IconCacheSize": GsIntConfig(
+        "图标缓存大小（MB）",
+        "缓存排行榜等处缩放/遮罩后的头像与武器图标, 0为关闭",
+        32,
+        512,
+    ),
+    "IconDiskCache": GsBoolConfig(
+        "图标磁盘缓存",
+        "开启后缩放后的图标同时保存到磁盘, 重启后仍可使用",
+        True,
+    ),
 }
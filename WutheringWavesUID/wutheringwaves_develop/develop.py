@@ -45,6 +45,7 @@ from ..utils.name_convert import (
 from ..utils.refresh_char_detail import refresh_char
 from ..utils.resource.constant import SKILL_TREE_BREACH_MAP, SPECIAL_CHAR, SPECIAL_CHAR_INT_ALL
 from ..utils.resource.download_file import get_material_img
+from ..utils.texture import get_texture
 from ..utils.waves_api import waves_api
 
 skillBreakList = ["2-1", "2-2", "2-3", "2-4", "2-5", "3-1", "3-2", "3-3", "3-4", "3-5"]
@@ -79,31 +80,6 @@ template_role_develop = {
 }
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
-material_star_1 = Image.open(TEXT_PATH / "material-star-1.png")
-material_star_2 = Image.open(TEXT_PATH / "material-star-2.png")
-material_star_3 = Image.open(TEXT_PATH / "material-star-3.png")
-material_star_4 = Image.open(TEXT_PATH / "material-star-4.png")
-material_star_5 = Image.open(TEXT_PATH / "material-star-5.png")
-material_star_img_map = {
-    1: material_star_1,
-    2: material_star_2,
-    3: material_star_3,
-    4: material_star_4,
-    5: material_star_5,
-}
-
-star_1 = Image.open(TEXT_PATH / "star-1.png")
-star_2 = Image.open(TEXT_PATH / "star-2.png")
-star_3 = Image.open(TEXT_PATH / "star-3.png")
-star_4 = Image.open(TEXT_PATH / "star-4.png")
-star_5 = Image.open(TEXT_PATH / "star-5.png")
-star_img_map = {
-    1: star_1,
-    2: star_2,
-    3: star_3,
-    4: star_4,
-    5: star_5,
-}
 
 
 skill_name_list = [
@@ -596,7 +572,7 @@ async def draw_material_card(cultivate_cost_list: list[CultivateCost], title: st
     for cultivate_cost in cultivate_cost_list:
         temp_img = Image.new("RGBA", (material_item_width, material_item_height), (0, 0, 0, 255))
 
-        material_star_img = copy.deepcopy(material_star_img_map[cultivate_cost.quality])
+        material_star_img = get_texture(TEXT_PATH / f"material-star-{cultivate_cost.quality}.png")
         material_item_img = await get_material_img(cultivate_cost.id)
         material_item_img = material_item_img.resize((material_item_width, material_item_width))
 
@@ -646,7 +622,7 @@ async def calc_role_need_card(
     # 角色头像
     square_avatar = await get_square_avatar(role_cost_detail.roleId)
     square_avatar = square_avatar.resize((180, 180))
-    star_img = copy.deepcopy(star_img_map[online_role.starLevel])
+    star_img = get_texture(TEXT_PATH / f"star-{online_role.starLevel}.png")
     top_bg_img.alpha_composite(square_avatar, (70, 40))
     top_bg_img.alpha_composite(star_img, (70, 40))
     top_bg_img_draw.text(
@@ -668,7 +644,7 @@ async def calc_role_need_card(
         weapon_id = content["weaponId"]
         square_weapon = await get_square_weapon(weapon_id)
         square_weapon = square_weapon.resize((180, 180))
-        star_img = copy.deepcopy(star_img_map[online_weapon.weaponStarLevel])
+        star_img = get_texture(TEXT_PATH / f"star-{online_weapon.weaponStarLevel}.png")
         top_bg_img.alpha_composite(square_weapon, (530, 40))
         top_bg_img.alpha_composite(star_img, (530, 40))
         top_bg_img_draw.text(
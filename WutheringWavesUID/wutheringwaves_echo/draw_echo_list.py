@@ -1,3 +1,4 @@
+from functools import partial
 from pathlib import Path
 
 from gsuid_core.models import Event
@@ -35,6 +36,7 @@ from ..utils.image import (
 )
 from ..utils.imagetool import draw_pic_with_ring
 from ..utils.resource.download_file import get_phantom_img
+from ..utils.response_cache import response_cache
 from ..utils.waves_api import waves_api
 from ..wutheringwaves_analyzecard.user_info_utils import get_user_detail_info
 from ..wutheringwaves_config import PREFIX
@@ -54,6 +56,15 @@ class WavesEchoRank(BaseModel):
 
 
 async def get_draw_list(ev: Event, uid: str, user_id: str, page_index: int = 1) -> str | bytes:
+    return await response_cache.get_or_render(
+        "echo_list",
+        uid,
+        (user_id, ev.bot_id, page_index),
+        partial(_draw_list, ev, uid, user_id, page_index),
+    )
+
+
+async def _draw_list(ev: Event, uid: str, user_id: str, page_index: int = 1) -> str | bytes:
     account_info = await get_user_detail_info(uid)
 
     all_role_detail: dict[str, RoleDetailData] | None = await get_all_role_detail_info(uid)
@@ -1,15 +1,15 @@
 from datetime import datetime
+from functools import partial
 import json
 import os
 from pathlib import Path
 import random
 
-import aiofiles
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 from PIL import Image, ImageDraw
 
+from ..utils.api.model import AccountBaseInfo
 from ..utils.fonts.waves_fonts import (
     waves_font_18,
     waves_font_20,
@@ -20,19 +20,25 @@ from ..utils.fonts.waves_fonts import (
     waves_font_32,
     waves_font_40,
 )
+from ..utils.gacha_stats import (
+    UP_POOL_NAMES,
+    get_max_consecutive_non_up,
+    get_max_consecutive_up,
+    get_non_deviation_rate,
+)
+from ..utils.gacha_store import load_gacha_stats
 from ..utils.image import (
     GOLD,
     add_footer,
-    cropped_square_avatar,
     get_event_avatar,
-    get_square_avatar,
-    get_square_weapon,
+    get_square_avatar_cropped_sync,
+    get_square_weapon_resized_sync,
     get_waves_bg,
 )
 from ..utils.queues.const import QUEUE_GACHA_RECORD, QUEUE_SCORE_RANK
 from ..utils.queues.queues import push_item
-from ..utils.resource.constant import NORMAL_LIST
-from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
+from ..utils.render_executor import convert_img, render_sync, render_task
+from ..utils.response_cache import response_cache
 from ..utils.util import get_version
 from ..wutheringwaves_config import PREFIX
 
@@ -133,17 +139,83 @@ async def draw_card_help():
     return msg
 
 
+def get_pool_total_data(gacha_name: str, stats: dict) -> dict:
+    """由卡池统计生成绘图与上传用的数据"""
+    current_data = {
+        "total": stats["count"],  # 抽卡总数
+        "avg": 0,  # 抽卡平均数
+        "avg_up": 0,  # up平均数
+        "remain": stats["num"] - 1,  # 已xx抽未出金
+        "time_range": "",
+        "all_time": "",
+        "r_num": list(stats["r_num"]),  # 包含首位的抽卡数量
+        "up_list": [item for item in stats["rank_s_list"] if item["is_up"]],  # 抽到的UP列表
+        "rank_s_list": list(stats["rank_s_list"]),  # 抽到的五星列表
+        "short_gacha_data": {"time": 0, "num": 0},
+        "long_gacha_data": {"time": 0, "num": 0},
+        "level": 0,  # 抽卡等级
+        "non_deviation_rate": "-",  # 不歪率
+        "max_consecutive_up": 0,  # 最大连up
+        "max_consecutive_non_up": 0,  # 最大连歪
+    }
+
+    if stats["count"]:
+        time_1 = datetime.strptime(stats["last_time"], "%Y-%m-%d %H:%M:%S")
+        time_2 = datetime.strptime(stats["first_time"], "%Y-%m-%d %H:%M:%S")
+        current_data["all_time"] = (time_1 - time_2).total_seconds()
+        current_data["time_range"] = f"{stats['first_time']}~{stats['last_time']}"
+
+    if len(current_data["rank_s_list"]) == 0:
+        current_data["avg"] = "-"
+    else:
+        _d = sum(current_data["r_num"]) / len(current_data["r_num"])
+        current_data["avg"] = float(f"{_d:.2f}")
+    # 计算平均up数量
+    if len(current_data["up_list"]) == 0:
+        current_data["avg_up"] = "-"
+    else:
+        _u = sum(current_data["r_num"]) / len(current_data["up_list"])
+        current_data["avg_up"] = float(f"{_u:.2f}")
+
+    if gacha_name in UP_POOL_NAMES and len(current_data["rank_s_list"]) > 0:
+        # 小保底不歪率：UP五星之后依然是UP五星的概率（排除大保底UP）
+        current_data["non_deviation_rate"] = get_non_deviation_rate(stats)
+        # 最大连up和最大连歪
+        current_data["max_consecutive_up"] = get_max_consecutive_up(stats)
+        current_data["max_consecutive_non_up"] = get_max_consecutive_non_up(stats)
+
+    current_data["level"] = 2
+    if current_data["avg_up"] == "-" and current_data["avg"] == "-":
+        current_data["level"] = 2
+    else:
+        if gacha_name in UP_POOL_NAMES:
+            if current_data["avg_up"] != "-":
+                current_data["level"] = get_level_from_list(current_data["avg_up"], [65, 80, 85, 113, 128])
+            elif current_data["avg"] != "-":
+                current_data["level"] = get_level_from_list(current_data["avg"], [36, 52, 56, 71, 74])
+        elif gacha_name in [
+            "武器精准调谐",
+            "角色调谐（常驻池）",
+            "武器调谐（常驻池）",
+            "新手自选唤取",
+        ]:
+            if current_data["avg"] != "-":
+                current_data["level"] = get_level_from_list(current_data["avg"], [36, 52, 56, 71, 74])
+        elif gacha_name == "新手调谐":
+            if current_data["avg"] != "-":
+                current_data["level"] = get_level_from_list(current_data["avg"], [10, 20, 30, 40, 45])
+    return current_data
+
+
+@render_task("gacha_log")
 async def draw_card(uid: str, ev: Event):
     # 获取数据
-    gacha_log_path = PLAYER_PATH / str(uid) / "gacha_logs.json"
-    if not gacha_log_path.exists():
+    gacha_stats = await load_gacha_stats(uid)
+    if not gacha_stats:
         return (
             f"[鸣潮] 你还没有抽卡记录噢!\n请发送 {PREFIX}导入抽卡链接 后重试!\n抽卡链接的获取方式请使用\n{PREFIX}抽卡帮助 查看！"
         )
-    async with aiofiles.open(gacha_log_path, encoding="UTF-8") as f:
-        raw_data: dict = json.loads(await f.read())
 
-    gachalogs = raw_data["data"]
     # 强制排序：角色精准 -> 角色联动 -> 武器精准 -> 武器联动，其余保持原有顺序
     preferred_order = [
         "角色精准调谐",
@@ -151,135 +223,36 @@ async def draw_card(uid: str, ev: Event):
         "武器精准调谐",
         "武器联动唤取",
     ]
-    ordered_keys = [k for k in preferred_order if k in gachalogs] + [k for k in gachalogs if k not in preferred_order]
-    gachalogs = {k: gachalogs[k] for k in ordered_keys}
-
-    total_data = {}
-    for gacha_name in gachalogs:
-        total_data[gacha_name] = {
-            "total": 0,  # 抽卡总数
-            "avg": 0,  # 抽卡平均数
-            "avg_up": 0,  # up平均数
-            "remain": 0,  # 已xx抽未出金
-            "time_range": "",
-            "all_time": "",
-            "r_num": [],  # 包含首位的抽卡数量
-            "up_list": [],  # 抽到的UP列表
-            "rank_s_list": [],  # 抽到的五星列表
-            "short_gacha_data": {"time": 0, "num": 0},
-            "long_gacha_data": {"time": 0, "num": 0},
-            "level": 0,  # 抽卡等级
-            "non_deviation_rate": "-",  # 不歪率
-            "max_consecutive_up": 0,  # 最大连up
-            "max_consecutive_non_up": 0,  # 最大连歪
-        }
+    ordered_keys = [k for k in preferred_order if k in gacha_stats] + [k for k in gacha_stats if k not in preferred_order]
+    total_data = {k: get_pool_total_data(k, gacha_stats[k]) for k in ordered_keys}
 
-    for gacha_name in gachalogs:
-        num = 1
-        gacha_data = gachalogs[gacha_name]
-        current_data = total_data[gacha_name]
-        for index, data in enumerate(gacha_data[::-1]):
-            if index == 0:
-                current_data["time_range"] = data["time"]
-            if index == len(gacha_data) - 1:
-                time_1 = datetime.strptime(data["time"], "%Y-%m-%d %H:%M:%S")
-                time_2 = datetime.strptime(current_data["time_range"], "%Y-%m-%d %H:%M:%S")
-                current_data["all_time"] = (time_1 - time_2).total_seconds()
-
-                current_data["time_range"] += "~" + data["time"]
-
-            if data["qualityLevel"] == 5:
-                data["gacha_num"] = num
-
-                # 判断是否是UP
-                if data["name"] in NORMAL_LIST:
-                    data["is_up"] = False
-                else:
-                    data["is_up"] = True
-
-                current_data["r_num"].append(num)
-                current_data["rank_s_list"].append(data)
-                if data["is_up"]:
-                    current_data["up_list"].append(data)
-
-                num = 1
-            else:
-                num += 1
-            current_data["total"] += 1
+    # 只缓存图片, 上传与本地记录在缓存命中时也要执行
+    card_img = await response_cache.get_or_render(
+        "gacha_log", uid, (ev.user_id, ev.bot_id), partial(_draw_card_img, uid, ev, total_data)
+    )
+    # 上传抽卡记录到服务器
+    await upload_gacha_to_server(uid, total_data, ev)
 
-        current_data["remain"] = num - 1
-        if len(current_data["rank_s_list"]) == 0:
-            current_data["avg"] = "-"
-        else:
-            _d = sum(current_data["r_num"]) / len(current_data["r_num"])
-            current_data["avg"] = float(f"{_d:.2f}")
-        # 计算平均up数量
-        if len(current_data["up_list"]) == 0:
-            current_data["avg_up"] = "-"
-        else:
-            _u = sum(current_data["r_num"]) / len(current_data["up_list"])
-            current_data["avg_up"] = float(f"{_u:.2f}")
-        # 计算不歪率
-        if (
-            gacha_name in ["角色精准调谐", "角色联动唤取", "角色忆旅唤取", "角色新旅唤取"]
-            and len(current_data["rank_s_list"]) > 0
-        ):
-            # 计算小保底不歪率：UP五星之后依然是UP五星的概率（排除大保底UP）
-            up_after_up_count = 0  # 小保底不歪的次数
-            total_small_guarantee = 0  # 小保底总次数
-
-            rank_s_list = current_data["rank_s_list"]
-
-            # 检查第一个五星（如果是角色）
-            if len(rank_s_list) > 0:
-                first = rank_s_list[0]
-                if first.get("resourceType") == "角色" and first.get("qualityLevel") == 5:
-                    total_small_guarantee += 1
-                    if first.get("is_up", False):
-                        up_after_up_count += 1
-
-            # 检查后续五星：只统计UP之后的情况
-            for i in range(len(rank_s_list) - 1):
-                # 只统计五星角色
-                if rank_s_list[i].get("resourceType") == "角色" and rank_s_list[i].get("qualityLevel") == 5:
-                    # 如果当前五星是UP
-                    if rank_s_list[i].get("is_up", False):
-                        # 检查下一个五星
-                        if rank_s_list[i + 1].get("resourceType") == "角色" and rank_s_list[i + 1].get("qualityLevel") == 5:
-                            total_small_guarantee += 1
-                            if rank_s_list[i + 1].get("is_up", False):
-                                up_after_up_count += 1
-
-            if total_small_guarantee > 0:
-                current_data["non_deviation_rate"] = float(f"{up_after_up_count / total_small_guarantee * 100:.1f}")
-            else:
-                current_data["non_deviation_rate"] = "-"
+    return card_img
 
-            # 计算最大连up和最大连歪
-            current_data["max_consecutive_up"] = calculate_max_consecutive_up(current_data["rank_s_list"])
-            current_data["max_consecutive_non_up"] = calculate_max_consecutive_non_up(current_data["rank_s_list"])
 
-        current_data["level"] = 2
-        if current_data["avg_up"] == "-" and current_data["avg"] == "-":
-            current_data["level"] = 2
-        else:
-            if gacha_name in ["角色精准调谐", "角色联动唤取", "角色忆旅唤取", "角色新旅唤取"]:
-                if current_data["avg_up"] != "-":
-                    current_data["level"] = get_level_from_list(current_data["avg_up"], [65, 80, 85, 113, 128])
-                elif current_data["avg"] != "-":
-                    current_data["level"] = get_level_from_list(current_data["avg"], [36, 52, 56, 71, 74])
-            elif gacha_name in [
-                "武器精准调谐",
-                "角色调谐（常驻池）",
-                "武器调谐（常驻池）",
-                "新手自选唤取",
-            ]:
-                if current_data["avg"] != "-":
-                    current_data["level"] = get_level_from_list(current_data["avg"], [36, 52, 56, 71, 74])
-            elif gacha_name == "新手调谐":
-                if current_data["avg"] != "-":
-                    current_data["level"] = get_level_from_list(current_data["avg"], [10, 20, 30, 40, 45])
+async def _draw_card_img(uid: str, ev: Event, total_data: dict) -> bytes:
+    # 统一国服与国际服头图
+    from ..wutheringwaves_analyzecard.user_info_utils import get_user_detail_info
+
+    account_info = await get_user_detail_info(uid)
+    card_polygon = await get_random_card_polygon(ev)
+
+    card_img = await draw_gacha_card(total_data, account_info, card_polygon)
+    return await convert_img(card_img)
 
+
+@render_sync("gacha_log")
+def draw_gacha_card(
+    total_data: dict,
+    account_info: AccountBaseInfo,
+    card_polygon: Image.Image,
+) -> Image.Image:
     oset = 280
     # bset = 150
 
@@ -347,7 +320,7 @@ async def draw_card(uid: str, ev: Event):
     up_icon = Image.open(TEXT_PATH / "up_tag.png")
     up_icon = up_icon.resize((68, 52))
 
-    async def draw_pic(item) -> Image.Image:
+    def draw_pic(item) -> Image.Image:
         item_bg = Image.new("RGBA", (145, 150))
         item_fg_cp = item_fg.copy()
         item_fg_cp = item_fg_cp.resize((145, 150))
@@ -355,12 +328,10 @@ async def draw_card(uid: str, ev: Event):
 
         item_temp = Image.new("RGBA", (145, 150))
         if item["resourceType"] == "武器":
-            item_icon = await get_square_weapon(item["resourceId"])
-            item_icon = item_icon.resize((115, 115)).convert("RGBA")
+            item_icon = get_square_weapon_resized_sync(item["resourceId"], (115, 115))
             item_temp.paste(item_icon, (19, 0), item_icon)
         else:
-            item_icon = await get_square_avatar(item["resourceId"])
-            item_icon = await cropped_square_avatar(item_icon, 115)
+            item_icon = get_square_avatar_cropped_sync(item["resourceId"], 115)
             item_temp.paste(item_icon, (19, 0), item_icon)
 
         item_bg.paste(item_temp, (-2, -2), item_temp)
@@ -394,7 +365,7 @@ async def draw_card(uid: str, ev: Event):
         if gacha_data["total"] == 0:
             continue  # 总抽数为0，不绘制任何内容，包括标题栏
         # 会歪的唤取使用bar_up.png，其他使用bar.png
-        if gacha_name in ["角色精准调谐", "角色联动唤取", "角色忆旅唤取", "角色新旅唤取"]:
+        if gacha_name in UP_POOL_NAMES:
             title = Image.open(TEXT_PATH / "bar_up.png")
         else:
             title = Image.open(TEXT_PATH / "bar.png")
@@ -426,7 +397,7 @@ async def draw_card(uid: str, ev: Event):
         tag = HOMO_TAG[level]
 
         # 显示不歪率和最大连歪
-        if gacha_name in ["角色精准调谐", "角色联动唤取", "角色忆旅唤取", "角色新旅唤取"]:
+        if gacha_name in UP_POOL_NAMES:
             # 缩小20%的字体和间隔
             title_draw.text((150, 178), avg_s, "white", waves_font_25, "mm")
             title_draw.text((150, 205), "平均出金", "white", waves_font_18, "mm")
@@ -456,13 +427,12 @@ async def draw_card(uid: str, ev: Event):
 
         card_img.paste(title, (10, _header + y + gindex * oset), title)
         gindex += 1
-        s_list = gacha_data["rank_s_list"]
-        s_list.reverse()
+        s_list = gacha_data["rank_s_list"][::-1]
         if s_list:
             cols, rows, w_item, _, step, row_height = calc_dynamic_params(len(s_list))
             left_x = 90  # 固定起始x（总宽度 820，居中起始位置 = (1000-820)/2 = 90）
             for index, item in enumerate(s_list):
-                item_bg = await draw_pic(item)
+                item_bg = draw_pic(item)
                 new_h = int(item_bg.height * w_item / item_bg.width)
                 item_bg = item_bg.resize((w_item, new_h))
 
@@ -493,7 +463,7 @@ async def draw_card(uid: str, ev: Event):
         s_list = gacha_data["rank_s_list"]
         if not s_list:
             continue
-        item_bg = await draw_pic(s_list[0])
+        item_bg = draw_pic(s_list[0])
 
         newbie_bg_cp = newbie_bg.copy()
         newbie_bg_cp_draw = ImageDraw.Draw(newbie_bg_cp)
@@ -518,13 +488,9 @@ async def draw_card(uid: str, ev: Event):
         )
         nindex += 1
 
-    # 上传抽卡记录到服务器
-    await upload_gacha_to_server(uid, total_data, ev)
-
-    await draw_uid_avatar(uid, ev, card_img)
+    draw_uid_avatar(card_img, account_info, card_polygon)
 
     card_img = add_footer(card_img, 600, 20)
-    card_img = await convert_img(card_img)
     return card_img
 
 
@@ -555,12 +521,7 @@ async def get_random_card_polygon(ev: Event):
     return card_img.resize((280, 400))
 
 
-async def draw_uid_avatar(uid, ev, card_img):
-    # 统一国服与国际服头图
-    from ..wutheringwaves_analyzecard.user_info_utils import get_user_detail_info
-
-    account_info = await get_user_detail_info(uid)
-
+def draw_uid_avatar(card_img, account_info, card_polygon):
     base_info_bg = Image.open(TEXT_PATH / "base_info_bg.png")
     base_info_draw = ImageDraw.Draw(base_info_bg)
     base_info_draw.text((275, 120), f"{account_info.name[:7]}", "white", waves_font_30, "lm")
@@ -568,7 +529,6 @@ async def draw_uid_avatar(uid, ev, card_img):
     base_info_bg = base_info_bg.resize((900, 450))
     card_img.alpha_composite(base_info_bg, (110, 30))
     #
-    card_polygon = await get_random_card_polygon(ev)
     card_img.alpha_composite(card_polygon, (80, 0))
 
 
@@ -683,62 +643,3 @@ def extract_gacha_statistics(total_data: dict) -> dict:
         }
 
     return stats
-
-
-def calculate_max_consecutive_up(rank_s_list: list[dict]) -> int:
-    """
-    计算最多连续UP数（只统计五星角色）
-
-    例如: up,up,up,no,up,no,up,no,up,up,up
-    - 最多连续UP: 3
-    """
-    if not rank_s_list:
-        return 0
-
-    max_consecutive = 0
-    current_consecutive = 0
-
-    for item in rank_s_list:
-        # 只统计五星角色
-        if item.get("resourceType") == "角色" and item.get("qualityLevel") == 5:
-            if item.get("is_up", False):
-                current_consecutive += 1
-                max_consecutive = max(max_consecutive, current_consecutive)
-            else:
-                current_consecutive = 0
-
-    return max_consecutive
-
-
-def calculate_max_consecutive_non_up(rank_s_list: list[dict]) -> int:
-    """
-    计算最多连续非UP次数，遇到连续UP（2个或以上）才中断（只统计五星角色）
-
-    单个UP不中断计数，只有连续UP（2个或以上）才重置。
-    """
-    if not rank_s_list:
-        return 0
-
-    max_non_up = 0
-    current_non_up = 0
-    prev_is_up = False  # 前一个是否是UP
-
-    for item in rank_s_list:
-        # 只统计五星角色
-        if item.get("resourceType") == "角色" and item.get("qualityLevel") == 5:
-            if item.get("is_up", False):
-                # 当前是UP
-                if prev_is_up:
-                    # 前一个也是UP，形成连续UP，中断并结算
-                    max_non_up = max(max_non_up, current_non_up)
-                    current_non_up = 0
-                prev_is_up = True
-            else:
-                # 当前是非UP
-                current_non_up += 1
-                prev_is_up = False
-
-    # 最后如果还有未结算的，也要计入
-    max_non_up = max(max_non_up, current_non_up)
-
-    return max_non_up
@@ -18,8 +18,9 @@ from ..utils.ascension.weapon import weapon_id_data
 from ..utils.bot_url import get_url
 from ..utils.cache import TimedCache
 from ..utils.database.models import WavesBind
+from ..utils.gacha_store import has_gachalogs, load_gachalogs, save_gachalogs_data, snapshot_gachalogs
 from ..utils.resource.constant import NORMAL_LIST
-from ..utils.resource.RESOURCE_PATH import PLAYER_PATH, waves_templates
+from ..utils.resource.RESOURCE_PATH import waves_templates
 from ..wutheringwaves_config import WutheringWavesConfig
 from .draw_gachalogs import gacha_type_meta_rename
 from .get_gachalogs import gacha_type_meta_data_reverse
@@ -172,11 +173,11 @@ def convert_export_to_storage(export_data, uid):
 
 def get_resource_data():
     resource_data = []
-    for rid, data in char_id_data.items():
+    for rid, data in char_id_data.summaries().items():
         resource_data.append(
             {"name": str(data["name"]), "quality": int(data["starLevel"]), "resourceId": int(rid), "resourceType": "角色"}
         )
-    for wid, data in weapon_id_data.items():
+    for wid, data in weapon_id_data.summaries().items():
         resource_data.append(
             {"name": str(data["name"]), "quality": int(data["starLevel"]), "resourceId": int(wid), "resourceType": "武器"}
         )
@@ -229,8 +230,7 @@ async def waves_edit_data_get(auth: str):
     if not uid:
         return JSONResponse(status_code=400, content={"success": False, "msg": "未找到UID"})
 
-    gacha_log_path = PLAYER_PATH / str(uid) / "gacha_logs.json"
-    if not gacha_log_path.exists():
+    if not await has_gachalogs(uid):
         # 无记录，返回空数据
         export_data = {
             "info": {
@@ -245,8 +245,7 @@ async def waves_edit_data_get(auth: str):
         }
     else:
         try:
-            with open(gacha_log_path, encoding="utf-8") as f:
-                storage_data = json.load(f)
+            storage_data = await load_gachalogs(uid)
             export_data = convert_storage_to_export(storage_data)
         except Exception as e:
             logger.error(f"读取抽卡记录失败: {e}")
@@ -286,10 +285,8 @@ async def waves_edit_data_post(auth: str, data: dict):
             return JSONResponse(status_code=400, content={"success": False, "msg": "数据格式错误"})
 
         storage_data = convert_export_to_storage(data, target_uid)  # 传入正确的目标UID
-        gacha_log_path = PLAYER_PATH / str(target_uid) / "gacha_logs.json"
-        gacha_log_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(gacha_log_path, "w", encoding="utf-8") as f:
-            json.dump(storage_data, f, ensure_ascii=False, indent=4)
+        await snapshot_gachalogs(str(target_uid), type="edit")
+        await save_gachalogs_data(str(target_uid), storage_data["data"], data_time=storage_data["data_time"])
 
         temp["complete"] = True
         temp["msg"] = f"抽卡记录已更新，UID：{target_uid}"
@@ -316,8 +313,7 @@ async def waves_fetch_gacha(auth: str, data: dict):
     if pm > 1 and str(uid_to_fetch) != str(temp.get("uid")):
         return JSONResponse(status_code=403, content={"success": False, "msg": "无权限获取其他用户数据"})
 
-    gacha_log_path = PLAYER_PATH / str(uid_to_fetch) / "gacha_logs.json"
-    if not gacha_log_path.exists():
+    if not await has_gachalogs(uid_to_fetch):
         # 无记录，返回空数据
         export_data = {
             "info": {
@@ -332,8 +328,7 @@ async def waves_fetch_gacha(auth: str, data: dict):
         }
     else:
         try:
-            with open(gacha_log_path, encoding="utf-8") as f:
-                storage_data = json.load(f)
+            storage_data = await load_gachalogs(uid_to_fetch)
             export_data = convert_storage_to_export(storage_data)
         except Exception as e:
             logger.error(f"读取抽卡记录失败: {e}")
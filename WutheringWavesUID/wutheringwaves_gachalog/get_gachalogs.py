@@ -3,15 +3,14 @@ import base64
 import copy
 from datetime import datetime
 import json
-from pathlib import Path
 
 import aiofiles
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-import msgspec
 
 from ..utils.api.model import GachaLog
 from ..utils.database.models import WavesUser
+from ..utils.gacha_store import load_gachalogs, save_gachalogs_data, snapshot_gachalogs
 from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
 from ..utils.waves_api import waves_api
 from ..version import WutheringWavesUID_version
@@ -56,79 +55,165 @@ gachalogs_history_meta = {
 ERROR_MSG_INVALID_LINK = "当前抽卡链接已经失效，请重新导入抽卡链接"
 
 
+_HASH_MOD = (1 << 61) - 1
+_HASH_BASE = 1_000_003
+
+
+def _tokenize(*logs_list: list[GachaLog]) -> list[list[int]]:
+    """将记录映射为整数, 相等(所有字段相同)的记录得到相同的整数"""
+    token_map: dict[tuple, int] = {}
+    result = []
+    for logs in logs_list:
+        tokens = []
+        for log in logs:
+            key = tuple(log.__dict__.values())
+            tokens.append(token_map.setdefault(key, len(token_map) + 1))
+        result.append(tokens)
+    return result
+
+
+def _z_function(s: list[int]) -> list[int]:
+    n = len(s)
+    z = [0] * n
+    if n:
+        z[0] = n
+    left = right = 0
+    for i in range(1, n):
+        if i < right:
+            z[i] = min(right - i, z[i - left])
+        while i + z[i] < n and s[z[i]] == s[i + z[i]]:
+            z[i] += 1
+        if i + z[i] > right:
+            left, right = i, i + z[i]
+    return z
+
+
+def _window_hashes(tokens: list[int], length: int) -> list[int]:
+    """所有长度为 length 的子串的多项式哈希"""
+    if length > len(tokens):
+        return []
+    high = pow(_HASH_BASE, length, _HASH_MOD)
+    h = 0
+    prefix = [0]
+    for t in tokens:
+        h = (h * _HASH_BASE + t) % _HASH_MOD
+        prefix.append(h)
+    return [(prefix[i + length] - prefix[i] * high) % _HASH_MOD for i in range(len(tokens) - length + 1)]
+
+
+def _find_common(a: list[int], b: list[int], length: int) -> tuple[int, int] | None:
+    """
+    查找长度为 length 的公共子串, 返回 (a_start, b_start)
+    多个结果时取 a_start 最大, 其次 b_start 最大 (与原 dp 的遍历顺序一致)
+    """
+    b_index: dict[int, list[int]] = {}
+    for j, h in enumerate(_window_hashes(b, length)):
+        b_index.setdefault(h, []).append(j)
+
+    a_hashes = _window_hashes(a, length)
+    for i in range(len(a_hashes) - 1, -1, -1):
+        positions = b_index.get(a_hashes[i])
+        if not positions:
+            continue
+        # 哈希命中后逐项比对, 排除哈希冲突
+        for j in reversed(positions):
+            if a[i : i + length] == b[j : j + length]:
+                return i, j
+    return None
+
+
+def _longest_common_substring(a: list[int], b: list[int]) -> tuple[int, int, int] | None:
+    """二分长度 + 滚动哈希求最长公共子串, 返回 (a_start, b_start, length)"""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if _find_common(a, b, mid):
+            low = mid
+        else:
+            high = mid - 1
+    if low == 0:
+        return None
+    found = _find_common(a, b, low)
+    if not found:
+        return None
+    return found[0], found[1], low
+
+
 def find_longest_suffix_in_old(old: list[GachaLog], new: list[GachaLog]) -> tuple[tuple[int, int], tuple[int, int]] | None:
     """
     返回以新记录最后一个元素结尾的最长公共子串的索引范围。
     如果不存在任何匹配，返回 None。
     返回值格式：((old_start, old_end), (new_start, new_end))
+
+    将两个序列反转后, 新记录的后缀变为前缀, 对 `反转新记录 + 分隔符 + 反转旧记录` 求 Z 函数,
+    旧记录中每个位置能匹配的最长前缀即为 z 值, O(n + m)。
     """
     n, m = len(old), len(new)
+    if not n or not m:
+        return None
+
+    old_tokens, new_tokens = _tokenize(old, new)
+    z = _z_function(new_tokens[::-1] + [0] + old_tokens[::-1])
+
     max_len = 0
-    best_old_end = best_new_end = -1
-
-    # 新记录从末尾开始向前检查，旧记录从任意位置开始向后匹配
-    for i in range(m):  # i 表示新记录中匹配的起始索引（从 0 到 m-1）
-        # 当前新记录的后缀是 new[i:]
-        # 我们希望在 old 中找到与这个后缀相等的最长子串
-        # 可以通过遍历 old 的每个位置 j，尝试匹配
-        for j in range(n):
-            # 从 (i, j) 开始向后匹配，直到不相等或越界
-            k = 0
-            while i + k < m and j + k < n and new[i + k] == old[j + k]:
-                k += 1
-            # 如果这个匹配延伸到新记录的末尾（i+k == m），且长度大于当前最大
-            if i + k == m and k > max_len:
-                max_len = k
-                best_old_end = j + k - 1
-                best_new_end = i + k - 1
+    best_pos = -1
+    for p in range(n):
+        k = z[m + 1 + p]
+        # 长度相同时取反转后最靠后的位置, 即原序列中最靠前的位置
+        if k and k >= max_len:
+            max_len = k
+            best_pos = p
 
     if max_len == 0:
         return None
 
-    return (best_old_end - max_len + 1, best_old_end), (best_new_end - max_len + 1, best_new_end)
+    old_start = n - best_pos - max_len
+    return (old_start, old_start + max_len - 1), (m - max_len, m - 1)
 
 
 # 找到两个数组中最长公共子串的下标
 def find_longest_common_subarray_indices(a: list[GachaLog], b: list[GachaLog]) -> tuple[tuple[int, int], tuple[int, int]] | None:
-    n, m = len(a), len(b)
-    dp = [[0] * (m + 1) for _ in range(n + 1)]
-    length = 0
-    a_end = b_end = 0
-
-    for i in range(n - 1, -1, -1):
-        for j in range(m - 1, -1, -1):
-            if a[i] == b[j]:
-                dp[i][j] = dp[i + 1][j + 1] + 1
-                if dp[i][j] > length:
-                    length = dp[i][j]
-                    a_end = i + length - 1
-                    b_end = j + length - 1
-            else:
-                dp[i][j] = 0
-
-    if length == 0:
+    a_tokens, b_tokens = _tokenize(a, b)
+    found = _longest_common_substring(a_tokens, b_tokens)
+    if not found:
         return None
-
-    return (a_end - length + 1, a_end), (b_end - length + 1, b_end)
+    a_start, b_start, length = found
+    return (a_start, a_start + length - 1), (b_start, b_start + length - 1)
 
 
 # 根据最长公共子串递归合并两个GachaLog列表，不去重，按time排序
 def merge_gacha_logs_by_common_subarray(a: list[GachaLog], b: list[GachaLog]) -> list[GachaLog]:
-    common_indices = find_longest_common_subarray_indices(a, b)
-    if not common_indices:
-        return sorted(
-            a + b,
-            key=lambda log: datetime.strptime(log.time, "%Y-%m-%d %H:%M:%S"),
-            reverse=True,
-        )
+    a_tokens, b_tokens = _tokenize(a, b)
+    result: list[GachaLog] = []
+
+    # 用栈代替递归: 依次处理 前缀 -> 公共部分 -> 后缀
+    stack: list[tuple[int, int, int, int] | list[GachaLog]] = [(0, len(a), 0, len(b))]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            result.extend(item)
+            continue
 
-    (a_start, a_end), (b_start, b_end) = common_indices
+        a_lo, a_hi, b_lo, b_hi = item
+        found = _longest_common_substring(a_tokens[a_lo:a_hi], b_tokens[b_lo:b_hi])
+        if not found:
+            result.extend(
+                sorted(
+                    a[a_lo:a_hi] + b[b_lo:b_hi],
+                    key=lambda log: datetime.strptime(log.time, "%Y-%m-%d %H:%M:%S"),
+                    reverse=True,
+                )
+            )
+            continue
 
-    prefix = merge_gacha_logs_by_common_subarray(a[:a_start], b[:b_start])
-    common_subarray = a[a_start : a_end + 1]
-    suffix = merge_gacha_logs_by_common_subarray(a[a_end + 1 :], b[b_end + 1 :])
+        a_start, b_start, length = found
+        a_start += a_lo
+        b_start += b_lo
+        stack.append((a_start + length, a_hi, b_start + length, b_hi))
+        stack.append(a[a_start : a_start + length])
+        stack.append((a_lo, a_start, b_lo, b_start))
 
-    return prefix + common_subarray + suffix
+    return result
 
 
 async def get_new_gachalog(
@@ -204,16 +289,6 @@ async def get_new_gachalog_for_file(
     return None, new, new_count
 
 
-async def backup_gachalogs(uid: str, gachalogs_history: dict, type: str):
-    path = PLAYER_PATH / str(uid)
-    if not path.exists():
-        path.mkdir(parents=True, exist_ok=True)
-    # 备份
-    backup_path = path / f"{type}_gacha_logs_{datetime.now().strftime('%Y-%m-%d.%H%M%S')}.json"
-    async with aiofiles.open(backup_path, "w", encoding="UTF-8") as file:
-        await file.write(json.dumps(gachalogs_history, ensure_ascii=False))
-
-
 async def save_gachalogs(
     ev: Event,
     uid: str,
@@ -221,32 +296,13 @@ async def save_gachalogs(
     is_force: bool = False,
     import_data: dict[str, list[GachaLog]] | None = None,
 ) -> str:
-    path = PLAYER_PATH / str(uid)
-    if not path.exists():
-        path.mkdir(parents=True, exist_ok=True)
-
-    # 抽卡记录json路径
-    gachalogs_path = path / "gacha_logs.json"
-
-    temp_gachalogs_history = {}
-    if gachalogs_path.exists():
-        with Path.open(gachalogs_path, encoding="UTF-8") as f:
-            gachalogs_history: dict = json.load(f)
-
+    gachalogs_history: dict[str, list[dict]] = {gacha_name: [] for gacha_name in gachalogs_history_meta}
+    stored = await load_gachalogs(uid)
+    if stored:
         # import 时备份
         if not record_id:
-            await backup_gachalogs(uid, gachalogs_history, type="import")
-
-        # update 时备份
-        temp_gachalogs_history = copy.deepcopy(gachalogs_history)
-
-        gachalogs_history = gachalogs_history["data"]
-    else:
-        gachalogs_history = copy.deepcopy(gachalogs_history_meta)
-
-    temp = copy.deepcopy(gachalogs_history_meta)
-    temp.update(gachalogs_history)
-    gachalogs_history = temp
+            await snapshot_gachalogs(uid, type="import")
+        gachalogs_history.update(stored["data"])
 
     is_need_backup = False
     for gacha_name, card_pool_type in gacha_type_meta_data.items():
@@ -265,8 +321,12 @@ async def save_gachalogs(
 
             is_need_backup = True
 
+    # update 时备份(此时磁盘上仍是修正前的数据)
     if is_need_backup:
-        await backup_gachalogs(uid, temp_gachalogs_history, type="update")
+        await snapshot_gachalogs(uid, type="update")
+
+    # 磁盘上的记录, 用于只追加新增的部分; 修正过旧记录时需要整体重写
+    old_data = None if is_need_backup else {k: list(v) for k, v in gachalogs_history.items()}
 
     for gacha_name in gacha_type_meta_data.keys():
         gachalogs_history[gacha_name] = [GachaLog(**log) for log in gachalogs_history[gacha_name]]
@@ -288,22 +348,13 @@ async def save_gachalogs(
     # 获取当前时间
     current_time = datetime.now().strftime("%Y-%m-%d %H-%M-%S")
 
-    # 初始化最后保存的数据
-    result = {"uid": uid, "data_time": current_time}
-
     # ========== 新增：时间顺序异常的检查与清理 ==========
-    result["data"] = {  # type: ignore
+    data = {
         gacha_name: clean_and_convert_gachalogs(gachalogs_new.get(gacha_name, [])) for gacha_name in gacha_type_meta_data.keys()
     }
-
-    # 保存清理后的数量
-    for gacha_name in gacha_type_meta_data.keys():
-        result[gacha_name] = len(result["data"][gacha_name])  # type: ignore
     # ==============================================
 
-    vo = msgspec.to_builtins(result)
-    async with aiofiles.open(gachalogs_path, "w", encoding="UTF-8") as file:
-        await file.write(json.dumps(vo, ensure_ascii=False))
+    await save_gachalogs_data(uid, data, old_data=old_data, data_time=current_time)
 
     # 计算数据
     all_add = sum(gachalogs_count_add.values())
@@ -397,12 +448,8 @@ async def export_gachalogs(uid: str) -> dict:
     now = datetime.now()
     current_time = now.strftime("%Y-%m-%d %H:%M:%S")
 
-    # 抽卡记录json路径
-    gachalogs_path = path / "gacha_logs.json"
-    if gachalogs_path.exists():
-        async with aiofiles.open(gachalogs_path, encoding="UTF-8") as f:
-            raw_data = json.loads(await f.read())
-
+    raw_data = await load_gachalogs(uid)
+    if raw_data:
         result = {
             "info": {
                 "export_time": current_time,
@@ -6,7 +6,6 @@ import time
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 import httpx
 from PIL import Image, ImageDraw
 
@@ -46,34 +45,35 @@ from ..utils.image import (
     WAVES_VOID,
     WEAPON_RESONLEVEL_COLOR,
     add_footer,
-    crop_center_img,
-    get_attribute,
-    get_attribute_effect,
-    get_role_pile_old,
-    get_square_avatar,
-    get_square_weapon,
+    draw_rank_user_avatar,
+    get_attribute_effect_sync,
+    get_attribute_sync,
+    get_rank_role_avatar,
+    get_role_pile_old_sync,
+    get_square_weapon_cropped_sync,
     get_user_avatar,
     get_waves_bg,
 )
 from ..utils.name_convert import alias_to_char_name, char_name_to_char_id
+from ..utils.render_executor import convert_img, render_sync, render_task
 from ..utils.resource.constant import ATTRIBUTE_ID_MAP, SPECIAL_CHAR_NAME
+from ..utils.texture import get_texture
 from ..utils.util import get_version
 from ..utils.waves_api import waves_api
 from ..wutheringwaves_analyzecard.user_info_utils import get_region_for_rank
 from ..wutheringwaves_config import WutheringWavesConfig
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
-TITLE_I = Image.open(TEXT_PATH / "title.png")
-TITLE_II = Image.open(TEXT_PATH / "title2.png")
-avatar_mask = Image.open(TEXT_PATH / "avatar_mask.png")
-weapon_icon_bg_3 = Image.open(TEXT_PATH / "weapon_icon_bg_3.png")
-weapon_icon_bg_4 = Image.open(TEXT_PATH / "weapon_icon_bg_4.png")
-weapon_icon_bg_5 = Image.open(TEXT_PATH / "weapon_icon_bg_5.png")
-promote_icon = Image.open(TEXT_PATH / "promote_icon.png")
-char_mask = Image.open(TEXT_PATH / "char_mask.png")
-char_mask2 = Image.open(TEXT_PATH / "char_mask.png")
+TITLE_I = get_texture(TEXT_PATH / "title.png")
+TITLE_II = get_texture(TEXT_PATH / "title2.png")
+weapon_icon_bg_3 = get_texture(TEXT_PATH / "weapon_icon_bg_3.png")
+weapon_icon_bg_4 = get_texture(TEXT_PATH / "weapon_icon_bg_4.png")
+weapon_icon_bg_5 = get_texture(TEXT_PATH / "weapon_icon_bg_5.png")
+promote_icon = get_texture(TEXT_PATH / "promote_icon.png")
+char_mask = get_texture(TEXT_PATH / "char_mask.png")
+char_mask2 = get_texture(TEXT_PATH / "char_mask.png")
 char_mask2 = char_mask2.resize((1300, char_mask2.size[1]))
-logo_img = Image.open(TEXT_PATH / "logo_small_2.png")
+logo_img = get_texture(TEXT_PATH / "logo_small_2.png")
 pic_cache = TimedCache(600, 200)
 
 
@@ -113,6 +113,7 @@ async def get_rank(item: RankItem) -> RankInfoResponse | None:
             logger.exception(f"获取排行失败: {e}")
 
 
+@render_task("all_rank")
 async def draw_all_rank_card(bot: Bot, ev: Event, char: str, rank_type: str, pages: int) -> str | bytes:
     is_self_ck = False
     self_uid = ""
@@ -156,7 +157,32 @@ async def draw_all_rank_card(bot: Bot, ev: Event, char: str, rank_type: str, pag
     if not rankInfoList.data:
         return "获取排行失败"
 
-    totalNum = len(rankInfoList.data.details)
+    tasks = [get_avatar(rank.user_id, rank.char_id) for rank in rankInfoList.data.details]
+    results = await asyncio.gather(*tasks)
+
+    card_img = await draw_all_rank_img(
+        rankInfoList.data.details, results, char_id, char_name, attribute_name, rank_type, pages, page_num, self_uid, is_self_ck
+    )
+    card_img = await convert_img(card_img)
+
+    logger.info(f"[get_rank_info_for_user] end: {time.time() - start_time}")
+    return card_img
+
+
+@render_sync("all_rank")
+def draw_all_rank_img(
+    details: list[RankDetail],
+    results: list[Image.Image],
+    char_id: str,
+    char_name: str,
+    attribute_name: str,
+    rank_type: str,
+    pages: int,
+    page_num: int,
+    self_uid: str,
+    is_self_ck: bool,
+) -> Image.Image:
+    totalNum = len(details)
     title_h = 500
     bar_star_h = 110
     text_bar_h = 130
@@ -188,30 +214,21 @@ async def draw_all_rank_card(bot: Bot, ev: Event, char: str, rank_type: str, pag
 
     card_img.alpha_composite(text_bar_img, (0, title_h))
 
-    bar = Image.open(TEXT_PATH / "bar1.png")
+    bar = get_texture(TEXT_PATH / "bar1.png")
     total_score = 0
     total_damage = 0
 
-    pic = await get_square_avatar(char_id)
-
-    pic_temp = Image.new("RGBA", pic.size)
-    pic_temp.paste(pic.resize((160, 160)), (10, 10))
-    pic_temp = pic_temp.resize((160, 160))
-
-    tasks = [get_avatar(rank.user_id, rank.char_id) for rank in rankInfoList.data.details]
-    results = await asyncio.gather(*tasks)
-
     bot_color = copy.deepcopy(BOT_COLOR)
     bot_color_map = {}
     avg_num = 0
-    for index, temp in enumerate(zip(rankInfoList.data.details, results)):
+    for index, temp in enumerate(zip(details, results)):
         rank: RankDetail = temp[0]
         role_avatar: Image.Image = temp[1]
         bar_bg = bar.copy()
         bar_star_draw = ImageDraw.Draw(bar_bg)
         bar_bg.paste(role_avatar, (100, 0), role_avatar)
 
-        role_attribute = await get_attribute(attribute_name, is_simple=True)
+        role_attribute = get_attribute_sync(attribute_name, is_simple=True)
         role_attribute = role_attribute.resize((40, 40)).convert("RGBA")
         bar_bg.alpha_composite(role_attribute, (300, 20))
 
@@ -240,7 +257,7 @@ async def draw_all_rank_card(bot: Bot, ev: Event, char: str, rank_type: str, pag
 
         # 评分
         if rank.phantom_score > 0.0:
-            score_bg = Image.open(TEXT_PATH / f"score_{rank.phantom_score_bg}.png")
+            score_bg = get_texture(TEXT_PATH / f"score_{rank.phantom_score_bg}.png")
             bar_bg.alpha_composite(score_bg, (545, 2))
             bar_star_draw.text(
                 (707, 45),
@@ -253,7 +270,7 @@ async def draw_all_rank_card(bot: Bot, ev: Event, char: str, rank_type: str, pag
 
         # 合鸣效果
         if rank.sonata_name:
-            effect_image = await get_attribute_effect(rank.sonata_name)
+            effect_image = get_attribute_effect_sync(rank.sonata_name)
             effect_image = effect_image.resize((50, 50))
             bar_bg.alpha_composite(effect_image, (790, 15))
             sonata_name = rank.sonata_name
@@ -273,8 +290,7 @@ async def draw_all_rank_card(bot: Bot, ev: Event, char: str, rank_type: str, pag
             logger.warning(f"武器名【{rank.weapon_id}】无法找到, 可能暂未适配, 请先检查输入是否正确！")
             continue
 
-        weapon_icon = await get_square_weapon(rank.weapon_id)
-        weapon_icon = crop_center_img(weapon_icon, 110, 110)
+        weapon_icon = get_square_weapon_cropped_sync(rank.weapon_id, 110)
         weapon_icon_bg = get_weapon_icon_bg(weapon_model.starLevel)
         weapon_icon_bg.paste(weapon_icon, (10, 20), weapon_icon)
 
@@ -401,7 +417,7 @@ async def draw_all_rank_card(bot: Bot, ev: Event, char: str, rank_type: str, pag
     img_temp = Image.new("RGBA", char_mask2.size)
     img_temp.alpha_composite(title, (-300, 0))
     # 人物bg
-    pile = await get_role_pile_old(char_id, custom=True)
+    pile = get_role_pile_old_sync(char_id, custom=True)
     img_temp.alpha_composite(pile, (600, -120))
 
     img_temp2 = Image.new("RGBA", char_mask2.size)
@@ -409,9 +425,6 @@ async def draw_all_rank_card(bot: Bot, ev: Event, char: str, rank_type: str, pag
 
     card_img.alpha_composite(img_temp2, (0, 0))
     card_img = add_footer(card_img)
-    card_img = await convert_img(card_img)
-
-    logger.info(f"[get_rank_info_for_user] end: {time.time() - start_time}")
     return card_img
 
 
@@ -454,37 +467,21 @@ async def get_avatar(
     char_id: int | str,
 ) -> Image.Image:
     try:
+        # 缓存 crop 和遮罩后的头像（onebot/discord 共用逻辑）
         if WutheringWavesConfig.get_config("QQPicCache").data:
-            pic = pic_cache.get(qid)
-            if not pic:
+            img = pic_cache.get(qid)
+            if not img:
                 pic = await get_user_avatar(qid, size=100)
-                pic_cache.set(qid, pic)
+                img = draw_rank_user_avatar(pic, TEXT_PATH / "avatar_mask.png")
+                pic_cache.set(qid, img)
         else:
             pic = await get_user_avatar(qid, size=100)
-            pic_cache.set(qid, pic)
-
-        # 统一处理 crop 和遮罩（onebot/discord 共用逻辑）
-        pic_temp = crop_center_img(pic, 120, 120)
-        img = Image.new("RGBA", (180, 180))
-        avatar_mask_temp = avatar_mask.copy()
-        mask_pic_temp = avatar_mask_temp.resize((120, 120))
-        img.paste(pic_temp, (0, -5), mask_pic_temp)
+            img = draw_rank_user_avatar(pic, TEXT_PATH / "avatar_mask.png")
+            pic_cache.set(qid, img)
 
     except Exception as e:
         # 打印异常，进行降级处理
         logger.warning(f"头像获取失败，使用默认头像: {e}")
-        pic = await get_square_avatar(char_id)
-
-        pic_temp = Image.new("RGBA", pic.size)
-        pic_temp.paste(pic.resize((160, 160)), (10, 10))
-        pic_temp = pic_temp.resize((160, 160))
-
-        avatar_mask_temp = avatar_mask.copy()
-        mask_pic_temp = Image.new("RGBA", avatar_mask_temp.size)
-        mask_pic_temp.paste(avatar_mask_temp, (-20, -45), avatar_mask_temp)
-        mask_pic_temp = mask_pic_temp.resize((160, 160))
-
-        img = Image.new("RGBA", (180, 180))
-        img.paste(pic_temp, (0, 0), mask_pic_temp)
+        img = await get_rank_role_avatar(char_id, TEXT_PATH / "avatar_mask.png")
 
     return img
@@ -5,22 +5,15 @@ import time
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 from PIL import Image, ImageDraw
 from pydantic import BaseModel
 
 from ..utils.api.model import RoleDetailData, WeaponData
 from ..utils.cache import TimedCache
-from ..utils.calc import WuWaCalc
-from ..utils.calculate import (
-    calc_phantom_score,
-    get_calc_map,
-    get_total_score_bg,
-)
-from ..utils.char_info_utils import get_all_role_detail_info_list
+from ..utils.char_info_utils import get_role_detail_info
 from ..utils.damage.abstract import DamageRankRegister
-from ..utils.database.models import WavesBind, WavesUser
+from ..utils.database.models import WavesBind, WavesRoleRank, WavesUser
 from ..utils.fonts.waves_fonts import (
     waves_font_14,
     waves_font_16,
@@ -39,41 +32,45 @@ from ..utils.image import (
     SPECIAL_GOLD,
     WEAPON_RESONLEVEL_COLOR,
     add_footer,
-    get_attribute,
-    get_attribute_effect,
-    get_role_pile_old,
+    get_attribute_effect_sync,
+    get_attribute_sync,
+    get_role_pile_old_sync,
     get_square_avatar,
-    get_square_weapon,
+    get_square_weapon_sync,
     get_user_avatar,
     get_waves_bg,
 )
 from ..utils.name_convert import alias_to_char_name, char_name_to_char_id
+from ..utils.rank_index import get_rank_index
+from ..utils.render_executor import convert_img, render_sync, render_task
 from ..utils.resource.constant import SPECIAL_CHAR, SPECIAL_CHAR_NAME
-from ..utils.util import hide_uid, send_master_info
+from ..utils.texture import get_texture
+from ..utils.util import hide_uid
 from ..wutheringwaves_analyzecard.user_info_utils import get_region_for_rank, get_user_detail_info
 from ..wutheringwaves_config import PREFIX, WutheringWavesConfig
 
 rank_length = 20  # 排行长度
 TEXT_PATH = Path(__file__).parent / "texture2d"
-TITLE_I = Image.open(TEXT_PATH / "title.png")
-TITLE_II = Image.open(TEXT_PATH / "title2.png")
-avatar_mask = Image.open(TEXT_PATH / "avatar_mask.png")
-weapon_icon_bg_3 = Image.open(TEXT_PATH / "weapon_icon_bg_3.png")
-weapon_icon_bg_4 = Image.open(TEXT_PATH / "weapon_icon_bg_4.png")
-weapon_icon_bg_5 = Image.open(TEXT_PATH / "weapon_icon_bg_5.png")
-promote_icon = Image.open(TEXT_PATH / "promote_icon.png")
-char_mask = Image.open(TEXT_PATH / "char_mask.png")
-char_mask2 = Image.open(TEXT_PATH / "char_mask.png")
+TITLE_I = get_texture(TEXT_PATH / "title.png")
+TITLE_II = get_texture(TEXT_PATH / "title2.png")
+avatar_mask = get_texture(TEXT_PATH / "avatar_mask.png")
+weapon_icon_bg_3 = get_texture(TEXT_PATH / "weapon_icon_bg_3.png")
+weapon_icon_bg_4 = get_texture(TEXT_PATH / "weapon_icon_bg_4.png")
+weapon_icon_bg_5 = get_texture(TEXT_PATH / "weapon_icon_bg_5.png")
+promote_icon = get_texture(TEXT_PATH / "promote_icon.png")
+char_mask = get_texture(TEXT_PATH / "char_mask.png")
+char_mask2 = get_texture(TEXT_PATH / "char_mask.png")
 char_mask2 = char_mask2.resize((1300, char_mask2.size[1]))
-logo_img = Image.open(TEXT_PATH / "logo_small_2.png")
+logo_img = get_texture(TEXT_PATH / "logo_small_2.png")
 pic_cache = TimedCache(86400, 200)
 
 
 class RankInfo(BaseModel):
-    roleDetail: RoleDetailData  # 角色明细
+    roleDetail: RoleDetailData | None = None  # 角色明细, 仅上榜角色加载
     qid: str  # qq id
     uid: str  # uid
-    kuro_name: str  # 用户名称
+    char_id: int  # 排行索引中计分的角色id, 漂泊者为分数最高的形态
+    kuro_name: str = ""  # 用户名称, 仅上榜角色加载
     server: str  # 区服
     server_color: tuple[int, int, int]  # 区服颜色
     level: int  # 角色等级
@@ -86,122 +83,35 @@ class RankInfo(BaseModel):
     sonata_name: str  # 合鸣效果
 
 
-async def get_one_rank_info(user_id, uid, role_detail, rankDetail):
-    equipPhantomList = role_detail.phantomData.equipPhantomList
-
-    calc: WuWaCalc = WuWaCalc(role_detail)
-    calc.phantom_pre = calc.prepare_phantom()
-    calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
-    calc.calc_temp = get_calc_map(
-        calc.phantom_card,
-        role_detail.role.roleName,
-        role_detail.role.roleId,
-    )
-
-    # 评分
-    phantom_score = 0
-    # calc_temp = get_calc_map(phantom_sum_value, role_detail.role.roleName)
-    for i, _phantom in enumerate(equipPhantomList):
-        if _phantom and _phantom.phantomProp:
-            props = _phantom.get_props()
-            _score, _bg = calc_phantom_score(role_detail.role.roleId, props, _phantom.cost, calc.calc_temp)
-            phantom_score += _score
-
-    if phantom_score == 0:
-        return
-
-    phantom_bg = get_total_score_bg(role_detail.role.roleName, phantom_score, calc.calc_temp)
-
-    calc.role_card = calc.enhance_summation_card_value(calc.phantom_card)
-    calc.damageAttribute = calc.card_sort_map_to_attribute(calc.role_card)
-
-    if rankDetail:
-        crit_damage, expected_damage = rankDetail["func"](calc.damageAttribute, role_detail)
-    else:
-        expected_damage = "0"
-
-    sonata_name = ""
-    ph_detail = calc.phantom_card.get("ph_detail", [])
-    if isinstance(ph_detail, list):
-        for ph in ph_detail:
-            if ph.get("ph_num") == 5:
-                sonata_name = ph.get("ph_name", "")
-                break
-
-            if ph.get("isFull"):
-                sonata_name = ph.get("ph_name", "")
-                break
-
+def get_one_rank_info(user_id: str, uid: str, rank_row: WavesRoleRank, rankDetail) -> RankInfo:
     # 区服
     region_text, region_color = get_region_for_rank(uid)
 
-    # 用户名称
-    account_info = await get_user_detail_info(uid)
-
-    rankInfo = RankInfo(
+    return RankInfo(
         **{
-            "roleDetail": role_detail,
             "qid": user_id,
             "uid": uid,
-            "kuro_name": account_info.name[:6],
+            "char_id": rank_row.char_id,
             "server": region_text,
             "server_color": region_color,
-            "level": role_detail.role.level,
-            "chain": role_detail.get_chain_num(),
-            "chainName": role_detail.get_chain_name(),
-            "score": round(phantom_score, 2),
-            "score_bg": phantom_bg,
-            "expected_damage": expected_damage,
-            "expected_damage_int": int(expected_damage.replace(",", "")),
-            "sonata_name": sonata_name,
+            "level": rank_row.level,
+            "chain": rank_row.chain,
+            "chainName": f"{['零', '一', '二', '三', '四', '五', '六'][rank_row.chain]}链",
+            "score": rank_row.score,
+            "score_bg": rank_row.score_bg,
+            "expected_damage": rank_row.expected_damage if rankDetail else "0",
+            "expected_damage_int": rank_row.expected_damage_int if rankDetail else 0,
+            "sonata_name": rank_row.sonata_name,
         }
     )
-    return rankInfo
 
 
 async def find_role_detail(uid: str, char_id: int | str | list[str] | list[int]) -> RoleDetailData | None:
-    role_details = await get_all_role_detail_info_list(uid)
-    if role_details is None:
-        return None
-
-    # 将char_id转换为字符串列表进行匹配
-    if isinstance(char_id, (int, str)):
-        char_id_list = [str(char_id)]
-    else:
-        char_id_list = [str(cid) for cid in char_id]
-
-    # 使用生成器来进行过滤
-    return next((role for role in role_details if str(role.role.roleId) in char_id_list), None)
-
-
-async def get_rank_info_for_uid(
-    user_id: str,
-    uid: str,
-    char_id,
-    find_char_id,
-    rankDetail,
-    tokenLimitFlag,
-    wavesTokenUsersMap,
-):
-    """
-    获取单个用户的单个 UID 的排行信息
-    """
-    if tokenLimitFlag and (user_id, uid) not in wavesTokenUsersMap:
-        return None
-
-    role_detail = await find_role_detail(uid, find_char_id)
-    if not role_detail:
-        return None
-    if not role_detail.phantomData or not role_detail.phantomData.equipPhantomList:
-        return None
-
-    try:
-        rankInfo = await get_one_rank_info(user_id, uid, role_detail, rankDetail)
-        return rankInfo
-    except Exception as e:
-        logger.warning(f"获取用户{user_id} id{uid} 的排行数据,错误: {e}")
-        await send_master_info(f"获取用户{user_id} id{uid} 的排行数据,错误: {e}")
-        return None
+    """读取uid的角色面板, 漂泊者等多个角色id时读取排行索引中计分的角色"""
+    rank_row = (await get_rank_index([uid], char_id)).get(uid)
+    if rank_row:
+        return await get_role_detail_info(uid, rank_row.char_id)
+    return await get_role_detail_info(uid, char_id)
 
 
 async def get_all_rank_info(
@@ -222,30 +132,38 @@ async def get_all_rank_info(
                 uid_to_user_id[uid] = user.user_id
             # 重复 UID 自动忽略，不覆盖原有映射
 
-    # 并发控制
-    semaphore = asyncio.Semaphore(50)
-
-    async def process_uid(uid, user_id):
-        async with semaphore:
-            return await get_rank_info_for_uid(
-                user_id,
-                uid,
-                char_id,
-                find_char_id,
-                rankDetail,
-                tokenLimitFlag,
-                wavesTokenUsersMap,
-            )
+    if tokenLimitFlag:
+        uid_to_user_id = {uid: user_id for uid, user_id in uid_to_user_id.items() if (user_id, uid) in wavesTokenUsersMap}
 
-    # 创建所有 UID 任务
-    tasks = [process_uid(uid, user_id) for uid, user_id in uid_to_user_id.items()]
-    results = await asyncio.gather(*tasks)
+    # 从排行索引读取, 不再逐个计算
+    rank_index = await get_rank_index(uid_to_user_id.keys(), find_char_id)
 
-    # 过滤掉 None 结果
-    rankInfoList = [rank_info for rank_info in results if rank_info is not None]
+    rankInfoList = []
+    for uid, user_id in uid_to_user_id.items():
+        rank_row = rank_index.get(uid)
+        if not rank_row:
+            continue
+        rankInfoList.append(get_one_rank_info(user_id, uid, rank_row, rankDetail))
     return rankInfoList
 
 
+async def load_rank_role_detail(rankInfoList: list[RankInfo]) -> list[RankInfo]:
+    """加载上榜角色的面板数据与用户名称, 面板已不存在的会被移除"""
+
+    async def _load(rank: RankInfo):
+        role_detail = await get_role_detail_info(rank.uid, rank.char_id)
+        if not role_detail:
+            return None
+        rank.roleDetail = role_detail
+        # 用户名称
+        account_info = await get_user_detail_info(rank.uid)
+        rank.kuro_name = account_info.name[:6]
+        return rank
+
+    results = await asyncio.gather(*[_load(rank) for rank in rankInfoList])
+    return [rank for rank in results if rank is not None]
+
+
 async def get_waves_token_condition(ev):
     wavesTokenUsersMap = {}
     flag = False
@@ -262,6 +180,7 @@ async def get_waves_token_condition(ev):
     return flag, wavesTokenUsersMap
 
 
+@render_task("bot_rank")
 async def draw_bot_rank_img(bot: Bot, ev: Event, char: str, rank_type: str) -> str | bytes:
     char_id = char_name_to_char_id(char)
     if not char_id:
@@ -344,7 +263,28 @@ async def draw_bot_rank_img(bot: Bot, ev: Event, char: str, rank_type: str) -> s
     rankInfoList = rankInfoList[:rank_length]
     if rankId and rankInfo and rankId > rank_length:
         rankInfoList.append(rankInfo)
+    rankInfoList = await load_rank_role_detail(rankInfoList)
+
+    tasks = [get_avatar(ev, rank.qid, rank.roleDetail.role.roleId) for rank in rankInfoList]
+    results = await asyncio.gather(*tasks)
+
+    card_img = await draw_bot_rank_card(rankInfoList, results, char_id, char_name, rank_type, damage_title, rankId)
+    card_img = await convert_img(card_img)
 
+    logger.info(f"[get_rank_info_for_user] end: {time.time() - start_time}")
+    return card_img
+
+
+@render_sync("bot_rank")
+def draw_bot_rank_card(
+    rankInfoList: list[RankInfo],
+    results: list[Image.Image],
+    char_id: str,
+    char_name: str,
+    rank_type: str,
+    damage_title: str,
+    rankId: int | None,
+) -> Image.Image:
     totalNum = len(rankInfoList)
     title_h = 500
     bar_star_h = 110
@@ -352,23 +292,22 @@ async def draw_bot_rank_img(bot: Bot, ev: Event, char: str, rank_type: str) -> s
     card_img = get_waves_bg(1300, h, "bg3")
     card_img_draw = ImageDraw.Draw(card_img)
 
-    bar = Image.open(TEXT_PATH / "bar1.png")
+    bar = get_texture(TEXT_PATH / "bar1.png")
     total_score = 0
     total_damage = 0
 
-    tasks = [get_avatar(ev, rank.qid, rank.roleDetail.role.roleId) for rank in rankInfoList]
-    results = await asyncio.gather(*tasks)
-
     for index, temp in enumerate(zip(rankInfoList, results)):
         rank, role_avatar = temp
         rank: RankInfo
-        rank_role_detail: RoleDetailData = rank.roleDetail
+        rank_role_detail = rank.roleDetail
+        if rank_role_detail is None:
+            continue
         bar_bg = bar.copy()
         bar_star_draw = ImageDraw.Draw(bar_bg)
         # role_avatar = await get_avatar(ev, rank.qid, role_detail.role.roleId)
         bar_bg.paste(role_avatar, (100, 0), role_avatar)
 
-        role_attribute = await get_attribute(rank_role_detail.role.attributeName or "导电", is_simple=True)
+        role_attribute = get_attribute_sync(rank_role_detail.role.attributeName or "导电", is_simple=True)
         role_attribute = role_attribute.resize((40, 40)).convert("RGBA")
         bar_bg.alpha_composite(role_attribute, (300, 20))
 
@@ -396,7 +335,7 @@ async def draw_bot_rank_img(bot: Bot, ev: Event, char: str, rank_type: str) -> s
 
         # 评分
         if rank.score > 0.0:
-            score_bg = Image.open(TEXT_PATH / f"score_{rank.score_bg}.png")
+            score_bg = get_texture(TEXT_PATH / f"score_{rank.score_bg}.png")
             bar_bg.alpha_composite(score_bg, (545, 2))
             bar_star_draw.text(
                 (707, 45),
@@ -409,7 +348,7 @@ async def draw_bot_rank_img(bot: Bot, ev: Event, char: str, rank_type: str) -> s
 
         # 合鸣效果
         if rank.sonata_name:
-            effect_image = await get_attribute_effect(rank.sonata_name)
+            effect_image = get_attribute_effect_sync(rank.sonata_name)
             effect_image = effect_image.resize((50, 50))
             bar_bg.alpha_composite(effect_image, (790, 15))
             sonata_name = rank.sonata_name
@@ -425,7 +364,7 @@ async def draw_bot_rank_img(bot: Bot, ev: Event, char: str, rank_type: str) -> s
         weapon_bg_temp = Image.new("RGBA", (600, 300))
 
         weaponData: WeaponData = rank_role_detail.weaponData
-        weapon_icon = await get_square_weapon(weaponData.weapon.weaponId)
+        weapon_icon = get_square_weapon_sync(weaponData.weapon.weaponId)
         weapon_icon = crop_center_img(weapon_icon, 110, 110)
         weapon_icon_bg = get_weapon_icon_bg(weaponData.weapon.weaponStarLevel)
         weapon_icon_bg.paste(weapon_icon, (10, 20), weapon_icon)
@@ -538,7 +477,7 @@ async def draw_bot_rank_img(bot: Bot, ev: Event, char: str, rank_type: str) -> s
     img_temp = Image.new("RGBA", char_mask2.size)
     img_temp.alpha_composite(title, (-300, 0))
     # 人物bg
-    pile = await get_role_pile_old(char_id)
+    pile = get_role_pile_old_sync(char_id)
     img_temp.alpha_composite(pile, (600, -120))
 
     img_temp2 = Image.new("RGBA", char_mask2.size)
@@ -546,9 +485,6 @@ async def draw_bot_rank_img(bot: Bot, ev: Event, char: str, rank_type: str) -> s
 
     card_img.alpha_composite(img_temp2, (0, 0))
     card_img = add_footer(card_img)
-    card_img = await convert_img(card_img)
-
-    logger.info(f"[get_rank_info_for_user] end: {time.time() - start_time}")
     return card_img
 
 
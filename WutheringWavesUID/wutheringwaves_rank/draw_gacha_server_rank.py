@@ -5,8 +5,6 @@ from pathlib import Path
 
 from gsuid_core.bot import Bot
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
-from gsuid_core.utils.image.image_tools import crop_center_img
 import httpx
 from PIL import Image, ImageDraw
 
@@ -42,19 +40,21 @@ from ..utils.image import (
     WAVES_SIERRA,
     WAVES_VOID,
     add_footer,
+    draw_rank_user_avatar,
     get_ICON,
-    get_square_avatar,
+    get_rank_role_avatar,
     get_user_avatar,
     get_waves_bg,
 )
+from ..utils.render_executor import convert_img, render_sync, render_task
+from ..utils.texture import get_texture
 from ..utils.util import get_version
 from ..wutheringwaves_analyzecard.user_info_utils import get_region_for_rank
 from ..wutheringwaves_config import PREFIX, WutheringWavesConfig
 from ..wutheringwaves_grouprank.models import GroupRankRecord
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
-avatar_mask = Image.open(TEXT_PATH / "avatar_mask.png")
-bar1_img = Image.open(TEXT_PATH / "bar1.png")
+bar1_img = get_texture(TEXT_PATH / "bar1.png")
 pic_cache = TimedCache(86400, 200)
 
 BOT_COLOR = [
@@ -255,6 +255,7 @@ def _merge_gacha_rank_data(
     return result
 
 
+@render_task("gacha_server_rank")
 async def draw_gacha_server_rank_img(bot: Bot, ev: Event, rank_type: str, pages: int = 1, user_type: str = "") -> str | bytes:
     """
     绘制抽卡排行榜图片
@@ -374,13 +375,30 @@ async def draw_rank_card(
         user_rank_info = rank_data.data.user_rank
         rank_list = list(rank_list) + [user_rank_info]
 
+    # 获取头像
+    details = rank_list
+    tasks = [get_avatar(detail.user_id) for detail in details]
+    results = await asyncio.gather(*tasks)
+
+    card_img = await draw_gacha_rank_img(details, results, rank_type, user_waves_id, user_type)
+    return await convert_img(card_img)
+
+
+@render_sync("gacha_server_rank")
+def draw_gacha_rank_img(
+    details: list,
+    results: list[Image.Image],
+    rank_type: str,
+    user_waves_id: str,
+    user_type: str,
+) -> Image.Image:
     # 设置图像尺寸
     width = 1300
     text_bar_height = 130
     item_spacing = 120
     header_height = 510
     footer_height = 50
-    char_list_len = len(rank_list)
+    char_list_len = len(details)
 
     # 计算所需的总高度
     total_height = header_height + text_bar_height + item_spacing * char_list_len + footer_height
@@ -436,12 +454,7 @@ async def draw_rank_card(
     card_img.alpha_composite(text_bar_img, (0, header_height))
 
     # 导入必要的图片资源
-    bar = Image.open(TEXT_PATH / "bar1.png")
-
-    # 获取头像
-    details = rank_list
-    tasks = [get_avatar(detail.user_id) for detail in details]
-    results = await asyncio.gather(*tasks)
+    bar = get_texture(TEXT_PATH / "bar1.png")
 
     # bot颜色映射
     bot_color_map = {}
@@ -655,8 +668,8 @@ async def draw_rank_card(
         card_img.paste(bar_bg, (0, y_pos), bar_bg)
 
     # title
-    title_bg = Image.open(TEXT_PATH / "gacha_bg.jpg")
-    title_bg = title_bg.crop((0, 0, width, 500))
+    title_bg = get_texture(TEXT_PATH / "gacha_bg.jpg")
+    title_bg = title_bg.crop((0, 0, width, 500)).convert("RGB")
 
     # icon
     icon = get_ICON()
@@ -670,7 +683,7 @@ async def draw_rank_card(
     title_bg_draw.text((220, 290), title_text, "white", waves_font_58, "lm")
 
     # 遮罩
-    char_mask = Image.open(TEXT_PATH / "char_mask.png").convert("RGBA")
+    char_mask = get_texture(TEXT_PATH / "char_mask.png")
     # 根据width扩图
     char_mask = char_mask.resize((width, char_mask.height * width // char_mask.width))
     char_mask = char_mask.crop((0, char_mask.height - 500, width, char_mask.height))
@@ -680,43 +693,27 @@ async def draw_rank_card(
     card_img.paste(char_mask_temp, (0, 0), char_mask_temp)
 
     card_img = add_footer(card_img)
-    return await convert_img(card_img)
+    return card_img
 
 
 async def get_avatar(user_id: str) -> Image.Image:
     """获取用户头像 - 与练度总排行一致"""
     try:
+        # 缓存 crop 和遮罩后的头像（onebot/discord 共用逻辑）
         if WutheringWavesConfig.get_config("QQPicCache").data:
-            pic = pic_cache.get(user_id)
-            if not pic:
+            img = pic_cache.get(user_id)
+            if not img:
                 pic = await get_user_avatar(user_id, size=100)
-                pic_cache.set(user_id, pic)
+                img = draw_rank_user_avatar(pic, TEXT_PATH / "avatar_mask.png")
+                pic_cache.set(user_id, img)
         else:
             pic = await get_user_avatar(user_id, size=100)
-            pic_cache.set(user_id, pic)
-
-        # 统一处理 crop 和遮罩（onebot/discord 共用逻辑）
-        pic_temp = crop_center_img(pic, 120, 120)
-        img = Image.new("RGBA", (180, 180))
-        avatar_mask_temp = avatar_mask.copy()
-        mask_pic_temp = avatar_mask_temp.resize((120, 120))
-        img.paste(pic_temp, (0, -5), mask_pic_temp)
+            img = draw_rank_user_avatar(pic, TEXT_PATH / "avatar_mask.png")
+            pic_cache.set(user_id, img)
 
     except Exception:
         # 打印异常，进行降级处理
-        pic = await get_square_avatar("1505")
-
-        pic_temp = Image.new("RGBA", pic.size)
-        pic_temp.paste(pic.resize((160, 160)), (10, 10))
-        pic_temp = pic_temp.resize((160, 160))
-
-        avatar_mask_temp = avatar_mask.copy()
-        mask_pic_temp = Image.new("RGBA", avatar_mask_temp.size)
-        mask_pic_temp.paste(avatar_mask_temp, (-20, -45), avatar_mask_temp)
-        mask_pic_temp = mask_pic_temp.resize((160, 160))
-
-        img = Image.new("RGBA", (180, 180))
-        img.paste(pic_temp, (0, 0), mask_pic_temp)
+        img = await get_rank_role_avatar("1505", TEXT_PATH / "avatar_mask.png")
 
     return img
 
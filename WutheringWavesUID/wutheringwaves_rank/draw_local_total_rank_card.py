@@ -5,7 +5,6 @@ import time
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 from PIL import Image, ImageDraw
 from pydantic import BaseModel
@@ -29,17 +28,20 @@ from ..utils.image import (
     add_footer,
     get_ICON,
     get_square_avatar,
+    get_square_avatar_sync,
     get_user_avatar,
     get_waves_bg,
 )
+from ..utils.render_executor import convert_img, render_sync, render_task
+from ..utils.texture import get_texture
 from ..utils.util import hide_uid
 from ..wutheringwaves_analyzecard.user_info_utils import get_region_for_rank
 from ..wutheringwaves_config import WutheringWavesConfig
 from ..wutheringwaves_grouprank.models import GroupRankRecord
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
-avatar_mask = Image.open(TEXT_PATH / "avatar_mask.png")
-char_mask = Image.open(TEXT_PATH / "char_mask.png")
+avatar_mask = get_texture(TEXT_PATH / "avatar_mask.png")
+char_mask = get_texture(TEXT_PATH / "char_mask.png")
 pic_cache = TimedCache(600, 200)
 
 rank_length = 20  # 排行显示前20名
@@ -151,6 +153,7 @@ async def get_bot_total_rank_data(ev: Event, bot_bool: bool) -> list[BotTotalRan
     return all_rank_data
 
 
+@render_task("local_total_rank")
 async def draw_local_total_rank(bot: Bot, ev: Event, bot_bool: bool = False) -> str | bytes:
     """绘制练度Bot排行"""
     self_uid = await WavesBind.get_uid_by_game(ev.user_id, ev.bot_id)
@@ -169,6 +172,21 @@ async def draw_local_total_rank(bot: Bot, ev: Event, bot_bool: bool = False) ->
                 rank_data_list.append(r)
                 break
 
+    # 获取头像
+    tasks = [get_avatar(ev, rank.user_id, rank.char_score_details[0]["char_id"]) for rank in rank_data_list]
+    results = await asyncio.gather(*tasks)
+
+    card_img = await draw_local_total_rank_card(rank_data_list, results, self_uid, bot_bool)
+    return await convert_img(card_img)
+
+
+@render_sync("local_total_rank")
+def draw_local_total_rank_card(
+    rank_data_list: list[BotTotalRankDetail],
+    results: list[Image.Image],
+    self_uid: str,
+    bot_bool: bool,
+) -> Image.Image:
     # 设置图像尺寸
     width = 1300
     text_bar_height = 130
@@ -211,11 +229,7 @@ async def draw_local_total_rank(bot: Bot, ev: Event, bot_bool: bool = False) ->
     card_img.alpha_composite(text_bar_img, (0, header_height))
 
     # 导入必要的图片资源
-    bar = Image.open(TEXT_PATH / "bar1.png")
-
-    # 获取头像
-    tasks = [get_avatar(ev, rank.user_id, rank.char_score_details[0]["char_id"]) for rank in rank_data_list]
-    results = await asyncio.gather(*tasks)
+    bar = get_texture(TEXT_PATH / "bar1.png")
 
     # 绘制排行条目
     for rank_temp_index, temp in enumerate(zip(rank_data_list, results)):
@@ -290,12 +304,11 @@ async def draw_local_total_rank(bot: Bot, ev: Event, bot_bool: bool = False) ->
                 char_x = char_start_x + i * char_spacing
 
                 # 获取角色头像
-                char_avatar = await get_square_avatar(char["char_id"])
+                char_avatar = get_square_avatar_sync(char["char_id"])
                 char_avatar = char_avatar.resize((char_size, char_size))
 
                 # 应用圆形遮罩
-                char_mask_img = Image.open(TEXT_PATH / "char_mask.png")
-                char_mask_resized = char_mask_img.resize((char_size, char_size))
+                char_mask_resized = get_texture(TEXT_PATH / "char_mask.png", (char_size, char_size))
                 char_avatar_masked = Image.new("RGBA", (char_size, char_size))
                 char_avatar_masked.paste(char_avatar, (0, 0), char_mask_resized)
 
@@ -322,8 +335,8 @@ async def draw_local_total_rank(bot: Bot, ev: Event, bot_bool: bool = False) ->
         card_img.paste(bar_bg, (0, y_pos), bar_bg)
 
     # title
-    title_bg = Image.open(TEXT_PATH / "totalrank.jpg")
-    title_bg = title_bg.crop((0, 0, width, 500))
+    title_bg = get_texture(TEXT_PATH / "totalrank.jpg")
+    title_bg = title_bg.crop((0, 0, width, 500)).convert("RGB")
 
     # icon
     icon = get_ICON()
@@ -340,7 +353,7 @@ async def draw_local_total_rank(bot: Bot, ev: Event, bot_bool: bool = False) ->
     title_bg_draw.text((220, 350), f"更新于: {time_str}", GREY, waves_font_30, "lm")
 
     # 遮罩
-    char_mask = Image.open(TEXT_PATH / "char_mask.png").convert("RGBA")
+    char_mask = get_texture(TEXT_PATH / "char_mask.png")
     # 根据width扩图
     char_mask = char_mask.resize((width, char_mask.height * width // char_mask.width))
     char_mask = char_mask.crop((0, char_mask.height - 500, width, char_mask.height))
@@ -350,7 +363,7 @@ async def draw_local_total_rank(bot: Bot, ev: Event, bot_bool: bool = False) ->
     card_img.paste(char_mask_temp, (0, 0), char_mask_temp)
 
     card_img = add_footer(card_img)
-    return await convert_img(card_img)
+    return card_img
 
 
 async def get_avatar(
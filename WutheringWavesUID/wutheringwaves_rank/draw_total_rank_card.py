@@ -5,13 +5,13 @@ from pathlib import Path
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 import httpx
 from PIL import Image, ImageDraw
 
 from ..utils.api.wwapi import (
     GET_TOTAL_RANK_URL,
+    TotalRankDetail,
     TotalRankRequest,
     TotalRankResponse,
 )
@@ -41,16 +41,19 @@ from ..utils.image import (
     add_footer,
     get_ICON,
     get_square_avatar,
+    get_square_avatar_sync,
     get_user_avatar,
     get_waves_bg,
 )
+from ..utils.render_executor import convert_img, render_sync, render_task
+from ..utils.texture import get_texture
 from ..utils.util import get_version
 from ..wutheringwaves_analyzecard.user_info_utils import get_region_for_rank
 from ..wutheringwaves_config import WutheringWavesConfig
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
-avatar_mask = Image.open(TEXT_PATH / "avatar_mask.png")
-char_mask = Image.open(TEXT_PATH / "char_mask.png")
+avatar_mask = get_texture(TEXT_PATH / "avatar_mask.png")
+char_mask = get_texture(TEXT_PATH / "char_mask.png")
 pic_cache = TimedCache(600, 200)
 
 
@@ -90,6 +93,7 @@ async def get_rank(item: TotalRankRequest) -> TotalRankResponse | None:
             logger.exception(f"获取练度排行失败: {e}")
 
 
+@render_task("total_rank")
 async def draw_total_rank(bot: Bot, ev: Event, pages: int) -> str | bytes:
     page_num = 20
     self_uid = await WavesBind.get_uid_by_game(ev.user_id, ev.bot_id)
@@ -112,13 +116,28 @@ async def draw_total_rank(bot: Bot, ev: Event, pages: int) -> str | bytes:
     if not rankInfoList.data:
         return "获取练度总排行失败"
 
+    # 获取头像
+    details = rankInfoList.data.score_details
+    tasks = [get_avatar(detail.user_id) for detail in details]
+    results = await asyncio.gather(*tasks)
+
+    card_img = await draw_total_rank_card(details, results, self_uid)
+    return await convert_img(card_img)
+
+
+@render_sync("total_rank")
+def draw_total_rank_card(
+    details: list[TotalRankDetail],
+    results: list[Image.Image],
+    self_uid: str,
+) -> Image.Image:
     # 设置图像尺寸
     width = 1300
     text_bar_height = 130
     item_spacing = 120
     header_height = 510
     footer_height = 50
-    char_list_len = len(rankInfoList.data.score_details)
+    char_list_len = len(details)
 
     # 计算所需的总高度
     total_height = header_height + text_bar_height + item_spacing * char_list_len + footer_height
@@ -154,12 +173,7 @@ async def draw_total_rank(bot: Bot, ev: Event, pages: int) -> str | bytes:
     card_img.alpha_composite(text_bar_img, (0, header_height))
 
     # 导入必要的图片资源
-    bar = Image.open(TEXT_PATH / "bar1.png")
-
-    # 获取头像
-    details = rankInfoList.data.score_details
-    tasks = [get_avatar(detail.user_id) for detail in details]
-    results = await asyncio.gather(*tasks)
+    bar = get_texture(TEXT_PATH / "bar1.png")
 
     # 获取角色信息
     bot_color_map = {}
@@ -263,12 +277,11 @@ async def draw_total_rank(bot: Bot, ev: Event, pages: int) -> str | bytes:
                 char_x = char_start_x + i * char_spacing
 
                 # 获取角色头像
-                char_avatar = await get_square_avatar(char.char_id)
+                char_avatar = get_square_avatar_sync(char.char_id)
                 char_avatar = char_avatar.resize((char_size, char_size))
 
                 # 应用圆形遮罩
-                char_mask_img = Image.open(TEXT_PATH / "char_mask.png")
-                char_mask_resized = char_mask_img.resize((char_size, char_size))
+                char_mask_resized = get_texture(TEXT_PATH / "char_mask.png", (char_size, char_size))
                 char_avatar_masked = Image.new("RGBA", (char_size, char_size))
                 char_avatar_masked.paste(char_avatar, (0, 0), char_mask_resized)
 
@@ -295,8 +308,8 @@ async def draw_total_rank(bot: Bot, ev: Event, pages: int) -> str | bytes:
         card_img.paste(bar_bg, (0, y_pos), bar_bg)
 
     # title
-    title_bg = Image.open(TEXT_PATH / "totalrank.jpg")
-    title_bg = title_bg.crop((0, 0, width, 500))
+    title_bg = get_texture(TEXT_PATH / "totalrank.jpg")
+    title_bg = title_bg.crop((0, 0, width, 500)).convert("RGB")
 
     # icon
     icon = get_ICON()
@@ -309,7 +322,7 @@ async def draw_total_rank(bot: Bot, ev: Event, pages: int) -> str | bytes:
     title_bg_draw.text((220, 290), title_text, "white", waves_font_58, "lm")
 
     # 遮罩
-    char_mask = Image.open(TEXT_PATH / "char_mask.png").convert("RGBA")
+    char_mask = get_texture(TEXT_PATH / "char_mask.png")
     # 根据width扩图
     char_mask = char_mask.resize((width, char_mask.height * width // char_mask.width))
     char_mask = char_mask.crop((0, char_mask.height - 500, width, char_mask.height))
@@ -319,7 +332,7 @@ async def draw_total_rank(bot: Bot, ev: Event, pages: int) -> str | bytes:
     card_img.paste(char_mask_temp, (0, 0), char_mask_temp)
 
     card_img = add_footer(card_img)
-    return await convert_img(card_img)
+    return card_img
 
 
 async def get_avatar(
@@ -7,7 +7,6 @@ import re
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 import httpx
 from PIL import Image, ImageDraw
@@ -41,19 +40,22 @@ from ..utils.image import (
     WAVES_SIERRA,
     WAVES_VOID,
     add_footer,
+    draw_rank_user_avatar,
     get_ICON,
-    get_square_avatar,
+    get_rank_role_avatar,
+    get_square_avatar_resized_sync,
     get_user_avatar,
     get_waves_bg,
     pic_download_from_url,
 )
+from ..utils.render_executor import convert_img, render_sync, render_task
 from ..utils.resource.RESOURCE_PATH import MATRIX_PATH
+from ..utils.texture import get_texture, load_texture
 from ..utils.util import get_end_time, get_version
 from ..wutheringwaves_config import WutheringWavesConfig
 from ..wutheringwaves_grouprank.models import GroupRankRecord
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
-avatar_mask = Image.open(TEXT_PATH / "avatar_mask.png")
 default_avatar_char_id = "1505"
 pic_cache = TimedCache(600, 200)
 
@@ -188,6 +190,7 @@ def _merge_rank_data(
     return rank_list
 
 
+@render_task("matrix_rank")
 async def draw_all_matrix_rank_card(bot: Bot, ev: Event):
     waves_id = await WavesBind.get_uid_by_game(ev.user_id, ev.bot_id)
     match = re.search(r"(\d+)", ev.raw_text)
@@ -287,6 +290,27 @@ async def draw_all_matrix_rank_card(bot: Bot, ev: Event):
     if not display_list:
         return "暂无矩阵排行数据" if "上期" not in ev.raw_text else "暂无上期排行数据"
 
+    tasks = [get_avatar(rank.user_id) for rank in display_list]
+    results = await asyncio.gather(*tasks)
+    buff_icons = {}
+    for rank in display_list:
+        if rank.team.buff_icon not in buff_icons:
+            buff_icons[rank.team.buff_icon] = await pic_download_from_url(MATRIX_PATH, rank.team.buff_icon)
+
+    card_img = await draw_matrix_rank_card(display_list, results, waves_id, title, last_rank, buff_icons)
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+@render_sync("matrix_rank")
+def draw_matrix_rank_card(
+    display_list: list[MatrixRank],
+    results: list[Image.Image],
+    waves_id: str | None,
+    title: str,
+    last_rank: str,
+    buff_icons: dict[str, Image.Image],
+) -> Image.Image:
     # 设置图像尺寸
     width = 1300
     item_spacing = 120
@@ -302,12 +326,12 @@ async def draw_all_matrix_rank_card(bot: Bot, ev: Event):
 
     # title - 使用矩阵背景图
     try:
-        title_bg = Image.open(TEXT_PATH / "matrix_bg.png").convert("RGBA")
+        title_bg = get_texture(TEXT_PATH / "matrix_bg.png")
         title_bg = crop_center_img(title_bg, width, 500)
     except Exception:
         # 如果矩阵背景不存在，使用海墟背景
-        title_bg = Image.open(TEXT_PATH / "slash.jpg")
-        title_bg = title_bg.crop((0, 0, width, 500))
+        title_bg = get_texture(TEXT_PATH / "slash.jpg")
+        title_bg = title_bg.crop((0, 0, width, 500)).convert("RGB")
 
     # icon
     icon = get_ICON()
@@ -338,7 +362,7 @@ async def draw_all_matrix_rank_card(bot: Bot, ev: Event):
     title_bg_draw.text((220, 350), subtitle_text, (255, 215, 100), waves_font_20, "lm")
 
     # 遮罩
-    char_mask = Image.open(TEXT_PATH / "char_mask.png").convert("RGBA")
+    char_mask = get_texture(TEXT_PATH / "char_mask.png")
     # 根据width扩图
     char_mask = char_mask.resize((width, char_mask.height * width // char_mask.width))
     char_mask = char_mask.crop((0, char_mask.height - 500, width, char_mask.height))
@@ -347,9 +371,6 @@ async def draw_all_matrix_rank_card(bot: Bot, ev: Event):
 
     card_img.paste(char_mask_temp, (0, 0), char_mask_temp)
 
-    tasks = [get_avatar(rank.user_id) for rank in display_list]
-    results = await asyncio.gather(*tasks)
-
     # 获取角色信息
     bot_color_map = {}
     bot_color = copy.deepcopy(BOT_COLOR)
@@ -357,7 +378,7 @@ async def draw_all_matrix_rank_card(bot: Bot, ev: Event):
     for rank_temp_index, temp in enumerate(zip(display_list, results)):
         rank_temp: MatrixRank = temp[0]
         role_avatar: Image.Image = temp[1]
-        role_bg = Image.open(TEXT_PATH / "bar1.png")
+        role_bg = load_texture(TEXT_PATH / "bar1.png")
         role_bg.paste(role_avatar, (100, 0), role_avatar)
         role_bg_draw = ImageDraw.Draw(role_bg)
 
@@ -429,9 +450,8 @@ async def draw_all_matrix_rank_card(bot: Bot, ev: Event):
             rank_icon_name = "matrix_b.png"  # B
 
         try:
-            rank_icon = Image.open(TEXT_PATH / rank_icon_name).convert("RGBA")
             # 调整图标大小
-            rank_icon = rank_icon.resize((70, 70))
+            rank_icon = get_texture(TEXT_PATH / rank_icon_name, (70, 70))
             role_bg.alpha_composite(rank_icon, (980, 20))
         except Exception as e:
             logger.warning(f"无法加载评级图标 {rank_icon_name}: {e}")
@@ -464,8 +484,7 @@ async def draw_all_matrix_rank_card(bot: Bot, ev: Event):
             char_model = get_char_model(char_id)
             if char_model is None:
                 continue
-            char_avatar = await get_square_avatar(char_id)
-            char_avatar = char_avatar.resize((45, 45))
+            char_avatar = get_square_avatar_resized_sync(char_id, (45, 45)).copy()
 
             # 显示链度
             if char_chain != -1:
@@ -483,7 +502,7 @@ async def draw_all_matrix_rank_card(bot: Bot, ev: Event):
 
             role_bg.alpha_composite(char_avatar, (720 + role_index * 50, 20))
 
-        buff_pic = await pic_download_from_url(MATRIX_PATH, team.buff_icon)
+        buff_pic = buff_icons[team.buff_icon]
         buff_pic = buff_pic.resize((50, 50))
         role_bg.alpha_composite(buff_pic, (870, 15))
 
@@ -499,7 +518,6 @@ async def draw_all_matrix_rank_card(bot: Bot, ev: Event):
         card_img.paste(role_bg, (0, 510 + rank_temp_index * item_spacing), role_bg)
 
     card_img = add_footer(card_img)
-    card_img = await convert_img(card_img)
     return card_img
 
 
@@ -507,37 +525,21 @@ async def get_avatar(
     qid: str | None,
 ) -> Image.Image:
     try:
+        # 缓存 crop 和遮罩后的头像（onebot/discord 共用逻辑）
         if WutheringWavesConfig.get_config("QQPicCache").data:
-            pic = pic_cache.get(qid)
-            if not pic:
+            img = pic_cache.get(qid)
+            if not img:
                 pic = await get_user_avatar(qid, size=100)
-                pic_cache.set(qid, pic)
+                img = draw_rank_user_avatar(pic, TEXT_PATH / "avatar_mask.png")
+                pic_cache.set(qid, img)
         else:
             pic = await get_user_avatar(qid, size=100)
-            pic_cache.set(qid, pic)
-
-        # 统一处理 crop 和遮罩（onebot/discord 共用逻辑）
-        pic_temp = crop_center_img(pic, 120, 120)
-        img = Image.new("RGBA", (180, 180))
-        avatar_mask_temp = avatar_mask.copy()
-        mask_pic_temp = avatar_mask_temp.resize((120, 120))
-        img.paste(pic_temp, (0, -5), mask_pic_temp)
+            img = draw_rank_user_avatar(pic, TEXT_PATH / "avatar_mask.png")
+            pic_cache.set(qid, img)
 
     except Exception as e:
         # 打印异常，进行降级处理
         logger.warning(f"头像获取失败，使用默认头像: {e}")
-        pic = await get_square_avatar(default_avatar_char_id)
-
-        pic_temp = Image.new("RGBA", pic.size)
-        pic_temp.paste(pic.resize((160, 160)), (10, 10))
-        pic_temp = pic_temp.resize((160, 160))
-
-        avatar_mask_temp = avatar_mask.copy()
-        mask_pic_temp = Image.new("RGBA", avatar_mask_temp.size)
-        mask_pic_temp.paste(avatar_mask_temp, (-20, -45), avatar_mask_temp)
-        mask_pic_temp = mask_pic_temp.resize((160, 160))
-
-        img = Image.new("RGBA", (180, 180))
-        img.paste(pic_temp, (0, 0), mask_pic_temp)
+        img = await get_rank_role_avatar(default_avatar_char_id, TEXT_PATH / "avatar_mask.png")
 
     return img
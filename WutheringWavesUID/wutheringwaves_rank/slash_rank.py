@@ -6,7 +6,6 @@ import re
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 import httpx
 from PIL import Image, ImageDraw
@@ -40,17 +39,20 @@ from ..utils.image import (
     add_footer,
     get_ICON,
     get_square_avatar,
+    get_square_avatar_sync,
     get_user_avatar,
     get_waves_bg,
     pic_download_from_url,
 )
+from ..utils.render_executor import convert_img, render_sync, render_task
 from ..utils.resource.RESOURCE_PATH import SLASH_PATH
+from ..utils.texture import get_texture, load_texture
 from ..utils.util import get_version
 from ..wutheringwaves_abyss.draw_slash_card import COLOR_QUALITY
 from ..wutheringwaves_config import WutheringWavesConfig
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
-avatar_mask = Image.open(TEXT_PATH / "avatar_mask.png")
+avatar_mask = get_texture(TEXT_PATH / "avatar_mask.png")
 default_avatar_char_id = "1505"
 pic_cache = TimedCache(600, 200)
 
@@ -105,6 +107,7 @@ async def get_rank(item: SlashRankItem) -> SlashRankRes | None:
             logger.exception(f"获取排行失败: {e}")
 
 
+@render_task("slash_rank")
 async def draw_all_slash_rank_card(bot: Bot, ev: Event):
     waves_id = await WavesBind.get_uid_by_game(ev.user_id, ev.bot_id)
     match = re.search(r"(\d+)", ev.raw_text)
@@ -132,12 +135,33 @@ async def draw_all_slash_rank_card(bot: Bot, ev: Event):
     if not rankInfoList.data:
         return "获取排行失败"
 
+    rank_list = rankInfoList.data.rank_list
+    tasks = [get_avatar(rank.user_id) for rank in rank_list]
+    results = await asyncio.gather(*tasks)
+    buff_icons = {}
+    for rank in rank_list:
+        for slash_half in rank.half_list:
+            if slash_half.buff_icon not in buff_icons:
+                buff_icons[slash_half.buff_icon] = await pic_download_from_url(SLASH_PATH, slash_half.buff_icon)
+
+    card_img = await draw_slash_rank_card(rank_list, results, item, buff_icons)
+    card_img = await convert_img(card_img)
+    return card_img
+
+
+@render_sync("slash_rank")
+def draw_slash_rank_card(
+    rank_list: list[SlashRank],
+    results: list[Image.Image],
+    item: SlashRankItem,
+    buff_icons: dict[str, Image.Image],
+) -> Image.Image:
     # 设置图像尺寸
     width = 1300
     item_spacing = 120
     header_height = 510
     footer_height = 50
-    char_list_len = len(rankInfoList.data.rank_list)
+    char_list_len = len(rank_list)
 
     # 计算所需的总高度
     total_height = header_height + item_spacing * char_list_len + footer_height
@@ -146,8 +170,8 @@ async def draw_all_slash_rank_card(bot: Bot, ev: Event):
     card_img = get_waves_bg(width, total_height, "bg9")
 
     # title
-    title_bg = Image.open(TEXT_PATH / "slash.jpg")
-    title_bg = title_bg.crop((0, 0, width, 500))
+    title_bg = get_texture(TEXT_PATH / "slash.jpg")
+    title_bg = title_bg.crop((0, 0, width, 500)).convert("RGB")
 
     # icon
     icon = get_ICON()
@@ -160,7 +184,7 @@ async def draw_all_slash_rank_card(bot: Bot, ev: Event):
     title_bg_draw.text((220, 290), title_text, "white", waves_font_58, "lm")
 
     # 遮罩
-    char_mask = Image.open(TEXT_PATH / "char_mask.png").convert("RGBA")
+    char_mask = get_texture(TEXT_PATH / "char_mask.png")
     # 根据width扩图
     char_mask = char_mask.resize((width, char_mask.height * width // char_mask.width))
     char_mask = char_mask.crop((0, char_mask.height - 500, width, char_mask.height))
@@ -169,10 +193,6 @@ async def draw_all_slash_rank_card(bot: Bot, ev: Event):
 
     card_img.paste(char_mask_temp, (0, 0), char_mask_temp)
 
-    rank_list = rankInfoList.data.rank_list
-    tasks = [get_avatar(rank.user_id) for rank in rank_list]
-    results = await asyncio.gather(*tasks)
-
     # 获取角色信息
     bot_color_map = {}
     bot_color = copy.deepcopy(BOT_COLOR)
@@ -182,7 +202,7 @@ async def draw_all_slash_rank_card(bot: Bot, ev: Event):
     for rank_temp_index, temp in enumerate(zip(rank_list, results)):
         rank_temp: SlashRank = temp[0]
         role_avatar: Image.Image = temp[1]
-        role_bg = Image.open(TEXT_PATH / "bar1.png")
+        role_bg = load_texture(TEXT_PATH / "bar1.png")
         # role_bg = Image.new("RGBA", (width, info_h), (255, 255, 255, 0))
         role_bg.paste(role_avatar, (100, 0), role_avatar)
         role_bg_draw = ImageDraw.Draw(role_bg)
@@ -255,7 +275,7 @@ async def draw_all_slash_rank_card(bot: Bot, ev: Event):
                 char_model = get_char_model(char_id)
                 if char_model is None:
                     continue
-                char_avatar = await get_square_avatar(char_id)
+                char_avatar = get_square_avatar_sync(char_id)
                 char_avatar = char_avatar.resize((45, 45))
 
                 if char_chain != -1:
@@ -286,7 +306,7 @@ async def draw_all_slash_rank_card(bot: Bot, ev: Event):
                 [0, 45, 50, 50],
                 fill=buff_color,
             )
-            buff_pic = await pic_download_from_url(SLASH_PATH, slash_half.buff_icon)
+            buff_pic = buff_icons[slash_half.buff_icon]
             buff_pic = buff_pic.resize((50, 50))
             buff_bg.paste(buff_pic, (0, 0), buff_pic)
 
@@ -304,7 +324,6 @@ async def draw_all_slash_rank_card(bot: Bot, ev: Event):
         card_img.paste(role_bg, (0, 510 + rank_temp_index * item_spacing), role_bg)
 
     card_img = add_footer(card_img)
-    card_img = await convert_img(card_img)
     return card_img
 
 
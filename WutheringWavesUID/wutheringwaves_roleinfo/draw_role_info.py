@@ -23,14 +23,14 @@ from ..utils.image import (
     GOLD,
     GREY,
     add_footer,
-    cropped_square_avatar,
     get_attribute,
-    get_square_avatar,
+    get_square_avatar_cropped,
     get_square_weapon,
     get_waves_bg,
 )
 from ..utils.imagetool import draw_pic_with_ring
 from ..utils.resource.constant import NORMAL_LIST, SPECIAL_CHAR_INT
+from ..utils.texture import get_texture, load_texture
 from ..utils.waves_api import waves_api
 from ..wutheringwaves_analyzecard.user_info_utils import get_user_detail_info
 
@@ -191,7 +191,7 @@ async def draw_role_img(uid: str, ck: str, user_id: str, ev: Event):
         account_info.creatTime = 1
 
     # 初始化基础信息栏位
-    bs = Image.open(TEXT_PATH / "bs.png")
+    bs = load_texture(TEXT_PATH / "bs.png")
 
     # 角色信息
     roleTotalNum = (
@@ -216,7 +216,7 @@ async def draw_role_img(uid: str, ck: str, user_id: str, ev: Event):
     def calc_info_block(_x: int, _y: int, key: str, value: str, color_path: str = ""):
         if not color_path:
             color_path = "info_block.png"
-        info_block = Image.open(TEXT_PATH / f"{color_path}")
+        info_block = load_texture(TEXT_PATH / f"{color_path}")
         info_block_draw = ImageDraw.Draw(info_block)
         info_block_draw.text((66, 90), key, "white", waves_font_26, "mm")
         info_block_draw.text((66, 43), value, "white", waves_font_40, "mm")
@@ -246,11 +246,10 @@ async def draw_role_img(uid: str, ck: str, user_id: str, ev: Event):
     async def calc_role_info(_x: int, _y: int, roleInfo: Role):
         if not role_detail_info_map:
             return
-        char_bg = Image.open(TEXT_PATH / "char_bg.png")
+        char_bg = load_texture(TEXT_PATH / "char_bg.png")
         char_attribute = await get_attribute(roleInfo.attributeName)
         char_attribute = char_attribute.resize((40, 40)).convert("RGBA")
-        role_avatar = await get_square_avatar(roleInfo.roleId)
-        role_avatar = await cropped_square_avatar(role_avatar, 130)
+        role_avatar = await get_square_avatar_cropped(roleInfo.roleId, 130)
         char_bg.paste(role_avatar, (10, 25), role_avatar)
         char_bg.paste(char_attribute, (155, 13), char_attribute)
 
@@ -269,7 +268,7 @@ async def draw_role_img(uid: str, ck: str, user_id: str, ev: Event):
                 break
 
         if temp:
-            weapon_bg = Image.open(TEXT_PATH / "weapon_bg.png")
+            weapon_bg = load_texture(TEXT_PATH / "weapon_bg.png")
             weaponId = temp.weaponData.weapon.weaponId
             weapon_icon = await get_square_weapon(weaponId)
             weapon_icon = weapon_icon.resize((75, 75)).convert("RGBA")
@@ -292,7 +291,7 @@ async def draw_role_img(uid: str, ck: str, user_id: str, ev: Event):
         await calc_role_info(_x, _y, role)
 
     # 基础信息 名字 特征码
-    base_info_bg = Image.open(TEXT_PATH / "base_info_bg.png")
+    base_info_bg = load_texture(TEXT_PATH / "base_info_bg.png")
     base_info_draw = ImageDraw.Draw(base_info_bg)
     base_info_draw.text((275, 120), f"{account_info.name[:7]}", "white", waves_font_30, "lm")
     base_info_draw.text((226, 173), f"特征码:  {account_info.id}", GOLD, waves_font_25, "lm")
@@ -304,16 +303,16 @@ async def draw_role_img(uid: str, ck: str, user_id: str, ev: Event):
     card_img.paste(avatar_ring, (55, 80), avatar_ring)
 
     # 右侧装饰
-    char = Image.open(TEXT_PATH / "char.png")
+    char = get_texture(TEXT_PATH / "char.png")
     card_img.paste(char, (910, 0), char)
 
     # 账号基本信息，由于可能会没有，放在一起
     if account_info.is_full:
-        line = Image.open(TEXT_PATH / "line.png")
+        line = load_texture(TEXT_PATH / "line.png")
         line_draw = ImageDraw.Draw(line)
         line_draw.text((475, 30), "基本信息", "white", waves_font_30, "mm")
 
-        title_bar = Image.open(TEXT_PATH / "title_bar.png")
+        title_bar = load_texture(TEXT_PATH / "title_bar.png")
         title_bar_draw = ImageDraw.Draw(title_bar)
         title_bar_draw.text((660, 125), "账号等级", GREY, waves_font_26, "mm")
         title_bar_draw.text((660, 78), f"Lv.{account_info.level}", "white", waves_font_42, "mm")
@@ -324,7 +323,7 @@ async def draw_role_img(uid: str, ck: str, user_id: str, ev: Event):
         card_img.paste(bs, (-10, yset - bs.size[1] - 70), bs)
         card_img.paste(title_bar, (0, 70), title_bar)
 
-    line2 = Image.open(TEXT_PATH / "line.png")
+    line2 = load_texture(TEXT_PATH / "line.png")
     line2_draw = ImageDraw.Draw(line2)
     line2_draw.text((475, 30), "角色信息", "white", waves_font_30, "mm")
     card_img.paste(line2, (15, yset - 70), line2)
@@ -8,20 +8,27 @@ from ..wutheringwaves_resource import startup
 async def all_start():
     logger.info("[鸣潮] 启动中...")
     try:
+        from ..utils.calculate import calc_template_registry
         from ..utils.damage.register_char import register_char
         from ..utils.damage.register_echo import register_echo
         from ..utils.damage.register_weapon import register_weapon
         from ..utils.limit_user_card import load_limit_user_card
         from ..utils.map.damage.register import register_damage, register_rank
         from ..utils.queues import init_queues
+        from ..wutheringwaves_config import WutheringWavesConfig
 
         # 注册
         register_weapon()
         register_echo()
-        register_damage()
-        register_rank()
+        # 伤害计算模块默认在第一次使用时导入
+        damage_preload = WutheringWavesConfig.get_config("DamagePreload").data
+        register_damage(eager=damage_preload)
+        register_rank(eager=damage_preload)
         register_char()
 
+        # 预加载评分模板
+        calc_template_registry.preload()
+
         # 初始化任务队列
         init_queues()
 
@@ -1,7 +1,11 @@
 from gsuid_core.status.plugin_status import register_status
 
+from ..utils.char_info_utils import role_detail_cache
 from ..utils.database.models import WavesBind, WavesUser
 from ..utils.image import get_ICON
+from ..utils.queues.queues import get_dispatcher_stats
+from ..utils.render_executor import render_executor
+from ..utils.texture import texture_manager
 
 
 async def get_user_num():
@@ -14,11 +18,64 @@ async def get_add_num():
     return len(datas)
 
 
+async def get_role_cache_size():
+    return role_detail_cache.info()["size"]
+
+
+async def get_role_cache_hit_rate():
+    return f"{role_detail_cache.info()['hit_rate'] * 100:.1f}%"
+
+
+async def get_queue_depth():
+    return sum(i["depth"] for i in get_dispatcher_stats().values())
+
+
+async def get_queue_failed():
+    return sum(i["failed"] + i["dropped"] for i in get_dispatcher_stats().values())
+
+
+async def get_queue_latency():
+    stats = [i for i in get_dispatcher_stats().values() if i["processed"]]
+    if not stats:
+        return "0ms"
+    latency = sum(i["avg_latency"] * i["processed"] for i in stats) / sum(i["processed"] for i in stats)
+    return f"{latency * 1000:.0f}ms"
+
+
+async def get_render_latency():
+    stats = [i for i in render_executor.get_stats().values() if i["processed"]]
+    if not stats:
+        return "0ms"
+    latency = sum(i["avg_latency"] * i["processed"] for i in stats) / sum(i["processed"] for i in stats)
+    return f"{latency * 1000:.0f}ms"
+
+
+async def get_render_waiting():
+    return render_executor.waiting
+
+
+async def get_render_rejected():
+    return sum(i["rejected"] for i in render_executor.get_stats().values())
+
+
+async def get_texture_cache_size():
+    return f"{texture_manager.get_stats()['bytes'] / 1024 / 1024:.1f}MB"
+
+
 register_status(
     get_ICON(),
     "WutheringWavesUID",
     {
         "绑定UID": get_add_num,
         "登录账户": get_user_num,
+        "面板缓存数": get_role_cache_size,
+        "面板缓存命中率": get_role_cache_hit_rate,
+        "任务队列积压": get_queue_depth,
+        "任务失败数": get_queue_failed,
+        "任务平均耗时": get_queue_latency,
+        "绘图平均耗时": get_render_latency,
+        "绘图排队数": get_render_waiting,
+        "绘图拒绝数": get_render_rejected,
+        "素材缓存大小": get_texture_cache_size,
     },
 )
@@ -1,13 +1,12 @@
 from collections import defaultdict
-import copy
 from pathlib import Path
 import textwrap
 
 from gsuid_core.logger import logger
 from gsuid_core.utils.image.convert import convert_img
-from PIL import Image, ImageDraw
+from PIL import ImageDraw
 
-from ..utils.ascension.echo import echo_id_data, get_echo_model, set_name_to_echo_ids
+from ..utils.ascension.echo import echo_id_data, get_echo_model, load_set_mappings
 from ..utils.ascension.model import EchoModel
 from ..utils.ascension.sonata import sonata_id_data
 from ..utils.ascension.weapon import weapon_id_data
@@ -22,21 +21,10 @@ from ..utils.image import (
 from ..utils.name_convert import alias_to_sonata_name
 from ..utils.resource.constant import SONATA_GROUP, get_short_name
 from ..utils.resource.download_file import get_phantom_img
+from ..utils.texture import get_texture
 from ..wutheringwaves_config import PREFIX
 
 TEXT_PATH = Path(__file__).parent.parent / "wutheringwaves_develop" / "texture2d"
-star_1 = Image.open(TEXT_PATH / "star-1.png")
-star_2 = Image.open(TEXT_PATH / "star-2.png")
-star_3 = Image.open(TEXT_PATH / "star-3.png")
-star_4 = Image.open(TEXT_PATH / "star-4.png")
-star_5 = Image.open(TEXT_PATH / "star-5.png")
-star_img_map = {
-    1: star_1,
-    2: star_2,
-    3: star_3,
-    4: star_4,
-    5: star_5,
-}
 
 
 async def draw_weapon_list(weapon_type: str):
@@ -63,7 +51,7 @@ async def draw_weapon_list(weapon_type: str):
     target_type = reverse_type_map.get(weapon_type)
     logger.debug(f"成功处理：{target_type}")
 
-    for weapon_id, data in weapon_id_data.items():
+    for weapon_id, data in weapon_id_data.summaries().items():
         name = data.get("name", "未知武器")
         star_level = data.get("starLevel", 0)
         w_type = data.get("type", 0)  # 注意：避免与参数同名冲突
@@ -148,8 +136,7 @@ async def draw_weapon_list(weapon_type: str):
                 weapon_icon = weapon_icon.resize((icon_size, icon_size))
 
                 # 获取并调整武器背景框
-                star_img = copy.deepcopy(star_img_map[weapon["star_level"]])
-                star_img = star_img.resize((icon_size, icon_size))
+                star_img = get_texture(TEXT_PATH / f"star-{weapon['star_level']}.png", (icon_size, icon_size))
                 img.alpha_composite(weapon_icon, (x_pos, row_y))
                 img.alpha_composite(star_img, (x_pos, row_y))
 
@@ -301,6 +288,7 @@ async def draw_sonata_list():
 
 async def draw_echo_list(sonata_type: str):
     # 确保数据已加载
+    set_name_to_echo_ids = load_set_mappings()
     if not echo_id_data or not set_name_to_echo_ids:
         return "[鸣潮][声骸列表]暂无数据"
 
@@ -0,0 +1,224 @@
+"""
+抽卡记录合并
+
+Z 函数/滚动哈希实现与原来的暴力匹配/dp/递归实现对比, 结果需要完全一致(包括多个匹配时的取舍)。
+"""
+
+from datetime import datetime, timedelta
+import random
+
+import pytest
+
+pytest.importorskip("gsuid_core")
+
+from WutheringWavesUID.utils.api.model import GachaLog
+from WutheringWavesUID.wutheringwaves_gachalog.get_gachalogs import (
+    _z_function,
+    find_longest_common_subarray_indices,
+    find_longest_suffix_in_old,
+    merge_gacha_logs_by_common_subarray,
+)
+
+
+# ----- 原实现, 作为对照 -----
+def old_find_longest_suffix_in_old(old: list[GachaLog], new: list[GachaLog]):
+    n, m = len(old), len(new)
+    max_len = 0
+    best_old_end = best_new_end = -1
+    for i in range(m):
+        for j in range(n):
+            k = 0
+            while i + k < m and j + k < n and new[i + k] == old[j + k]:
+                k += 1
+            if i + k == m and k > max_len:
+                max_len = k
+                best_old_end = j + k - 1
+                best_new_end = i + k - 1
+
+    if max_len == 0:
+        return None
+
+    return (best_old_end - max_len + 1, best_old_end), (best_new_end - max_len + 1, best_new_end)
+
+
+def old_find_longest_common_subarray_indices(a: list[GachaLog], b: list[GachaLog]):
+    n, m = len(a), len(b)
+    dp = [[0] * (m + 1) for _ in range(n + 1)]
+    length = 0
+    a_end = b_end = 0
+
+    for i in range(n - 1, -1, -1):
+        for j in range(m - 1, -1, -1):
+            if a[i] == b[j]:
+                dp[i][j] = dp[i + 1][j + 1] + 1
+                if dp[i][j] > length:
+                    length = dp[i][j]
+                    a_end = i + length - 1
+                    b_end = j + length - 1
+            else:
+                dp[i][j] = 0
+
+    if length == 0:
+        return None
+
+    return (a_end - length + 1, a_end), (b_end - length + 1, b_end)
+
+
+def old_merge_gacha_logs_by_common_subarray(a: list[GachaLog], b: list[GachaLog]) -> list[GachaLog]:
+    common_indices = old_find_longest_common_subarray_indices(a, b)
+    if not common_indices:
+        return sorted(
+            a + b,
+            key=lambda log: datetime.strptime(log.time, "%Y-%m-%d %H:%M:%S"),
+            reverse=True,
+        )
+
+    (a_start, a_end), (b_start, b_end) = common_indices
+
+    prefix = old_merge_gacha_logs_by_common_subarray(a[:a_start], b[:b_start])
+    common_subarray = a[a_start : a_end + 1]
+    suffix = old_merge_gacha_logs_by_common_subarray(a[a_end + 1 :], b[b_end + 1 :])
+
+    return prefix + common_subarray + suffix
+
+
+def naive_z_function(s: list[int]) -> list[int]:
+    z = []
+    for i in range(len(s)):
+        k = 0
+        while i + k < len(s) and s[k] == s[i + k]:
+            k += 1
+        z.append(k)
+    return z
+
+
+# ----- 测试数据 -----
+ITEMS = [
+    (21010011, 3, "武器", "教学长刃"),
+    (21020011, 3, "武器", "教学迅刀"),
+    (21050011, 3, "武器", "教学音感仪"),
+    (1402, 4, "角色", "秧秧"),
+    (1602, 4, "角色", "丹瑾"),
+    (1203, 5, "角色", "安可"),
+]
+START = datetime(2024, 5, 23, 12, 0, 0)
+
+
+def make_log(item: int, time: datetime) -> GachaLog:
+    resource_id, quality, resource_type, name = ITEMS[item]
+    return GachaLog(
+        cardPoolType="角色精准调谐",
+        resourceId=resource_id,
+        qualityLevel=quality,
+        resourceType=resource_type,
+        name=name,
+        count=1,
+        time=time.strftime("%Y-%m-%d %H:%M:%S"),
+    )
+
+
+def make_logs(items: list[int], seconds: list[int] | None = None) -> list[GachaLog]:
+    """items 为 ITEMS 的下标; seconds 为距 START 的秒数, 不传时所有记录在同一秒"""
+    seconds = seconds or [0] * len(items)
+    return [make_log(item, START - timedelta(seconds=second)) for item, second in zip(items, seconds)]
+
+
+def random_logs(rng: random.Random, length: int, start: datetime) -> list[GachaLog]:
+    """时间倒序的记录, 十连时同一秒有多条"""
+    logs = []
+    now = start
+    while len(logs) < length:
+        for _ in range(rng.choice((1, 1, 10))):
+            logs.append(make_log(rng.randrange(len(ITEMS)), now))
+        now -= timedelta(seconds=rng.choice((1, 30, 3600)))
+    return logs[:length]
+
+
+def random_pair(rng: random.Random) -> tuple[list[GachaLog], list[GachaLog]]:
+    """本地记录与新记录: 新记录 = 新增 + 本地记录的一段, 偶尔插入错误数据或完全无关"""
+    old = random_logs(rng, rng.randint(0, 40), START)
+    kind = rng.random()
+    if kind < 0.2 or not old:
+        new = random_logs(rng, rng.randint(0, 40), START + timedelta(days=rng.randint(-1, 1)))
+    else:
+        lo = rng.randint(0, len(old) - 1)
+        hi = rng.randint(lo + 1, len(old))
+        new = random_logs(rng, rng.randint(0, 15), START + timedelta(days=1)) + old[lo:hi]
+        if kind < 0.5:
+            # 中间混入错误数据
+            pos = rng.randint(0, len(new) - 1)
+            new[pos:pos] = random_logs(rng, rng.randint(1, 3), START)
+    if rng.random() < 0.5:
+        old, new = new, old
+    return old, new
+
+
+CHECKS = [
+    (old_find_longest_suffix_in_old, find_longest_suffix_in_old),
+    (old_find_longest_common_subarray_indices, find_longest_common_subarray_indices),
+    (old_merge_gacha_logs_by_common_subarray, merge_gacha_logs_by_common_subarray),
+]
+
+
+@pytest.mark.parametrize(
+    "s",
+    [[], [1], [1, 1, 1], [1, 2, 1, 2, 1], [1, 2, 0, 1, 2, 1, 2], [3, 3, 1, 3, 3, 3, 1]],
+)
+def test_z_function(s):
+    assert _z_function(s) == naive_z_function(s)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_z_function_random(seed):
+    rng = random.Random(seed)
+    s = [rng.randint(1, 3) for _ in range(rng.randint(0, 60))]
+    assert _z_function(s) == naive_z_function(s)
+
+
+@pytest.mark.parametrize(
+    ("a", "b"),
+    [
+        # 没有公共部分
+        ([0, 1], [2, 3]),
+        ([], [0, 1]),
+        ([0, 1], []),
+        # 多个等长的公共子串: 取 a 中最靠后, 其次 b 中最靠后的
+        ([0, 1, 0, 1], [0, 1]),
+        ([0, 1], [0, 1, 0, 1]),
+        ([0, 1, 2, 0, 1], [0, 1, 3, 0, 1]),
+        ([0, 0, 0, 0], [0, 0]),
+        # 新记录的后缀在旧记录中出现多次
+        ([3, 4, 3, 4, 5], [1, 3, 4]),
+        ([0, 0, 0], [1, 0, 0]),
+    ],
+)
+@pytest.mark.parametrize(("old_func", "new_func"), CHECKS)
+def test_tie_break(a, b, old_func, new_func):
+    logs_a, logs_b = make_logs(a), make_logs(b)
+    assert new_func(logs_a, logs_b) == old_func(logs_a, logs_b)
+
+
+@pytest.mark.parametrize(("old_func", "new_func"), CHECKS)
+def test_no_common_sorted_by_time(old_func, new_func):
+    # 没有公共部分时按时间倒序, 同一秒的记录保持原有顺序
+    a = make_logs([0, 1, 2], [0, 10, 10])
+    b = make_logs([3, 4], [5, 10])
+    assert new_func(a, b) == old_func(a, b)
+
+
+def test_merge_keeps_duplicates():
+    # 不去重: 本地记录与新记录的公共部分只保留一份, 其余重复记录都保留
+    old = make_logs([0, 1, 0, 1], [4, 3, 2, 1])
+    new = make_logs([2, 0, 1], [0, 2, 1])
+    merged = merge_gacha_logs_by_common_subarray(old, new)
+    assert merged == old_merge_gacha_logs_by_common_subarray(old, new)
+    assert len(merged) == len(old) + len(new) - 2
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_random_against_old(seed):
+    rng = random.Random(seed)
+    for _ in range(5):
+        old, new = random_pair(rng)
+        for old_func, new_func in CHECKS:
+            assert new_func(old, new) == old_func(old, new)
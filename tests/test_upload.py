@@ -0,0 +1,233 @@
+"""
+上传管道
+
+在本地起一个 HTTP 服务代替排行服务器, 检查凑批、去重、重试与暂存数据的恢复。
+"""
+
+import asyncio
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import threading
+from typing import Any
+
+import pytest
+
+pytest.importorskip("gsuid_core")
+
+from WutheringWavesUID.utils.queues import gacha_record_key, slash_record_key, upload
+from WutheringWavesUID.utils.queues.upload import UploadPipeline
+
+
+class StandInServer:
+    """代替排行服务器, fail_times 次请求返回 503, 之后返回 200 并记录请求体"""
+
+    def __init__(self):
+        self.fail_times = 0
+        self.requests = 0
+        self.received: list[dict] = []
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with server.lock:
+                    server.requests += 1
+                    failed = server.fail_times > 0
+                    if failed:
+                        server.fail_times -= 1
+                    else:
+                        server.received.append(body)
+                self.send_response(503 if failed else 200)
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/upload"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def reset(self, fail_times: int = 0):
+        with self.lock:
+            self.fail_times = fail_times
+            self.requests = 0
+            self.received = []
+
+
+@pytest.fixture(scope="module")
+def stand_in_server():
+    server = StandInServer()
+    yield server
+    server.httpd.shutdown()
+
+
+@pytest.fixture
+def server(stand_in_server: StandInServer, monkeypatch: pytest.MonkeyPatch) -> StandInServer:
+    monkeypatch.setattr(upload, "get_waves_token", lambda: "test-token")
+    stand_in_server.reset()
+    return stand_in_server
+
+
+def run(coro):
+    """每个测试使用独立的事件循环, 结束时关闭共用的连接池"""
+
+    async def _run():
+        try:
+            return await coro
+        finally:
+            await upload.get_upload_client().aclose()
+
+    return asyncio.run(_run())
+
+
+def make_pipeline(server: StandInServer, spool_dir: Path, key_func: Callable[[dict], Any], **kwargs) -> UploadPipeline:
+    kwargs.setdefault("linger", 0.05)
+    kwargs.setdefault("retry_base", 0.05)
+    pipeline = UploadPipeline("test", server.url, "测试", key_func=key_func, **kwargs)
+    pipeline.spool_dir = spool_dir
+    return pipeline
+
+
+async def wait_until(cond: Callable[[], bool], timeout: float = 5):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not cond():
+        assert loop.time() < deadline, "等待超时"
+        await asyncio.sleep(0.02)
+
+
+def spooled(spool_dir: Path) -> list[Path]:
+    return list(spool_dir.glob("*.json"))
+
+
+def test_retry(server: StandInServer, tmp_path: Path):
+    """5xx 按退避重试, 成功后删除暂存文件"""
+    server.reset(fail_times=2)
+
+    async def main():
+        pipeline = make_pipeline(server, tmp_path, gacha_record_key)
+        await pipeline.submit({"waves_id": "100000001", "gacha_details": "{}"})
+        await wait_until(lambda: len(server.received) == 1)
+        await wait_until(lambda: not spooled(tmp_path))
+        pipeline.stop()
+        return pipeline
+
+    pipeline = run(main())
+    assert server.requests == 3
+    assert pipeline.stats["retried"] == 2
+    assert pipeline.stats["uploaded"] == 1
+
+
+def test_dedup(server: StandInServer, tmp_path: Path):
+    """同一批内 key 相同的数据只上传最新的一条, 冥海数据按 wavesId + challengeId 去重"""
+
+    async def main():
+        pipeline = make_pipeline(server, tmp_path, slash_record_key, linger=0.3)
+        for score in (100, 200, 300):
+            await pipeline.submit({"wavesId": "100000001", "challengeId": 1, "score": score})
+        await pipeline.submit({"wavesId": "100000001", "challengeId": 2, "score": 400})
+        await pipeline.submit({"wavesId": "100000002", "challengeId": 1, "score": 500})
+        await wait_until(lambda: len(server.received) == 3)
+        await wait_until(lambda: not spooled(tmp_path))
+        pipeline.stop()
+        return pipeline
+
+    pipeline = run(main())
+    assert sorted(item["score"] for item in server.received) == [300, 400, 500]
+    assert pipeline.stats["deduped"] == 2
+
+
+def test_batch_size(server: StandInServer, tmp_path: Path):
+    """单批最多 batch_size 条, 去重只在同一批内进行"""
+
+    async def main():
+        pipeline = make_pipeline(server, tmp_path, gacha_record_key, batch_size=2, linger=0.3)
+        for index in range(3):
+            await pipeline.submit({"waves_id": "100000001", "gacha_details": str(index)})
+        await wait_until(lambda: len(server.received) == 2)
+        await wait_until(lambda: not spooled(tmp_path))
+        pipeline.stop()
+        return pipeline
+
+    pipeline = run(main())
+    assert [item["gacha_details"] for item in server.received] == ["1", "2"]
+    assert pipeline.stats["deduped"] == 1
+
+
+def test_no_token(server: StandInServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """没有配置 Token 时不上传, 也不保留暂存文件"""
+    monkeypatch.setattr(upload, "get_waves_token", lambda: "")
+
+    async def main():
+        pipeline = make_pipeline(server, tmp_path, gacha_record_key)
+        await pipeline.submit({"waves_id": "100000001", "gacha_details": "{}"})
+        await wait_until(lambda: not spooled(tmp_path))
+        pipeline.stop()
+
+    run(main())
+    assert server.requests == 0
+
+
+def test_spool_replay_after_restart(server: StandInServer, tmp_path: Path):
+    """重试耗尽的数据保留在暂存目录, 重启后 start() 恢复上传"""
+    server.reset(fail_times=100)
+
+    async def fail():
+        pipeline = make_pipeline(server, tmp_path, gacha_record_key, max_retries=1)
+        await pipeline.submit({"waves_id": "100000003", "gacha_details": "{}"})
+        await wait_until(lambda: pipeline.stats["failed"] == 1)
+        pipeline.stop()
+
+    run(fail())
+    assert len(spooled(tmp_path)) == 1
+
+    server.reset()
+
+    async def restart():
+        pipeline = make_pipeline(server, tmp_path, gacha_record_key)
+        pipeline.start()
+        await wait_until(lambda: len(server.received) == 1)
+        await wait_until(lambda: not spooled(tmp_path))
+        pipeline.stop()
+        return pipeline
+
+    pipeline = run(restart())
+    assert server.received[0]["waves_id"] == "100000003"
+    assert pipeline.stats["restored"] == 1
+
+
+def test_spool_replay_periodic(server: StandInServer, tmp_path: Path):
+    """不重启时, 重试耗尽的数据在 retry_interval 后重新上传"""
+    server.reset(fail_times=1)
+
+    async def main():
+        pipeline = make_pipeline(server, tmp_path, gacha_record_key, max_retries=0, retry_interval=0.3)
+        await pipeline.submit({"waves_id": "100000004", "gacha_details": "{}"})
+        await wait_until(lambda: len(server.received) == 1)
+        await wait_until(lambda: not spooled(tmp_path))
+        pipeline.stop()
+        return pipeline
+
+    pipeline = run(main())
+    assert pipeline.stats["failed"] == 1
+    assert pipeline.stats["restored"] == 1
+
+
+def test_corrupt_spool_dropped(server: StandInServer, tmp_path: Path):
+    """损坏的暂存文件在恢复时删除, 不影响其他数据"""
+    (tmp_path / "1_broken.json").write_text("{", encoding="utf-8")
+    (tmp_path / "2_ok.json").write_text(json.dumps({"waves_id": "100000005", "gacha_details": "{}"}), encoding="utf-8")
+
+    async def main():
+        pipeline = make_pipeline(server, tmp_path, gacha_record_key)
+        pipeline.start()
+        await wait_until(lambda: len(server.received) == 1)
+        await wait_until(lambda: not spooled(tmp_path))
+        pipeline.stop()
+
+    run(main())
+    assert server.received[0]["waves_id"] == "100000005"
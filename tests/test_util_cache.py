@@ -0,0 +1,208 @@
+"""
+timed_async_cache
+
+缓存键、并发调用合并、过期后返回旧值并在后台刷新, 以及返回值复制。
+时间通过替换 util.time 控制, 不依赖真实等待。
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("gsuid_core")
+
+from WutheringWavesUID.utils import util
+from WutheringWavesUID.utils.util import timed_async_cache
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """clock[0] 为当前时间, 修改后缓存按新时间判断是否过期"""
+    now = [1000.0]
+    monkeypatch.setattr(util, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def make_counter(**kwargs):
+    """返回 (被缓存的函数, 调用记录)"""
+    calls = []
+
+    @timed_async_cache(10, **kwargs)
+    async def fetch(uid: str, token: str, server: str = "cn"):
+        calls.append((uid, token, server))
+        return {"uid": uid, "token": token, "server": server, "n": len(calls)}
+
+    return fetch, calls
+
+
+def test_key_includes_defaults():
+    """默认值参与缓存键, 位置参数与关键字参数是同一个键"""
+    fetch, calls = make_counter()
+
+    async def main():
+        await fetch("1", "a")
+        await fetch("1", "a", "cn")
+        await fetch(uid="1", token="a", server="cn")
+        await fetch("1", "a", "tw")
+
+    asyncio.run(main())
+    assert calls == [("1", "a", "cn"), ("1", "a", "tw")]
+
+
+def test_key_keeps_token_unless_excluded():
+    fetch, calls = make_counter()
+    excluded, excluded_calls = make_counter(exclude=["token"])
+
+    async def main():
+        for token in ("a", "b"):
+            await fetch("1", token)
+            await excluded("1", token)
+
+    asyncio.run(main())
+    assert len(calls) == 2
+    assert len(excluded_calls) == 1
+
+
+def test_key_unhashable_and_class_method():
+    """不可哈希的参数按 repr 区分; 类方法的不同实例共用缓存"""
+    calls = []
+
+    class Api:
+        @timed_async_cache(10)
+        async def query(self, data: dict):
+            calls.append(data)
+            return len(calls)
+
+    async def main():
+        return [
+            await Api().query({"a": 1}),
+            await Api().query({"a": 1}),
+            await Api().query({"a": 2}),
+        ]
+
+    assert asyncio.run(main()) == [1, 1, 2]
+
+
+def test_condition_and_maxsize():
+    """不满足 condition 的结果不缓存; 超出 maxsize 时淘汰最久未使用的"""
+    fetch, calls = make_counter(condition=lambda x: x["uid"] != "0", maxsize=2)
+
+    async def main():
+        await fetch("0", "a")
+        await fetch("0", "a")
+        await fetch("1", "a")
+        await fetch("2", "a")
+        await fetch("1", "a")
+        await fetch("3", "a")
+        await fetch("1", "a")
+        await fetch("2", "a")
+
+    asyncio.run(main())
+    assert [uid for uid, *_ in calls] == ["0", "0", "1", "2", "3", "2"]
+    assert fetch.cache_info()["evictions"] == 2
+
+
+def test_single_flight():
+    """相同参数的并发调用只执行一次, 不同参数互不影响"""
+    calls = []
+
+    @timed_async_cache(10)
+    async def fetch(uid: str):
+        calls.append(uid)
+        await asyncio.sleep(0.05)
+        return uid
+
+    async def main():
+        return await asyncio.gather(*(fetch(uid) for uid in ("1", "1", "1", "2")))
+
+    assert asyncio.run(main()) == ["1", "1", "1", "2"]
+    assert sorted(calls) == ["1", "2"]
+    assert fetch.cache_info()["inflight"] == 0
+
+
+def test_single_flight_exception_not_cached():
+    """执行失败时所有等待的调用都收到异常, 之后的调用重新执行"""
+    calls = []
+
+    @timed_async_cache(10)
+    async def fetch(uid: str):
+        calls.append(uid)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise ValueError(uid)
+        return uid
+
+    async def main():
+        results = await asyncio.gather(fetch("1"), fetch("1"), return_exceptions=True)
+        return results, await fetch("1")
+
+    results, retry = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert retry == "1"
+    assert calls == ["1", "1"]
+
+
+def test_stale_refresh(clock: list[float]):
+    """过期后 stale 时间内返回旧值并在后台刷新, 超过 stale 时间重新执行"""
+    fetch, calls = make_counter(stale=5)
+
+    async def main():
+        first = await fetch("1", "a")
+
+        clock[0] += 12
+        stale = await fetch("1", "a")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        refreshed = await fetch("1", "a")
+
+        clock[0] += 20
+        expired = await fetch("1", "a")
+        return first, stale, refreshed, expired
+
+    first, stale, refreshed, expired = asyncio.run(main())
+    assert stale["n"] == first["n"] == 1
+    assert refreshed["n"] == 2
+    assert expired["n"] == 3
+    info = fetch.cache_info()
+    assert (info["hits"], info["stale_hits"], info["misses"]) == (1, 1, 2)
+
+
+def test_stale_refresh_failure_keeps_old_value(clock: list[float]):
+    """后台刷新失败时保留旧值, 不抛出未获取的异常, 下次调用再次刷新"""
+    calls = []
+
+    @timed_async_cache(10, stale=5)
+    async def fetch(uid: str):
+        calls.append(uid)
+        if len(calls) > 1:
+            raise ValueError(uid)
+        return len(calls)
+
+    async def main():
+        await fetch("1")
+        clock[0] += 12
+        stale = await fetch("1")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return stale, await fetch("1")
+
+    assert asyncio.run(main()) == (1, 1)
+    assert len(calls) == 3
+
+
+def test_copy():
+    """传入 copy 时每次返回复制的结果, 修改返回值不影响缓存"""
+    fetch, _ = make_counter(copy=dict)
+    shared, _ = make_counter()
+
+    async def main():
+        value = await fetch("1", "a")
+        value["uid"] = "changed"
+        shared_value = await shared("1", "a")
+        return value, await fetch("1", "a"), shared_value, await shared("1", "a")
+
+    value, again, shared_value, shared_again = asyncio.run(main())
+    assert again["uid"] == "1"
+    assert again is not value
+    assert shared_again is shared_value